@@ -26,6 +26,7 @@ from render.plan2gantt import (
     parse_date_field,
     add_workdays,
     sub_workdays,
+    count_workdays_between,
     is_workday as _is_workday,
     normalize_start as _normalize_start,
     compute_node_schedule,
@@ -419,6 +420,47 @@ class TestValidation(unittest.TestCase):
         with self.assertRaises(ValidationError) as ctx:
             validate_views(views, plan)
         self.assertIn("meta.id", str(ctx.exception))
+    
+    def test_after_cycles_all_reported(self):
+        """Все циклы по after перечислены в одной ошибке."""
+        plan = {
+            "version": 1,
+            "meta": {"id": "test", "title": "Test"},
+            "nodes": {
+                "a": {"title": "A", "after": ["b"]},
+                "b": {"title": "B", "after": ["a"]},
+                "c": {"title": "C", "after": ["c"]},
+            }
+        }
+        with self.assertRaises(ValidationError) as ctx:
+            validate_plan(plan)
+        self.assertEqual(ctx.exception.path, "nodes.a.after")
+        self.assertEqual(ctx.exception.value, "a -> b -> a; c -> c")
+    
+    def test_after_cycle_long_chain(self):
+        """Длинная цепочка after не упирается в лимит рекурсии."""
+        depth = sys.getrecursionlimit() * 3
+        nodes = {f"n{i}": {"title": "Task", "after": [f"n{i - 1}"]} for i in range(1, depth)}
+        nodes["n0"] = {"title": "Task", "after": [f"n{depth - 1}"]}
+        plan = {"version": 1, "meta": {"id": "test", "title": "Test"}, "nodes": nodes}
+        with self.assertRaises(ValidationError) as ctx:
+            validate_plan(plan)
+        self.assertIn("via after", str(ctx.exception))
+    
+    def test_parent_cycle_without_tail(self):
+        """Цикл по parent показывается без хвоста, с первого узла цикла."""
+        plan = {
+            "version": 1,
+            "meta": {"id": "test", "title": "Test"},
+            "nodes": {
+                "x": {"title": "X", "parent": "b"},
+                "a": {"title": "A", "parent": "b"},
+                "b": {"title": "B", "parent": "a"},
+            }
+        }
+        with self.assertRaises(ValidationError) as ctx:
+            validate_plan(plan)
+        self.assertEqual(ctx.exception.value, "a -> b -> a")
 
 
 class TestFixtures(unittest.TestCase):
@@ -513,6 +555,14 @@ class TestDateExcludes(unittest.TestCase):
         start = date(2024, 3, 7)
         result = add_workdays(start, 2, cal)
         self.assertEqual(result, date(2024, 3, 12))
+    
+    def test_count_workdays_between_with_holiday(self):
+        """count_workdays_between не считает выходные и праздники."""
+        cal = _make_calendar(["weekends", "2024-03-08"])
+        
+        # Mon Mar 4 .. Tue Mar 12: 4 + 2 workdays (Fri 8 is holiday)
+        self.assertEqual(count_workdays_between(date(2024, 3, 4), date(2024, 3, 12), cal), 6)
+        self.assertEqual(count_workdays_between(date(2024, 3, 12), date(2024, 3, 4), cal), 0)
 
 
 class TestStartNormalization(unittest.TestCase):
@@ -15,7 +15,7 @@ import re
 import sys
 from collections import defaultdict
 from datetime import date, datetime
-from typing import Any, Dict, Optional, Set, List
+from typing import Any, Dict, Optional, Set, List, Tuple
 
 import yaml
 
@@ -295,6 +295,31 @@ def find_roots(plan: Dict[str, Any]) -> List[str]:
     return roots
 
 
+def euler_intervals(
+    children_map: Dict[str, list], roots: List[str]
+) -> Tuple[List[str], Dict[str, int], Dict[str, int]]:
+    """Depth-first order of the hierarchy and the [enter, leave) slice of each subtree.
+
+    The descendants of n are order[enter[n] + 1:leave[n]]. Nodes on parent
+    cycles are not reachable from a root and get no interval.
+    """
+    order: List[str] = []
+    enter: Dict[str, int] = {}
+    leave: Dict[str, int] = {}
+    stack: List[tuple] = [(root_id, False) for root_id in reversed(roots)]
+    while stack:
+        nid, done = stack.pop()
+        if done:
+            leave[nid] = len(order)
+            continue
+        enter[nid] = len(order)
+        order.append(nid)
+        stack.append((nid, True))
+        for child in reversed(children_map.get(nid, [])):
+            stack.append((child, False))
+    return order, enter, leave
+
+
 # ---------- Status-based colors ----------
 
 def build_status_classes(plan: Dict[str, Any]) -> Dict[str, str]:
@@ -434,8 +459,15 @@ def render_dag_mermaid(
                 if not parent or parent not in nodes:
                     break
                 cur = parent
-        # plus all descendants
-        stack = list(requested_tracks)
+        # plus all descendants (a slice of the depth-first order; tracks on
+        # a parent cycle have no interval and are walked instead)
+        order, enter, leave = euler_intervals(children_map, roots)
+        stack = []
+        for tid in requested_tracks:
+            if tid in enter:
+                visible_nodes.update(order[enter[tid] + 1:leave[tid]])
+            else:
+                stack.append(tid)
         while stack:
             nid = stack.pop()
             for child in children_map.get(nid, []):
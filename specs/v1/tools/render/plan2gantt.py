@@ -33,7 +33,8 @@ import argparse
 import json
 import re
 import sys
-from dataclasses import dataclass
+from bisect import bisect_right
+from dataclasses import dataclass, field
 from datetime import date, datetime, timedelta
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Set, Tuple
@@ -156,6 +157,16 @@ def parse_duration_days(value: Any, field_path: str, rep: Reporter) -> int:
 class Calendar:
     weekends: bool
     exclude_dates: Set[date]
+    # Sorted ordinals of exclude_dates that would otherwise be workdays;
+    # lets workday arithmetic jump whole weeks and bisect over holidays.
+    holidays: Tuple[int, ...] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        holidays = sorted(
+            d.toordinal() for d in self.exclude_dates
+            if not (self.weekends and d.weekday() >= 5)
+        )
+        object.__setattr__(self, "holidays", tuple(holidays))
 
 
 def build_calendar(excludes: Any, rep: Reporter, view_path: str) -> Calendar:
@@ -203,18 +214,46 @@ def is_workday(d: date, cal: Calendar) -> bool:
     return True
 
 
+def _weekdays_upto(ordinal: int) -> int:
+    # Ordinal 1 (0001-01-01) is a Monday: 5 weekdays per whole week.
+    return (ordinal // 7) * 5 + min(ordinal % 7, 5)
+
+
+def _weekday_ordinal(count: int) -> int:
+    # Inverse of _weekdays_upto: smallest ordinal with _weekdays_upto >= count.
+    weeks, rest = divmod(count - 1, 5)
+    return weeks * 7 + rest + 1
+
+
+def _base_upto(ordinal: int, cal: Calendar) -> int:
+    return _weekdays_upto(ordinal) if cal.weekends else ordinal
+
+
+def _base_ordinal(count: int, cal: Calendar) -> int:
+    return _weekday_ordinal(count) if cal.weekends else count
+
+
+def _workdays_upto(ordinal: int, cal: Calendar) -> int:
+    """Number of workdays with ordinal <= ordinal (only differences are meaningful)."""
+    return _base_upto(ordinal, cal) - bisect_right(cal.holidays, ordinal)
+
+
+def _nth_workday(count: int, cal: Calendar) -> date:
+    """Workday whose _workdays_upto value equals count."""
+    ordinal = _base_ordinal(count, cal)
+    deficit = count - _workdays_upto(ordinal, cal)
+    while deficit > 0:
+        ordinal = _base_ordinal(_base_upto(ordinal, cal) + deficit, cal)
+        deficit = count - _workdays_upto(ordinal, cal)
+    return date.fromordinal(ordinal)
+
+
 def next_workday(d: date, cal: Calendar) -> date:
-    cur = d + timedelta(days=1)
-    while not is_workday(cur, cal):
-        cur += timedelta(days=1)
-    return cur
+    return _nth_workday(_workdays_upto(d.toordinal(), cal) + 1, cal)
 
 
 def prev_workday(d: date, cal: Calendar) -> date:
-    cur = d - timedelta(days=1)
-    while not is_workday(cur, cal):
-        cur -= timedelta(days=1)
-    return cur
+    return _nth_workday(_workdays_upto(d.toordinal() - 1, cal), cal)
 
 
 def add_workdays(start: date, n: int, cal: Calendar) -> date:
@@ -223,13 +262,9 @@ def add_workdays(start: date, n: int, cal: Calendar) -> date:
     adds n workdays AFTER start (start is included in duration via duration-1).
     n=0 => returns start.
     """
-    cur = start
-    added = 0
-    while added < n:
-        cur += timedelta(days=1)
-        if is_workday(cur, cal):
-            added += 1
-    return cur
+    if n <= 0:
+        return start
+    return _nth_workday(_workdays_upto(start.toordinal(), cal) + n, cal)
 
 
 def sub_workdays(finish: date, n: int, cal: Calendar) -> date:
@@ -238,25 +273,19 @@ def sub_workdays(finish: date, n: int, cal: Calendar) -> date:
     subtracts n workdays BEFORE finish (finish is included via duration-1).
     n=0 => returns finish.
     """
-    cur = finish
-    subtracted = 0
-    while subtracted < n:
-        cur -= timedelta(days=1)
-        if is_workday(cur, cal):
-            subtracted += 1
-    return cur
+    if n <= 0:
+        return finish
+    before = _workdays_upto(finish.toordinal() - 1, cal)
+    return _nth_workday(before - n + 1, cal)
 
 
 def count_workdays_between(start: date, finish: date, cal: Calendar) -> int:
     if finish < start:
         return 0
-    cur = start
-    count = 0
-    while cur <= finish:
-        if is_workday(cur, cal):
-            count += 1
-        cur += timedelta(days=1)
-    return count
+    return (
+        _workdays_upto(finish.toordinal(), cal)
+        - _workdays_upto(start.toordinal() - 1, cal)
+    )
 
 
 def normalize_start(d: date, cal: Calendar, milestone: bool, rep: Reporter, node_path: str) -> date:
@@ -264,9 +293,7 @@ def normalize_start(d: date, cal: Calendar, milestone: bool, rep: Reporter, node
         return d
     if is_workday(d, cal):
         return d
-    cur = d
-    while not is_workday(cur, cal):
-        cur += timedelta(days=1)
+    cur = next_workday(d - timedelta(days=1), cal)
     rep.warn(f"{node_path}.start: {d.isoformat()} is excluded, normalized to {cur.isoformat()}")
     return cur
 
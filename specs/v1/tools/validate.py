@@ -24,9 +24,10 @@ import argparse
 import json
 import re
 import sys
+from collections import deque
 from datetime import date, datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set, Tuple
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 
 
 # ============================================================================
@@ -562,95 +563,166 @@ def _check_cycles_parent(nodes: Dict[str, Any]) -> None:
     """
     Checks for absence of circular references via parent.
     
+    Every node has at most one parent, so each node is walked once and
+    every cycle is found in O(N) (see _find_functional_cycles).
+    
     Raises:
-        ValidationError: when cycle is found
+        ValidationError: listing every cycle found
     """
-    for node_id in nodes:
-        visited: Set[str] = set()
-        current = node_id
-        
-        while current:
-            if current in visited:
-                # Found cycle
-                cycle_path = _build_cycle_path(nodes, node_id, 'parent')
-                raise ValidationError(
-                    "Circular reference detected via parent",
-                    path=f"nodes.{node_id}.parent",
-                    value=cycle_path,
-                    expected="acyclic parent relationship graph"
-                )
-            
-            visited.add(current)
-            node = nodes.get(current, {})
-            current = node.get('parent') if isinstance(node, dict) else None
+    def parent_of(node_id: str) -> Optional[str]:
+        node = nodes.get(node_id)
+        return node.get('parent') if isinstance(node, dict) else None
+    
+    cycles = _find_functional_cycles(list(nodes), parent_of)
+    if cycles:
+        raise ValidationError(
+            "Circular reference detected via parent",
+            path=f"nodes.{cycles[0][0]}.parent",
+            value="; ".join(" -> ".join(cycle) for cycle in cycles),
+            expected="acyclic parent relationship graph"
+        )
 
 
 def _check_cycles_after(nodes: Dict[str, Any]) -> None:
     """
     Checks for absence of circular dependencies via after.
     
-    Uses depth-first search (DFS) algorithm to detect cycles.
+    Finds the strongly connected components of the after graph in
+    O(V + E) without recursion (see _find_cycles) and reports each
+    group of mutually dependent nodes once.
     
     Raises:
-        ValidationError: when cycle is found
+        ValidationError: listing every cycle found
     """
-    # States: 0 = not visited, 1 = in progress, 2 = completed
-    state: Dict[str, int] = {node_id: 0 for node_id in nodes}
+    def after_of(node_id: str) -> List[str]:
+        node = nodes.get(node_id)
+        after = node.get('after') if isinstance(node, dict) else None
+        return after if isinstance(after, list) else []
     
-    def dfs(node_id: str, path: List[str]) -> None:
-        if state[node_id] == 2:
-            return
-        
-        if state[node_id] == 1:
-            # Found cycle
-            cycle_start = path.index(node_id)
-            cycle = path[cycle_start:] + [node_id]
-            raise ValidationError(
-                "Circular dependency detected via after",
-                path=f"nodes.{node_id}.after",
-                value=" -> ".join(cycle),
-                expected="acyclic dependency graph"
-            )
-        
-        state[node_id] = 1
-        path.append(node_id)
-        
-        node = nodes.get(node_id, {})
-        after = node.get('after', []) if isinstance(node, dict) else []
-        
-        if isinstance(after, list):
-            for dep in after:
-                if dep in nodes:
-                    dfs(dep, path)
-        
-        path.pop()
-        state[node_id] = 2
-    
-    for node_id in nodes:
-        if state[node_id] == 0:
-            dfs(node_id, [])
+    cycles = _find_cycles(list(nodes), after_of)
+    if cycles:
+        raise ValidationError(
+            "Circular dependency detected via after",
+            path=f"nodes.{cycles[0][0]}.after",
+            value="; ".join(" -> ".join(cycle) for cycle in cycles),
+            expected="acyclic dependency graph"
+        )
 
 
-def _build_cycle_path(nodes: Dict[str, Any], start_id: str, field: str) -> str:
-    """Builds string representation of cycle for error message."""
-    path = [start_id]
-    current = start_id
-    
-    while True:
-        node = nodes.get(current, {})
-        next_id = node.get(field) if isinstance(node, dict) else None
+def _find_cycles(node_ids: List[str], successors: Callable[[str], List[str]]) -> List[List[str]]:
+    """
+    Finds one cycle per strongly connected component that has a cycle.
+    
+    Iterative Tarjan: O(V + E), no recursion. A component has a cycle if
+    it has more than one member or a self-loop; it is reported as the
+    shortest closed path through its first member (in node_ids order),
+    e.g. ['a', 'b', 'a'] for a -> b -> a. Successors that are not in
+    node_ids are ignored.
+    """
+    position = {node_id: i for i, node_id in enumerate(node_ids)}
+    index: Dict[str, int] = {}
+    low: Dict[str, int] = {}
+    stack: List[str] = []
+    on_stack: Set[str] = set()
+    cycles: List[List[str]] = []
+    
+    for root_id in node_ids:
+        if root_id in index:
+            continue
         
-        if next_id is None:
-            break
+        index[root_id] = low[root_id] = len(index)
+        stack.append(root_id)
+        on_stack.add(root_id)
+        work = [(root_id, iter(successors(root_id)))]
+        while work:
+            node_id, edges = work[-1]
+            for next_id in edges:
+                if next_id not in position:
+                    continue
+                if next_id not in index:
+                    index[next_id] = low[next_id] = len(index)
+                    stack.append(next_id)
+                    on_stack.add(next_id)
+                    work.append((next_id, iter(successors(next_id))))
+                    break
+                if next_id in on_stack and index[next_id] < low[node_id]:
+                    low[node_id] = index[next_id]
+            else:
+                work.pop()
+                if work and low[node_id] < low[work[-1][0]]:
+                    low[work[-1][0]] = low[node_id]
+                if low[node_id] != index[node_id]:
+                    continue
+                
+                component: Set[str] = set()
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    component.add(member)
+                    if member == node_id:
+                        break
+                start_id = min(component, key=position.__getitem__)
+                if len(component) > 1 or start_id in successors(start_id):
+                    cycles.append(_shortest_cycle(start_id, component, successors))
+    
+    cycles.sort(key=lambda cycle: position[cycle[0]])
+    return cycles
+
+
+def _shortest_cycle(start_id: str, component: Set[str],
+                    successors: Callable[[str], List[str]]) -> List[str]:
+    """Shortest closed path from start_id back to itself inside component (BFS)."""
+    previous: Dict[str, Optional[str]] = {start_id: None}
+    queue = deque([start_id])
+    while queue:
+        node_id = queue.popleft()
+        for next_id in successors(node_id):
+            if next_id == start_id:
+                path = [start_id]
+                current: Optional[str] = node_id
+                while current is not None:
+                    path.append(current)
+                    current = previous[current]
+                path.reverse()
+                return path
+            if next_id in component and next_id not in previous:
+                previous[next_id] = node_id
+                queue.append(next_id)
+    raise ValueError(f"No cycle through {start_id!r}")
+
+
+def _find_functional_cycles(node_ids: List[str],
+                            successor: Callable[[str], Optional[str]]) -> List[List[str]]:
+    """
+    Finds every cycle of a graph with at most one successor per node.
+    
+    Each node is walked once (O(N)); a walk stops when it leaves the
+    graph, reaches a node of an earlier walk, or closes on its own path.
+    Cycles start at their first member in node_ids order.
+    """
+    position = {node_id: i for i, node_id in enumerate(node_ids)}
+    walked: Dict[str, int] = {}
+    cycles: List[List[str]] = []
+    
+    for walk, root_id in enumerate(node_ids):
+        path: List[str] = []
+        current: Optional[str] = root_id
+        while current is not None and current in position and current not in walked:
+            walked[current] = walk
+            path.append(current)
+            current = successor(current)
         
-        if next_id in path:
-            path.append(next_id)
-            break
+        if current is None or walked.get(current) != walk:
+            continue
         
-        path.append(next_id)
-        current = next_id
-    
-    return " -> ".join(path)
+        cycle = path[path.index(current):]
+        first = min(range(len(cycle)), key=lambda i: position[cycle[i]])
+        cycle = cycle[first:] + cycle[:first]
+        cycle.append(cycle[0])
+        cycles.append(cycle)
+    
+    cycles.sort(key=lambda cycle: position[cycle[0]])
+    return cycles
 
 
 def _check_after_chains_have_anchor(nodes: Dict[str, Any], warnings: List[str]) -> None:
@@ -0,0 +1,7 @@
+"""
+Benchmarks for the opskarta v2 reference tools.
+
+Each module is runnable on its own, e.g.:
+    python -m specs.v2.benchmarks.bench_memory --nodes 100000
+    python -m specs.v2.benchmarks.bench_load --fragments 400
+"""
@@ -0,0 +1,84 @@
+"""
+Load benchmark: load_plan_set time by number of worker processes.
+
+Generates a synthetic plan set split into many fragment files and
+times load_plan_set with --jobs 1, 2, 4, ... up to the CPU count,
+then sequential loads through a cold and a warm FragmentCache, and
+loading a compiled snapshot of the plan.
+
+Usage:
+    python -m specs.v2.benchmarks.bench_load [--nodes N] [--fragments F] [--repeat R] [--max-jobs J]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from specs.v2.benchmarks.bench_memory import write_plan_set
+from specs.v2.tools.cache import FragmentCache
+from specs.v2.tools.loader import load_plan_set
+from specs.v2.tools.snapshot import load_snapshot, save_snapshot
+
+
+def job_counts(cpus: int) -> list[int]:
+    """Powers of two up to cpus, plus cpus itself."""
+    counts = [1]
+    while counts[-1] * 2 <= cpus:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != cpus:
+        counts.append(cpus)
+    return counts
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--nodes", type=int, default=40000, help="number of nodes")
+    parser.add_argument("--fragments", type=int, default=400, help="number of node fragments")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per job count (best is reported)")
+    parser.add_argument("--max-jobs", type=int, default=None, help="largest job count (default: CPU count)")
+    args = parser.parse_args(argv)
+    
+    cpus = args.max_jobs or os.cpu_count() or 1
+    with tempfile.TemporaryDirectory() as tmp:
+        files = write_plan_set(Path(tmp), args.nodes, args.fragments)
+        print(f"nodes: {args.nodes}, files: {len(files)}, max jobs: {cpus}")
+        
+        baseline = None
+        for jobs in job_counts(cpus):
+            best = float("inf")
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                load_plan_set(files, jobs)
+                best = min(best, time.perf_counter() - started)
+            baseline = baseline or best
+            print(f"jobs {jobs:3d}: {best:7.2f} s  (x{baseline / best:.2f})")
+        
+        cache = FragmentCache(Path(tmp) / "cache")
+        started = time.perf_counter()
+        load_plan_set(files, cache=cache)
+        cold = time.perf_counter() - started
+        warm = float("inf")
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            load_plan_set(files, cache=cache)
+            warm = min(warm, time.perf_counter() - started)
+        print(f"cache cold: {cold:7.2f} s")
+        print(f"cache warm: {warm:7.2f} s  (x{baseline / warm:.2f})")
+        
+        snapshot = str(Path(tmp) / "plan.opsnap")
+        save_snapshot(load_plan_set(files, cache=cache), snapshot)
+        best = float("inf")
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            load_snapshot(snapshot)
+            best = min(best, time.perf_counter() - started)
+        print(f"snapshot:   {best:7.2f} s  (x{baseline / best:.2f})")
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,156 @@
+"""
+Memory benchmark: bytes per node of a loaded plan set.
+
+Generates a synthetic plan set (nodes split over several fragments,
+every node scheduled), loads it with load_plan_set and reports the
+memory retained by the MergedPlan. For comparison, the same plan is
+rebuilt in the previous layout: dataclasses with a per-instance
+__dict__, one string object per YAML occurrence and a flat sources
+dict with "type:id" keys.
+
+Usage:
+    python -m specs.v2.benchmarks.bench_memory [--nodes N] [--fragments F]
+"""
+
+import argparse
+import dataclasses
+import sys
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+from specs.v2.tools import models
+from specs.v2.tools.loader import load_plan_set
+
+
+KINDS = ("epic", "story", "task")
+STATUSES = ("not_started", "in_progress", "done")
+
+
+def write_plan_set(directory: Path, nodes: int, fragments: int) -> list[str]:
+    """
+    Write a synthetic plan set and return its file paths.
+    
+    Args:
+        directory: Output directory
+        nodes: Total number of nodes
+        fragments: Number of node fragments (plus one main fragment)
+        
+    Returns:
+        File paths, main fragment first
+    """
+    main = directory / "main.plan.yaml"
+    main.write_text(
+        "version: 2\n"
+        "meta:\n  id: bench\n  title: Bench\n"
+        "statuses:\n"
+        + "".join(f"  {status}: {{ label: {status} }}\n" for status in STATUSES)
+        + "schedule:\n"
+        "  calendars:\n    default:\n      excludes: [weekends]\n"
+        "  default_calendar: default\n",
+        encoding="utf-8",
+    )
+    files = [str(main)]
+    
+    per_fragment = -(-nodes // fragments)
+    for f in range(fragments):
+        lines = ["nodes:\n"]
+        schedule = ["schedule:\n  nodes:\n"]
+        for i in range(f * per_fragment, min(nodes, (f + 1) * per_fragment)):
+            lines.append(
+                f"  n{i}:\n"
+                f"    title: Node {i}\n"
+                f"    kind: {KINDS[i % 3]}\n"
+                f"    status: {STATUSES[i % 3]}\n"
+                + (f"    parent: n{i // 10}\n" if i else "")
+                + (f"    after: [n{i - 1}]\n" if i % 10 else "")
+                + f"    effort: {i % 8 + 1}\n"
+            )
+            schedule.append(
+                f"    n{i}:\n"
+                + ("      start: \"2024-03-01\"\n" if i % 10 == 0 else "")
+                + f"      duration: {i % 5 + 1}d\n"
+            )
+        path = directory / f"team{f}.plan.yaml"
+        path.write_text("".join(lines + schedule), encoding="utf-8")
+        files.append(str(path))
+    
+    return files
+
+
+def _unslotted(cls: type) -> type:
+    """Recreate a model dataclass without __slots__ (previous layout)."""
+    return dataclasses.make_dataclass(
+        cls.__name__,
+        [(f.name, f.type, f) for f in dataclasses.fields(cls)],
+    )
+
+
+def _copy_str(value):
+    """New string object with the same value (no interning)."""
+    return "".join(list(value)) if isinstance(value, str) else value
+
+
+def legacy_copy(plan: models.MergedPlan) -> tuple:
+    """
+    Rebuild the per-element parts of a plan in the previous layout.
+    
+    Returns:
+        (nodes, schedule_nodes, sources) in the previous representation
+    """
+    LegacyNode = _unslotted(models.Node)
+    LegacyScheduleNode = _unslotted(models.ScheduleNode)
+    
+    nodes = {}
+    for node_id, node in plan.nodes.items():
+        values = {
+            f.name: _copy_str(getattr(node, f.name))
+            for f in dataclasses.fields(models.Node)
+        }
+        if node.after is not None:
+            values["after"] = [_copy_str(dep_id) for dep_id in node.after]
+        nodes[_copy_str(node_id)] = LegacyNode(**values)
+    
+    schedule_nodes = {}
+    for node_id, sn in plan.schedule.nodes.items():
+        schedule_nodes[_copy_str(node_id)] = LegacyScheduleNode(**{
+            f.name: _copy_str(getattr(sn, f.name))
+            for f in dataclasses.fields(models.ScheduleNode)
+        })
+    
+    sources = {key: source for key, source in plan.sources.items()}
+    return nodes, schedule_nodes, sources
+
+
+def measure(build) -> tuple[int, object]:
+    """Return (retained bytes, result) of calling build()."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return after - before, result
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--nodes", type=int, default=10000, help="number of nodes")
+    parser.add_argument("--fragments", type=int, default=20, help="number of node fragments")
+    args = parser.parse_args(argv)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        files = write_plan_set(Path(tmp), args.nodes, args.fragments)
+        current, plan = measure(lambda: load_plan_set(files))
+    
+    legacy, _ = measure(lambda: legacy_copy(plan))
+    
+    n = args.nodes
+    print(f"nodes: {n}, fragments: {args.fragments}")
+    print(f"previous layout: {legacy / n:8.0f} bytes/node")
+    print(f"current layout:  {current / n:8.0f} bytes/node")
+    print(f"saved:           {1 - current / legacy:8.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,181 @@
+"""
+Render benchmark: renderer time by plan size.
+
+Builds synthetic plans in memory (a hierarchy with ten children per
+node) and times the renderers at growing sizes; time per node should
+stay flat as the plan grows. A single parent chain deeper than the
+recursion limit checks that rendering does not recurse. Many views
+with where filters are then evaluated over the largest plan, and an
+effort cube with six dimensions is built for it. Finally, the peak
+memory of rendering its dependency graph to a file is compared between
+building the whole string (render_deps) and streaming lines
+(iter_deps + write_lines).
+
+Usage:
+    python -m specs.v2.benchmarks.bench_render [--sizes N,N,...] [--depth D] [--views V] [--repeat R]
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+from specs.v2.tools.cube import EffortCube
+from specs.v2.tools.effort import compute_effort_metrics
+from specs.v2.tools.models import MergedPlan, Node, Schedule, ScheduleNode, View, ViewFilter
+from specs.v2.tools.render.common import apply_view_filter, write_lines
+from specs.v2.tools.render.deps import iter_deps, render_deps
+from specs.v2.tools.render.masks import FilterMasks
+from specs.v2.tools.render.tree import render_tree
+
+
+KINDS = ("phase", "epic", "task", "bug")
+
+# Dimensions of the effort cube
+CUBE_DIMENSIONS = ("status", "kind", "fragment", "scheduled", "calendar", "x.team")
+
+
+def filter_views(count: int, nodes: int) -> dict[str, View]:
+    """Views cycling through kind, status, has_schedule and parent filters."""
+    views = {}
+    for i in range(count):
+        where = ViewFilter(
+            kind=[KINDS[i % len(KINDS)], KINDS[(i + 1) % len(KINDS)]] if i % 2 else None,
+            status=["todo"] if i % 3 == 0 else None,
+            has_schedule=bool(i % 2) if i % 5 == 0 else None,
+            parent=f"n{i % max(nodes // 100, 1)}" if i % 4 == 1 else None,
+        )
+        views[f"view{i}"] = View(title=f"View {i}", where=where)
+    return views
+
+
+def build_plan(nodes: int, deep: bool = False) -> MergedPlan:
+    """
+    Synthetic plan.
+    
+    Args:
+        nodes: Number of nodes
+        deep: Chain every node under the previous one instead of ten
+              children per node (no schedule is added)
+    
+    Returns:
+        MergedPlan with a "by_title" view (order_by: title)
+    """
+    plan = MergedPlan(views={"by_title": View(title="By title", order_by="title")})
+    for i in range(nodes):
+        parent = None
+        if i:
+            parent = f"n{i - 1}" if deep else f"n{(i - 1) // 10}"
+        plan.nodes[f"n{i}"] = Node(
+            title=f"Node {(i * 7919) % nodes}",
+            kind=KINDS[i % len(KINDS)],
+            status="todo" if i % 3 else "done",
+            parent=parent,
+            effort=float(i % 5) if i % 2 else None,
+            after=[f"n{i - 1}", f"n{i // 2}"] if i % 7 == 3 else None,
+            x={"team": f"team{i % 7}"},
+        )
+        plan.sources.add("node", f"n{i}", f"part{i % 13}.plan.yaml")
+    compute_effort_metrics(plan)
+    if not deep:
+        plan.schedule = Schedule(nodes={
+            node_id: ScheduleNode(duration="1d") for node_id in list(plan.nodes)[::2]
+        })
+    return plan
+
+
+def best_time(func, repeat: int) -> float:
+    """Best wall time of repeat calls."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def peak_memory(func) -> int:
+    """Peak traced memory (bytes) allocated while func runs."""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--sizes", default="1000,10000,50000",
+        help="comma-separated plan sizes (default: 1000,10000,50000)",
+    )
+    parser.add_argument("--depth", type=int, default=3000, help="length of the parent chain")
+    parser.add_argument("--views", type=int, default=60, help="number of filtered views")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per size (best is reported)")
+    args = parser.parse_args(argv)
+    
+    sizes = [int(size) for size in args.sizes.split(",")]
+    for size in sizes:
+        plan = build_plan(size)
+        plain = best_time(lambda: render_tree(plan), args.repeat)
+        ordered = best_time(lambda: render_tree(plan, "by_title"), args.repeat)
+        print(
+            f"tree {size:7d} nodes: {plain:7.3f} s ({plain / size * 1e6:5.1f} us/node), "
+            f"order_by title {ordered:7.3f} s ({ordered / size * 1e6:5.1f} us/node)"
+        )
+    
+    plan = build_plan(args.depth, deep=True)
+    elapsed = best_time(lambda: render_tree(plan), args.repeat)
+    print(f"tree chain of {args.depth} nodes: {elapsed:7.3f} s")
+    
+    size = sizes[-1]
+    plan = build_plan(size)
+    plan.views.update(filter_views(args.views, size))
+    node_ids = list(plan.nodes)
+    
+    def filter_all() -> None:
+        for view in plan.views.values():
+            apply_view_filter(plan, node_ids, view.where)
+    
+    started = time.perf_counter()
+    filter_all()
+    cold = time.perf_counter() - started
+    warm = best_time(filter_all, args.repeat)
+    masks = FilterMasks.of(plan)
+    evaluate = best_time(
+        lambda: [masks.mask(view.where) for view in plan.views.values() if view.where],
+        args.repeat,
+    )
+    print(
+        f"filters: {args.views} views over {size} nodes: first pass {cold * 1000:7.1f} ms, "
+        f"cached {warm * 1000:7.1f} ms, bitset evaluation {evaluate * 1000:7.2f} ms"
+    )
+    
+    started = time.perf_counter()
+    cube = EffortCube(plan, CUBE_DIMENSIONS)
+    built = time.perf_counter() - started
+    roots = plan.index.roots
+    query = best_time(
+        lambda: [cube.breakdown(dimension, root) for dimension in CUBE_DIMENSIONS for root in roots],
+        args.repeat,
+    )
+    print(
+        f"effort cube: {len(CUBE_DIMENSIONS)} dimensions over {size} nodes: "
+        f"built in {built * 1000:7.1f} ms, breakdown per root {query * 1000:7.2f} ms"
+    )
+    
+    with open(os.devnull, "w", encoding="utf-8") as devnull:
+        joined = peak_memory(lambda: print(render_deps(plan), file=devnull))
+        streamed = peak_memory(lambda: write_lines(iter_deps(plan), devnull))
+    print(
+        f"deps to file, {size} nodes: peak {joined / 2**20:6.1f} MiB as one string, "
+        f"{streamed / 2**20:6.1f} MiB streamed"
+    )
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,227 @@
+"""
+Startup benchmark: CLI import time and end-to-end time on a tiny plan.
+
+Runs CLI commands on a two-node plan (and its compiled snapshot) in
+fresh interpreters with python -X importtime and checks that each
+command imports only what it needs: modules of other subcommands must
+not be imported, commands reading a snapshot must not import PyYAML,
+and the time spent importing (beyond the bare interpreter's own
+start-up) must stay within a budget. The end-to-end time of validate is then
+compared with its budget and with the interpreter start-up that no
+command can avoid (python -c "import yaml").
+
+Exits with status 1 if a budget is exceeded or a forbidden module is
+imported.
+
+Usage:
+    python -m specs.v2.benchmarks.bench_startup [--repeat R] [--import-budget MS] [--wall-budget MS]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+
+TINY_PLAN = """\
+version: 2
+meta:
+  id: tiny
+  title: Tiny plan
+nodes:
+  root:
+    title: Root
+  task:
+    title: Task
+    parent: root
+    effort: 3
+"""
+
+# Modules that only other subcommands need, and NumPy (imported on
+# first use, for large plans only)
+OTHER_COMMANDS = (
+    "specs.v2.tools.watch",
+    "specs.v2.tools.serve",
+    "http.server",
+    "concurrent.futures.process",
+    "numpy",
+)
+
+# Command (with {plan} for the plan file, {snapshot} for its compiled
+# snapshot and {tmp} for the temporary directory) -> (modules it must
+# not import, expected exit status)
+COMMANDS = {
+    "validate": (
+        ["validate", "{plan}"],
+        OTHER_COMMANDS + (
+            "specs.v2.tools.effort",
+            "specs.v2.tools.scheduler",
+            "specs.v2.tools.snapshot",
+            "specs.v2.tools.cube",
+            "specs.v2.tools.render",
+        ),
+        0,
+    ),
+    "render tree": (
+        ["render", "tree", "{plan}"],
+        OTHER_COMMANDS + (
+            "specs.v2.tools.cube",
+            "specs.v2.tools.render.gantt",
+            "specs.v2.tools.render.summary",
+        ),
+        0,
+    ),
+    "render effort-summary": (
+        ["render", "effort-summary", "{plan}"],
+        OTHER_COMMANDS + (
+            "specs.v2.tools.scheduler",
+            "specs.v2.tools.render.tree",
+            "specs.v2.tools.render.gantt",
+        ),
+        0,
+    ),
+    "render tree snapshot": (
+        ["render", "tree", "{snapshot}"],
+        OTHER_COMMANDS + (
+            "yaml",
+            "specs.v2.tools.cube",
+            "specs.v2.tools.render.gantt",
+            "specs.v2.tools.render.summary",
+        ),
+        0,
+    ),
+    # Loads the snapshot and imports the server, then fails to bind a
+    # socket in a missing directory instead of serving forever
+    "serve snapshot": (
+        ["serve", "{snapshot}", "--socket", "{tmp}/missing/serve.sock"],
+        (
+            "yaml",
+            "numpy",
+            "specs.v2.tools.watch",
+            "concurrent.futures.process",
+        ),
+        1,
+    ),
+}
+
+# Long-running commands: their imports are paid once per process, so
+# only the forbidden modules are checked, not the import budget
+UNBUDGETED = {"serve snapshot"}
+
+# Runs main() so that the import of the cli module itself is timed
+RUN_CLI = "import sys; from specs.v2.tools.cli import main; sys.exit(main(sys.argv[1:]))"
+
+
+def run(args: list[str], cwd: str) -> subprocess.CompletedProcess:
+    """Run the interpreter with args, with this repository on the path."""
+    root = str(Path(__file__).resolve().parents[3])
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [root, os.environ.get("PYTHONPATH")])))
+    return subprocess.run(
+        [sys.executable, *args], cwd=cwd, env=env,
+        capture_output=True, text=True,
+    )
+
+
+def parse_importtime(stderr: str) -> dict[str, float]:
+    """
+    Top-level imports of a python -X importtime run.
+    
+    Args:
+        stderr: Standard error of the run
+    
+    Returns:
+        Module name -> cumulative import time in ms, for the imports not
+        made on behalf of another module
+    """
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if cumulative.strip().isdigit() and not name.startswith("  "):
+            times[name.strip()] = int(cumulative) / 1000
+    return times
+
+
+def all_imports(stderr: str) -> set[str]:
+    """Every module named in a python -X importtime run."""
+    return {
+        line.rsplit("|", 1)[1].strip()
+        for line in stderr.splitlines()
+        if line.startswith("import time:")
+    }
+
+
+def best_time(args: list[str], cwd: str, repeat: int) -> float:
+    """Best wall time in ms of repeat runs of the interpreter with args."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run(args, cwd)
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeat", type=int, default=10, help="runs per measurement (best is reported)")
+    parser.add_argument(
+        "--import-budget", type=float, default=100.0, metavar="MS",
+        help="import time allowed per command, in ms (default: 100)",
+    )
+    parser.add_argument(
+        "--wall-budget", type=float, default=100.0, metavar="MS",
+        help="end-to-end time allowed for validate, in ms (default: 100)",
+    )
+    args = parser.parse_args(argv)
+    
+    failures = []
+    with tempfile.TemporaryDirectory() as tmp:
+        plan = Path(tmp) / "plan.yaml"
+        plan.write_text(TINY_PLAN, encoding="utf-8")
+        snapshot = Path(tmp) / "plan.opsnap"
+        compiled = run(["-m", "specs.v2.tools.cli", "compile", str(plan), "-o", str(snapshot), "--no-cache"], tmp)
+        if compiled.returncode != 0:
+            print(compiled.stderr, file=sys.stderr)
+            return 1
+        
+        startup = set(parse_importtime(run(["-X", "importtime", "-c", "pass"], tmp).stderr))
+        for label, (command, forbidden, status) in COMMANDS.items():
+            cli_args = [arg.format(plan=plan, snapshot=snapshot, tmp=tmp) for arg in command] + ["--no-cache"]
+            best, fastest = float("inf"), {}
+            for _ in range(args.repeat):
+                result = run(["-X", "importtime", "-c", RUN_CLI, *cli_args], tmp)
+                if result.returncode != status:
+                    print(result.stderr, file=sys.stderr)
+                    failures.append(f"{label}: exit status {result.returncode}")
+                    break
+                imports = parse_importtime(result.stderr)
+                total = sum(ms for name, ms in imports.items() if name not in startup)
+                if total < best:
+                    best, fastest = total, imports
+            else:
+                cli = fastest.get("specs.v2.tools.cli", 0.0)
+                print(f"{label:22s} imports {best:6.1f} ms (cli module {cli:5.1f} ms)")
+                if best > args.import_budget and label not in UNBUDGETED:
+                    failures.append(f"{label}: imports take {best:.1f} ms > {args.import_budget:.0f} ms")
+                unexpected = sorted(set(forbidden) & all_imports(result.stderr))
+                if unexpected:
+                    failures.append(f"{label}: imports {', '.join(unexpected)}")
+        
+        validate = ["-m", "specs.v2.tools.cli", "validate", str(plan), "--no-cache"]
+        wall = best_time(validate, tmp, args.repeat)
+        floor = best_time(["-c", "import yaml"], tmp, args.repeat)
+        print(f"validate end to end   {wall:6.1f} ms (python -c 'import yaml': {floor:5.1f} ms)")
+        if wall > args.wall_budget:
+            failures.append(f"validate: {wall:.1f} ms end to end > {args.wall_budget:.0f} ms")
+    
+    for failure in failures:
+        print(f"FAIL {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
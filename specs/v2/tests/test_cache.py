@@ -0,0 +1,196 @@
+"""
+Tests for the cache module (on-disk cache of parsed fragments).
+"""
+
+import os
+import pickle
+import shutil
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from specs.v2.tools.cache import FragmentCache, default_cache_dir
+from specs.v2.tools.loader import LoadError, load_fragment, load_plan_set
+
+
+PLAN = """
+version: 2
+nodes:
+  task1:
+    title: Task 1
+    kind: task
+schedule:
+  nodes:
+    task1:
+      start: 2024-03-01
+      duration: 2d
+"""
+
+
+class TestFragmentCache(unittest.TestCase):
+    """Tests for FragmentCache."""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache = FragmentCache(Path(self.temp_dir) / "cache")
+    
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def _entries(self):
+        return sorted(self.cache.directory.glob("*/*.pickle"))
+    
+    def test_key_depends_on_content(self):
+        """Keys are stable for equal content and differ otherwise."""
+        self.assertEqual(self.cache.key(b"a: 1\n"), self.cache.key(b"a: 1\n"))
+        self.assertNotEqual(self.cache.key(b"a: 1\n"), self.cache.key(b"a: 2\n"))
+    
+    def test_put_get(self):
+        """Stored data is returned on a hit; unknown keys miss."""
+        key = self.cache.key(b"x")
+        self.assertIsNone(self.cache.get(key))
+        self.assertTrue(self.cache.put(key, {"version": 2}))
+        self.assertEqual(self.cache.get(key), {"version": 2})
+        self.assertEqual(self.cache.stored, 1)
+    
+    def test_corrupt_entry_is_a_miss(self):
+        """Unreadable entries are removed and treated as misses."""
+        key = self.cache.key(b"x")
+        self.cache.put(key, {"version": 2})
+        self._entries()[0].write_bytes(b"not a pickle")
+        
+        self.assertIsNone(self.cache.get(key))
+        self.assertEqual(self._entries(), [])
+    
+    def test_entry_with_foreign_global_is_a_miss(self):
+        """Entries that would call arbitrary globals are never unpickled."""
+        key = self.cache.key(b"x")
+        self.cache.put(key, {"version": 2})
+        self._entries()[0].write_bytes(pickle.dumps({"version": os.system}))
+        
+        self.assertIsNone(self.cache.get(key))
+        self.assertEqual(self._entries(), [])
+    
+    def test_yaml_value_types_round_trip(self):
+        """Dates, datetimes and sets from yaml.safe_load are allowed."""
+        import datetime
+        data = {
+            "start": datetime.date(2024, 3, 1),
+            "at": datetime.datetime(2024, 3, 1, 12, tzinfo=datetime.timezone(datetime.timedelta(hours=2))),
+            "tags": {"a", "b"},
+        }
+        key = self.cache.key(b"y")
+        self.cache.put(key, data)
+        self.assertEqual(self.cache.get(key), data)
+    
+    def test_default_directory_is_per_user(self):
+        """The default directory follows XDG, never the working directory."""
+        with mock.patch.dict(os.environ, {"XDG_CACHE_HOME": "/xdg"}, clear=False):
+            os.environ.pop("OPSKARTA_CACHE_DIR", None)
+            self.assertEqual(default_cache_dir(), os.path.join("/xdg", "opskarta"))
+        with mock.patch.dict(os.environ, {}, clear=False):
+            os.environ.pop("OPSKARTA_CACHE_DIR", None)
+            os.environ.pop("XDG_CACHE_HOME", None)
+            self.assertEqual(
+                default_cache_dir(),
+                os.path.join(os.path.expanduser("~"), ".cache", "opskarta"),
+            )
+        with mock.patch.dict(os.environ, {"OPSKARTA_CACHE_DIR": "/override"}, clear=False):
+            self.assertEqual(default_cache_dir(), "/override")
+    
+    def test_prune_by_age(self):
+        """Entries unused for longer than max_age are evicted."""
+        self.cache.max_age = 60
+        self.cache.put(self.cache.key(b"old"), {})
+        self.cache.put(self.cache.key(b"new"), {})
+        old = self.cache._path(self.cache.key(b"old"))
+        os.utime(old, (time.time() - 120, time.time() - 120))
+        
+        self.assertEqual(self.cache.prune(), 1)
+        self.assertIsNone(self.cache.get(self.cache.key(b"old")))
+        self.assertEqual(self.cache.get(self.cache.key(b"new")), {})
+    
+    def test_prune_by_size_evicts_least_recently_used(self):
+        """Least recently used entries go first when over max_bytes."""
+        keys = [self.cache.key(bytes([i])) for i in range(3)]
+        now = time.time()
+        for i, key in enumerate(keys):
+            self.cache.put(key, {"payload": "x" * 1000})
+            os.utime(self.cache._path(key), (now - 30 + i, now - 30 + i))
+        # Using the oldest entry makes it the most recently used one
+        self.cache.get(keys[0])
+        
+        size = self.cache._path(keys[0]).stat().st_size
+        self.cache.max_bytes = 2 * size
+        self.assertEqual(self.cache.prune(), 1)
+        self.assertIsNone(self.cache.get(keys[1]))
+        self.assertIsNotNone(self.cache.get(keys[0]))
+        self.assertIsNotNone(self.cache.get(keys[2]))
+    
+    def test_clear(self):
+        """clear() removes all entries."""
+        self.cache.put(self.cache.key(b"x"), {})
+        self.cache.clear()
+        self.assertEqual(self._entries(), [])
+
+
+class TestLoadFragmentWithCache(unittest.TestCase):
+    """Tests for load_fragment/load_plan_set with a FragmentCache."""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache = FragmentCache(Path(self.temp_dir) / "cache")
+        self.plan_file = Path(self.temp_dir) / "plan.yaml"
+        self.plan_file.write_text(PLAN, encoding="utf-8")
+    
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def test_hit_skips_yaml(self):
+        """A warm load returns the same fragment without parsing YAML."""
+        cold = load_fragment(str(self.plan_file), self.cache)
+        with mock.patch("yaml.safe_load") as safe_load:
+            warm = load_fragment(str(self.plan_file), self.cache)
+        
+        safe_load.assert_not_called()
+        self.assertEqual(warm, cold)
+        self.assertEqual(warm, load_fragment(str(self.plan_file)))
+    
+    def test_source_follows_path(self):
+        """Identical files at different paths share an entry but not _source."""
+        copy = Path(self.temp_dir) / "copy.yaml"
+        copy.write_text(PLAN, encoding="utf-8")
+        
+        load_fragment(str(self.plan_file), self.cache)
+        fragment = load_fragment(str(copy), self.cache)
+        
+        self.assertEqual(fragment["_source"], str(copy))
+        self.assertEqual(self.cache.stored, 1)
+    
+    def test_edit_invalidates(self):
+        """Changed content misses the cache."""
+        load_fragment(str(self.plan_file), self.cache)
+        self.plan_file.write_text(PLAN.replace("Task 1", "Renamed"), encoding="utf-8")
+        
+        fragment = load_fragment(str(self.plan_file), self.cache)
+        self.assertEqual(fragment["nodes"]["task1"]["title"], "Renamed")
+    
+    def test_errors_are_not_cached(self):
+        """Invalid fragments raise LoadError on every load."""
+        self.plan_file.write_text("unknown_block: 1\n", encoding="utf-8")
+        for _ in range(2):
+            with self.assertRaises(LoadError):
+                load_fragment(str(self.plan_file), self.cache)
+        self.assertEqual(self.cache.stored, 0)
+    
+    def test_load_plan_set_same_result(self):
+        """Plans loaded through a warm cache equal uncached plans."""
+        files = [str(self.plan_file)]
+        load_plan_set(files, cache=self.cache)
+        self.assertEqual(load_plan_set(files, cache=self.cache), load_plan_set(files))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -10,6 +10,9 @@ Requirements covered:
 """
 
 import os
+import socket
+import subprocess
+import sys
 import tempfile
 from pathlib import Path
 from typing import Generator
@@ -24,7 +27,22 @@ from specs.v2.tools.cli import (
     cmd_render_tree,
     cmd_render_list,
     cmd_render_deps,
+    cmd_render_critical,
+    cmd_render_effort_summary,
+    cmd_compile,
+    cmd_render_all,
+    cmd_watch,
+    cmd_serve,
 )
+from specs.v2.tools.serve import RenderHTTPServer
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache_dir(tmp_path: Path, monkeypatch) -> Path:
+    """Keep the fragment cache of CLI runs out of the working directory."""
+    cache_dir = tmp_path / "opskarta-cache"
+    monkeypatch.setenv("OPSKARTA_CACHE_DIR", str(cache_dir))
+    return cache_dir
 
 
 @pytest.fixture
@@ -257,6 +275,23 @@ class TestParser:
         assert args.command == "render"
         assert args.format == "deps"
     
+    def test_render_critical_parsing(self):
+        """Render critical command should parse correctly."""
+        parser = create_parser()
+        args = parser.parse_args(["render", "critical", "plan.yaml"])
+        assert args.command == "render"
+        assert args.format == "critical"
+    
+    def test_jobs_parsing(self):
+        """--jobs is accepted by validate and render commands."""
+        parser = create_parser()
+        args = parser.parse_args(["validate", "--jobs", "4", "plan.yaml"])
+        assert args.jobs == 4
+        args = parser.parse_args(["render", "tree", "plan.yaml", "-j", "0"])
+        assert args.jobs == 0
+        args = parser.parse_args(["render", "gantt", "plan.yaml"])
+        assert args.jobs == 1
+    
     def test_multiple_files_parsing(self):
         """Multiple files should be parsed correctly."""
         parser = create_parser()
@@ -297,6 +332,79 @@ class TestValidateCommand:
         assert result == 0
 
 
+# Runs main() in a fresh interpreter, then prints the imported modules
+IMPORTED_MODULES = (
+    "import sys\n"
+    "from specs.v2.tools.cli import main\n"
+    "try:\n"
+    "    status = main(sys.argv[1:])\n"
+    "except SystemExit as e:\n"
+    "    status = e.code\n"
+    "print(*sorted(sys.modules))\n"
+    "sys.exit(status)\n"
+)
+
+
+def imported_modules(*args: str) -> set[str]:
+    """Modules imported by a CLI run in a fresh interpreter."""
+    root = str(Path(__file__).resolve().parents[3])
+    result = subprocess.run(
+        [sys.executable, "-c", IMPORTED_MODULES, *args],
+        env=dict(os.environ, PYTHONPATH=root),
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, result.stderr
+    return set(result.stdout.splitlines()[-1].split())
+
+
+class TestSubcommandImports:
+    """Each subcommand imports only the modules it needs."""
+    
+    def test_validate(self, valid_plan_file: Path):
+        modules = imported_modules("validate", str(valid_plan_file), "--no-cache")
+        assert "specs.v2.tools.validator" in modules
+        for name in (
+            "specs.v2.tools.effort",
+            "specs.v2.tools.scheduler",
+            "specs.v2.tools.snapshot",
+            "specs.v2.tools.cube",
+            "specs.v2.tools.render",
+            "specs.v2.tools.watch",
+            "specs.v2.tools.serve",
+            "http.server",
+            "concurrent.futures.process",
+            "tempfile",
+        ):
+            assert name not in modules
+    
+    def test_render_tree(self, valid_plan_file: Path):
+        modules = imported_modules("render", "tree", str(valid_plan_file), "--no-cache")
+        assert "specs.v2.tools.render.tree" in modules
+        for name in (
+            "specs.v2.tools.render.gantt",
+            "specs.v2.tools.render.summary",
+            "specs.v2.tools.cube",
+            "specs.v2.tools.serve",
+        ):
+            assert name not in modules
+    
+    def test_render_snapshot(self, valid_plan_file: Path, temp_dir: Path):
+        snapshot_file = temp_dir / "plan.opsnap"
+        assert main(["compile", str(valid_plan_file), "-o", str(snapshot_file), "--no-cache"]) == 0
+        # The default fragment cache is created, but nothing parses YAML
+        modules = imported_modules("render", "tree", str(snapshot_file))
+        assert "specs.v2.tools.snapshot" in modules
+        assert "specs.v2.tools.cache" in modules
+        assert "yaml" not in modules
+    
+    def test_help(self):
+        modules = imported_modules("--help")
+        tools = {name for name in modules if name.startswith("specs.v2.tools.")}
+        assert tools == {"specs.v2.tools.cli", "specs.v2.tools.cache_dir"}
+        assert "yaml" not in modules
+
+
 class TestRenderGanttCommand:
     """Tests for the render gantt command."""
     
@@ -421,6 +529,366 @@ class TestRenderDepsCommand:
         assert result == 0
 
 
+class TestRenderCriticalCommand:
+    """Tests for the render critical command."""
+    
+    def test_render_critical_basic(self, plan_with_schedule: Path, capsys):
+        """Render critical should list the critical chain in order."""
+        result = cmd_render_critical([str(plan_with_schedule)], None)
+        assert result == 0
+        
+        captured = capsys.readouterr()
+        assert captured.out.splitlines()[:4] == [
+            "Critical path (finish 2024-03-12):",
+            "- Task 1 [2024-03-01 .. 2024-03-05]",
+            "- Task 2 [2024-03-06 .. 2024-03-12]",
+            "- Milestone 1 [2024-03-12 .. 2024-03-12]",
+        ]
+    
+    def test_render_critical_via_main(self, plan_with_schedule: Path, capsys):
+        """Render critical via main() should work."""
+        result = main(["render", "critical", str(plan_with_schedule)])
+        assert result == 0
+
+
+class TestRenderEffortSummaryCommand:
+    """Tests for the render effort-summary command."""
+    
+    def test_render_effort_summary_by_status(self, valid_plan_file: Path, capsys):
+        """Tables should total each root's subtree per status."""
+        result = cmd_render_effort_summary([str(valid_plan_file)], ["status"], None)
+        assert result == 0
+        
+        captured = capsys.readouterr()
+        assert captured.out.splitlines() == [
+            "Effort by status (sp):",
+            "        not_started  in_progress  (none)  total",
+            "Task 1            3            0       2      5",
+            "Task 2            0            3       0      3",
+            "Total             3            3       2      8",
+        ]
+    
+    def test_render_effort_summary_via_main(self, multi_file_main: Path, multi_file_nodes: Path, capsys):
+        """--by and --node should be passed through main()."""
+        result = main([
+            "render", "effort-summary", str(multi_file_main), str(multi_file_nodes),
+            "--by", "fragment", "--by", "scheduled",
+        ])
+        assert result == 0
+        
+        output = capsys.readouterr().out
+        assert "Effort by fragment:" in output
+        assert str(multi_file_nodes) in output
+        assert "Effort by scheduled:" in output
+    
+    def test_render_effort_summary_node(self, valid_plan_file: Path, capsys):
+        """--node should summarize the node's children."""
+        result = main(["render", "effort-summary", str(valid_plan_file), "--by", "kind", "--node", "task1"])
+        assert result == 0
+        
+        lines = capsys.readouterr().out.splitlines()
+        assert lines[0] == "Effort by kind under Task 1 (sp):"
+        assert lines[2].split() == ["Task", "3", "2", "2"]
+        assert lines[3].split() == ["Total", "5", "5"]
+    
+    def test_render_effort_summary_unknown_dimension(self, valid_plan_file: Path, capsys):
+        """Unknown dimensions should be reported as render errors."""
+        result = cmd_render_effort_summary([str(valid_plan_file)], ["owner"], None)
+        assert result == 1
+        
+        captured = capsys.readouterr()
+        assert "[error] [render] Unknown dimension 'owner'" in captured.err
+
+
+class TestCompileCommand:
+    """Tests for the compile command and rendering from snapshots."""
+    
+    def test_compile_parsing(self):
+        """compile requires --output."""
+        parser = create_parser()
+        args = parser.parse_args(["compile", "a.yaml", "b.yaml", "-o", "plan.opsnap"])
+        assert args.command == "compile"
+        assert args.files == ["a.yaml", "b.yaml"]
+        assert args.output == "plan.opsnap"
+        with pytest.raises(SystemExit):
+            parser.parse_args(["compile", "a.yaml"])
+    
+    @pytest.mark.parametrize("render_format", ["gantt", "tree", "list", "deps", "critical"])
+    def test_render_from_snapshot(
+        self,
+        plan_with_schedule: Path,
+        temp_dir: Path,
+        render_format: str,
+        capsys,
+    ):
+        """Rendering a snapshot prints the same output as the YAML files."""
+        snapshot = temp_dir / "plan.opsnap"
+        assert cmd_compile([str(plan_with_schedule)], str(snapshot)) == 0
+        capsys.readouterr()
+        
+        assert main(["render", render_format, str(plan_with_schedule)]) == 0
+        from_yaml = capsys.readouterr()
+        assert main(["render", render_format, str(snapshot)]) == 0
+        from_snapshot = capsys.readouterr()
+        
+        assert from_snapshot.out == from_yaml.out
+        assert from_snapshot.err == from_yaml.err
+    
+    def test_compile_invalid_plan(self, invalid_plan_file: Path, temp_dir: Path, capsys):
+        """Invalid plans are not compiled."""
+        snapshot = temp_dir / "plan.opsnap"
+        assert main(["compile", str(invalid_plan_file), "-o", str(snapshot)]) == 1
+        assert not snapshot.exists()
+        assert "error" in capsys.readouterr().err.lower()
+    
+    def test_render_corrupt_snapshot(self, valid_plan_file: Path, temp_dir: Path, capsys):
+        """Corrupt snapshots are reported as snapshot errors."""
+        snapshot = temp_dir / "plan.opsnap"
+        assert main(["compile", str(valid_plan_file), "-o", str(snapshot)]) == 0
+        snapshot.write_bytes(snapshot.read_bytes()[:40])
+        
+        assert main(["render", "tree", str(snapshot)]) == 1
+        assert "[error] [snapshot]" in capsys.readouterr().err
+    
+    def test_compile_requires_snapshot_suffix(self, valid_plan_file: Path, temp_dir: Path, capsys):
+        """Snapshots must be named *.opsnap, the only names render reads as snapshots."""
+        output = temp_dir / "plan.bin"
+        assert main(["compile", str(valid_plan_file), "-o", str(output)]) == 1
+        assert not output.exists()
+        assert ".opsnap" in capsys.readouterr().err
+    
+    def test_snapshot_content_is_not_sniffed(self, valid_plan_file: Path, temp_dir: Path, capsys):
+        """A snapshot under another name is parsed as YAML, not unpickled."""
+        snapshot = temp_dir / "plan.opsnap"
+        assert main(["compile", str(valid_plan_file), "-o", str(snapshot)]) == 0
+        disguised = temp_dir / "plan.yaml"
+        disguised.write_bytes(snapshot.read_bytes())
+        capsys.readouterr()
+        
+        assert main(["render", "tree", str(disguised)]) == 1
+        assert "[error] [loading]" in capsys.readouterr().err
+
+
+class TestRenderAllCommand:
+    """Tests for the render all command."""
+    
+    @pytest.fixture
+    def scheduled_plan_with_views(self, temp_dir: Path) -> Path:
+        """Plan with a schedule and two views (one id unsafe as a file name)."""
+        plan_file = temp_dir / "scheduled_views.yaml"
+        plan_file.write_text("""
+version: 2
+meta:
+  id: scheduled-views
+  title: Scheduled Views
+
+nodes:
+  epic1:
+    title: Epic 1
+    kind: epic
+  task1:
+    title: Task 1
+    kind: task
+    parent: epic1
+  task2:
+    title: Task 2
+    kind: task
+    parent: epic1
+    after: [task1]
+
+schedule:
+  nodes:
+    task1:
+      start: "2024-03-04"
+      duration: "2d"
+    task2:
+      duration: "1d"
+
+views:
+  tasks:
+    title: Tasks
+    where:
+      kind: [task]
+  "team a/b":
+    title: Team A/B
+    order_by: title
+""")
+        return plan_file
+    
+    def test_render_all_parsing(self):
+        """render all requires --out-dir and takes repeatable --format."""
+        parser = create_parser()
+        args = parser.parse_args([
+            "render", "all", "a.yaml", "b.yaml", "--out-dir", "site",
+            "--format", "tree", "--format", "gantt", "--render-jobs", "4",
+        ])
+        assert args.command == "render"
+        assert args.format == "all"
+        assert args.files == ["a.yaml", "b.yaml"]
+        assert args.out_dir == "site"
+        assert args.formats == ["tree", "gantt"]
+        assert args.render_jobs == 4
+        
+        args = parser.parse_args(["render", "all", "a.yaml", "-o", "site"])
+        assert args.formats is None
+        assert args.render_jobs == 1
+        with pytest.raises(SystemExit):
+            parser.parse_args(["render", "all", "a.yaml"])
+    
+    @pytest.mark.parametrize("render_jobs", [1, 2])
+    def test_render_all_matches_single_renders(
+        self,
+        scheduled_plan_with_views: Path,
+        temp_dir: Path,
+        render_jobs: int,
+        capsys,
+    ):
+        """Every file equals the output of the matching render command."""
+        out_dir = temp_dir / "site"
+        assert cmd_render_all(
+            [str(scheduled_plan_with_views)], str(out_dir), render_jobs=render_jobs,
+        ) == 0
+        assert "OK: 15 files" in capsys.readouterr().out
+        
+        suffixes = {"gantt": "mmd", "tree": "txt", "list": "txt", "deps": "mmd", "critical": "txt"}
+        views = {"_plan": None, "tasks": "tasks", "team_a_b": "team a/b"}
+        assert sorted(os.listdir(out_dir)) == sorted(
+            f"{name}.{fmt}.{suffix}" for name in views for fmt, suffix in suffixes.items()
+        )
+        for name, view_id in views.items():
+            for render_format, suffix in suffixes.items():
+                argv = ["render", render_format, str(scheduled_plan_with_views)]
+                if view_id is not None:
+                    argv += ["--view", view_id]
+                assert main(argv) == 0
+                expected = capsys.readouterr().out
+                assert (out_dir / f"{name}.{render_format}.{suffix}").read_text() == expected
+    
+    def test_render_all_skips_schedule_formats(self, plan_with_views: Path, temp_dir: Path):
+        """Plans without a schedule get no gantt or critical files."""
+        out_dir = temp_dir / "site"
+        assert main(["render", "all", str(plan_with_views), "--out-dir", str(out_dir)]) == 0
+        assert sorted(os.listdir(out_dir)) == sorted(
+            f"{name}.{fmt}.{suffix}"
+            for name in ("_plan", "backlog", "tasks_only")
+            for fmt, suffix in (("tree", "txt"), ("list", "txt"), ("deps", "mmd"))
+        )
+    
+    def test_render_all_selected_formats(self, plan_with_schedule: Path, temp_dir: Path):
+        """--format limits the rendered formats."""
+        out_dir = temp_dir / "site"
+        assert main([
+            "render", "all", str(plan_with_schedule), "-o", str(out_dir),
+            "--format", "gantt", "--format", "list",
+        ]) == 0
+        assert sorted(os.listdir(out_dir)) == ["_plan.gantt.mmd", "_plan.list.txt"]
+    
+    def test_render_all_invalid_plan(self, invalid_plan_file: Path, temp_dir: Path, capsys):
+        """Invalid plans are reported once and nothing is written."""
+        out_dir = temp_dir / "site"
+        assert main(["render", "all", str(invalid_plan_file), "-o", str(out_dir)]) == 1
+        assert not out_dir.exists()
+        assert "error" in capsys.readouterr().err.lower()
+    
+    def test_render_all_value_error(self, plan_with_schedule: Path, temp_dir: Path, monkeypatch, capsys):
+        """A ValueError while computing the plan is reported as a render error."""
+        from specs.v2.tools import scheduler
+        
+        def fail(plan):
+            raise ValueError("Bad calendar")
+        
+        monkeypatch.setattr(scheduler, "compute_schedule", fail)
+        out_dir = temp_dir / "site"
+        assert main(["render", "all", str(plan_with_schedule), "-o", str(out_dir)]) == 1
+        assert not out_dir.exists()
+        assert "[error] [render] Bad calendar" in capsys.readouterr().err
+
+
+class TestWatchCommand:
+    """Tests for the watch command."""
+    
+    def test_watch_parsing(self):
+        """watch takes a render format, view, output and interval."""
+        parser = create_parser()
+        args = parser.parse_args([
+            "watch", "a.yaml", "b.yaml", "--render", "tree",
+            "--view", "v", "--out", "plan.md", "--interval", "2",
+        ])
+        assert args.command == "watch"
+        assert args.files == ["a.yaml", "b.yaml"]
+        assert (args.render, args.view, args.out, args.interval) == ("tree", "v", "plan.md", 2.0)
+        args = parser.parse_args(["watch", "a.yaml"])
+        assert (args.render, args.out, args.interval) == ("gantt", None, 0.5)
+        with pytest.raises(SystemExit):
+            parser.parse_args(["watch", "a.yaml", "--render", "pdf"])
+    
+    def test_watch_writes_output(self, plan_with_schedule: Path, temp_dir: Path, capsys):
+        """The first poll renders the plan to the output file."""
+        out = temp_dir / "plan.md"
+        result = cmd_watch([str(plan_with_schedule)], "gantt", None, str(out), polls=1)
+        assert result == 0
+        
+        assert main(["render", "gantt", str(plan_with_schedule)]) == 0
+        assert out.read_text(encoding="utf-8") == capsys.readouterr().out
+    
+    def test_watch_reports_errors(self, invalid_plan_file: Path, capsys):
+        """Invalid plans are reported and not rendered."""
+        result = cmd_watch([str(invalid_plan_file)], "tree", None, None, polls=2, interval=0)
+        assert result == 1
+        
+        captured = capsys.readouterr()
+        assert captured.out == ""
+        assert "error" in captured.err.lower()
+
+
+class TestServeCommand:
+    """Tests for the serve command."""
+    
+    def test_serve_parsing(self):
+        """serve takes optional files and listening options."""
+        parser = create_parser()
+        args = parser.parse_args([
+            "serve", "a.yaml", "b.yaml", "--port", "9000", "--root", "plans",
+            "--threads", "2", "--output-cache", "10", "--plan-cache", "4",
+        ])
+        assert args.command == "serve"
+        assert args.files == ["a.yaml", "b.yaml"]
+        assert (args.host, args.port, args.socket, args.root) == ("127.0.0.1", 9000, None, "plans")
+        assert (args.threads, args.output_cache, args.plan_cache) == (2, 10, 4)
+        args = parser.parse_args(["serve", "--socket", "/tmp/opskarta.sock"])
+        assert (args.files, args.socket) == ([], "/tmp/opskarta.sock")
+    
+    def test_serve_until_interrupted(self, invalid_plan_file: Path, monkeypatch, capsys):
+        """Default plan errors are reported; Ctrl+C stops the server."""
+        def interrupt(self, *args, **kwargs):
+            raise KeyboardInterrupt
+        
+        monkeypatch.setattr(RenderHTTPServer, "serve_forever", interrupt)
+        result = cmd_serve([str(invalid_plan_file)], port=0)
+        assert result == 0
+        
+        err = capsys.readouterr().err
+        assert "[error]" in err
+        assert "[serve] listening on http://127.0.0.1:" in err
+    
+    def test_serve_address_in_use(self, capsys):
+        """A port that cannot be bound is an error."""
+        with socket.socket() as taken:
+            taken.bind(("127.0.0.1", 0))
+            taken.listen()
+            result = cmd_serve([], port=taken.getsockname()[1])
+        assert result == 1
+        assert "[error] [serve]" in capsys.readouterr().err
+    
+    def test_serve_socket_path_is_a_plan_file(self, valid_plan_file: Path, capsys):
+        """A mistyped --socket pointing at a plan file leaves the file alone."""
+        content = valid_plan_file.read_bytes()
+        result = cmd_serve([], socket_path=str(valid_plan_file))
+        assert result == 1
+        assert "Not a socket" in capsys.readouterr().err
+        assert valid_plan_file.read_bytes() == content
+
+
 class TestMultiFileSupport:
     """Tests for multi-file plan support (Requirements 5.11, 5.12)."""
     
@@ -465,6 +933,41 @@ class TestMultiFileSupport:
         assert "Task 2" in captured.out
 
 
+class TestFragmentCache:
+    """Tests for the fragment cache options."""
+    
+    def test_cache_parsing(self):
+        """--no-cache and --cache-dir are accepted by all commands."""
+        parser = create_parser()
+        args = parser.parse_args(["validate", "plan.yaml"])
+        assert args.no_cache is False
+        assert args.cache_dir is None
+        args = parser.parse_args(
+            ["render", "gantt", "plan.yaml", "--no-cache", "--cache-dir", "c"]
+        )
+        assert args.no_cache is True
+        assert args.cache_dir == "c"
+    
+    def test_cache_used_by_default(self, valid_plan_file: Path, isolated_cache_dir: Path):
+        """Runs store parsed fragments in the cache directory."""
+        assert main(["validate", str(valid_plan_file)]) == 0
+        assert len(list(isolated_cache_dir.glob("*/*.pickle"))) == 1
+        
+        # Warm run gives the same result
+        assert main(["validate", str(valid_plan_file)]) == 0
+    
+    def test_cache_dir_option(self, valid_plan_file: Path, temp_dir: Path):
+        """--cache-dir overrides the default directory."""
+        cache_dir = temp_dir / "cache"
+        assert main(["validate", "--cache-dir", str(cache_dir), str(valid_plan_file)]) == 0
+        assert len(list(cache_dir.glob("*/*.pickle"))) == 1
+    
+    def test_no_cache(self, valid_plan_file: Path, isolated_cache_dir: Path):
+        """--no-cache neither reads nor writes the cache."""
+        assert main(["validate", "--no-cache", str(valid_plan_file)]) == 0
+        assert not isolated_cache_dir.exists()
+
+
 class TestErrorHandling:
     """Tests for error handling in CLI."""
     
@@ -507,3 +1010,24 @@ nodes:
         captured = capsys.readouterr()
         # Error messages should be in stderr
         assert "error" in captured.err.lower()
+    
+    def test_schedule_warnings_reported(self, temp_dir: Path, capsys):
+        """Unschedulable nodes are reported on stderr by render gantt."""
+        plan_file = temp_dir / "plan.yaml"
+        plan_file.write_text("""
+version: 2
+nodes:
+  task1:
+    title: Task 1
+schedule:
+  nodes:
+    task1:
+      duration: 2d
+""")
+        
+        result = cmd_render_gantt([str(plan_file)], None)
+        assert result == 0
+        
+        captured = capsys.readouterr()
+        assert "[warning] [scheduling] Node 'task1': cannot compute start date" in captured.err
+        assert "path: schedule.nodes.task1" in captured.err
@@ -0,0 +1,149 @@
+"""
+Tests for the columns module (ordinal date columns).
+"""
+
+import unittest
+from array import array
+from datetime import date
+
+from specs.v2.tools.columns import UNSCHEDULED, ScheduleColumns, _numpy
+from specs.v2.tools.models import (
+    Calendar,
+    MergedPlan,
+    Node,
+    Schedule,
+    ScheduleNode,
+)
+from specs.v2.tools.scheduler import compute_schedule
+
+
+class TestScheduleColumns(unittest.TestCase):
+    """Tests for ScheduleColumns."""
+    
+    use_numpy = False
+    
+    def setUp(self):
+        self.columns = ScheduleColumns.from_dates(
+            ["a", "b", "c", "d"],
+            {
+                "a": (date(2024, 3, 4), date(2024, 3, 8)),
+                "b": (date(2024, 3, 1), date(2024, 3, 4)),
+                "c": (None, None),
+                "d": (date(2024, 3, 11), date(2024, 3, 12)),
+            },
+            use_numpy=self.use_numpy,
+        )
+    
+    def test_dates(self):
+        """Ordinals round-trip to dates; unscheduled nodes are None."""
+        self.assertEqual(len(self.columns), 4)
+        self.assertEqual(self.columns.dates("a"), (date(2024, 3, 4), date(2024, 3, 8)))
+        self.assertEqual(self.columns.dates("c"), (None, None))
+        self.assertEqual(self.columns.start[2], UNSCHEDULED)
+    
+    def test_set(self):
+        """set() updates one position."""
+        self.columns.set("c", date(2024, 4, 1), date(2024, 4, 2))
+        self.assertEqual(self.columns.dates("c"), (date(2024, 4, 1), date(2024, 4, 2)))
+        self.columns.set("a", None, None)
+        self.assertEqual(self.columns.dates("a"), (None, None))
+    
+    def test_bounds(self):
+        """Bounds ignore unscheduled nodes."""
+        self.assertEqual(self.columns.bounds(), (date(2024, 3, 1), date(2024, 3, 12)))
+        self.assertIsNone(ScheduleColumns.from_dates(["x"], {}).bounds())
+        self.assertIsNone(ScheduleColumns([]).bounds())
+    
+    def test_in_range(self):
+        """Range query returns overlapping nodes in column order."""
+        self.assertEqual(
+            self.columns.in_range(date(2024, 3, 4), date(2024, 3, 4)),
+            ["a", "b"],
+        )
+        self.assertEqual(
+            self.columns.in_range(date(2024, 3, 9), date(2024, 3, 31)),
+            ["d"],
+        )
+    
+    def test_order_by(self):
+        """Sorting by a column omits unscheduled nodes."""
+        self.assertEqual(self.columns.order_by("start"), ["b", "a", "d"])
+        self.assertEqual(self.columns.order_by("finish"), ["b", "a", "d"])
+        self.assertEqual(set(self.columns.sort_key("start")), {"a", "b", "d"})
+        with self.assertRaises(ValueError):
+            self.columns.order_by("title")
+    
+    def test_materialize(self):
+        """materialize() writes the ISO string fields."""
+        schedule = Schedule(nodes={
+            "a": ScheduleNode(),
+            "c": ScheduleNode(computed_start="2000-01-01"),
+        })
+        self.columns.materialize(schedule)
+        self.assertEqual(schedule.nodes["a"].computed_start, "2024-03-04")
+        self.assertEqual(schedule.nodes["a"].computed_finish, "2024-03-08")
+        self.assertIsNone(schedule.nodes["c"].computed_start)
+
+
+@unittest.skipIf(_numpy() is None, "NumPy is not installed")
+class TestNumpyScheduleColumns(TestScheduleColumns):
+    """Tests for NumPy-backed ScheduleColumns."""
+    
+    use_numpy = True
+    
+    def test_numpy_arrays(self):
+        self.assertNotIsInstance(self.columns.start, array)
+        self.assertEqual(str(self.columns.start.dtype), "int32")
+
+
+class TestComputeScheduleColumns(unittest.TestCase):
+    """Tests for the columns produced by compute_schedule."""
+    
+    def setUp(self):
+        self.plan = MergedPlan(
+            nodes={
+                "a": Node(title="A"),
+                "b": Node(title="B", after=["a"]),
+                "c": Node(title="C"),
+            },
+            schedule=Schedule(
+                calendars={"default": Calendar(excludes=["weekends"])},
+                default_calendar="default",
+                nodes={
+                    "a": ScheduleNode(start="2024-03-01", duration="3d"),
+                    "b": ScheduleNode(duration="2d"),
+                    "c": ScheduleNode(duration="1d"),
+                },
+            ),
+        )
+    
+    def test_columns_match_strings(self):
+        """Columns hold the same dates as the materialized strings."""
+        compute_schedule(self.plan)
+        columns = self.plan.schedule.columns
+        self.assertEqual(columns.node_ids, ("a", "b", "c"))
+        # array('i') columns: the scheduler never imports NumPy
+        self.assertIsInstance(columns.start, array)
+        for node_id, sn in self.plan.schedule.nodes.items():
+            start, finish = columns.dates(node_id)
+            self.assertEqual(start.isoformat() if start else None, sn.computed_start)
+            self.assertEqual(finish.isoformat() if finish else None, sn.computed_finish)
+    
+    def test_without_materialize(self):
+        """materialize=False fills only the columns."""
+        compute_schedule(self.plan)
+        self.plan.schedule.nodes["a"].start = "2024-03-04"
+        compute_schedule(self.plan, materialize=False)
+        
+        self.assertIsNone(self.plan.schedule.nodes["b"].computed_start)
+        self.assertEqual(
+            self.plan.schedule.columns.dates("b"),
+            (date(2024, 3, 7), date(2024, 3, 8)),
+        )
+        
+        self.plan.schedule.columns.materialize(self.plan.schedule)
+        self.assertEqual(self.plan.schedule.nodes["b"].computed_start, "2024-03-07")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,164 @@
+"""
+Tests for the effort aggregation cube (cube.py).
+
+Requirements covered:
+- 2.6: effort_rollup = sum of effort_effective of direct children
+- 2.7: effort_gap = max(0, effort - effort_rollup) when node has effort and children
+"""
+
+import random
+import unittest
+
+from specs.v2.tools.cube import EffortCube, own_effort, resolve_dimension
+from specs.v2.tools.effort import compute_effort_metrics
+from specs.v2.tools.models import MergedPlan, Node, Schedule, ScheduleNode
+
+
+def make_plan() -> MergedPlan:
+    """Two phases from two fragments, one of them partly estimated above its children."""
+    plan = MergedPlan(
+        nodes={
+            "p1": Node(title="Phase 1", kind="phase"),
+            "t1": Node(title="Task 1", kind="task", status="done", parent="p1", effort=3),
+            "t2": Node(title="Task 2", kind="task", status="todo", parent="p1", effort=2),
+            "p2": Node(title="Phase 2", kind="phase", status="todo", effort=10),
+            "t3": Node(title="Task 3", kind="bug", status="todo", parent="p2", effort=4,
+                       x={"team": "core"}),
+            "t4": Node(title="Task 4", status="done", parent="t3", effort=1, x={"team": "web"}),
+        },
+        schedule=Schedule(
+            default_calendar="work",
+            nodes={
+                "t1": ScheduleNode(duration="1d"),
+                "t4": ScheduleNode(duration="1d", calendar="ops"),
+            },
+        ),
+    )
+    for node_id in ("p1", "t1", "t2"):
+        plan.sources.add("node", node_id, "a.yaml")
+    for node_id in ("p2", "t3", "t4"):
+        plan.sources.add("node", node_id, "b.yaml")
+    compute_effort_metrics(plan)
+    return plan
+
+
+class TestOwnEffort(unittest.TestCase):
+    """own_effort(): effort not covered by children."""
+    
+    def test_leaves_and_gaps(self):
+        plan = make_plan()
+        self.assertEqual(
+            own_effort(plan, ["p1", "t1", "t2", "p2", "t3", "t4"]),
+            [0, 3, 2, 6, 3, 1],
+        )
+
+
+class TestEffortCube(unittest.TestCase):
+    """Totals, counts and breakdowns of EffortCube."""
+    
+    def setUp(self):
+        self.plan = make_plan()
+        self.cube = EffortCube(self.plan, ["status", "kind", "fragment", "scheduled", "calendar", "x.team"])
+    
+    def test_subtree_total_is_effort_effective(self):
+        for node_id, node in self.plan.nodes.items():
+            self.assertEqual(self.cube.total(node_id), node.effort_effective, node_id)
+        self.assertEqual(self.cube.total(), 15)
+        self.assertEqual(self.cube.count(), 6)
+    
+    def test_single_criterion(self):
+        self.assertEqual(self.cube.total(where={"status": "todo"}), 11)
+        self.assertEqual(self.cube.total("p2", {"status": "done"}), 1)
+        self.assertEqual(self.cube.count("p1", {"kind": "task"}), 2)
+        self.assertEqual(self.cube.total(where={"fragment": "b.yaml"}), 10)
+        self.assertEqual(self.cube.total(where={"calendar": "work"}), 3)
+        self.assertEqual(self.cube.total("p2", {"x.team": "web"}), 1)
+    
+    def test_several_criteria(self):
+        where = {"status": "todo", "scheduled": "unscheduled"}
+        self.assertEqual(self.cube.total(where=where), 11)
+        self.assertEqual(self.cube.count(where=where), 3)
+        self.assertEqual(self.cube.total("t3", {"status": "done", "calendar": "ops"}), 1)
+        self.assertEqual(self.cube.total(where={"status": "done", "kind": "bug"}), 0)
+    
+    def test_absent_value_matches_nothing(self):
+        self.assertEqual(self.cube.total(where={"status": "blocked"}), 0)
+        self.assertEqual(self.cube.count(where={"status": "blocked"}), 0)
+    
+    def test_breakdown(self):
+        self.assertEqual(
+            self.cube.breakdown("status"),
+            {None: (0, 1), "done": (4, 2), "todo": (11, 3)},
+        )
+        self.assertEqual(self.cube.breakdown("scheduled", "p1"), {"unscheduled": (2, 2), "scheduled": (3, 1)})
+        self.assertEqual(self.cube.values("kind"), ["phase", "task", "bug", None])
+    
+    def test_unknown_names(self):
+        with self.assertRaises(ValueError):
+            self.cube.total("missing")
+        with self.assertRaises(ValueError):
+            self.cube.breakdown("owner")
+        with self.assertRaises(ValueError):
+            EffortCube(self.plan, ["owner"])
+        with self.assertRaises(ValueError):
+            EffortCube(self.plan, ["kind", "kind"])
+        with self.assertRaises(ValueError):
+            resolve_dimension("x.")
+    
+    def test_custom_dimension(self):
+        cube = EffortCube(
+            self.plan, [],
+            extra={"milestone": lambda plan, ids: [plan.nodes[i].milestone for i in ids]},
+        )
+        self.assertEqual(cube.dimensions, ["milestone"])
+        self.assertEqual(cube.breakdown("milestone"), {False: (15, 6)})
+    
+    def test_parent_cycle(self):
+        plan = MergedPlan(
+            nodes={
+                "root": Node(title="Root", effort=1),
+                "a": Node(title="A", parent="b", status="todo", effort=2),
+                "b": Node(title="B", parent="a", status="done"),
+                "c": Node(title="C", parent="b", status="todo", effort=3),
+            }
+        )
+        compute_effort_metrics(plan)
+        cube = EffortCube(plan, ["status"])
+        
+        self.assertEqual(cube.count("a"), 3)
+        self.assertEqual(cube.total("b", {"status": "todo"}), 3)
+        self.assertEqual(cube.breakdown("status", "a"), {"todo": (3, 2), "done": (0, 1)})
+        self.assertEqual(cube.count(), 4)
+    
+    def test_matches_scan(self):
+        rng = random.Random(5)
+        statuses = ["todo", "done", None]
+        kinds = ["task", "bug"]
+        for _ in range(50):
+            nodes = {}
+            for i in range(rng.randint(1, 30)):
+                parent = f"n{rng.randrange(i)}" if i and rng.random() < 0.8 else None
+                nodes[f"n{i}"] = Node(
+                    title=f"n{i}", parent=parent,
+                    status=rng.choice(statuses), kind=rng.choice(kinds),
+                    effort=rng.choice([None, 1, 2, 5]),
+                )
+            plan = MergedPlan(nodes=nodes)
+            compute_effort_metrics(plan)
+            cube = EffortCube(plan, ["status", "kind"])
+            effort = dict(zip(plan.nodes, own_effort(plan, list(plan.nodes))))
+            
+            for node_id in plan.nodes:
+                subtree = [node_id] + plan.index.descendants(node_id)
+                status, kind = rng.choice(statuses), rng.choice(kinds)
+                matching = [
+                    n for n in subtree
+                    if plan.nodes[n].status == status and plan.nodes[n].kind == kind
+                ]
+                where = {"status": status, "kind": kind}
+                self.assertEqual(cube.count(node_id, where), len(matching))
+                self.assertEqual(cube.total(node_id, where), sum(effort[n] for n in matching))
+
+
+if __name__ == "__main__":
+    unittest.main()
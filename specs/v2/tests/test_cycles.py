@@ -0,0 +1,169 @@
+"""
+Tests for cycle detection (strongly connected components, functional graphs).
+
+Requirements covered:
+- 2.2: parent and after references must not form cycles
+"""
+
+import random
+import sys
+import unittest
+
+from specs.v2.tools.cycles import (
+    find_cycles,
+    find_functional_cycles,
+    strongly_connected_components,
+)
+from specs.v2.tools.models import MergedPlan, Node
+from specs.v2.tools.validator import validate
+
+
+def successors_of(graph: dict[str, list[str]]):
+    """Successor function of an adjacency dict."""
+    return lambda node_id: graph.get(node_id, [])
+
+
+class TestStronglyConnectedComponents(unittest.TestCase):
+    """strongly_connected_components()."""
+    
+    def test_components(self):
+        graph = {
+            "a": ["b"], "b": ["c"], "c": ["a", "d"],
+            "d": ["e"], "e": ["d"], "f": ["a"], "g": [],
+        }
+        components = strongly_connected_components(graph, successors_of(graph))
+        self.assertEqual(
+            sorted(components),
+            [["a", "b", "c"], ["d", "e"], ["f"], ["g"]],
+        )
+        # Reverse topological order: d/e before a/b/c before f
+        self.assertLess(components.index(["d", "e"]), components.index(["a", "b", "c"]))
+        self.assertLess(components.index(["a", "b", "c"]), components.index(["f"]))
+    
+    def test_ignores_edges_outside_graph(self):
+        graph = {"a": ["missing", "b"], "b": ["a"]}
+        self.assertEqual(strongly_connected_components(graph, successors_of(graph)), [["a", "b"]])
+    
+    def test_matches_reachability(self):
+        rng = random.Random(7)
+        for _ in range(50):
+            ids = [f"n{i}" for i in range(rng.randint(1, 15))]
+            graph = {n: rng.sample(ids, rng.randint(0, min(3, len(ids)))) for n in ids}
+            
+            reach = {}
+            for n in ids:
+                seen, stack = {n}, [n]
+                while stack:
+                    for m in graph[stack.pop()]:
+                        if m not in seen:
+                            seen.add(m)
+                            stack.append(m)
+                reach[n] = seen
+            
+            for component in strongly_connected_components(ids, successors_of(graph)):
+                for n in ids:
+                    same = n in reach[component[0]] and component[0] in reach[n]
+                    self.assertEqual(n in component, same)
+
+
+class TestFindCycles(unittest.TestCase):
+    """find_cycles(): one shortest cycle per cyclic component."""
+    
+    def test_reports_every_component_once(self):
+        graph = {
+            "a": ["b"], "b": ["a"],
+            "c": ["c"],
+            "d": ["e"], "e": ["f"], "f": ["d", "e"],
+            "g": ["a"],
+        }
+        self.assertEqual(
+            find_cycles(graph, successors_of(graph)),
+            [["a", "b", "a"], ["c", "c"], ["d", "e", "f", "d"]],
+        )
+    
+    def test_shortest_cycle_through_first_member(self):
+        # a -> b -> c -> d -> a and the shortcut a -> d
+        graph = {"a": ["b", "d"], "b": ["c"], "c": ["d"], "d": ["a"]}
+        self.assertEqual(find_cycles(graph, successors_of(graph)), [["a", "d", "a"]])
+    
+    def test_acyclic(self):
+        graph = {"a": [], "b": ["a"], "c": ["a", "b"]}
+        self.assertEqual(find_cycles(graph, successors_of(graph)), [])
+    
+    def test_long_chain_without_recursion(self):
+        depth = sys.getrecursionlimit() * 3
+        graph = {f"n{i}": [f"n{i + 1}"] for i in range(depth)}
+        graph[f"n{depth}"] = ["n0"]
+        cycles = find_cycles(graph, successors_of(graph))
+        self.assertEqual(len(cycles), 1)
+        self.assertEqual(len(cycles[0]), depth + 2)
+
+
+class TestFindFunctionalCycles(unittest.TestCase):
+    """find_functional_cycles(): graphs with one successor per node."""
+    
+    def test_cycles_with_tails(self):
+        parent = {"x": "b", "a": "c", "b": "a", "c": "b", "s": "s", "t": "s", "u": None}
+        self.assertEqual(
+            find_functional_cycles(parent, parent.get),
+            [["a", "c", "b", "a"], ["s", "s"]],
+        )
+    
+    def test_successor_outside_graph_ends_walk(self):
+        parent = {"a": "missing", "b": "a"}
+        self.assertEqual(find_functional_cycles(parent, parent.get), [])
+    
+    def test_long_loop(self):
+        size = sys.getrecursionlimit() * 3
+        parent = {f"n{i}": f"n{(i + 1) % size}" for i in range(size)}
+        cycles = find_functional_cycles(parent, parent.get)
+        self.assertEqual(len(cycles), 1)
+        self.assertEqual(cycles[0][0], "n0")
+        self.assertEqual(len(cycles[0]), size + 1)
+
+
+class TestValidatorCycles(unittest.TestCase):
+    """Cycle errors reported by validate()."""
+    
+    def errors(self, plan: MergedPlan, kind: str) -> list[str]:
+        return [
+            e.message for e in validate(plan).errors
+            if e.message.startswith(f"Cyclic {kind}")
+        ]
+    
+    def test_every_after_cycle_reported(self):
+        plan = MergedPlan(nodes={
+            "a": Node(title="A", after=["b"]),
+            "b": Node(title="B", after=["a"]),
+            "c": Node(title="C", after=["d"]),
+            "d": Node(title="D", after=["c", "a"]),
+            "e": Node(title="E", after=["e"]),
+        })
+        self.assertEqual(self.errors(plan, "after"), [
+            "Cyclic after dependency detected: a -> b -> a",
+            "Cyclic after dependency detected: c -> d -> c",
+            "Cyclic after dependency detected: e -> e",
+        ])
+    
+    def test_every_parent_cycle_reported(self):
+        plan = MergedPlan(nodes={
+            "below": Node(title="Below", parent="b"),
+            "a": Node(title="A", parent="b"),
+            "b": Node(title="B", parent="a"),
+            "c": Node(title="C", parent="c"),
+        })
+        self.assertEqual(self.errors(plan, "parent"), [
+            "Cyclic parent dependency detected: a -> b -> a",
+            "Cyclic parent dependency detected: c -> c",
+        ])
+    
+    def test_long_after_chain(self):
+        depth = sys.getrecursionlimit() * 3
+        nodes = {"n0": Node(title="n0", after=[f"n{depth - 1}"])}
+        for i in range(1, depth):
+            nodes[f"n{i}"] = Node(title=f"n{i}", after=[f"n{i - 1}"])
+        self.assertEqual(len(self.errors(MergedPlan(nodes=nodes), "after")), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
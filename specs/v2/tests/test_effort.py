@@ -8,9 +8,14 @@ Tests cover:
 - 2.9: For nodes with children, effort_effective = effort if set, else effort_rollup
 """
 
+import copy
+import random
+import sys
 import unittest
+from unittest import mock
 
-from specs.v2.tools.effort import compute_effort_metrics
+from specs.v2.tools import effort
+from specs.v2.tools.effort import compute_effort_metrics, update_effort
 from specs.v2.tools.models import MergedPlan, Node
 
 
@@ -431,6 +436,303 @@ class TestComputeEffortMetricsEdgeCases(unittest.TestCase):
         self.assertIsNone(orphan.effort_rollup)  # No children
 
 
+class TestComputeEffortMetricsLargePlans(unittest.TestCase):
+    """Iterative level-by-level rollup."""
+    
+    def test_hierarchy_deeper_than_recursion_limit(self):
+        """A chain deeper than the recursion limit rolls up to the root."""
+        depth = sys.getrecursionlimit() * 5
+        nodes = {"n0": Node(title="n0")}
+        for i in range(1, depth):
+            nodes[f"n{i}"] = Node(title=f"n{i}", parent=f"n{i - 1}")
+        nodes[f"n{depth - 1}"].effort = 2
+        plan = MergedPlan(nodes=nodes)
+        
+        compute_effort_metrics(plan)
+        
+        self.assertEqual(plan.nodes["n0"].effort_rollup, 2)
+        self.assertEqual(plan.nodes["n0"].effort_effective, 2)
+    
+    def test_sums_match_sum_over_children(self):
+        """Rollups keep sum() order and types (ints stay ints)."""
+        plan = MergedPlan(
+            nodes={
+                "ints": Node(title="Ints"),
+                "i1": Node(title="I1", parent="ints", effort=2),
+                "i2": Node(title="I2", parent="ints", effort=3),
+                "floats": Node(title="Floats", effort=1),
+                "f1": Node(title="F1", parent="floats", effort=0.1),
+                "f2": Node(title="F2", parent="floats", effort=0.2),
+                "f3": Node(title="F3", parent="floats", effort=0.3),
+                "empty": Node(title="Empty"),
+                "e1": Node(title="E1", parent="empty"),
+            }
+        )
+        
+        compute_effort_metrics(plan)
+        
+        self.assertIs(type(plan.nodes["ints"].effort_rollup), int)
+        self.assertEqual(plan.nodes["ints"].effort_rollup, 5)
+        self.assertEqual(plan.nodes["floats"].effort_rollup, sum([0.1, 0.2, 0.3]))
+        self.assertEqual(plan.nodes["floats"].effort_gap, max(0.0, 1 - sum([0.1, 0.2, 0.3])))
+        self.assertIs(type(plan.nodes["empty"].effort_rollup), float)
+        self.assertEqual(plan.nodes["empty"].effort_rollup, 0.0)
+    
+    def test_parent_cycle_is_handled(self):
+        """Nodes on a parent cycle get metrics without recursion errors."""
+        plan = MergedPlan(
+            nodes={
+                "a": Node(title="A", parent="b", effort=1),
+                "b": Node(title="B", parent="a"),
+                "leaf": Node(title="Leaf", parent="b", effort=4),
+            }
+        )
+        
+        compute_effort_metrics(plan)
+        
+        self.assertEqual(plan.nodes["leaf"].effort_effective, 4)
+        self.assertEqual(plan.nodes["b"].effort_rollup, 4)
+        self.assertEqual(plan.nodes["a"].effort_effective, 1)
+    
+    def test_recomputed_after_hierarchy_edit(self):
+        """Cached level arrays follow plan.invalidate_index()."""
+        plan = MergedPlan(
+            nodes={
+                "p1": Node(title="P1"),
+                "p2": Node(title="P2"),
+                "t": Node(title="T", parent="p1", effort=3),
+            }
+        )
+        compute_effort_metrics(plan)
+        self.assertEqual(plan.nodes["p1"].effort_rollup, 3)
+        
+        plan.nodes["t"].parent = "p2"
+        plan.invalidate_index()
+        compute_effort_metrics(plan)
+        
+        self.assertIsNone(plan.nodes["p1"].effort_rollup)
+        self.assertEqual(plan.nodes["p2"].effort_rollup, 3)
+    
+    @unittest.skipIf(effort._numpy() is None, "NumPy not installed")
+    def test_numpy_matches_python(self):
+        """The numpy.add.at rollup gives the same values and types."""
+        def make_plan():
+            nodes = {}
+            for i in range(500):
+                nodes[f"n{i}"] = Node(
+                    title=f"n{i}",
+                    parent=f"n{(i - 1) // 3}" if i else None,
+                    effort=[None, 1, 0.1, 2.5, 0][i % 5] if i % 7 else None,
+                )
+            return MergedPlan(nodes=nodes)
+        
+        with_numpy = make_plan()
+        with mock.patch.object(effort, "_NUMPY_MIN_NODES", 0):
+            compute_effort_metrics(with_numpy)
+        without_numpy = make_plan()
+        effort._rollup_forest(without_numpy)
+        
+        for node_id, node in with_numpy.nodes.items():
+            other = without_numpy.nodes[node_id]
+            for name in ("effort_rollup", "effort_effective", "effort_gap"):
+                self.assertEqual(repr(getattr(node, name)), repr(getattr(other, name)))
+    
+    
+    def test_large_int_sums_exact(self):
+        """Int sums beyond float64 precision are exact, with or without NumPy."""
+        plan = MergedPlan(
+            nodes={
+                "p": Node(title="P"),
+                "a": Node(title="A", parent="p", effort=2 ** 53),
+                "b": Node(title="B", parent="p", effort=1),
+            }
+        )
+        self.assertFalse(effort._exact_in_float64(plan))
+        compute_effort_metrics(plan)
+        self.assertEqual(plan.nodes["p"].effort_rollup, 2 ** 53 + 1)
+        self.assertIsInstance(plan.nodes["p"].effort_rollup, int)
+    
+    def test_small_plans_do_not_import_numpy(self):
+        """Plans below _NUMPY_MIN_NODES never load NumPy."""
+        with mock.patch.object(effort, "_numpy") as numpy:
+            compute_effort_metrics(MergedPlan(nodes={
+                "p": Node(title="P"),
+                "a": Node(title="A", parent="p", effort=1),
+            }))
+        numpy.assert_not_called()
+    
+    @unittest.skipIf(effort._numpy() is None, "NumPy not installed")
+    def test_numpy_used_up_to_exact_limit(self):
+        """Int efforts whose absolute sum fits 53 bits take the NumPy path."""
+        plan = MergedPlan(
+            nodes={
+                "p": Node(title="P"),
+                "a": Node(title="A", parent="p", effort=2 ** 53 - 1),
+                "b": Node(title="B", parent="p", effort=-1),
+                "c": Node(title="C", parent="p", effort=2),
+            }
+        )
+        self.assertFalse(effort._exact_in_float64(plan))
+        plan.nodes["c"].effort = 0
+        self.assertTrue(effort._exact_in_float64(plan))
+        
+        with mock.patch.object(effort, "_NUMPY_MIN_NODES", 0):
+            with mock.patch.object(effort, "_rollup_forest") as rollup_forest:
+                compute_effort_metrics(plan)
+        rollup_forest.assert_not_called()
+        self.assertEqual(plan.nodes["p"].effort_rollup, 2 ** 53 - 2)
+        self.assertIsInstance(plan.nodes["p"].effort_rollup, int)
+
+
+class TestUpdateEffort(unittest.TestCase):
+    """update_effort(): incremental update along the ancestor path."""
+    
+    def make_plan(self) -> MergedPlan:
+        plan = MergedPlan(
+            nodes={
+                "root": Node(title="Root"),
+                "epic": Node(title="Epic", parent="root", effort=10),
+                "s1": Node(title="S1", parent="epic", effort=3),
+                "s2": Node(title="S2", parent="epic", effort=4),
+                "other": Node(title="Other", parent="root"),
+                "o1": Node(title="O1", parent="other", effort=1),
+            }
+        )
+        compute_effort_metrics(plan)
+        return plan
+    
+    def assert_matches_full_computation(self, plan: MergedPlan) -> None:
+        expected = copy.deepcopy(plan)
+        expected.invalidate_index()
+        compute_effort_metrics(expected)
+        for node_id, node in plan.nodes.items():
+            other = expected.nodes[node_id]
+            self.assertEqual(
+                (node.effort_rollup, node.effort_effective, node.effort_gap),
+                (other.effort_rollup, other.effort_effective, other.effort_gap),
+                node_id,
+            )
+    
+    def test_leaf_effort_change(self):
+        plan = self.make_plan()
+        plan.nodes["o1"].effort = 6
+        
+        updated = update_effort(plan, "o1")
+        
+        self.assertEqual(updated, ["o1", "other", "root"])
+        self.assertEqual(plan.nodes["other"].effort_rollup, 6)
+        self.assertEqual(plan.nodes["root"].effort_rollup, 16)
+        self.assert_matches_full_computation(plan)
+    
+    def test_stops_at_ancestor_with_own_effort(self):
+        plan = self.make_plan()
+        plan.nodes["s1"].effort = 1
+        
+        updated = update_effort(plan, "s1")
+        
+        self.assertEqual(updated, ["s1", "epic"])
+        self.assertEqual(plan.nodes["epic"].effort_gap, 5)
+        self.assert_matches_full_computation(plan)
+    
+    def test_parent_effort_cleared(self):
+        plan = self.make_plan()
+        plan.nodes["epic"].effort = None
+        
+        self.assertEqual(update_effort(plan, "epic"), ["epic", "root"])
+        self.assertEqual(plan.nodes["epic"].effort_effective, 7)
+        self.assertIsNone(plan.nodes["epic"].effort_gap)
+        self.assert_matches_full_computation(plan)
+    
+    def test_unchanged_effort(self):
+        plan = self.make_plan()
+        self.assertEqual(update_effort(plan, "s2"), ["s2"])
+    
+    def test_move_between_parents(self):
+        plan = self.make_plan()
+        plan.nodes["s2"].parent = "other"
+        
+        update_effort(plan, "s2", old_parent="epic")
+        
+        self.assertEqual(plan.nodes["epic"].effort_rollup, 3)
+        self.assertEqual(plan.nodes["other"].effort_rollup, 5)
+        self.assertEqual(plan.nodes["root"].effort_rollup, 15)
+        self.assertEqual(plan.index.children["other"], ["s2", "o1"])
+        self.assert_matches_full_computation(plan)
+    
+    def test_move_leaves_and_creates_leaves(self):
+        plan = self.make_plan()
+        plan.nodes["o1"].parent = "s1"
+        
+        update_effort(plan, "o1", old_parent="other")
+        
+        self.assertIsNone(plan.nodes["other"].effort_rollup)
+        self.assertIsNone(plan.nodes["other"].effort_effective)
+        self.assertEqual(plan.nodes["s1"].effort_rollup, 1)
+        self.assertEqual(plan.nodes["s1"].effort_gap, 2)
+        self.assert_matches_full_computation(plan)
+    
+    def test_move_to_and_from_roots(self):
+        plan = self.make_plan()
+        plan.nodes["epic"].parent = None
+        update_effort(plan, "epic", old_parent="root")
+        self.assertEqual(plan.nodes["root"].effort_rollup, 1)
+        self.assert_matches_full_computation(plan)
+        
+        plan.nodes["epic"].parent = "other"
+        update_effort(plan, "epic", old_parent=None)
+        self.assertEqual(plan.nodes["root"].effort_rollup, 11)
+        self.assert_matches_full_computation(plan)
+    
+    def test_added_node(self):
+        plan = self.make_plan()
+        plan.nodes["o2"] = Node(title="O2", parent="other", effort=2)
+        
+        update_effort(plan, "o2", old_parent=None)
+        
+        self.assertEqual(plan.nodes["root"].effort_rollup, 13)
+        self.assert_matches_full_computation(plan)
+    
+    def test_deep_chain_without_recursion(self):
+        depth = sys.getrecursionlimit() * 3
+        nodes = {"n0": Node(title="n0")}
+        for i in range(1, depth):
+            nodes[f"n{i}"] = Node(title=f"n{i}", parent=f"n{i - 1}")
+        plan = MergedPlan(nodes=nodes)
+        compute_effort_metrics(plan)
+        
+        plan.nodes[f"n{depth - 1}"].effort = 5
+        updated = update_effort(plan, f"n{depth - 1}")
+        
+        self.assertEqual(len(updated), depth)
+        self.assertEqual(plan.nodes["n0"].effort_rollup, 5)
+    
+    def test_random_edits_match_full_computation(self):
+        rng = random.Random(3)
+        for _ in range(100):
+            size = rng.randint(1, 12)
+            nodes = {}
+            for i in range(size):
+                parent = f"n{rng.randrange(i)}" if i and rng.random() < 0.8 else None
+                nodes[f"n{i}"] = Node(title=f"n{i}", parent=parent, effort=rng.choice([None, 1, 2.5]))
+            plan = MergedPlan(nodes=nodes)
+            compute_effort_metrics(plan)
+            
+            for _ in range(5):
+                node_id = rng.choice(list(nodes))
+                node = nodes[node_id]
+                node.effort = rng.choice([None, 0, 3, 0.5])
+                if rng.random() < 0.5:
+                    update_effort(plan, node_id)
+                    continue
+                # Move under a node outside its subtree
+                below = {node_id} | set(plan.index.descendants(node_id))
+                old_parent = node.parent
+                node.parent = rng.choice([None] + [n for n in nodes if n not in below])
+                update_effort(plan, node_id, old_parent=old_parent)
+            
+            self.assert_matches_full_computation(plan)
+
+
 class TestComputeEffortMetricsDesignExample(unittest.TestCase):
     """Tests based on examples from design.md."""
     
@@ -0,0 +1,305 @@
+"""
+Tests for the plan index (shared children, reverse after edges, hierarchy order).
+"""
+
+import copy
+import pickle
+import unittest
+
+from specs.v2.tools.index import PlanIndex
+from specs.v2.tools.models import MergedPlan, Node, NodeMap, Schedule, ScheduleNode
+from specs.v2.tools.scheduler import IncrementalScheduler
+from specs.v2.tools.validator import validate
+
+
+def make_plan(**nodes: Node) -> MergedPlan:
+    """MergedPlan with the given nodes, in keyword order."""
+    return MergedPlan(nodes=dict(nodes))
+
+
+class TestPlanIndexBuild(unittest.TestCase):
+    """Structures built by PlanIndex.build."""
+    
+    def setUp(self):
+        self.plan = make_plan(
+            phase1=Node(title="Phase 1"),
+            task1=Node(title="Task 1", parent="phase1"),
+            phase2=Node(title="Phase 2", after=["phase1"]),
+            sub1=Node(title="Sub 1", parent="task1"),
+            task2=Node(title="Task 2", parent="phase1", after=["task1", "task1", "missing"]),
+            task3=Node(title="Task 3", parent="phase2", after=["task2"]),
+        )
+        self.index = PlanIndex.build(self.plan)
+    
+    def test_children_in_plan_order(self):
+        self.assertEqual(self.index.children, {
+            "phase1": ["task1", "task2"],
+            "task1": ["sub1"],
+            "phase2": ["task3"],
+        })
+    
+    def test_roots(self):
+        self.assertEqual(self.index.roots, ["phase1", "phase2"])
+    
+    def test_dependents_deduplicated(self):
+        self.assertEqual(self.index.dependents, {
+            "phase1": ["phase2"],
+            "task1": ["task2"],
+            "missing": ["task2"],
+            "task2": ["task3"],
+        })
+    
+    def test_preorder_and_depth(self):
+        self.assertEqual(
+            self.index.preorder,
+            ["phase1", "task1", "sub1", "task2", "phase2", "task3"],
+        )
+        self.assertEqual(self.index.depth, {
+            "phase1": 0, "task1": 1, "sub1": 2, "task2": 1, "phase2": 0, "task3": 1,
+        })
+    
+    def test_euler_intervals(self):
+        index = self.index
+        subtree = lambda node_id: index.preorder[index.enter[node_id]:index.leave[node_id]]
+        self.assertEqual(subtree("phase1"), ["phase1", "task1", "sub1", "task2"])
+        self.assertEqual(subtree("task1"), ["task1", "sub1"])
+        self.assertEqual(subtree("sub1"), ["sub1"])
+        self.assertEqual(subtree("phase2"), ["phase2", "task3"])
+    
+    def test_topological_order(self):
+        order = self.index.topological_order
+        self.assertEqual(sorted(order), sorted(self.plan.nodes))
+        for node_id, node in self.plan.nodes.items():
+            for dep_id in node.after or ():
+                if dep_id in self.plan.nodes:
+                    self.assertLess(order.index(dep_id), order.index(node_id))
+        self.assertEqual(self.index.after_blocked, [])
+        self.assertEqual(self.index.detached, [])
+    
+    def test_empty_plan(self):
+        index = PlanIndex.build(MergedPlan())
+        self.assertEqual(index.preorder, [])
+        self.assertEqual(index.topological_order, [])
+
+
+class TestPlanIndexCycles(unittest.TestCase):
+    """Invalid plans: cycles and dangling references."""
+    
+    def test_parent_cycle_nodes_are_detached(self):
+        plan = make_plan(
+            root=Node(title="Root"),
+            a=Node(title="A", parent="b"),
+            b=Node(title="B", parent="a"),
+            below=Node(title="Below", parent="a"),
+            orphan=Node(title="Orphan", parent="missing"),
+        )
+        index = PlanIndex.build(plan)
+        self.assertEqual(index.roots, ["root", "orphan"])
+        self.assertEqual(index.detached, ["a", "b", "below"])
+        self.assertNotIn("a", index.enter)
+        self.assertNotIn("below", index.depth)
+    
+    def test_after_cycle_nodes_are_blocked(self):
+        plan = make_plan(
+            a=Node(title="A", after=["b"]),
+            b=Node(title="B", after=["a"]),
+            c=Node(title="C", after=["b"]),
+            d=Node(title="D"),
+            e=Node(title="E", after=["e"]),
+        )
+        index = PlanIndex.build(plan)
+        self.assertEqual(index.topological_order, ["d"])
+        self.assertEqual(index.after_blocked, ["a", "b", "c", "e"])
+    
+    def test_deep_hierarchy_without_recursion(self):
+        depth = 20000
+        nodes = {"n0": Node(title="n0")}
+        for i in range(1, depth):
+            nodes[f"n{i}"] = Node(title=f"n{i}", parent=f"n{i - 1}", after=[f"n{i - 1}"])
+        index = PlanIndex.build(MergedPlan(nodes=nodes))
+        self.assertEqual(index.depth[f"n{depth - 1}"], depth - 1)
+        self.assertEqual(index.leave["n0"], depth)
+        self.assertEqual(len(index.topological_order), depth)
+
+
+class TestPlanIndexDescendants(unittest.TestCase):
+    """descendants() and is_descendant() over Euler-tour intervals."""
+    
+    def setUp(self):
+        self.plan = make_plan(
+            root=Node(title="Root"),
+            a=Node(title="A", parent="root"),
+            a1=Node(title="A1", parent="a"),
+            b=Node(title="B", parent="root"),
+            other=Node(title="Other"),
+            c1=Node(title="C1", parent="c2"),
+            c2=Node(title="C2", parent="c1"),
+            below=Node(title="Below", parent="c1"),
+            orphan=Node(title="Orphan", parent="missing"),
+        )
+        self.index = PlanIndex.build(self.plan)
+    
+    def test_descendants_slice(self):
+        self.assertEqual(self.index.descendants("root"), ["a", "a1", "b"])
+        self.assertEqual(self.index.descendants("a"), ["a1"])
+        self.assertEqual(self.index.descendants("b"), [])
+    
+    def test_is_descendant(self):
+        index = self.index
+        self.assertTrue(index.is_descendant("a1", "root"))
+        self.assertTrue(index.is_descendant("b", "root"))
+        self.assertFalse(index.is_descendant("root", "root"))
+        self.assertFalse(index.is_descendant("b", "a"))
+        self.assertFalse(index.is_descendant("other", "root"))
+        self.assertFalse(index.is_descendant("c1", "root"))
+        self.assertFalse(index.is_descendant("unknown", "root"))
+    
+    def test_missing_ancestor_walks_children(self):
+        self.assertEqual(self.index.descendants("missing"), ["orphan"])
+        self.assertTrue(self.index.is_descendant("orphan", "missing"))
+        self.assertFalse(self.index.is_descendant("a", "missing"))
+    
+    def test_detached_ancestor_walks_children(self):
+        self.assertEqual(set(self.index.descendants("c1")), {"c2", "c1", "below"})
+        self.assertTrue(self.index.is_descendant("below", "c2"))
+        self.assertFalse(self.index.is_descendant("a", "c2"))
+    
+    def test_matches_naive_walk(self):
+        for ancestor_id in self.plan.nodes:
+            expected = set()
+            for node_id in self.plan.nodes:
+                current, seen = self.plan.nodes[node_id].parent, set()
+                while current in self.plan.nodes and current not in seen:
+                    if current == ancestor_id:
+                        expected.add(node_id)
+                        break
+                    seen.add(current)
+                    current = self.plan.nodes[current].parent
+            actual = {n for n in self.plan.nodes if self.index.is_descendant(n, ancestor_id)}
+            self.assertEqual(actual, expected, ancestor_id)
+
+
+class TestMergedPlanIndex(unittest.TestCase):
+    """Caching and invalidation of MergedPlan.index."""
+    
+    def test_cached(self):
+        plan = make_plan(a=Node(title="A"), b=Node(title="B", parent="a"))
+        self.assertIs(plan.index, plan.index)
+    
+    def test_rebuilt_when_nodes_change_size(self):
+        plan = make_plan(a=Node(title="A"))
+        first = plan.index
+        plan.nodes["b"] = Node(title="B", parent="a")
+        self.assertIsNot(plan.index, first)
+        self.assertEqual(plan.index.children, {"a": ["b"]})
+    
+    def test_rebuilt_when_nodes_replaced(self):
+        plan = make_plan(a=Node(title="A"))
+        first = plan.index
+        plan.nodes = {"b": Node(title="B")}
+        self.assertIsNot(plan.index, first)
+        self.assertEqual(plan.index.roots, ["b"])
+    
+    def test_rebuilt_when_node_removed_and_added(self):
+        plan = make_plan(a=Node(title="A"), b=Node(title="B"))
+        first = plan.index
+        del plan.nodes["b"]
+        plan.nodes["c"] = Node(title="C", parent="a")
+        self.assertIsNot(plan.index, first)
+        self.assertEqual(plan.index.children, {"a": ["c"]})
+    
+    def test_rebuilt_when_node_replaced_under_same_id(self):
+        plan = make_plan(a=Node(title="A"), b=Node(title="B"))
+        self.assertEqual(plan.index.roots, ["a", "b"])
+        plan.nodes["b"] = Node(title="B", parent="a")
+        self.assertEqual(plan.index.roots, ["a"])
+    
+    def test_rebuilt_after_dict_methods(self):
+        plan = make_plan(a=Node(title="A"), b=Node(title="B"))
+        for edit in (
+            lambda nodes: nodes.pop("b"),
+            lambda nodes: nodes.update(b=Node(title="B", parent="a")),
+            lambda nodes: nodes.clear(),
+            lambda nodes: nodes.setdefault("a", Node(title="A")),
+        ):
+            first = plan.index
+            edit(plan.nodes)
+            self.assertIsNot(plan.index, first)
+            self.assertEqual(plan.index.roots, list(plan.nodes)[:1])
+    
+    def test_nodes_wrapped_in_node_map(self):
+        plan = make_plan(a=Node(title="A"))
+        self.assertIsInstance(plan.nodes, NodeMap)
+        plan.nodes = {"b": Node(title="B")}
+        self.assertIsInstance(plan.nodes, NodeMap)
+        self.assertEqual(pickle.loads(pickle.dumps(plan)), plan)
+        self.assertIsInstance(copy.deepcopy(plan).nodes, NodeMap)
+    
+    def test_copies_keep_staleness(self):
+        plan = make_plan(a=Node(title="A"))
+        plan.index
+        plan.nodes["b"] = Node(title="B", parent="a")
+        for copied in (copy.deepcopy(plan), pickle.loads(pickle.dumps(plan))):
+            self.assertEqual(copied.nodes.version, plan.nodes.version)
+            self.assertEqual(copied.index.children, {"a": ["b"]})
+        self.assertEqual(plan.index.children, {"a": ["b"]})
+    
+    def test_copies_keep_fresh_index(self):
+        plan = make_plan(a=Node(title="A"), b=Node(title="B", parent="a"))
+        plan.index
+        for copied in (copy.deepcopy(plan), pickle.loads(pickle.dumps(plan))):
+            copied.nodes["c"] = Node(title="C", parent="b")
+            self.assertEqual(copied.index.children, {"a": ["b"], "b": ["c"]})
+    
+    def test_in_place_edit_needs_invalidate(self):
+        plan = make_plan(a=Node(title="A"), b=Node(title="B"))
+        first = plan.index
+        plan.nodes["b"].parent = "a"
+        # Node fields are not tracked: the index is stale until invalidated
+        self.assertIs(plan.index, first)
+        self.assertEqual(plan.index.roots, ["a", "b"])
+        plan.invalidate_index()
+        self.assertEqual(plan.index.roots, ["a"])
+    
+    def test_invalidate_after_in_place_edit(self):
+        plan = make_plan(a=Node(title="A"), b=Node(title="B"))
+        self.assertEqual(plan.index.roots, ["a", "b"])
+        plan.nodes["b"].parent = "a"
+        plan.invalidate_index()
+        self.assertEqual(plan.index.roots, ["a"])
+    
+    def test_not_part_of_equality_or_repr(self):
+        plan = make_plan(a=Node(title="A"))
+        other = make_plan(a=Node(title="A"))
+        plan.index
+        self.assertEqual(plan, other)
+        self.assertNotIn("PlanIndex", repr(plan))
+    
+    def test_validate_reports_cycles_after_edit(self):
+        plan = make_plan(a=Node(title="A"), b=Node(title="B", parent="a"))
+        self.assertTrue(validate(plan).is_valid)
+        plan.nodes["a"].parent = "b"
+        plan.invalidate_index()
+        result = validate(plan)
+        self.assertFalse(result.is_valid)
+        self.assertIn("Cyclic parent dependency", result.errors[0].message)
+    
+    def test_incremental_update_invalidates(self):
+        plan = MergedPlan(
+            nodes={"a": Node(title="A"), "b": Node(title="B")},
+            schedule=Schedule(nodes={
+                "a": ScheduleNode(start="2024-03-04", duration="2d"),
+                "b": ScheduleNode(duration="1d"),
+            }),
+        )
+        scheduler = IncrementalScheduler(plan)
+        self.assertEqual(plan.index.dependents, {})
+        plan.nodes["b"].after = ["a"]
+        scheduler.update(["b"])
+        self.assertEqual(plan.index.dependents, {"a": ["b"]})
+        scheduler.refresh()
+        self.assertEqual(plan.schedule.nodes["b"].computed_start, "2024-03-06")
+
+
+if __name__ == "__main__":
+    unittest.main()
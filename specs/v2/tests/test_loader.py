@@ -14,6 +14,7 @@ Tests cover:
 - 1.10: Source tracking for each element
 """
 
+import pickle
 import tempfile
 import unittest
 from pathlib import Path
@@ -26,7 +27,7 @@ from specs.v2.tools.loader import (
     load_plan_set,
     merge_fragments,
 )
-from specs.v2.tools.models import MergedPlan
+from specs.v2.tools.models import MergedPlan, SourceIndex
 
 
 class TestAllowedBlocks(unittest.TestCase):
@@ -874,6 +875,83 @@ class TestMergeFragmentsSourceTracking(unittest.TestCase):
         
         self.assertEqual(result.sources["node:task1"], "nodes.yaml")
         self.assertEqual(result.sources["schedule_node:task1"], "schedule.yaml")
+    
+    def test_structured_source_index(self):
+        """Sources are grouped by element type and still iterate as type:id."""
+        fragment = {
+            "_source": "plan.yaml",
+            "nodes": {"task1": {"title": "Task 1"}, "task2": {"title": "Task 2"}},
+            "schedule": {"default_calendar": "work"},
+        }
+        
+        result = merge_fragments([fragment])
+        
+        self.assertIsInstance(result.sources, SourceIndex)
+        self.assertEqual(result.sources.source("node", "task2"), "plan.yaml")
+        self.assertIsNone(result.sources.source("view", "task2"))
+        self.assertEqual(result.sources.of_type("node"), {"task1": "plan.yaml", "task2": "plan.yaml"})
+        self.assertEqual(
+            dict(result.sources),
+            {
+                "node:task1": "plan.yaml",
+                "node:task2": "plan.yaml",
+                "schedule:default_calendar": "plan.yaml",
+            },
+        )
+        self.assertEqual(len(result.sources), 3)
+        self.assertEqual(result.sources.get("node:missing"), None)
+        self.assertEqual(result.sources, {**result.sources})
+
+
+class TestSourceIndex(unittest.TestCase):
+    """Tests for SourceIndex mapping behaviour."""
+    
+    def test_flat_mapping_access(self):
+        """type:id keys can be set, read and deleted."""
+        sources = SourceIndex({"node:a": "a.yaml"})
+        sources["view:v"] = "v.yaml"
+        self.assertEqual(sources["view:v"], "v.yaml")
+        del sources["node:a"]
+        self.assertNotIn("node:a", sources)
+        with self.assertRaises(KeyError):
+            sources["no-colon"]
+        with self.assertRaises(KeyError):
+            del sources["node:a"]
+    
+    def test_discard(self):
+        """discard() forgets a source and ignores unknown elements."""
+        sources = SourceIndex({"node:a": "a.yaml", "node:b": "a.yaml"})
+        sources.discard("node", "a")
+        sources.discard("node", "missing")
+        sources.discard("view", "v")
+        self.assertEqual(dict(sources), {"node:b": "a.yaml"})
+
+
+class TestMergeFragmentsMemoryLayout(unittest.TestCase):
+    """Tests for the compact model layout of merged plans."""
+    
+    def test_models_are_slotted(self):
+        """Per-element models have no per-instance __dict__."""
+        result = merge_fragments([{
+            "_source": "plan.yaml",
+            "nodes": {"task1": {"title": "Task 1"}},
+            "schedule": {"nodes": {"task1": {"duration": "1d"}}},
+        }])
+        self.assertFalse(hasattr(result.nodes["task1"], "__dict__"))
+        self.assertFalse(hasattr(result.schedule.nodes["task1"], "__dict__"))
+    
+    def test_repeated_strings_are_interned(self):
+        """Ids and kinds from different fragments share one string object."""
+        f1 = {"_source": "a.yaml", "nodes": {"".join(["ta", "sk1"]): {"title": "T", "kind": "".join(["ta", "sk"])}}}
+        f2 = {"_source": "b.yaml", "nodes": {"task2": {
+            "title": "T", "kind": "".join(["t", "ask"]), "after": ["".join(["task", "1"])],
+        }}}
+        
+        result = merge_fragments([f1, f2])
+        
+        task1_key = next(iter(result.nodes))
+        self.assertIs(result.nodes["task1"].kind, result.nodes["task2"].kind)
+        self.assertIs(result.nodes["task2"].after[0], task1_key)
 
 
 class TestMergeFragmentsNodeFields(unittest.TestCase):
@@ -1167,6 +1245,61 @@ meta:
         self.assertEqual(result.sources["meta:title"], path2)
 
 
+class TestLoadPlanSetParallel(unittest.TestCase):
+    """Tests for parallel fragment parsing (load_plan_set jobs)."""
+    
+    def setUp(self):
+        """Create a temporary directory with a few fragments."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.files = []
+        for i in range(4):
+            path = Path(self.temp_dir) / f"team{i}.yaml"
+            path.write_text(
+                f"version: 2\n"
+                f"nodes:\n"
+                f"  task{i}:\n"
+                f"    title: Task {i}\n"
+                f"    kind: task\n"
+                + (f"    after: [task{i - 1}]\n" if i else ""),
+                encoding="utf-8",
+            )
+            self.files.append(str(path))
+    
+    def test_same_result_as_sequential(self):
+        """Worker processes produce the same plan, order and sources."""
+        sequential = load_plan_set(self.files)
+        parallel = load_plan_set(self.files, jobs=2)
+        
+        self.assertEqual(parallel, sequential)
+        self.assertEqual(list(parallel.nodes), ["task0", "task1", "task2", "task3"])
+        self.assertEqual(parallel.sources["node:task3"], self.files[3])
+    
+    def test_merge_conflict_in_file_order(self):
+        """Conflicts name the files in the given order."""
+        with self.assertRaises(MergeConflictError) as ctx:
+            load_plan_set([self.files[1], self.files[0], self.files[1]], jobs=2)
+        self.assertEqual(ctx.exception.files, [self.files[1], self.files[1]])
+    
+    def test_first_load_error_is_raised(self):
+        """The error of the first failing file (in file order) is raised."""
+        bad = Path(self.temp_dir) / "bad.yaml"
+        bad.write_text("unknown_block: 1\n", encoding="utf-8")
+        missing = str(Path(self.temp_dir) / "missing.yaml")
+        
+        with self.assertRaises(LoadError) as ctx:
+            load_plan_set([self.files[0], str(bad), missing], jobs=2)
+        self.assertEqual(ctx.exception.file_path, str(bad))
+        self.assertEqual(ctx.exception.block_name, "unknown_block")
+    
+    def test_load_error_pickles(self):
+        """LoadError keeps its attributes across processes."""
+        error = pickle.loads(pickle.dumps(LoadError("boom", "a.yaml", "nodes")))
+        self.assertEqual(
+            (error.message, error.file_path, error.block_name, str(error)),
+            ("boom", "a.yaml", "nodes", "[a.yaml] boom (block: 'nodes')"),
+        )
+
+
 class TestForbiddenNodeFields(unittest.TestCase):
     """Tests for forbidden fields in nodes (Requirement 2.4).
     
@@ -5,6 +5,7 @@ This module tests the shared functionality used by all renderers:
 - apply_view_filter: Filter nodes based on ViewFilter criteria
 - sort_nodes: Sort nodes by a specified field
 - get_descendants: Get all descendants of a node
+- write_lines: Stream rendered lines to a text stream
 
 Requirements covered:
 - 4.7: View filtering with where clause (kind, status, has_schedule, parent)
@@ -12,6 +13,7 @@ Requirements covered:
 - 4.9: Renderer uses calendar from Schedule for date calculations (not View)
 """
 
+import io
 import unittest
 
 from specs.v2.tools.models import (
@@ -19,13 +21,30 @@ from specs.v2.tools.models import (
     Node,
     Schedule,
     ScheduleNode,
+    View,
     ViewFilter,
 )
+from specs.v2.tools.render import (
+    iter_critical,
+    iter_deps,
+    iter_gantt,
+    iter_list,
+    iter_tree,
+    render_critical,
+    render_deps,
+    render_gantt,
+    render_list,
+    render_tree,
+)
+from specs.v2.tools.render import common
 from specs.v2.tools.render.common import (
     apply_view_filter,
     get_descendants,
     sort_nodes,
+    write_lines,
 )
+from specs.v2.tools.scheduler import compute_critical_path
+from specs.v2.tools.scheduler import compute_schedule
 
 
 class TestGetDescendants(unittest.TestCase):
@@ -448,6 +467,34 @@ class TestSortNodes(unittest.TestCase):
         
         result = sort_nodes(plan, ["t1", "t2", "t3"], "issue")
         self.assertEqual(result, ["t2", "t3", "t1"])  # PROJ-1, PROJ-2, PROJ-3
+    
+    def test_sort_by_schedule_dates(self):
+        """Sort by computed start/finish; unscheduled nodes go last."""
+        plan = MergedPlan(
+            nodes={
+                "t1": Node(title="Task 1"),
+                "t2": Node(title="Task 2"),
+                "t3": Node(title="Task 3"),
+                "t4": Node(title="Task 4"),
+            },
+            schedule=Schedule(nodes={
+                "t1": ScheduleNode(start="2024-03-05", duration="1d"),
+                "t2": ScheduleNode(start="2024-03-01", duration="9d"),
+                "t3": ScheduleNode(start="2024-03-03", duration="1d"),
+            }),
+        )
+        compute_schedule(plan, materialize=False)
+        
+        result = sort_nodes(plan, ["t4", "t1", "t2", "t3"], "start")
+        self.assertEqual(result, ["t2", "t3", "t1", "t4"])
+        result = sort_nodes(plan, ["t4", "t1", "t2", "t3"], "finish")
+        self.assertEqual(result, ["t3", "t1", "t2", "t4"])
+        
+        # Without columns the ISO strings are used
+        plan.schedule.columns.materialize(plan.schedule)
+        plan.schedule.columns = None
+        result = sort_nodes(plan, ["t4", "t1", "t2", "t3"], "start")
+        self.assertEqual(result, ["t2", "t3", "t1", "t4"])
 
 
 class TestFilterAndSortIntegration(unittest.TestCase):
@@ -584,3 +631,90 @@ class TestSanitizeMermaidText(unittest.TestCase):
         
         result = sanitize_mermaid_text("")
         self.assertEqual(result, "")
+
+
+class TestWriteLines(unittest.TestCase):
+    """Tests for write_lines function."""
+
+    def written(self, lines) -> str:
+        stream = io.StringIO()
+        write_lines(lines, stream)
+        return stream.getvalue()
+
+    def test_matches_print(self):
+        """Output equals print() of the joined lines."""
+        for lines in ([], [""], ["a"], ["a", "", "b"], ["", ""]):
+            expected = io.StringIO()
+            print("\n".join(lines), file=expected)
+            self.assertEqual(self.written(lines), expected.getvalue(), lines)
+
+    def test_consumes_generator_in_chunks(self):
+        """Long outputs are written in chunks, in order."""
+        consumed = []
+
+        def lines():
+            for i in range(common.WRITE_CHUNK_LINES * 2 + 3):
+                consumed.append(i)
+                yield str(i)
+
+        stream = io.StringIO()
+        writes = []
+        original_write = stream.write
+        stream.write = lambda text: writes.append(len(consumed)) or original_write(text)
+        write_lines(lines(), stream)
+
+        self.assertEqual(writes, [
+            common.WRITE_CHUNK_LINES,
+            common.WRITE_CHUNK_LINES * 2,
+            common.WRITE_CHUNK_LINES * 2 + 3,
+        ])
+        self.assertEqual(
+            stream.getvalue().split("\n")[-3:],
+            [str(common.WRITE_CHUNK_LINES * 2 + 1), str(common.WRITE_CHUNK_LINES * 2 + 2), ""],
+        )
+
+
+class TestStreamingRenderers(unittest.TestCase):
+    """The iter_* renderers yield the lines their render_* wrappers join."""
+
+    def setUp(self):
+        self.plan = MergedPlan(
+            nodes={
+                "phase": Node(title="Phase", kind="phase", status="todo"),
+                "a": Node(title="A", kind="task", parent="phase", effort=2),
+                "b": Node(title="B", kind="task", parent="phase", after=["a"], milestone=True),
+                "c": Node(title="C", kind="task", status="todo", after=["b"]),
+            },
+            schedule=Schedule(nodes={
+                "a": ScheduleNode(start="2024-03-04", duration="2d"),
+                "b": ScheduleNode(duration="1d"),
+                "c": ScheduleNode(duration="3d"),
+            }),
+            views={
+                "tasks": View(title="Tasks", where=ViewFilter(kind=["task"]), order_by="title"),
+                "none": View(title="None", where=ViewFilter(kind=["epic"]), group_by="parent"),
+            },
+        )
+        compute_schedule(self.plan)
+        compute_critical_path(self.plan)
+        self.pairs = [
+            (iter_gantt, render_gantt),
+            (iter_tree, render_tree),
+            (iter_list, render_list),
+            (iter_deps, render_deps),
+            (iter_critical, render_critical),
+        ]
+
+    def test_lines_match_strings(self):
+        """Joining the yielded lines gives the rendered string."""
+        for view_id in ("", "tasks", "none"):
+            for iterate, render in self.pairs:
+                lines = list(iterate(self.plan, view_id))
+                self.assertTrue(all("\n" not in line for line in lines))
+                self.assertEqual("\n".join(lines), render(self.plan, view_id), (render, view_id))
+
+    def test_unknown_view_raises_on_call(self):
+        """A missing view is reported before iteration starts."""
+        for iterate, _ in self.pairs:
+            with self.assertRaises(ValueError):
+                iterate(self.plan, "missing")
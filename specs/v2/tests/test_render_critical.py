@@ -0,0 +1,74 @@
+"""
+Tests for the critical path renderer module.
+"""
+
+import unittest
+
+from specs.v2.tools.models import (
+    Calendar,
+    MergedPlan,
+    Node,
+    Schedule,
+    ScheduleNode,
+    View,
+    ViewFilter,
+)
+from specs.v2.tools.render.critical import render_critical
+from specs.v2.tools.scheduler import compute_critical_path, compute_schedule
+
+
+class TestRenderCritical(unittest.TestCase):
+    """Tests for render_critical function."""
+    
+    def setUp(self):
+        self.plan = MergedPlan(
+            nodes={
+                "a": Node(title="A", kind="task"),
+                "b": Node(title="B", kind="task", after=["a"]),
+                "d": Node(title="D", kind="chore"),
+            },
+            schedule=Schedule(
+                calendars={"default": Calendar(excludes=["weekends"])},
+                default_calendar="default",
+                nodes={
+                    "a": ScheduleNode(start="2024-03-11", duration="2d"),
+                    "b": ScheduleNode(duration="3d"),
+                    "d": ScheduleNode(start="2024-03-11", duration="1d"),
+                },
+            ),
+            views={"tasks": View(title="Tasks", where=ViewFilter(kind=["task"]))},
+        )
+        compute_schedule(self.plan)
+        compute_critical_path(self.plan)
+    
+    def test_critical_and_float_sections(self):
+        """Critical chain first, then the other nodes with their float."""
+        self.assertEqual(
+            render_critical(self.plan),
+            "Critical path (finish 2024-03-15):\n"
+            "- A [2024-03-11 .. 2024-03-12]\n"
+            "- B [2024-03-13 .. 2024-03-15]\n"
+            "\n"
+            "Float:\n"
+            "- D [2024-03-11 .. 2024-03-11] float 4d, latest 2024-03-15 .. 2024-03-15",
+        )
+    
+    def test_view_filter(self):
+        """View filter hides nodes from both sections."""
+        output = render_critical(self.plan, "tasks")
+        self.assertNotIn("Float:", output)
+        self.assertNotIn("- D ", output)
+    
+    def test_unknown_view(self):
+        """Unknown view raises ValueError."""
+        with self.assertRaises(ValueError):
+            render_critical(self.plan, "missing")
+    
+    def test_without_critical_path_pass(self):
+        """Nothing to report before compute_critical_path has run."""
+        plan = MergedPlan(nodes={"a": Node(title="A")}, schedule=Schedule())
+        self.assertEqual(render_critical(plan), "")
+
+
+if __name__ == "__main__":
+    unittest.main()
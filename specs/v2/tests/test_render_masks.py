@@ -0,0 +1,168 @@
+"""
+Tests for bitset evaluation of view filters (render/masks.py).
+
+Requirements covered:
+- 4.7: View filtering with where clause (kind, status, has_schedule, parent)
+"""
+
+import unittest
+
+from specs.v2.tools.effort import compute_effort_metrics, update_effort
+from specs.v2.tools.models import (
+    MergedPlan,
+    Node,
+    Schedule,
+    ScheduleNode,
+    ViewFilter,
+)
+from specs.v2.tools.render.common import apply_view_filter
+from specs.v2.tools.render.masks import FilterMasks
+
+
+def make_plan() -> MergedPlan:
+    """Plan with two phases, mixed kinds/statuses and a partial schedule."""
+    return MergedPlan(
+        nodes={
+            "p1": Node(title="Phase 1", kind="phase"),
+            "t1": Node(title="Task 1", kind="task", status="done", parent="p1"),
+            "t2": Node(title="Task 2", kind="task", status="todo", parent="p1"),
+            "p2": Node(title="Phase 2", kind="phase", status="todo"),
+            "t3": Node(title="Task 3", kind="bug", parent="p2"),
+            "t4": Node(title="Task 4", parent="t3"),
+        },
+        schedule=Schedule(nodes={
+            "t4": ScheduleNode(duration="1d"),
+            "t1": ScheduleNode(duration="2d"),
+        }),
+    )
+
+
+class TestFilterMasks(unittest.TestCase):
+    """Masks built by FilterMasks."""
+    
+    def setUp(self):
+        self.plan = make_plan()
+        self.masks = FilterMasks(self.plan)
+    
+    def test_bits_follow_plan_order(self):
+        self.assertEqual(self.masks.node_ids, ["p1", "t1", "t2", "p2", "t3", "t4"])
+        self.assertEqual(self.masks.all, 0b111111)
+    
+    def test_value_masks(self):
+        self.assertEqual(self.masks.kind["phase"], 0b001001)
+        self.assertEqual(self.masks.kind["task"], 0b000110)
+        self.assertEqual(self.masks.kind[None], 0b100000)
+        self.assertEqual(self.masks.status["todo"], 0b001100)
+        self.assertEqual(self.masks.scheduled, 0b100010)
+    
+    def test_descendants(self):
+        self.assertEqual(self.masks.descendants("p1"), 0b000110)
+        self.assertEqual(self.masks.descendants("p2"), 0b110000)
+        self.assertEqual(self.masks.descendants("t4"), 0)
+        self.assertEqual(self.masks.descendants("missing"), 0)
+    
+    def test_mask_combines_criteria(self):
+        view_filter = ViewFilter(kind=["task", "bug"], has_schedule=False)
+        self.assertEqual(self.masks.mask(view_filter), 0b010100)
+        self.assertEqual(self.masks.ids(0b010100), ["t2", "t3"])
+    
+    def test_unknown_values_match_nothing(self):
+        self.assertEqual(self.masks.mask(ViewFilter(kind=["epic"])), 0)
+        self.assertEqual(self.masks.mask(ViewFilter(status=[])), 0)
+        self.assertEqual(self.masks.ids(0), [])
+    
+    def test_filter_keeps_input_order(self):
+        view_filter = ViewFilter(status=["todo", "done"])
+        self.assertEqual(self.masks.filter(["p2", "t2", "ghost", "t1"], view_filter), ["p2", "t2", "t1"])
+        self.assertEqual(self.masks.filter(list(self.plan.nodes), view_filter), ["t1", "t2", "p2"])
+
+
+class TestFilterMasksCache(unittest.TestCase):
+    """Caching of masks in plan.index."""
+    
+    def test_shared_per_plan(self):
+        plan = make_plan()
+        self.assertIs(FilterMasks.of(plan), FilterMasks.of(plan))
+    
+    def test_rebuilt_with_index(self):
+        plan = make_plan()
+        view_filter = ViewFilter(status=["todo"])
+        self.assertEqual(apply_view_filter(plan, list(plan.nodes), view_filter), ["t2", "p2"])
+        
+        plan.nodes["t1"].status = "todo"
+        plan.invalidate_index()
+        
+        self.assertEqual(apply_view_filter(plan, list(plan.nodes), view_filter), ["t1", "t2", "p2"])
+    
+    def test_rebuilt_when_schedule_changes_size(self):
+        plan = make_plan()
+        view_filter = ViewFilter(has_schedule=True)
+        self.assertEqual(apply_view_filter(plan, list(plan.nodes), view_filter), ["t1", "t4"])
+        
+        plan.schedule.nodes["p1"] = ScheduleNode(duration="1d")
+        
+        self.assertEqual(apply_view_filter(plan, list(plan.nodes), view_filter), ["p1", "t1", "t4"])
+    
+    def test_rebuilt_when_schedule_node_swapped(self):
+        plan = make_plan()
+        view_filter = ViewFilter(has_schedule=True)
+        self.assertEqual(apply_view_filter(plan, list(plan.nodes), view_filter), ["t1", "t4"])
+        
+        del plan.schedule.nodes["t1"]
+        plan.schedule.nodes["t2"] = ScheduleNode(duration="2d")
+        
+        self.assertEqual(apply_view_filter(plan, list(plan.nodes), view_filter), ["t2", "t4"])
+    
+    def test_rebuilt_when_schedule_replaced(self):
+        plan = make_plan()
+        view_filter = ViewFilter(has_schedule=True)
+        self.assertEqual(apply_view_filter(plan, list(plan.nodes), view_filter), ["t1", "t4"])
+        
+        plan.schedule = Schedule(nodes={
+            "t2": ScheduleNode(duration="1d"),
+            "t3": ScheduleNode(duration="2d"),
+        })
+        
+        self.assertEqual(apply_view_filter(plan, list(plan.nodes), view_filter), ["t2", "t3"])
+    
+    def test_rebuilt_when_node_replaced(self):
+        plan = make_plan()
+        view_filter = ViewFilter(kind=["bug"])
+        self.assertEqual(apply_view_filter(plan, list(plan.nodes), view_filter), ["t3"])
+        
+        plan.nodes["t2"] = Node(title="Task 2", kind="bug", parent="p1")
+        
+        self.assertEqual(apply_view_filter(plan, list(plan.nodes), view_filter), ["t2", "t3"])
+    
+    def test_in_place_edit_needs_invalidate(self):
+        plan = make_plan()
+        view_filter = ViewFilter(kind=["bug"])
+        self.assertEqual(apply_view_filter(plan, list(plan.nodes), view_filter), ["t3"])
+        
+        plan.nodes["t2"].kind = "bug"
+        self.assertEqual(apply_view_filter(plan, list(plan.nodes), view_filter), ["t3"])
+        plan.invalidate_index()
+        
+        self.assertEqual(apply_view_filter(plan, list(plan.nodes), view_filter), ["t2", "t3"])
+    
+    def test_rebuilt_after_update_effort_move(self):
+        plan = make_plan()
+        compute_effort_metrics(plan)
+        view_filter = ViewFilter(parent="p1")
+        self.assertEqual(apply_view_filter(plan, list(plan.nodes), view_filter), ["t1", "t2"])
+        
+        plan.nodes["t4"].parent = "t2"
+        update_effort(plan, "t4", old_parent="t3")
+        
+        self.assertEqual(apply_view_filter(plan, list(plan.nodes), view_filter), ["t1", "t2", "t4"])
+    
+    def test_result_is_a_copy(self):
+        plan = make_plan()
+        view_filter = ViewFilter(kind=["phase"])
+        result = apply_view_filter(plan, list(plan.nodes), view_filter)
+        result.append("t1")
+        self.assertEqual(apply_view_filter(plan, list(plan.nodes), view_filter), ["p1", "p2"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+"""
+Tests for the effort summary renderer (render/summary.py).
+"""
+
+import unittest
+
+from specs.v2.tools.effort import compute_effort_metrics
+from specs.v2.tools.models import MergedPlan, Meta, Node
+from specs.v2.tools.render.summary import (
+    format_effort,
+    iter_effort_summary,
+    render_effort_summary,
+)
+
+
+def make_plan() -> MergedPlan:
+    """Two phases with todo/done tasks."""
+    plan = MergedPlan(
+        meta=Meta(effort_unit="sp"),
+        nodes={
+            "p1": Node(title="Phase 1"),
+            "a": Node(title="A", parent="p1", status="todo", effort=5),
+            "b": Node(title="B", parent="p1", status="done", effort=8),
+            "p2": Node(title="Phase 2", effort=4),
+            "c": Node(title="C", parent="p2", status="todo", effort=3),
+        },
+    )
+    compute_effort_metrics(plan)
+    return plan
+
+
+class TestRenderEffortSummary(unittest.TestCase):
+    """render_effort_summary() tables."""
+    
+    def test_table_per_dimension(self):
+        self.assertEqual(
+            render_effort_summary(make_plan(), ["status", "scheduled"]),
+            "Effort by status (sp):\n"
+            "         todo  done  (none)  total\n"
+            "Phase 1     5     8       0     13\n"
+            "Phase 2     3     0       1      4\n"
+            "Total       8     8       1     17\n"
+            "\n"
+            "Effort by scheduled (sp):\n"
+            "         unscheduled  total\n"
+            "Phase 1           13     13\n"
+            "Phase 2            4      4\n"
+            "Total             17     17",
+        )
+    
+    def test_node_subtree(self):
+        lines = render_effort_summary(make_plan(), ["status"], "p1").splitlines()
+        self.assertEqual(lines, [
+            "Effort by status under Phase 1 (sp):",
+            "       todo  done  (none)  total",
+            "A         5     0       0      5",
+            "B         0     8       0      8",
+            "Total     5     8       0     13",
+        ])
+    
+    def test_errors_raised_before_first_line(self):
+        with self.assertRaises(ValueError):
+            iter_effort_summary(make_plan(), ["status"], "missing")
+        with self.assertRaises(ValueError):
+            iter_effort_summary(make_plan(), ["owner"])
+    
+    def test_format_effort(self):
+        self.assertEqual(format_effort(3), "3")
+        self.assertEqual(format_effort(0.1 + 0.2), "0.3")
+        self.assertEqual(format_effort(2.5), "2.5")
+        self.assertEqual(format_effort(4.0), "4")
+
+
+if __name__ == "__main__":
+    unittest.main()
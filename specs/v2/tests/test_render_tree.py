@@ -8,6 +8,7 @@ Tests cover:
 - 4.8: View sorting with order_by
 """
 
+import sys
 import unittest
 
 from specs.v2.tools.models import (
@@ -796,5 +797,57 @@ class TestRenderTreeNoViewId(unittest.TestCase):
         self.assertIn("Task 2", result)
 
 
+class TestRenderTreeLargePlans(unittest.TestCase):
+    """render_tree on deep and wide hierarchies."""
+    
+    def test_chain_deeper_than_recursion_limit(self):
+        """A parent chain longer than the recursion limit renders fully."""
+        depth = sys.getrecursionlimit() + 500
+        nodes = {"n0": Node(title="n0")}
+        for i in range(1, depth):
+            nodes[f"n{i}"] = Node(title=f"n{i}", parent=f"n{i - 1}")
+        
+        lines = render_tree(MergedPlan(nodes=nodes)).split("\n")
+        
+        self.assertEqual(len(lines), depth)
+        self.assertEqual(lines[-1], " " * 4 * (depth - 1) + "└── n" + str(depth - 1))
+    
+    def test_roots_in_plan_order(self):
+        """Without order_by, roots and children keep plan order."""
+        nodes = {}
+        for i in range(50):
+            nodes[f"r{i}"] = Node(title=f"Root {i}")
+        nodes["c"] = Node(title="Child", parent="r7")
+        
+        lines = render_tree(MergedPlan(nodes=nodes)).split("\n")
+        
+        self.assertEqual(lines[0], "├── Root 0")
+        self.assertEqual(lines[8], "│   └── Child")
+        self.assertEqual(lines[-1], "└── Root 49")
+    
+    def test_order_by_applies_at_every_level(self):
+        """order_by sorts roots and every children list."""
+        plan = MergedPlan(
+            nodes={
+                "b": Node(title="B"),
+                "a": Node(title="A"),
+                "b2": Node(title="Y", parent="b"),
+                "b1": Node(title="X", parent="b"),
+                "a1": Node(title="Z", parent="a"),
+            },
+            views={"sorted": View(order_by="title")},
+        )
+        
+        result = render_tree(plan, "sorted")
+        
+        self.assertEqual(result, "\n".join([
+            "├── A",
+            "│   └── Z",
+            "└── B",
+            "    ├── X",
+            "    └── Y",
+        ]))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,159 @@
+"""
+Tests for the scenarios module (batch what-if scheduling).
+"""
+
+import copy
+import unittest
+from datetime import date
+
+from specs.v2.tools.models import (
+    Calendar,
+    MergedPlan,
+    Node,
+    Schedule,
+    ScheduleNode,
+)
+from specs.v2.tools.scenarios import (
+    Scenario,
+    ScenarioScheduler,
+    run_scenarios,
+)
+from specs.v2.tools.scheduler import (
+    WARN_CYCLIC_DEPENDENCY,
+    compute_schedule,
+    parse_date,
+)
+
+
+class TestScenarioScheduler(unittest.TestCase):
+    """Tests for ScenarioScheduler."""
+    
+    def setUp(self):
+        self.plan = MergedPlan(
+            nodes={
+                "a": Node(title="A"),
+                "b": Node(title="B", after=["a"]),
+                "c": Node(title="C", after=["b"]),
+                "d": Node(title="D", after=["c"]),
+                "e": Node(title="E"),
+            },
+            schedule=Schedule(
+                calendars={"default": Calendar(excludes=["weekends"])},
+                default_calendar="default",
+                nodes={
+                    "a": ScheduleNode(start="2024-03-11", duration="2d"),
+                    "b": ScheduleNode(duration="3d"),
+                    "c": ScheduleNode(start="2024-03-11", duration="1d"),
+                    "d": ScheduleNode(duration="1d"),
+                    "e": ScheduleNode(start="2024-03-11", duration="1d", calendar="other"),
+                },
+            ),
+        )
+    
+    def assert_matches_copy(self, scheduler, scenario):
+        """Scenario result equals compute_schedule on an edited deep copy."""
+        result = scheduler.run(scenario)
+        
+        expected = copy.deepcopy(self.plan)
+        for node_id, fields in scenario.nodes.items():
+            for name, value in fields.items():
+                setattr(expected.schedule.nodes[node_id], name, value)
+        expected.schedule.calendars.update(scenario.calendars)
+        if scenario.default_calendar is not None:
+            expected.schedule.default_calendar = scenario.default_calendar
+        compute_schedule(expected)
+        
+        for node_id, sn in expected.schedule.nodes.items():
+            self.assertEqual(
+                scheduler.dates(result, node_id),
+                (
+                    parse_date(sn.computed_start) if sn.computed_start else None,
+                    parse_date(sn.computed_finish) if sn.computed_finish else None,
+                ),
+                node_id,
+            )
+        self.assertEqual(result.warnings, expected.schedule.warnings)
+        return result
+    
+    def test_baseline_without_overrides(self):
+        """An empty scenario returns the base schedule."""
+        scheduler = ScenarioScheduler(self.plan)
+        result = self.assert_matches_copy(scheduler, Scenario("base"))
+        self.assertEqual(result.name, "base")
+        self.assertEqual(scheduler.node_ids, ("a", "b", "c", "d", "e"))
+        self.assertEqual(scheduler.dates(result, "b"), (date(2024, 3, 13), date(2024, 3, 15)))
+    
+    def test_node_overrides(self):
+        """Changed durations and starts move the downstream nodes."""
+        scheduler = ScenarioScheduler(self.plan)
+        self.assert_matches_copy(scheduler, Scenario("slow", nodes={"a": {"duration": "5d"}}))
+        self.assert_matches_copy(scheduler, Scenario("late", nodes={"c": {"start": "2024-04-01"}}))
+    
+    def test_override_changes_dependencies(self):
+        """Clearing an explicit start attaches the node to its after-dependencies."""
+        scheduler = ScenarioScheduler(self.plan)
+        result = self.assert_matches_copy(
+            scheduler, Scenario("chained", nodes={"c": {"start": None}})
+        )
+        self.assertEqual(scheduler.dates(result, "c")[0], date(2024, 3, 18))
+    
+    def test_override_creates_cycle(self):
+        """Cycles that only exist in a scenario are reported as such."""
+        self.plan.nodes["a"].after = ["d"]
+        scheduler = ScenarioScheduler(self.plan)
+        result = self.assert_matches_copy(
+            scheduler, Scenario("cycle", nodes={"a": {"start": None}, "c": {"start": None}})
+        )
+        self.assertEqual(
+            {w.code for w in result.warnings},
+            {WARN_CYCLIC_DEPENDENCY},
+        )
+    
+    def test_calendar_overrides(self):
+        """Replaced, added and default calendars are applied."""
+        scheduler = ScenarioScheduler(self.plan)
+        self.assert_matches_copy(scheduler, Scenario("7-day", calendars={"default": Calendar()}))
+        self.assert_matches_copy(
+            scheduler,
+            Scenario("other", calendars={"other": Calendar(excludes=["2024-03-11"])}),
+        )
+        self.assert_matches_copy(
+            scheduler,
+            Scenario("switch", calendars={"plain": Calendar()}, default_calendar="plain"),
+        )
+    
+    def test_base_plan_not_modified(self):
+        """Scenarios never write to the base plan."""
+        before = copy.deepcopy(self.plan)
+        ScenarioScheduler(self.plan).run(
+            Scenario("x", nodes={"a": {"duration": "9d"}}, calendars={"default": Calendar()})
+        )
+        self.assertEqual(self.plan, before)
+    
+    def test_invalid_overrides(self):
+        """Overrides outside schedule.nodes or of other fields are rejected."""
+        scheduler = ScenarioScheduler(self.plan)
+        with self.assertRaises(ValueError):
+            scheduler.run(Scenario("x", nodes={"missing": {"duration": "1d"}}))
+        with self.assertRaises(ValueError):
+            scheduler.run(Scenario("x", nodes={"a": {"after": ["b"]}}))
+    
+    def test_run_all_with_process_pool(self):
+        """Worker processes return the same results, in input order."""
+        scenarios = [
+            Scenario(f"s{days}", nodes={"a": {"duration": f"{days}d"}})
+            for days in range(1, 6)
+        ]
+        serial = run_scenarios(self.plan, scenarios)
+        parallel = run_scenarios(self.plan, scenarios, jobs=2)
+        self.assertEqual(parallel, serial)
+        self.assertEqual([r.name for r in parallel], ["s1", "s2", "s3", "s4", "s5"])
+    
+    def test_plan_without_schedule(self):
+        """Plans without a schedule yield empty results."""
+        result = ScenarioScheduler(MergedPlan(nodes={})).run(Scenario("x"))
+        self.assertEqual((result.starts, result.finishes), ([], []))
+
+
+if __name__ == "__main__":
+    unittest.main()
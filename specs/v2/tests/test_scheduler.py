@@ -9,7 +9,10 @@ Tests cover:
 - 3.14: Use explicit start or mark as unschedulable when all deps unscheduled
 """
 
+import copy
+import sys
 import unittest
+from dataclasses import FrozenInstanceError
 from datetime import date
 
 from specs.v2.tools.models import (
@@ -20,14 +23,26 @@ from specs.v2.tools.models import (
     ScheduleNode,
 )
 from specs.v2.tools.scheduler import (
+    EMPTY_CALENDAR,
+    IncrementalScheduler,
+    WorkCalendar,
     add_workdays,
+    build_schedule_graph,
+    compile_calendar,
+    compile_calendars,
+    compute_critical_path,
     compute_schedule,
+    count_workdays_between,
     is_workday,
     next_workday,
     normalize_start,
     parse_date,
     parse_duration,
+    resolve_calendar,
     sub_workdays,
+    WARN_CYCLIC_DEPENDENCY,
+    WARN_DEPENDENCIES_UNSCHEDULABLE,
+    WARN_NO_START,
 )
 
 
@@ -221,6 +236,95 @@ class TestSubWorkdaysFunction(unittest.TestCase):
         self.assertEqual(result, date(2024, 3, 14))
 
 
+class TestWorkCalendar(unittest.TestCase):
+    """Tests for compiled calendar arithmetic."""
+
+    def test_compile_calendar(self):
+        """Weekend holidays are dropped, invalid excludes ignored."""
+        calendar = Calendar(excludes=[
+            "weekends", "2024-03-18", "2024-03-16", "2024-03-18", "bogus",
+        ])
+        compiled = compile_calendar(calendar)
+        self.assertTrue(compiled.weekends)
+        self.assertEqual(compiled.holidays, (date(2024, 3, 18).toordinal(),))
+
+    def test_long_duration_matches_day_walk(self):
+        """Whole-week jumps give the same result as walking day by day."""
+        holidays = [f"2024-{m:02d}-{d:02d}" for m in range(1, 13) for d in (1, 15)]
+        calendar = Calendar(excludes=["weekends"] + holidays)
+        start = date(2024, 1, 2)
+
+        expected = start
+        remaining = 199
+        while remaining > 0:
+            expected = expected.fromordinal(expected.toordinal() + 1)
+            if is_workday(expected, calendar):
+                remaining -= 1
+
+        self.assertEqual(add_workdays(start, 199, calendar), expected)
+        self.assertEqual(sub_workdays(expected, 199, calendar), start)
+
+    def test_no_weekends(self):
+        """Calendar without weekends counts every day except holidays."""
+        compiled = compile_calendar(Calendar(excludes=["2024-03-16"]))
+        # Friday + 2 days = Monday (Saturday is a holiday, Sunday counts)
+        self.assertEqual(compiled.add_workdays(date(2024, 3, 15), 2), date(2024, 3, 18))
+        self.assertEqual(compiled.next_workday(date(2024, 3, 15)), date(2024, 3, 17))
+
+    def test_count_workdays_between(self):
+        """Count workdays in an inclusive range."""
+        calendar = Calendar(excludes=["weekends", "2024-03-13"])
+        # Mon 11 .. Sun 17: Mon, Tue, Thu, Fri
+        self.assertEqual(count_workdays_between(date(2024, 3, 11), date(2024, 3, 17), calendar), 4)
+        self.assertEqual(count_workdays_between(date(2024, 3, 12), date(2024, 3, 11), calendar), 0)
+
+    def test_accepts_compiled_calendar(self):
+        """Module helpers accept a WorkCalendar directly."""
+        compiled = WorkCalendar(weekends=True)
+        self.assertEqual(add_workdays(date(2024, 3, 14), 3, compiled), date(2024, 3, 19))
+        self.assertFalse(is_workday(date(2024, 3, 16), compiled))
+
+    def test_frozen(self):
+        """Compiled calendars are immutable and can be shared."""
+        compiled = compile_calendar(Calendar(excludes=["2024-03-18"]))
+        self.assertEqual(compiled.excluded, frozenset({date(2024, 3, 18).toordinal()}))
+        with self.assertRaises(FrozenInstanceError):
+            compiled.weekends = True
+
+
+class TestCompileCalendars(unittest.TestCase):
+    """Tests for per-schedule calendar compilation and resolution."""
+
+    def setUp(self):
+        self.schedule = Schedule(
+            calendars={
+                "work": Calendar(excludes=["weekends"]),
+                "ops": Calendar(excludes=["2024-03-18"]),
+            },
+            default_calendar="work",
+        )
+
+    def test_compile_calendars(self):
+        """Every calendar_id is compiled once."""
+        compiled = compile_calendars(self.schedule)
+        self.assertEqual(set(compiled), {"work", "ops"})
+        self.assertTrue(compiled["work"].weekends)
+        self.assertFalse(compiled["ops"].weekends)
+
+    def test_resolve_shares_compiled_instance(self):
+        """Nodes with the same calendar get the same instance."""
+        compiled = compile_calendars(self.schedule)
+        self.assertIs(resolve_calendar(self.schedule, "ops", compiled), compiled["ops"])
+        self.assertIs(resolve_calendar(self.schedule, None, compiled), compiled["work"])
+
+    def test_resolve_fallback(self):
+        """Missing calendar resolves to the empty calendar."""
+        self.schedule.default_calendar = None
+        self.assertIs(resolve_calendar(self.schedule, None), EMPTY_CALENDAR)
+        self.assertIs(resolve_calendar(self.schedule, "missing"), EMPTY_CALENDAR)
+        self.assertFalse(resolve_calendar(self.schedule, "ops").is_workday(date(2024, 3, 18)))
+
+
 class TestComputeScheduleEmpty(unittest.TestCase):
     """Tests for compute_schedule with empty/no schedule."""
 
@@ -537,7 +641,50 @@ class TestComputeScheduleDependencies(unittest.TestCase):
         
         # task2 is unschedulable (no scheduled deps, no explicit start)
         self.assertIsNone(plan.schedule.nodes["task2"].computed_start)
-        self.assertTrue(any("task2" in w for w in plan.schedule.warnings))
+        self.assertEqual([w.node_id for w in plan.schedule.warnings], ["task2"])
+        self.assertEqual(plan.schedule.warnings[0].code, WARN_NO_START)
+
+
+class TestComputeScheduleWarnings(unittest.TestCase):
+    """Tests for structured scheduler warnings."""
+
+    def test_one_warning_per_node(self):
+        """A node gets a single warning, with the most specific code."""
+        plan = MergedPlan(
+            nodes={
+                "task1": Node(title="Task 1"),
+                "task2": Node(title="Task 2", after=["task1"]),
+                "task3": Node(title="Task 3", after=["task2"]),
+            },
+            schedule=Schedule(nodes={
+                "task2": ScheduleNode(),
+                "task3": ScheduleNode(),
+            }),
+        )
+
+        compute_schedule(plan)
+
+        warnings = {w.node_id: w for w in plan.schedule.warnings}
+        self.assertEqual(len(plan.schedule.warnings), 2)
+        self.assertEqual(warnings["task2"].code, WARN_NO_START)
+        self.assertEqual(warnings["task3"].code, WARN_DEPENDENCIES_UNSCHEDULABLE)
+        self.assertEqual(
+            str(warnings["task3"]),
+            "Node 'task3': all scheduled dependencies are unschedulable",
+        )
+
+    def test_many_unschedulable_nodes(self):
+        """Each unschedulable node is reported exactly once."""
+        count = 2000
+        plan = MergedPlan(
+            nodes={f"t{i}": Node(title=f"T{i}") for i in range(count)},
+            schedule=Schedule(nodes={f"t{i}": ScheduleNode() for i in range(count)}),
+        )
+
+        compute_schedule(plan)
+
+        self.assertEqual(len(plan.schedule.warnings), count)
+        self.assertEqual(len({w.node_id for w in plan.schedule.warnings}), count)
 
 
 class TestComputeScheduleMilestones(unittest.TestCase):
@@ -668,6 +815,259 @@ class TestComputeScheduleMemoization(unittest.TestCase):
         self.assertEqual(plan.schedule.nodes["end"].computed_start, "2024-03-20")
 
 
+def add_days_iso(start: str, days: int) -> str:
+    """Add calendar days to an ISO date string."""
+    return date.fromordinal(date.fromisoformat(start).toordinal() + days).isoformat()
+
+
+class TestComputeScheduleTopologicalOrder(unittest.TestCase):
+    """Tests for the iterative (topological) scheduling pass."""
+
+    def test_long_chain_no_recursion_limit(self):
+        """A chain longer than the recursion limit is scheduled."""
+        count = sys.getrecursionlimit() + 500
+        nodes = {"t0": Node(title="T0")}
+        schedule_nodes = {"t0": ScheduleNode(start="2024-03-11", duration="1d")}
+        for i in range(1, count):
+            nodes[f"t{i}"] = Node(title=f"T{i}", after=[f"t{i - 1}"])
+            schedule_nodes[f"t{i}"] = ScheduleNode(duration="1d")
+        plan = MergedPlan(
+            nodes=nodes,
+            schedule=Schedule(nodes=schedule_nodes),
+        )
+
+        compute_schedule(plan)
+
+        last = plan.schedule.nodes[f"t{count - 1}"]
+        self.assertEqual(last.computed_start, add_days_iso("2024-03-11", count - 1))
+        self.assertEqual(plan.schedule.warnings, [])
+
+    def test_graph_order_and_dependencies(self):
+        """Only dependencies that drive the start date become edges."""
+        plan = MergedPlan(
+            nodes={
+                "a": Node(title="A"),
+                "b": Node(title="B", after=["a", "x"]),
+                "c": Node(title="C", after=["b"]),
+                "x": Node(title="X"),  # Not scheduled
+            },
+            schedule=Schedule(nodes={
+                "c": ScheduleNode(start="2024-03-11"),  # Explicit start wins
+                "b": ScheduleNode(),
+                "a": ScheduleNode(start="2024-03-11"),
+            }),
+        )
+
+        graph = build_schedule_graph(plan)
+
+        self.assertEqual(graph.dependencies, {"c": [], "b": ["a"], "a": []})
+        self.assertEqual(graph.dependents["a"], ["b"])
+        self.assertEqual(graph.order, ["c", "a", "b"])
+        self.assertEqual(graph.blocked, [])
+
+    def test_cycle_is_unschedulable(self):
+        """Nodes on an after-cycle are reported instead of recursing forever."""
+        plan = MergedPlan(
+            nodes={
+                "a": Node(title="A", after=["b"]),
+                "b": Node(title="B", after=["a"]),
+                "c": Node(title="C", after=["b"]),
+                "d": Node(title="D"),
+            },
+            schedule=Schedule(nodes={
+                "a": ScheduleNode(),
+                "b": ScheduleNode(),
+                "c": ScheduleNode(),
+                "d": ScheduleNode(start="2024-03-11"),
+            }),
+        )
+
+        compute_schedule(plan)
+
+        self.assertEqual(build_schedule_graph(plan).blocked, ["a", "b", "c"])
+        for node_id in ("a", "b", "c"):
+            self.assertIsNone(plan.schedule.nodes[node_id].computed_start)
+        self.assertEqual(
+            [(w.node_id, w.code) for w in plan.schedule.warnings],
+            [(node_id, WARN_CYCLIC_DEPENDENCY) for node_id in ("a", "b", "c")],
+        )
+        self.assertEqual(plan.schedule.nodes["d"].computed_start, "2024-03-11")
+
+
+class TestIncrementalScheduler(unittest.TestCase):
+    """Tests for incremental rescheduling."""
+
+    def setUp(self):
+        self.plan = MergedPlan(
+            nodes={
+                "a": Node(title="A"),
+                "b": Node(title="B", after=["a"]),
+                "c": Node(title="C", after=["b"]),
+                "d": Node(title="D"),
+                "e": Node(title="E", after=["d"]),
+            },
+            schedule=Schedule(
+                calendars={"default": Calendar(excludes=["weekends"])},
+                default_calendar="default",
+                nodes={
+                    "a": ScheduleNode(start="2024-03-11", duration="2d"),
+                    "b": ScheduleNode(duration="3d"),
+                    "c": ScheduleNode(duration="1d"),
+                    "d": ScheduleNode(start="2024-03-11", duration="1d"),
+                    "e": ScheduleNode(duration="1d"),
+                },
+            ),
+        )
+
+    def assert_matches_full_run(self):
+        """Incremental state equals a fresh compute_schedule run."""
+        expected = copy.deepcopy(self.plan)
+        compute_schedule(expected)
+        for node_id, sn in expected.schedule.nodes.items():
+            actual = self.plan.schedule.nodes[node_id]
+            self.assertEqual(
+                (actual.computed_start, actual.computed_finish),
+                (sn.computed_start, sn.computed_finish),
+                node_id,
+            )
+        self.assertEqual(self.plan.schedule.warnings, expected.schedule.warnings)
+        columns = self.plan.schedule.columns
+        self.assertEqual(columns.node_ids, expected.schedule.columns.node_ids)
+        for node_id in columns.node_ids:
+            self.assertEqual(
+                columns.dates(node_id), expected.schedule.columns.dates(node_id), node_id
+            )
+
+    def test_initial_run_matches_compute_schedule(self):
+        """Construction performs a full pass."""
+        IncrementalScheduler(self.plan)
+        self.assertEqual(self.plan.schedule.nodes["c"].computed_start, "2024-03-18")
+        self.assert_matches_full_run()
+
+    def test_update_recomputes_downstream_cone_only(self):
+        """Only the edited node and its dependents are recomputed."""
+        scheduler = IncrementalScheduler(self.plan)
+        self.plan.schedule.nodes["a"].duration = "5d"
+
+        recomputed = scheduler.update(["a"])
+
+        self.assertEqual(recomputed, ["a", "b", "c"])
+        self.assertEqual(self.plan.schedule.nodes["b"].computed_start, "2024-03-18")
+        self.assert_matches_full_run()
+
+    def test_update_after_and_schedule_membership(self):
+        """Edits to after and to schedule.nodes membership are tracked."""
+        scheduler = IncrementalScheduler(self.plan)
+
+        self.plan.nodes["c"].after = ["b", "e"]
+        self.plan.schedule.nodes["d"].start = "2024-03-25"
+        scheduler.update(["c", "d"])
+        self.assert_matches_full_run()
+
+        del self.plan.schedule.nodes["a"]
+        scheduler.update(["a"])
+        self.assertEqual(
+            [(w.node_id, w.code) for w in self.plan.schedule.warnings],
+            [("b", WARN_NO_START)],
+        )
+        self.assert_matches_full_run()
+
+        self.plan.schedule.nodes["a"] = ScheduleNode(start="2024-03-12")
+        scheduler.update(["a"])
+        self.assertEqual(self.plan.schedule.warnings, [])
+        self.assert_matches_full_run()
+
+    def test_update_creating_and_breaking_cycle(self):
+        """Cycles introduced by an edit are detected, and cleared again."""
+        scheduler = IncrementalScheduler(self.plan)
+
+        self.plan.nodes["a"].after = ["c"]
+        self.plan.schedule.nodes["a"].start = None
+        scheduler.update(["a"])
+        self.assertEqual(
+            {w.code for w in self.plan.schedule.warnings},
+            {WARN_CYCLIC_DEPENDENCY},
+        )
+        self.assert_matches_full_run()
+
+        self.plan.nodes["a"].after = None
+        self.plan.schedule.nodes["a"].start = "2024-03-11"
+        scheduler.update(["a"])
+        self.assertEqual(self.plan.schedule.warnings, [])
+        self.assert_matches_full_run()
+
+
+class TestComputeCriticalPath(unittest.TestCase):
+    """Tests for the backward pass (latest dates, float, critical path)."""
+
+    def setUp(self):
+        self.plan = MergedPlan(
+            nodes={
+                "a": Node(title="A"),
+                "b": Node(title="B", after=["a"]),
+                "c": Node(title="C", after=["b"]),
+                "d": Node(title="D"),
+                "e": Node(title="E", after=["d"]),
+            },
+            schedule=Schedule(
+                calendars={"default": Calendar(excludes=["weekends"])},
+                default_calendar="default",
+                nodes={
+                    "a": ScheduleNode(start="2024-03-11", duration="2d"),
+                    "b": ScheduleNode(duration="3d"),
+                    "c": ScheduleNode(duration="1d"),
+                    "d": ScheduleNode(start="2024-03-11", duration="1d"),
+                    "e": ScheduleNode(duration="1d"),
+                },
+            ),
+        )
+
+    def test_critical_chain_and_float(self):
+        """Longest chain has zero float; the side branch has slack."""
+        compute_schedule(self.plan)
+        path = compute_critical_path(self.plan)
+
+        self.assertEqual(path, ["a", "b", "c"])
+        self.assertEqual(self.plan.schedule.critical_path, path)
+
+        nodes = self.plan.schedule.nodes
+        for node_id in path:
+            self.assertEqual(nodes[node_id].total_float, 0, node_id)
+            self.assertEqual(nodes[node_id].latest_start, nodes[node_id].computed_start)
+            self.assertEqual(nodes[node_id].latest_finish, nodes[node_id].computed_finish)
+
+        # d may slip to Friday, e to the plan finish on Monday (weekend skipped)
+        self.assertEqual(nodes["d"].latest_finish, "2024-03-15")
+        self.assertEqual(nodes["e"].latest_start, "2024-03-18")
+        self.assertEqual(nodes["d"].total_float, 4)
+        self.assertEqual(nodes["e"].total_float, 4)
+
+    def test_milestone_dependent(self):
+        """A milestone dependent bounds its dependency on the same day."""
+        self.plan.nodes["m"] = Node(title="M", after=["e"], milestone=True)
+        self.plan.schedule.nodes["m"] = ScheduleNode()
+        compute_schedule(self.plan)
+        compute_critical_path(self.plan)
+
+        nodes = self.plan.schedule.nodes
+        self.assertEqual(nodes["m"].latest_start, "2024-03-18")
+        self.assertEqual(nodes["e"].latest_finish, "2024-03-18")
+
+    def test_unschedulable_nodes_are_skipped(self):
+        """Nodes without computed dates get no latest dates."""
+        self.plan.schedule.nodes["a"].start = None
+        compute_schedule(self.plan)
+        path = compute_critical_path(self.plan)
+
+        self.assertEqual(path, ["d", "e"])
+        for node_id in ("a", "b", "c"):
+            self.assertIsNone(self.plan.schedule.nodes[node_id].total_float)
+
+    def test_no_schedule(self):
+        """Plans without a schedule have an empty critical path."""
+        self.assertEqual(compute_critical_path(MergedPlan(nodes={})), [])
+
+
 class TestComputeScheduleDesignExamples(unittest.TestCase):
     """Tests based on examples from design.md."""
 
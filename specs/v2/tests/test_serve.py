@@ -0,0 +1,307 @@
+"""
+Tests for the render server (serve.py).
+"""
+
+import contextlib
+import io
+import os
+import shutil
+import socket
+import tempfile
+import threading
+import unittest
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest import mock
+
+from specs.v2.tools import serve
+from specs.v2.tools.cli import cmd_render_critical, cmd_render_tree
+from specs.v2.tools.serve import OutputCache, PlanStore, RenderService, create_server
+
+
+MAIN = """
+version: 2
+meta:
+  id: served
+  title: Served plan
+  effort_unit: sp
+statuses:
+  todo: { label: "To do" }
+  done: { label: "Done" }
+schedule:
+  calendars:
+    default:
+      excludes: [weekends]
+  default_calendar: default
+views:
+  todo:
+    title: Todo
+    where:
+      status: [todo]
+"""
+
+NODES = """
+version: 2
+nodes:
+  a1:
+    title: A1
+    status: done
+    effort: 3
+  a2:
+    title: A2
+    status: todo
+    parent: a1
+    after: [a1]
+    effort: 2
+schedule:
+  nodes:
+    a1:
+      start: "2024-03-01"
+      duration: 3d
+    a2:
+      duration: 2d
+"""
+
+
+class ServeTestCase(unittest.TestCase):
+    """Temporary plan set with files main.yaml and nodes.yaml."""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.mtime = 1_700_000_000 * 10**9
+        self.main = str(Path(self.temp_dir) / "main.yaml")
+        self.nodes = str(Path(self.temp_dir) / "nodes.yaml")
+        self.write(self.main, MAIN)
+        self.write(self.nodes, NODES)
+        self.files = [self.main, self.nodes]
+        self.service = RenderService(self.files, root=self.temp_dir)
+    
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def write(self, path: str, content: str) -> None:
+        """Write a file with a distinct modification time."""
+        Path(path).write_text(content, encoding="utf-8")
+        self.mtime += 10**9
+        os.utime(path, ns=(self.mtime, self.mtime))
+    
+    def cli_output(self, command, *args) -> bytes:
+        """stdout of a cmd_render_* function."""
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(io.StringIO()):
+            self.assertEqual(command(self.files, *args), 0)
+        return stdout.getvalue().encode("utf-8")
+
+
+class TestRenderService(ServeTestCase):
+    """RenderService.handle()."""
+    
+    def test_matches_cli_output(self):
+        response = self.service.handle("/render/tree?view=todo")
+        self.assertEqual(response.status, 200)
+        self.assertEqual(response.body, self.cli_output(cmd_render_tree, "todo"))
+        
+        response = self.service.handle("/render/critical")
+        self.assertEqual(response.body, self.cli_output(cmd_render_critical, None))
+    
+    def test_output_cache(self):
+        first = self.service.handle("/render/list")
+        second = self.service.handle("/render/list")
+        self.assertFalse(first.cached)
+        self.assertTrue(second.cached)
+        self.assertEqual(first.body, second.body)
+        self.assertFalse(self.service.handle("/render/list?view=todo").cached)
+    
+    def test_files_relative_to_root(self):
+        response = self.service.handle("/render/effort-summary?file=main.yaml&file=nodes.yaml&by=status")
+        self.assertEqual(response.status, 200)
+        self.assertTrue(response.body.startswith(b"Effort by status (sp):\n"))
+    
+    def test_reload_on_change(self):
+        entry = self.service.plans.get(self.files)
+        self.assertIn(b"A2", self.service.handle("/render/list").body)
+        
+        self.write(self.nodes, NODES.replace("title: A2", "title: Renamed"))
+        
+        response = self.service.handle("/render/list")
+        self.assertFalse(response.cached)
+        self.assertIn(b"Renamed", response.body)
+        self.assertNotEqual(self.service.plans.get(self.files).generation, entry.generation)
+    
+    def test_touch_keeps_plan(self):
+        entry = self.service.plans.get(self.files)
+        self.service.handle("/render/deps")
+        
+        self.write(self.nodes, NODES)
+        
+        with mock.patch.object(serve, "load_computed_plan") as load:
+            self.assertTrue(self.service.handle("/render/deps").cached)
+        load.assert_not_called()
+        self.assertIs(self.service.plans.get(self.files), entry)
+    
+    def test_errors(self):
+        cases = {
+            "/": 404,
+            "/render/pdf": 404,
+            "/render/tree?view=missing": 400,
+            "/render/effort-summary?by=owner": 400,
+            "/render/tree?file=../outside.yaml": 403,
+            "/render/tree?file=/etc/passwd": 403,
+        }
+        for target, status in cases.items():
+            self.assertEqual(self.service.handle(target).status, status, target)
+        
+        self.assertEqual(RenderService(root=self.temp_dir).handle("/render/tree").status, 400)
+    
+    def test_invalid_plan(self):
+        self.write(self.nodes, NODES.replace("after: [a1]", "after: [ghost]"))
+        response = self.service.handle("/render/tree")
+        self.assertEqual(response.status, 422)
+        self.assertIn(b"ghost", response.body)
+        
+        self.write(self.nodes, NODES)
+        self.assertEqual(self.service.handle("/render/tree").status, 200)
+
+
+class TestPlanStore(ServeTestCase):
+    """PlanStore bounds."""
+    
+    def plan_set(self, name: str) -> list[str]:
+        """A copy of the plan set under another name."""
+        main = str(Path(self.temp_dir) / f"{name}.yaml")
+        self.write(main, MAIN)
+        return [main, self.nodes]
+    
+    def test_least_recently_used_dropped(self):
+        store = PlanStore(max_entries=2)
+        a, b, c = self.plan_set("a"), self.plan_set("b"), self.plan_set("c")
+        entry_a = store.get(a)
+        store.get(b)
+        self.assertIs(store.get(a), entry_a)
+        store.get(c)
+        self.assertEqual(len(store), 2)
+        self.assertIs(store.get(a), entry_a)
+        
+        with mock.patch.object(serve, "load_computed_plan", wraps=serve.load_computed_plan) as load:
+            store.get(b)
+        load.assert_called_once()
+        self.assertEqual(len(store), 2)
+    
+    def test_plan_set_with_missing_file_dropped(self):
+        store = PlanStore()
+        a, b = self.plan_set("a"), self.plan_set("b")
+        store.get(a)
+        store.get(b)
+        
+        os.remove(a[0])
+        entry = store.get(a)
+        self.assertIsNone(entry.plan)
+        self.assertIn("[error] [loading]", entry.errors[0])
+        self.assertEqual(len(store), 1)
+        
+        os.remove(b[0])
+        store.get(self.files)
+        self.assertEqual(len(store), 1)
+    
+    def test_missing_files_not_stored(self):
+        store = PlanStore()
+        for i in range(3):
+            entry = store.get([str(Path(self.temp_dir) / f"missing{i}.yaml")])
+            self.assertIsNone(entry.plan)
+        self.assertEqual(len(store), 0)
+    
+    def test_service_option(self):
+        service = RenderService(self.files, root=self.temp_dir, plan_cache_size=1)
+        self.assertEqual(service.handle("/render/list?file=main.yaml&file=nodes.yaml").status, 200)
+        self.assertEqual(service.handle("/render/list?file=nodes.yaml&file=main.yaml").status, 200)
+        self.assertEqual(len(service.plans), 1)
+
+
+class TestOutputCache(unittest.TestCase):
+    """OutputCache LRU."""
+    
+    def test_least_recently_used_dropped(self):
+        cache = OutputCache(2)
+        cache.put("a", b"1")
+        cache.put("b", b"2")
+        self.assertEqual(cache.get("a"), b"1")
+        cache.put("c", b"3")
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(len(cache), 2)
+    
+    def test_disabled(self):
+        cache = OutputCache(0)
+        cache.put("a", b"1")
+        self.assertIsNone(cache.get("a"))
+
+
+class TestServers(ServeTestCase):
+    """HTTP over TCP and Unix sockets."""
+    
+    def start(self, **kwargs):
+        server = create_server(self.service, quiet=True, threads=4, **kwargs)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        
+        def stop():
+            server.shutdown()
+            server.server_close()
+            thread.join()
+        
+        self.addCleanup(stop)
+        return server
+    
+    def test_concurrent_http_requests(self):
+        server = self.start(port=0)
+        base = f"http://127.0.0.1:{server.server_address[1]}"
+        expected = self.cli_output(cmd_render_tree, "todo")
+        
+        def fetch(_):
+            with urllib.request.urlopen(f"{base}/render/tree?view=todo", timeout=10) as response:
+                return response.status, response.headers["Content-Type"], response.read()
+        
+        with ThreadPoolExecutor(8) as executor:
+            results = list(executor.map(fetch, range(32)))
+        self.assertEqual(set(results), {(200, "text/plain; charset=utf-8", expected)})
+        
+        with self.assertRaises(urllib.error.HTTPError) as raised:
+            urllib.request.urlopen(f"{base}/render/tree?view=missing", timeout=10)
+        self.assertEqual(raised.exception.code, 400)
+    
+    @unittest.skipUnless(hasattr(socket, "AF_UNIX"), "Unix sockets not available")
+    def test_unix_socket(self):
+        path = str(Path(self.temp_dir) / "serve.sock")
+        self.start(socket_path=path)
+        
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.settimeout(10)
+            client.connect(path)
+            client.sendall(b"GET /render/list HTTP/1.0\r\n\r\n")
+            data = b""
+            while chunk := client.recv(65536):
+                data += chunk
+        
+        head, _, body = data.partition(b"\r\n\r\n")
+        self.assertTrue(head.startswith(b"HTTP/1.0 200"))
+        self.assertEqual(body, self.service.handle("/render/list").body)
+    
+    
+    def test_unix_socket_replaces_stale_socket(self):
+        path = str(Path(self.temp_dir) / "serve.sock")
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as stale:
+            stale.bind(path)
+        self.start(socket_path=path)
+        
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.connect(path)
+    
+    def test_unix_socket_keeps_other_files(self):
+        with self.assertRaises(FileExistsError):
+            create_server(self.service, socket_path=self.nodes, quiet=True)
+        self.assertEqual(Path(self.nodes).read_text(encoding="utf-8"), NODES)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,217 @@
+"""
+Tests for the snapshot module (compiled plan snapshots).
+"""
+
+import mmap
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import date
+from pathlib import Path
+from unittest import mock
+
+from specs.v2.tools.effort import compute_effort_metrics
+from specs.v2.tools.loader import load_plan_set
+from specs.v2.tools.models import (
+    Calendar,
+    MergedPlan,
+    Meta,
+    Node,
+    Schedule,
+    ScheduleNode,
+    Status,
+    View,
+    ViewFilter,
+)
+from specs.v2.tools.scheduler import compute_critical_path, compute_schedule
+from specs.v2.tools.snapshot import (
+    MAGIC,
+    SnapshotError,
+    is_snapshot,
+    load_snapshot,
+    save_snapshot,
+)
+
+
+EXAMPLES = Path(__file__).resolve().parents[1] / "en" / "examples"
+
+
+def computed(plan: MergedPlan) -> MergedPlan:
+    """Run the computations `opskarta compile` runs."""
+    compute_effort_metrics(plan)
+    compute_schedule(plan)
+    compute_critical_path(plan)
+    return plan
+
+
+class TestSnapshotRoundTrip(unittest.TestCase):
+    """save_snapshot/load_snapshot return an equal plan."""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, "plan.opsnap")
+    
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def round_trip(self, plan: MergedPlan) -> MergedPlan:
+        save_snapshot(plan, self.path)
+        return load_snapshot(self.path)
+    
+    def test_computed_plan(self):
+        """Nodes, effort metrics, schedule, float and critical path survive."""
+        plan = computed(MergedPlan(
+            meta=Meta(id="p", title="Plan", effort_unit="sp"),
+            statuses={"done": Status(label="Done", color="#00ff00")},
+            nodes={
+                "root": Node(title="Root", kind="summary", effort=10),
+                "a": Node(title="A", parent="root", effort=2.5, status="done"),
+                "b": Node(title="B", parent="root", after=["a"], effort=3, issue="T-1"),
+                "m": Node(title="M", after=["b"], milestone=True, notes="Ship", x={"k": [1]}),
+                "free": Node(title="Free", after=[]),
+            },
+            schedule=Schedule(
+                calendars={"default": Calendar(excludes=["weekends", "2024-03-08"])},
+                default_calendar="default",
+                nodes={
+                    "a": ScheduleNode(start="2024-03-04", duration="3d"),
+                    "b": ScheduleNode(duration="1w"),
+                    "m": ScheduleNode(duration="0d"),
+                    "orphan": ScheduleNode(duration="2d"),
+                },
+            ),
+            views={"v": View(title="V", where=ViewFilter(kind=["summary"]), order_by="start")},
+            x={"team": "core"},
+        ))
+        plan.sources.add("node", "a", "nodes.yaml")
+        plan.sources.add("schedule_node", "a", "schedule.yaml")
+        plan.sources.add("view", "v", "views.yaml")
+        
+        loaded = self.round_trip(plan)
+        
+        self.assertEqual(loaded, plan)
+        self.assertEqual(dict(loaded.sources), dict(plan.sources))
+        self.assertEqual(loaded.schedule.critical_path, plan.schedule.critical_path)
+        self.assertEqual(loaded.schedule.warnings, plan.schedule.warnings)
+        self.assertIsInstance(loaded.nodes["root"].effort, int)
+        self.assertIsInstance(loaded.nodes["a"].effort, float)
+        self.assertEqual(loaded.nodes["free"].after, [])
+        self.assertIsNone(loaded.nodes["root"].after)
+        self.assertEqual(loaded.schedule.columns.dates("b"), plan.schedule.columns.dates("b"))
+    
+    def test_values_outside_columns(self):
+        """Values that do not fit a column (e.g. unquoted dates) are kept."""
+        plan = MergedPlan(
+            nodes={
+                "a": Node(title="A", issue=123, parent="missing", after=["ghost"]),
+                "b": Node(title="Nul\0title", effort=True),
+            },
+            schedule=Schedule(nodes={
+                "a": ScheduleNode(start=date(2024, 3, 4), computed_start="not a date"),
+            }),
+        )
+        
+        loaded = self.round_trip(plan)
+        
+        self.assertEqual(loaded, plan)
+        self.assertEqual(loaded.schedule.nodes["a"].start, date(2024, 3, 4))
+        self.assertIs(loaded.nodes["b"].effort, True)
+    
+    def test_plan_without_schedule(self):
+        """Plans without a schedule keep schedule None."""
+        plan = computed(MergedPlan(nodes={"a": Node(title="A")}))
+        loaded = self.round_trip(plan)
+        self.assertIsNone(loaded.schedule)
+        self.assertEqual(loaded, plan)
+    
+    def test_example_plans(self):
+        """The bundled examples round-trip after full computation."""
+        for example in sorted(EXAMPLES.iterdir()):
+            with self.subTest(example=example.name):
+                files = sorted(str(path) for path in example.glob("*.plan.yaml"))
+                plan = computed(load_plan_set(files))
+                self.assertEqual(self.round_trip(plan), plan)
+
+
+class TestSnapshotErrors(unittest.TestCase):
+    """Tests for snapshot detection and errors."""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = Path(self.temp_dir) / "plan.opsnap"
+    
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def test_is_snapshot(self):
+        """Snapshots are recognized by their name, not their content."""
+        save_snapshot(MergedPlan(), str(self.path))
+        disguised = Path(self.temp_dir) / "plan.yaml"
+        save_snapshot(MergedPlan(), str(disguised))
+        
+        self.assertTrue(is_snapshot(str(self.path)))
+        self.assertFalse(is_snapshot(str(disguised)))
+        self.assertTrue(is_snapshot(str(Path(self.temp_dir) / "missing.opsnap")))
+    
+    def test_rest_with_foreign_global_is_rejected(self):
+        """REST never calls globals other than models and YAML value types."""
+        # Extension data is pickled into REST as-is
+        save_snapshot(MergedPlan(x={"hook": os.system}), str(self.path))
+        with self.assertRaises(SnapshotError) as ctx:
+            load_snapshot(str(self.path))
+        self.assertIn("not allowed", str(ctx.exception))
+    
+    def test_not_a_snapshot(self):
+        """Other files raise SnapshotError."""
+        self.path.write_bytes(b"version: 2\n" * 4)
+        with self.assertRaises(SnapshotError) as ctx:
+            load_snapshot(str(self.path))
+        self.assertEqual(ctx.exception.file_path, str(self.path))
+    
+    def test_unsupported_version(self):
+        """Snapshots of another format version must be recompiled."""
+        save_snapshot(MergedPlan(), str(self.path))
+        data = bytearray(self.path.read_bytes())
+        data[len(MAGIC)] += 1
+        self.path.write_bytes(bytes(data))
+        
+        with self.assertRaises(SnapshotError) as ctx:
+            load_snapshot(str(self.path))
+        self.assertIn("recompile", str(ctx.exception))
+    
+    def test_truncated(self):
+        """Truncated snapshots raise SnapshotError."""
+        save_snapshot(computed(MergedPlan(nodes={"a": Node(title="A")})), str(self.path))
+        self.path.write_bytes(self.path.read_bytes()[:-20])
+        with self.assertRaises(SnapshotError):
+            load_snapshot(str(self.path))
+    
+    def test_recompile_keeps_mapped_snapshot(self):
+        """A snapshot is replaced, not rewritten under a reader's mapping."""
+        save_snapshot(computed(MergedPlan(nodes={"a": Node(title="A")})), str(self.path))
+        before = self.path.read_bytes()
+        with open(self.path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            save_snapshot(computed(MergedPlan(nodes={"b": Node(title="B")})), str(self.path))
+            self.assertEqual(mapped[:], before)
+        self.assertEqual(list(load_snapshot(str(self.path)).nodes), ["b"])
+    
+    def test_failed_write_keeps_previous_snapshot(self):
+        """A failed compile leaves the previous snapshot and no temp file."""
+        save_snapshot(computed(MergedPlan(nodes={"a": Node(title="A")})), str(self.path))
+        before = self.path.read_bytes()
+        with mock.patch("specs.v2.tools.snapshot.os.replace", side_effect=OSError("disk full")):
+            with self.assertRaises(SnapshotError) as ctx:
+                save_snapshot(computed(MergedPlan(nodes={"b": Node(title="B")})), str(self.path))
+        self.assertIn("disk full", str(ctx.exception))
+        self.assertEqual(self.path.read_bytes(), before)
+        self.assertEqual(os.listdir(self.temp_dir), ["plan.opsnap"])
+    
+    def test_non_string_node_id(self):
+        """Node ids must be strings."""
+        with self.assertRaises(SnapshotError):
+            save_snapshot(MergedPlan(nodes={1: Node(title="A")}), str(self.path))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,194 @@
+"""
+Tests for the watch module (incremental re-merge of changed fragments).
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from specs.v2.tools.effort import compute_effort_metrics
+from specs.v2.tools.loader import LoadError, MergeConflictError, load_plan_set
+from specs.v2.tools.models import ViewFilter
+from specs.v2.tools.render.common import apply_view_filter
+from specs.v2.tools.scheduler import compute_schedule
+from specs.v2.tools.watch import PlanWatcher
+
+
+MAIN = """
+version: 2
+meta:
+  id: watched
+  title: Watched plan
+schedule:
+  calendars:
+    default:
+      excludes: [weekends]
+  default_calendar: default
+"""
+
+TEAM_A = """
+nodes:
+  a1:
+    title: A1
+    effort: 3
+  a2:
+    title: A2
+    after: [a1]
+    parent: a1
+schedule:
+  nodes:
+    a1:
+      start: "2024-03-01"
+      duration: 3d
+    a2:
+      duration: 2d
+"""
+
+TEAM_B = """
+nodes:
+  b1:
+    title: B1
+    after: [a2]
+schedule:
+  nodes:
+    b1:
+      duration: 1w
+"""
+
+
+class TestPlanWatcher(unittest.TestCase):
+    """Tests for PlanWatcher."""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.files = []
+        self.mtime = 1_700_000_000 * 10**9
+        for name, content in (("main", MAIN), ("a", TEAM_A), ("b", TEAM_B)):
+            path = str(Path(self.temp_dir) / f"{name}.yaml")
+            self.files.append(path)
+            self.write(path, content)
+        self.watcher = PlanWatcher(self.files)
+        self.assertEqual(self.watcher.update(self.watcher.poll()), self.files)
+        self.watcher.compute()
+    
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def write(self, path: str, content: str) -> None:
+        """Write a file with a distinct modification time."""
+        Path(path).write_text(content, encoding="utf-8")
+        self.mtime += 10**9
+        os.utime(path, ns=(self.mtime, self.mtime))
+    
+    def assert_matches_fresh_load(self):
+        """The watched plan equals a fresh load of the files."""
+        fresh = load_plan_set(self.files)
+        compute_effort_metrics(fresh)
+        compute_schedule(fresh)
+        plan = self.watcher.plan
+        self.assertEqual(plan, fresh)
+        self.assertEqual(list(plan.nodes), list(fresh.nodes))
+        self.assertEqual(list(plan.schedule.nodes), list(fresh.schedule.nodes))
+        self.assertEqual(dict(plan.sources), dict(fresh.sources))
+    
+    def edit(self, index: int, content: str) -> list[str]:
+        """Edit one file and update the watcher."""
+        self.write(self.files[index], content)
+        reparsed = self.watcher.update(self.watcher.poll())
+        self.watcher.compute()
+        return reparsed
+    
+    def test_view_filters_follow_edits(self):
+        """Cached filter masks are dropped when a file is re-merged."""
+        plan = self.watcher.plan
+        todo = ViewFilter(status=["todo"])
+        scheduled = ViewFilter(has_schedule=True)
+        self.assertEqual(apply_view_filter(plan, list(plan.nodes), todo), [])
+        self.assertEqual(apply_view_filter(plan, list(plan.nodes), scheduled), ["a1", "a2", "b1"])
+        
+        self.edit(2, TEAM_B.replace("    after: [a2]", "    after: [a2]\n    status: todo")
+                  .replace("schedule:\n  nodes:\n    b1:\n      duration: 1w\n", ""))
+        
+        self.assertEqual(apply_view_filter(plan, list(plan.nodes), todo), ["b1"])
+        self.assertEqual(apply_view_filter(plan, list(plan.nodes), scheduled), ["a1", "a2"])
+    
+    def test_initial_load(self):
+        """The first update loads all files."""
+        self.assert_matches_fresh_load()
+        self.assertEqual(self.watcher.poll(), [])
+    
+    def test_only_changed_file_is_reparsed(self):
+        """An edit re-merges one file and reschedules downstream nodes."""
+        plan = self.watcher.plan
+        b1 = plan.schedule.nodes["b1"]
+        
+        reparsed = self.edit(1, TEAM_A.replace("duration: 3d", "duration: 5d"))
+        
+        self.assertEqual(reparsed, [self.files[1]])
+        self.assertIs(self.watcher.plan, plan)
+        # Schedule nodes of unchanged files are kept (and rescheduled)
+        self.assertIs(plan.schedule.nodes["b1"], b1)
+        self.assertEqual(plan.schedule.nodes["a1"].computed_finish, "2024-03-07")
+        self.assert_matches_fresh_load()
+    
+    def test_added_removed_and_moved_nodes_keep_merge_order(self):
+        """Node and schedule node order matches a full merge."""
+        self.edit(1, TEAM_A + "  a0:\n    title: A0\n")
+        self.assert_matches_fresh_load()
+        
+        # Move a1 (and its schedule entry) to the last file
+        team_a = (
+            "nodes:\n  a2:\n    title: A2\n    after: [a1]\n"
+            "schedule:\n  nodes:\n    a2:\n      duration: 2d\n"
+        )
+        team_b = TEAM_B.replace(
+            "nodes:\n", "nodes:\n  a1:\n    title: A1\n", 1
+        ).replace(
+            "  nodes:\n", "  nodes:\n    a1:\n      start: \"2024-03-04\"\n      duration: 1d\n", 1
+        )
+        self.write(self.files[1], team_a)
+        self.write(self.files[2], team_b)
+        self.assertEqual(self.watcher.update(self.watcher.poll()), self.files[1:])
+        self.watcher.compute()
+        self.assert_matches_fresh_load()
+        self.assertEqual(list(self.watcher.plan.nodes), ["a2", "a1", "b1"])
+    
+    def test_calendar_change_reschedules_everything(self):
+        """Calendar edits in another fragment trigger a full schedule pass."""
+        self.edit(0, MAIN.replace("excludes: [weekends]", "excludes: []"))
+        self.assertEqual(self.watcher.plan.schedule.nodes["a1"].computed_finish, "2024-03-03")
+        self.assert_matches_fresh_load()
+    
+    def test_merge_conflict_then_recovery(self):
+        """Conflicts raise the error of a full load; fixing them recovers."""
+        with self.assertRaises(MergeConflictError) as ctx:
+            self.edit(2, TEAM_B.replace("nodes:\n", "nodes:\n  a1:\n    title: Dup\n", 1))
+        with self.assertRaises(MergeConflictError) as fresh:
+            load_plan_set(self.files)
+        self.assertEqual(str(ctx.exception), str(fresh.exception))
+        
+        self.assertEqual(self.edit(2, TEAM_B), self.files)
+        self.assert_matches_fresh_load()
+    
+    def test_load_error_then_recovery(self):
+        """Invalid YAML is reported; the next edit reloads the plan set."""
+        with self.assertRaises(LoadError):
+            self.edit(1, "nodes: [")
+        self.assertEqual(self.watcher.update(self.watcher.poll()), [])
+        
+        self.edit(1, TEAM_A)
+        self.assert_matches_fresh_load()
+    
+    def test_invalid_plan_defers_scheduling(self):
+        """Edits made while the plan is invalid are scheduled afterwards."""
+        # Update without compute() (e.g. validation failed), then fix
+        self.write(self.files[1], TEAM_A.replace("duration: 2d", "duration: 4d"))
+        self.watcher.update(self.watcher.poll())
+        self.edit(2, TEAM_B.replace("1w", "2d"))
+        self.assert_matches_fresh_load()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,24 +4,27 @@ opskarta v2 tools package.
 This package provides tools for working with opskarta v2 plan files:
 - models: Data structures (Node, Schedule, View, MergedPlan, etc.)
 - loader: Loading and merging plan fragments
+- cache: On-disk cache of parsed fragments
+- cache_dir: Default location of the fragment cache (no dependencies)
+- index: Shared graph index of a plan's nodes (MergedPlan.index)
 - validator: Validating plan structure and references
+- cycles: Cycle detection in after and parent graphs
 - effort: Computing effort metrics (rollup, effective, gap)
+- cube: Effort totals per subtree and dimension value (status, kind, ...)
 - scheduler: Computing schedule dates
+- scenarios: Batch what-if scheduling over one base plan
+- snapshot: Compiled binary snapshots of computed plans
+- watch: Incremental re-merge of changed fragment files
+- serve: Local render server keeping computed plans in memory
 - render: Rendering plans (gantt, tree, list, deps)
 - cli: Command-line interface
+
+The model classes are re-exported here (e.g. specs.v2.tools.MergedPlan)
+but imported on first access, so importing one tool module does not
+import the others; the CLI imports what each subcommand needs.
 """
 
-from .models import (
-    Calendar,
-    MergedPlan,
-    Meta,
-    Node,
-    Schedule,
-    ScheduleNode,
-    Status,
-    View,
-    ViewFilter,
-)
+import importlib
 
 __all__ = [
     "Calendar",
@@ -30,7 +33,22 @@ __all__ = [
     "Node",
     "Schedule",
     "ScheduleNode",
+    "ScheduleWarning",
+    "SourceIndex",
     "Status",
     "View",
     "ViewFilter",
 ]
+
+
+def __getattr__(name: str):
+    """Import the models re-exported above on first access (PEP 562)."""
+    if name not in __all__:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(".models", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
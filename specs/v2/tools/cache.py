@@ -0,0 +1,236 @@
+"""
+On-disk cache of parsed plan fragments for opskarta v2.
+
+Parsing YAML dominates the cost of loading large plan sets, and the
+same files are usually loaded by many CLI invocations in a row (e.g.
+several render commands in CI). This module stores the parsed,
+top-level-checked fragment data keyed by file content, so unchanged
+files skip yaml.safe_load entirely.
+
+Layout:
+- One pickle file per fragment: <directory>/<key[:2]>/<key>.pickle
+- key = SHA-256 of the cache version (loader and PyYAML versions) + the
+  raw file bytes, so edits, loader changes and PyYAML upgrades never
+  return stale data
+- Entries store the fragment without '_source': identical files at
+  different paths share one entry
+- Entries are written atomically (temp file + rename), so concurrent
+  processes (CLI runs, load_fragments workers) may share a directory
+
+Eviction: entries not used for max_age seconds are removed, then the
+least recently used ones until the directory fits in max_bytes. The
+loader prunes after storing new entries; hits refresh an entry's mtime.
+
+Safety: the default directory is per user ($XDG_CACHE_HOME/opskarta),
+not inside the plan checkout. Entries are read by a restricted
+unpickler that only rebuilds the values yaml.safe_load produces (plain
+containers, dates and times); an entry naming any other global (a
+planted or tampered file) counts as corrupt and is removed.
+"""
+
+import functools
+import hashlib
+import os
+import pickle
+import time
+from pathlib import Path
+from typing import Any, Optional, Union
+
+from specs.v2.tools.cache_dir import default_cache_dir
+
+
+# Bump when the loader's parsing or top-level checks change
+LOADER_VERSION = 1
+
+# Default eviction limits
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_MAX_AGE = 30 * 24 * 60 * 60
+
+_SUFFIX = ".pickle"
+
+# Globals an entry may reference: the non-container types of yaml.safe_load
+_ALLOWED_GLOBALS = frozenset({
+    ("datetime", "date"),
+    ("datetime", "datetime"),
+    ("datetime", "time"),
+    ("datetime", "timedelta"),
+    ("datetime", "timezone"),
+    ("builtins", "set"),
+    ("builtins", "frozenset"),
+})
+
+
+@functools.lru_cache(maxsize=None)
+def cache_version() -> bytes:
+    """
+    Part of every key: loader version and parser version.
+    
+    PyYAML is imported here, on the first key, rather than with this
+    module: commands that never parse YAML (e.g. rendering a snapshot)
+    create a FragmentCache without loading the parser.
+    """
+    import yaml
+    
+    return f"opskarta-fragment-{LOADER_VERSION}/pyyaml-{yaml.__version__}".encode()
+
+
+class _EntryUnpickler(pickle.Unpickler):
+    """Unpickler that refuses every global outside _ALLOWED_GLOBALS."""
+    
+    def find_class(self, module: str, name: str) -> Any:
+        if (module, name) not in _ALLOWED_GLOBALS:
+            raise pickle.UnpicklingError(f"Global '{module}.{name}' is not allowed in a cache entry")
+        return super().find_class(module, name)
+
+
+class FragmentCache:
+    """
+    Content-addressed store of parsed fragment data.
+    
+    Attributes:
+        directory: Cache directory (created on first store)
+        max_bytes: Size limit enforced by prune()
+        max_age: Age limit in seconds enforced by prune()
+        stored: Number of entries written by this instance
+    """
+    
+    def __init__(
+        self,
+        directory: Union[str, Path, None] = None,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        max_age: float = DEFAULT_MAX_AGE,
+    ) -> None:
+        self.directory = Path(directory if directory is not None else default_cache_dir())
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.stored = 0
+    
+    def __repr__(self) -> str:
+        return f"FragmentCache({str(self.directory)!r})"
+    
+    @staticmethod
+    def key(content: bytes) -> str:
+        """
+        Cache key of a file's raw content.
+        
+        Args:
+            content: File bytes, as read from disk
+        
+        Returns:
+            Hex digest
+        """
+        return hashlib.sha256(cache_version() + b"\0" + content).hexdigest()
+    
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / (key + _SUFFIX)
+    
+    def get(self, key: str) -> Optional[dict[str, Any]]:
+        """
+        Look up parsed fragment data.
+        
+        Unreadable or corrupt entries, and entries referencing globals
+        other than the yaml.safe_load value types, count as misses and
+        are removed.
+        
+        Args:
+            key: Key from FragmentCache.key
+        
+        Returns:
+            Fragment data (without '_source'), or None on a miss
+        """
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = _EntryUnpickler(f).load()
+        except FileNotFoundError:
+            return None
+        except Exception:
+            self._remove(path)
+            return None
+        if not isinstance(data, dict):
+            self._remove(path)
+            return None
+        
+        # Mark as recently used for eviction
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return data
+    
+    def put(self, key: str, data: dict[str, Any]) -> bool:
+        """
+        Store parsed fragment data.
+        
+        Failures (read-only or full disk, unpicklable values) are ignored:
+        the cache is an optimization only.
+        
+        Args:
+            key: Key from FragmentCache.key
+            data: Fragment data without '_source'
+        
+        Returns:
+            True if the entry was written
+        """
+        # Imported here: runs that only read the cache do not need it
+        import tempfile
+        
+        path = self._path(key)
+        tmp_name = None
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_name, path)
+            self.stored += 1
+            return True
+        except Exception:
+            if tmp_name is not None:
+                self._remove(Path(tmp_name))
+            return False
+    
+    def prune(self, now: Optional[float] = None) -> int:
+        """
+        Evict entries older than max_age, then least recently used
+        entries until the cache fits in max_bytes.
+        
+        Args:
+            now: Current time (time.time()), for tests
+        
+        Returns:
+            Number of entries removed
+        """
+        if now is None:
+            now = time.time()
+        
+        entries = []
+        for path in self.directory.glob(f"*/*{_SUFFIX}"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+        
+        removed = 0
+        total = sum(size for _, size, _ in entries)
+        for mtime, size, path in entries:
+            if now - mtime <= self.max_age and total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+            removed += 1
+        return removed
+    
+    def clear(self) -> None:
+        """Remove all cache entries."""
+        for path in self.directory.glob(f"*/*{_SUFFIX}"):
+            self._remove(path)
+    
+    @staticmethod
+    def _remove(path: Path) -> None:
+        try:
+            path.unlink()
+        except OSError:
+            pass
@@ -0,0 +1,33 @@
+"""
+Location of the fragment cache for opskarta v2.
+
+Kept apart from cache.py and free of third-party imports, so that the
+CLI can name the default directory in --help, and parse its options,
+without importing the cache, PyYAML or pickle.
+"""
+
+import os
+
+
+# Default cache directory when $XDG_CACHE_HOME is not set (per user)
+DEFAULT_CACHE_DIR = os.path.join("~", ".cache", "opskarta")
+
+# Environment variable overriding the default cache directory
+CACHE_DIR_ENV = "OPSKARTA_CACHE_DIR"
+
+# Per-user cache root (XDG base directories); the cache is its "opskarta"
+XDG_CACHE_ENV = "XDG_CACHE_HOME"
+
+
+def default_cache_dir() -> str:
+    """
+    Cache directory: $OPSKARTA_CACHE_DIR, else $XDG_CACHE_HOME/opskarta,
+    else DEFAULT_CACHE_DIR (~/.cache/opskarta).
+    """
+    override = os.environ.get(CACHE_DIR_ENV)
+    if override:
+        return override
+    xdg = os.environ.get(XDG_CACHE_ENV)
+    if xdg:
+        return os.path.join(xdg, "opskarta")
+    return os.path.expanduser(DEFAULT_CACHE_DIR)
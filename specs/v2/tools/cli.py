@@ -6,18 +6,42 @@ opskarta v2 plan files.
 
 Commands:
 - validate: Validate one or more plan files
-- render: Render plans in various formats (gantt, tree, list, deps)
+- render: Render plans in various formats (gantt, tree, list, deps, critical),
+  every view in every format at once (render all), or effort totals by
+  status, kind, fragment, etc. (render effort-summary)
+- compile: Write a compiled snapshot that render commands accept as FILE
+- watch: Re-render whenever plan files change
+- serve: Serve renders over local HTTP from plans kept in memory
 
 Usage examples:
     # Validate one or more plan files
     python -m specs.v2.tools.cli validate plan.yaml
     python -m specs.v2.tools.cli validate main.yaml nodes.yaml schedule.yaml
-
+    
     # Render with different formats
     python -m specs.v2.tools.cli render gantt plan.yaml
     python -m specs.v2.tools.cli render tree plan.yaml --view backlog
     python -m specs.v2.tools.cli render list plan.yaml --view tasks_only
     python -m specs.v2.tools.cli render deps plan.yaml
+    python -m specs.v2.tools.cli render critical plan.yaml
+    python -m specs.v2.tools.cli render effort-summary plan.yaml --by status --by x.team
+    
+    # Render every view in every format into a directory (one load/compute pass)
+    python -m specs.v2.tools.cli render all main.yaml nodes.yaml --out-dir site/
+    
+    # Compile once, render many views from the snapshot
+    python -m specs.v2.tools.cli compile main.yaml nodes.yaml -o plan.opsnap
+    python -m specs.v2.tools.cli render tree plan.opsnap --view backlog
+    
+    # Keep a rendered view up to date while editing
+    python -m specs.v2.tools.cli watch main.yaml nodes.yaml --render gantt --out plan.md
+    
+    # Serve renders on http://127.0.0.1:8765/render/<format>?view=<view_id>
+    python -m specs.v2.tools.cli serve main.yaml nodes.yaml
+
+Each command imports the modules it needs when it runs, so that e.g.
+validate does not pay for the scheduler, renderers or server (see
+benchmarks/bench_startup.py).
 
 Requirements covered:
 - 5.11: CLI SHALL accept list of files as command line arguments
@@ -25,14 +49,82 @@ Requirements covered:
 """
 
 import argparse
+import os
+import re
 import sys
-from typing import Optional, Sequence
+import time
+from typing import TYPE_CHECKING, Iterable, Iterator, Optional, Sequence
+
+from specs.v2.tools.cache_dir import CACHE_DIR_ENV, DEFAULT_CACHE_DIR
+
+if TYPE_CHECKING:
+    from specs.v2.tools.cache import FragmentCache
+    from specs.v2.tools.models import MergedPlan
 
-from specs.v2.tools.loader import load_plan_set, LoadError, MergeConflictError
-from specs.v2.tools.validator import validate as validate_plan, format_error
-from specs.v2.tools.scheduler import compute_schedule
-from specs.v2.tools.effort import compute_effort_metrics
-from specs.v2.tools.render import render_gantt, render_tree, render_list, render_deps
+
+def add_loading_arguments(parser: argparse.ArgumentParser) -> None:
+    """
+    Add plan loading options (--jobs, --no-cache, --cache-dir) to a subcommand.
+    
+    Args:
+        parser: Subcommand parser
+    """
+    parser.add_argument(
+        "--jobs", "-j",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Parse plan files in N worker processes (0 = one per CPU, default: 1)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always parse plan files; do not read or write the fragment cache",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        metavar="DIR",
+        help=(
+            f"Fragment cache directory (default: ${CACHE_DIR_ENV}, "
+            f"$XDG_CACHE_HOME/opskarta or {DEFAULT_CACHE_DIR})"
+        ),
+    )
+
+
+def fragment_cache_from_args(args: argparse.Namespace) -> Optional["FragmentCache"]:
+    """
+    Create the fragment cache selected by the loading options.
+    
+    Args:
+        args: Parsed arguments of a validate/render command
+    
+    Returns:
+        FragmentCache, or None with --no-cache
+    """
+    if args.no_cache:
+        return None
+    from specs.v2.tools.cache import FragmentCache
+    
+    return FragmentCache(args.cache_dir)
+
+
+# Render formats (render subcommands, watch --render)
+RENDER_FORMATS = ("gantt", "tree", "list", "deps", "critical")
+
+# Output file suffix per format (render all): Mermaid or plain text
+RENDER_SUFFIXES = {
+    "gantt": ".mmd",
+    "tree": ".txt",
+    "list": ".txt",
+    "deps": ".mmd",
+    "critical": ".txt",
+}
+
+# File name stem of the renders without a view (render all)
+UNFILTERED_NAME = "_plan"
+
+# Formats that need a schedule block
+SCHEDULE_FORMATS = ("gantt", "critical")
 
 
 def create_parser() -> argparse.ArgumentParser:
@@ -66,6 +158,31 @@ def create_parser() -> argparse.ArgumentParser:
         metavar="FILE",
         help="YAML plan file(s) to validate",
     )
+    add_loading_arguments(validate_parser)
+    
+    # Compile command
+    compile_parser = subparsers.add_parser(
+        "compile",
+        help="Compile plan files into a snapshot for rendering",
+        description=(
+            "Load, validate and compute plan files (effort, schedule, "
+            "critical path) and write a binary snapshot that render "
+            "commands accept instead of the YAML files."
+        ),
+    )
+    compile_parser.add_argument(
+        "files",
+        nargs="+",
+        metavar="FILE",
+        help="YAML plan file(s) to compile",
+    )
+    compile_parser.add_argument(
+        "--output", "-o",
+        required=True,
+        metavar="SNAPSHOT",
+        help="Snapshot file to write; the name must end with .opsnap",
+    )
+    add_loading_arguments(compile_parser)
     
     # Render command with subcommands
     render_parser = subparsers.add_parser(
@@ -91,8 +208,9 @@ def create_parser() -> argparse.ArgumentParser:
         "files",
         nargs="+",
         metavar="FILE",
-        help="YAML plan file(s) to render",
+        help="YAML plan file(s) or a compiled snapshot to render",
     )
+    add_loading_arguments(gantt_parser)
     gantt_parser.add_argument(
         "--view",
         metavar="VIEW_ID",
@@ -109,8 +227,9 @@ def create_parser() -> argparse.ArgumentParser:
         "files",
         nargs="+",
         metavar="FILE",
-        help="YAML plan file(s) to render",
+        help="YAML plan file(s) or a compiled snapshot to render",
     )
+    add_loading_arguments(tree_parser)
     tree_parser.add_argument(
         "--view",
         metavar="VIEW_ID",
@@ -127,8 +246,9 @@ def create_parser() -> argparse.ArgumentParser:
         "files",
         nargs="+",
         metavar="FILE",
-        help="YAML plan file(s) to render",
+        help="YAML plan file(s) or a compiled snapshot to render",
     )
+    add_loading_arguments(list_parser)
     list_parser.add_argument(
         "--view",
         metavar="VIEW_ID",
@@ -145,18 +265,274 @@ def create_parser() -> argparse.ArgumentParser:
         "files",
         nargs="+",
         metavar="FILE",
-        help="YAML plan file(s) to render",
+        help="YAML plan file(s) or a compiled snapshot to render",
     )
+    add_loading_arguments(deps_parser)
     deps_parser.add_argument(
         "--view",
         metavar="VIEW_ID",
         help="View ID to use for filtering",
     )
     
+    # Critical subcommand
+    critical_parser = render_subparsers.add_parser(
+        "critical",
+        help="Render critical path and float",
+        description="Compute the schedule and report the critical path and node float.",
+    )
+    critical_parser.add_argument(
+        "files",
+        nargs="+",
+        metavar="FILE",
+        help="YAML plan file(s) or a compiled snapshot to render",
+    )
+    add_loading_arguments(critical_parser)
+    critical_parser.add_argument(
+        "--view",
+        metavar="VIEW_ID",
+        help="View ID to use for filtering",
+    )
+    
+    # Effort summary subcommand
+    summary_parser = render_subparsers.add_parser(
+        "effort-summary",
+        help="Render effort totals by status, kind, fragment, etc.",
+        description=(
+            "Compute effort metrics and print one table per dimension: "
+            "effort totals per root node (or per child of --node) and "
+            "dimension value."
+        ),
+    )
+    summary_parser.add_argument(
+        "files",
+        nargs="+",
+        metavar="FILE",
+        help="YAML plan file(s) or a compiled snapshot to render",
+    )
+    add_loading_arguments(summary_parser)
+    summary_parser.add_argument(
+        "--by",
+        dest="dimensions",
+        action="append",
+        metavar="DIMENSION",
+        help=(
+            "Break effort down by DIMENSION: one of status, kind, "
+            "fragment, scheduled, calendar or x.KEY (repeatable; "
+            "default: status, kind, fragment, scheduled)"
+        ),
+    )
+    summary_parser.add_argument(
+        "--node",
+        metavar="NODE_ID",
+        help="Summarize the subtree of NODE_ID (rows are its children)",
+    )
+    
+    # All subcommand
+    all_parser = render_subparsers.add_parser(
+        "all",
+        help="Render every view in every format into a directory",
+        description=(
+            "Load, validate and compute the plan once, then render the "
+            "plan without a view and every view in every applicable "
+            "format (gantt and critical need a schedule) into "
+            "DIR/<view_id>.<format>.<mmd|txt>."
+        ),
+    )
+    all_parser.add_argument(
+        "files",
+        nargs="+",
+        metavar="FILE",
+        help="YAML plan file(s) or a compiled snapshot to render",
+    )
+    all_parser.add_argument(
+        "--out-dir", "-o",
+        required=True,
+        metavar="DIR",
+        help="Directory for the rendered files (created if missing)",
+    )
+    all_parser.add_argument(
+        "--format",
+        dest="formats",
+        action="append",
+        choices=RENDER_FORMATS,
+        metavar="FORMAT",
+        help=f"Only render this format (repeatable; default: all of {', '.join(RENDER_FORMATS)})",
+    )
+    all_parser.add_argument(
+        "--render-jobs",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Render in N worker processes (0 = one per CPU, default: 1)",
+    )
+    add_loading_arguments(all_parser)
+    
+    # Watch command
+    watch_parser = subparsers.add_parser(
+        "watch",
+        help="Re-render plan files whenever they change",
+        description=(
+            "Render plan files, then poll them and re-render after every "
+            "change, re-parsing only the changed files. Stop with Ctrl+C."
+        ),
+    )
+    watch_parser.add_argument(
+        "files",
+        nargs="+",
+        metavar="FILE",
+        help="YAML plan file(s) to watch",
+    )
+    watch_parser.add_argument(
+        "--render",
+        choices=RENDER_FORMATS,
+        default="gantt",
+        help="Render format (default: gantt)",
+    )
+    watch_parser.add_argument(
+        "--view",
+        metavar="VIEW_ID",
+        help="View ID to use for filtering/formatting",
+    )
+    watch_parser.add_argument(
+        "--out", "-o",
+        metavar="OUTPUT",
+        help="Write the rendered output to this file (default: stdout)",
+    )
+    watch_parser.add_argument(
+        "--interval",
+        type=float,
+        default=0.5,
+        metavar="SECONDS",
+        help="Polling interval (default: 0.5)",
+    )
+    add_loading_arguments(watch_parser)
+    
+    # Serve command
+    serve_parser = subparsers.add_parser(
+        "serve",
+        help="Serve renders over HTTP from plans kept in memory",
+        description=(
+            "Keep plan sets loaded and computed in memory and serve "
+            "GET /render/<format>?view=VIEW_ID[&file=PATH...] until "
+            "interrupted with Ctrl+C. Plans are reloaded when their files "
+            "change; rendered output is cached."
+        ),
+    )
+    serve_parser.add_argument(
+        "files",
+        nargs="*",
+        metavar="FILE",
+        help="Plan set served when a request has no file= parameter",
+    )
+    serve_parser.add_argument(
+        "--host",
+        default="127.0.0.1",
+        help="Address to listen on (default: 127.0.0.1)",
+    )
+    serve_parser.add_argument(
+        "--port",
+        type=int,
+        default=8765,
+        help="TCP port to listen on (default: 8765)",
+    )
+    serve_parser.add_argument(
+        "--socket",
+        metavar="PATH",
+        help="Listen on a Unix socket instead of TCP",
+    )
+    serve_parser.add_argument(
+        "--root",
+        metavar="DIR",
+        help="Directory that file= paths are relative to and must be inside (default: current directory)",
+    )
+    serve_parser.add_argument(
+        "--threads",
+        type=int,
+        metavar="N",
+        help="Request threads (default: 8)",
+    )
+    serve_parser.add_argument(
+        "--output-cache",
+        type=int,
+        metavar="N",
+        help="Rendered responses kept in memory (default: 256)",
+    )
+    serve_parser.add_argument(
+        "--plan-cache",
+        type=int,
+        metavar="N",
+        help="Plan sets kept loaded in memory (default: 16)",
+    )
+    add_loading_arguments(serve_parser)
+    
     return parser
 
 
-def cmd_validate(files: list[str]) -> int:
+def print_schedule_warnings(plan: "MergedPlan") -> None:
+    """
+    Print scheduler warnings to stderr.
+    
+    Uses the same layout as validation messages (see format_error):
+        [warning] [scheduling] message
+          path: schedule.nodes.<node_id>
+    
+    Args:
+        plan: MergedPlan after compute_schedule
+    """
+    if plan.schedule is None:
+        return
+    
+    for warning in plan.schedule.warnings:
+        print(
+            f"[warning] [scheduling] {warning.message}\n"
+            f"  path: schedule.nodes.{warning.node_id}",
+            file=sys.stderr,
+        )
+
+
+def compute_schedule_for_sorting(plan: "MergedPlan", view_id: Optional[str]) -> None:
+    """
+    Compute schedule dates when the view sorts by start or finish.
+    
+    Only the ordinal date columns are filled (no ISO strings), which is
+    all sort_nodes needs.
+    
+    Args:
+        plan: Validated MergedPlan
+        view_id: Optional view ID used for rendering
+    """
+    from specs.v2.tools.scheduler import compute_schedule
+    
+    view = plan.views.get(view_id) if view_id else None
+    if view is not None and view.order_by in ("start", "finish"):
+        compute_schedule(plan, materialize=False)
+
+
+def load_compiled_plan(files: list[str]) -> Optional["MergedPlan"]:
+    """
+    Load a compiled snapshot passed as the only FILE (named *.opsnap).
+    
+    Args:
+        files: FILE arguments of a render command
+    
+    Returns:
+        Computed MergedPlan, or None if files are not a single snapshot
+    
+    Raises:
+        SnapshotError: If the snapshot cannot be read
+    """
+    from specs.v2.tools.snapshot import is_snapshot, load_snapshot
+    
+    if len(files) != 1 or not is_snapshot(files[0]):
+        return None
+    return load_snapshot(files[0])
+
+
+def cmd_validate(
+    files: list[str],
+    jobs: Optional[int] = None,
+    cache: Optional["FragmentCache"] = None,
+) -> int:
     """
     Execute the validate command.
     
@@ -165,6 +541,8 @@ def cmd_validate(files: list[str]) -> int:
     
     Args:
         files: List of YAML file paths to validate
+        jobs: Worker processes for parsing files (see load_plan_set)
+        cache: Optional cache of parsed fragments (see load_plan_set)
         
     Returns:
         Exit code: 0 if valid, 1 if errors found
@@ -173,9 +551,12 @@ def cmd_validate(files: list[str]) -> int:
         - 5.11: Accept list of files as arguments
         - 5.12: Pass multiple files to Loader as Plan_Set
     """
+    from specs.v2.tools.loader import LoadError, MergeConflictError, load_plan_set
+    from specs.v2.tools.validator import format_error, validate as validate_plan
+    
     try:
         # Load and merge plan files
-        plan = load_plan_set(files)
+        plan = load_plan_set(files, jobs, cache)
         
         # Validate the merged plan
         result = validate_plan(plan)
@@ -207,22 +588,44 @@ def cmd_validate(files: list[str]) -> int:
         return 1
 
 
-def cmd_render_gantt(files: list[str], view_id: Optional[str]) -> int:
+def cmd_compile(
+    files: list[str],
+    output: str,
+    jobs: Optional[int] = None,
+    cache: Optional["FragmentCache"] = None,
+) -> int:
     """
-    Execute the render gantt command.
+    Execute the compile command.
     
-    Loads plan files, computes schedule, and renders as Mermaid Gantt.
+    Loads and validates plan files, computes effort metrics, schedule
+    and critical path, and writes a compiled snapshot.
     
     Args:
         files: List of YAML file paths
-        view_id: Optional view ID for filtering/formatting
+        output: Snapshot file to write
+        jobs: Worker processes for parsing files (see load_plan_set)
+        cache: Optional cache of parsed fragments (see load_plan_set)
         
     Returns:
         Exit code: 0 on success, 1 on error
     """
+    from specs.v2.tools.effort import compute_effort_metrics
+    from specs.v2.tools.loader import LoadError, MergeConflictError, load_plan_set
+    from specs.v2.tools.scheduler import compute_critical_path, compute_schedule
+    from specs.v2.tools.snapshot import SNAPSHOT_SUFFIX, SnapshotError, is_snapshot, save_snapshot
+    from specs.v2.tools.validator import format_error, validate as validate_plan
+    
+    # Render commands only read FILEs named *.opsnap as snapshots
+    if not is_snapshot(output):
+        print(
+            f"[error] [snapshot] [{output}] Snapshot file name must end with {SNAPSHOT_SUFFIX}",
+            file=sys.stderr,
+        )
+        return 1
+    
     try:
         # Load and merge plan files
-        plan = load_plan_set(files)
+        plan = load_plan_set(files, jobs, cache)
         
         # Validate first
         result = validate_plan(plan)
@@ -231,16 +634,81 @@ def cmd_render_gantt(files: list[str], view_id: Optional[str]) -> int:
                 print(format_error(error), file=sys.stderr)
             return 1
         
-        # Compute effort metrics
+        # Compute everything render commands need
         compute_effort_metrics(plan)
-        
-        # Compute schedule
         compute_schedule(plan)
+        compute_critical_path(plan)
+        print_schedule_warnings(plan)
+        
+        save_snapshot(plan, output)
+        print(f"OK: {output}")
+        
+        return 0
+        
+    except LoadError as e:
+        print(f"[error] [loading] {e}", file=sys.stderr)
+        return 1
+    except MergeConflictError as e:
+        print(f"[error] [merge] {e}", file=sys.stderr)
+        return 1
+    except SnapshotError as e:
+        print(f"[error] [snapshot] {e}", file=sys.stderr)
+        return 1
+
+
+def cmd_render_gantt(
+    files: list[str],
+    view_id: Optional[str],
+    jobs: Optional[int] = None,
+    cache: Optional["FragmentCache"] = None,
+) -> int:
+    """
+    Execute the render gantt command.
+    
+    Loads plan files, computes schedule, and renders as Mermaid Gantt.
+    
+    Args:
+        files: List of YAML file paths
+        view_id: Optional view ID for filtering/formatting
+        jobs: Worker processes for parsing files (see load_plan_set)
+        cache: Optional cache of parsed fragments (see load_plan_set)
+        
+    Returns:
+        Exit code: 0 on success, 1 on error
+    """
+    from specs.v2.tools.effort import compute_effort_metrics
+    from specs.v2.tools.loader import LoadError, MergeConflictError, load_plan_set
+    from specs.v2.tools.render.common import write_lines
+    from specs.v2.tools.render.gantt import iter_gantt
+    from specs.v2.tools.scheduler import compute_schedule
+    from specs.v2.tools.snapshot import SnapshotError
+    from specs.v2.tools.validator import format_error, validate as validate_plan
+    
+    try:
+        # A compiled snapshot is already validated and computed
+        plan = load_compiled_plan(files)
+        if plan is None:
+            # Load and merge plan files
+            plan = load_plan_set(files, jobs, cache)
+            
+            # Validate first
+            result = validate_plan(plan)
+            if not result.is_valid:
+                for error in result.errors:
+                    print(format_error(error), file=sys.stderr)
+                return 1
+            
+            # Compute effort metrics
+            compute_effort_metrics(plan)
+            
+            # Compute schedule
+            compute_schedule(plan)
+        
+        print_schedule_warnings(plan)
         
         # Render gantt (view_id is required for gantt)
         # If no view_id provided, use empty string to render all scheduled nodes
-        output = render_gantt(plan, view_id or "")
-        print(output)
+        write_lines(iter_gantt(plan, view_id or ""), sys.stdout)
         
         return 0
         
@@ -250,12 +718,20 @@ def cmd_render_gantt(files: list[str], view_id: Optional[str]) -> int:
     except MergeConflictError as e:
         print(f"[error] [merge] {e}", file=sys.stderr)
         return 1
+    except SnapshotError as e:
+        print(f"[error] [snapshot] {e}", file=sys.stderr)
+        return 1
     except ValueError as e:
         print(f"[error] [render] {e}", file=sys.stderr)
         return 1
 
 
-def cmd_render_tree(files: list[str], view_id: Optional[str]) -> int:
+def cmd_render_tree(
+    files: list[str],
+    view_id: Optional[str],
+    jobs: Optional[int] = None,
+    cache: Optional["FragmentCache"] = None,
+) -> int:
     """
     Execute the render tree command.
     
@@ -264,27 +740,39 @@ def cmd_render_tree(files: list[str], view_id: Optional[str]) -> int:
     Args:
         files: List of YAML file paths
         view_id: Optional view ID for filtering/sorting
+        jobs: Worker processes for parsing files (see load_plan_set)
+        cache: Optional cache of parsed fragments (see load_plan_set)
         
     Returns:
         Exit code: 0 on success, 1 on error
     """
+    from specs.v2.tools.effort import compute_effort_metrics
+    from specs.v2.tools.loader import LoadError, MergeConflictError, load_plan_set
+    from specs.v2.tools.render.common import write_lines
+    from specs.v2.tools.render.tree import iter_tree
+    from specs.v2.tools.snapshot import SnapshotError
+    from specs.v2.tools.validator import format_error, validate as validate_plan
+    
     try:
-        # Load and merge plan files
-        plan = load_plan_set(files)
-        
-        # Validate first
-        result = validate_plan(plan)
-        if not result.is_valid:
-            for error in result.errors:
-                print(format_error(error), file=sys.stderr)
-            return 1
-        
-        # Compute effort metrics
-        compute_effort_metrics(plan)
+        # A compiled snapshot is already validated and computed
+        plan = load_compiled_plan(files)
+        if plan is None:
+            # Load and merge plan files
+            plan = load_plan_set(files, jobs, cache)
+            
+            # Validate first
+            result = validate_plan(plan)
+            if not result.is_valid:
+                for error in result.errors:
+                    print(format_error(error), file=sys.stderr)
+                return 1
+            
+            # Compute effort metrics
+            compute_effort_metrics(plan)
+            compute_schedule_for_sorting(plan, view_id)
         
         # Render tree
-        output = render_tree(plan, view_id)
-        print(output)
+        write_lines(iter_tree(plan, view_id), sys.stdout)
         
         return 0
         
@@ -294,12 +782,20 @@ def cmd_render_tree(files: list[str], view_id: Optional[str]) -> int:
     except MergeConflictError as e:
         print(f"[error] [merge] {e}", file=sys.stderr)
         return 1
+    except SnapshotError as e:
+        print(f"[error] [snapshot] {e}", file=sys.stderr)
+        return 1
     except ValueError as e:
         print(f"[error] [render] {e}", file=sys.stderr)
         return 1
 
 
-def cmd_render_list(files: list[str], view_id: Optional[str]) -> int:
+def cmd_render_list(
+    files: list[str],
+    view_id: Optional[str],
+    jobs: Optional[int] = None,
+    cache: Optional["FragmentCache"] = None,
+) -> int:
     """
     Execute the render list command.
     
@@ -308,27 +804,39 @@ def cmd_render_list(files: list[str], view_id: Optional[str]) -> int:
     Args:
         files: List of YAML file paths
         view_id: Optional view ID for filtering/sorting
+        jobs: Worker processes for parsing files (see load_plan_set)
+        cache: Optional cache of parsed fragments (see load_plan_set)
         
     Returns:
         Exit code: 0 on success, 1 on error
     """
+    from specs.v2.tools.effort import compute_effort_metrics
+    from specs.v2.tools.loader import LoadError, MergeConflictError, load_plan_set
+    from specs.v2.tools.render.common import write_lines
+    from specs.v2.tools.render.list import iter_list
+    from specs.v2.tools.snapshot import SnapshotError
+    from specs.v2.tools.validator import format_error, validate as validate_plan
+    
     try:
-        # Load and merge plan files
-        plan = load_plan_set(files)
-        
-        # Validate first
-        result = validate_plan(plan)
-        if not result.is_valid:
-            for error in result.errors:
-                print(format_error(error), file=sys.stderr)
-            return 1
-        
-        # Compute effort metrics
-        compute_effort_metrics(plan)
+        # A compiled snapshot is already validated and computed
+        plan = load_compiled_plan(files)
+        if plan is None:
+            # Load and merge plan files
+            plan = load_plan_set(files, jobs, cache)
+            
+            # Validate first
+            result = validate_plan(plan)
+            if not result.is_valid:
+                for error in result.errors:
+                    print(format_error(error), file=sys.stderr)
+                return 1
+            
+            # Compute effort metrics
+            compute_effort_metrics(plan)
+            compute_schedule_for_sorting(plan, view_id)
         
         # Render list
-        output = render_list(plan, view_id)
-        print(output)
+        write_lines(iter_list(plan, view_id), sys.stdout)
         
         return 0
         
@@ -338,12 +846,20 @@ def cmd_render_list(files: list[str], view_id: Optional[str]) -> int:
     except MergeConflictError as e:
         print(f"[error] [merge] {e}", file=sys.stderr)
         return 1
+    except SnapshotError as e:
+        print(f"[error] [snapshot] {e}", file=sys.stderr)
+        return 1
     except ValueError as e:
         print(f"[error] [render] {e}", file=sys.stderr)
         return 1
 
 
-def cmd_render_deps(files: list[str], view_id: Optional[str]) -> int:
+def cmd_render_deps(
+    files: list[str],
+    view_id: Optional[str],
+    jobs: Optional[int] = None,
+    cache: Optional["FragmentCache"] = None,
+) -> int:
     """
     Execute the render deps command.
     
@@ -352,27 +868,109 @@ def cmd_render_deps(files: list[str], view_id: Optional[str]) -> int:
     Args:
         files: List of YAML file paths
         view_id: Optional view ID for filtering
+        jobs: Worker processes for parsing files (see load_plan_set)
+        cache: Optional cache of parsed fragments (see load_plan_set)
         
     Returns:
         Exit code: 0 on success, 1 on error
     """
+    from specs.v2.tools.effort import compute_effort_metrics
+    from specs.v2.tools.loader import LoadError, MergeConflictError, load_plan_set
+    from specs.v2.tools.render.common import write_lines
+    from specs.v2.tools.render.deps import iter_deps
+    from specs.v2.tools.snapshot import SnapshotError
+    from specs.v2.tools.validator import format_error, validate as validate_plan
+    
     try:
-        # Load and merge plan files
-        plan = load_plan_set(files)
+        # A compiled snapshot is already validated and computed
+        plan = load_compiled_plan(files)
+        if plan is None:
+            # Load and merge plan files
+            plan = load_plan_set(files, jobs, cache)
+            
+            # Validate first
+            result = validate_plan(plan)
+            if not result.is_valid:
+                for error in result.errors:
+                    print(format_error(error), file=sys.stderr)
+                return 1
+            
+            # Compute effort metrics
+            compute_effort_metrics(plan)
         
-        # Validate first
-        result = validate_plan(plan)
-        if not result.is_valid:
-            for error in result.errors:
-                print(format_error(error), file=sys.stderr)
-            return 1
+        # Render deps
+        write_lines(iter_deps(plan, view_id), sys.stdout)
         
-        # Compute effort metrics
-        compute_effort_metrics(plan)
+        return 0
         
-        # Render deps
-        output = render_deps(plan, view_id)
-        print(output)
+    except LoadError as e:
+        print(f"[error] [loading] {e}", file=sys.stderr)
+        return 1
+    except MergeConflictError as e:
+        print(f"[error] [merge] {e}", file=sys.stderr)
+        return 1
+    except SnapshotError as e:
+        print(f"[error] [snapshot] {e}", file=sys.stderr)
+        return 1
+    except ValueError as e:
+        print(f"[error] [render] {e}", file=sys.stderr)
+        return 1
+
+
+def cmd_render_critical(
+    files: list[str],
+    view_id: Optional[str],
+    jobs: Optional[int] = None,
+    cache: Optional["FragmentCache"] = None,
+) -> int:
+    """
+    Execute the render critical command.
+    
+    Loads plan files, computes schedule and critical path, and renders
+    the critical path report.
+    
+    Args:
+        files: List of YAML file paths
+        view_id: Optional view ID for filtering
+        jobs: Worker processes for parsing files (see load_plan_set)
+        cache: Optional cache of parsed fragments (see load_plan_set)
+        
+    Returns:
+        Exit code: 0 on success, 1 on error
+    """
+    from specs.v2.tools.effort import compute_effort_metrics
+    from specs.v2.tools.loader import LoadError, MergeConflictError, load_plan_set
+    from specs.v2.tools.render.common import write_lines
+    from specs.v2.tools.render.critical import iter_critical
+    from specs.v2.tools.scheduler import compute_critical_path, compute_schedule
+    from specs.v2.tools.snapshot import SnapshotError
+    from specs.v2.tools.validator import format_error, validate as validate_plan
+    
+    try:
+        # A compiled snapshot is already validated and computed
+        plan = load_compiled_plan(files)
+        if plan is None:
+            # Load and merge plan files
+            plan = load_plan_set(files, jobs, cache)
+            
+            # Validate first
+            result = validate_plan(plan)
+            if not result.is_valid:
+                for error in result.errors:
+                    print(format_error(error), file=sys.stderr)
+                return 1
+            
+            # Compute effort metrics
+            compute_effort_metrics(plan)
+            
+            # Compute schedule, then the backward pass
+            compute_schedule(plan)
+            compute_critical_path(plan)
+        
+        print_schedule_warnings(plan)
+        
+        # Render critical path
+        write_lines(iter_critical(plan, view_id), sys.stdout)
         
         return 0
         
@@ -382,11 +980,476 @@ def cmd_render_deps(files: list[str], view_id: Optional[str]) -> int:
     except MergeConflictError as e:
         print(f"[error] [merge] {e}", file=sys.stderr)
         return 1
+    except SnapshotError as e:
+        print(f"[error] [snapshot] {e}", file=sys.stderr)
+        return 1
     except ValueError as e:
         print(f"[error] [render] {e}", file=sys.stderr)
         return 1
 
 
+def cmd_render_effort_summary(
+    files: list[str],
+    dimensions: Optional[list[str]],
+    node_id: Optional[str],
+    jobs: Optional[int] = None,
+    cache: Optional["FragmentCache"] = None,
+) -> int:
+    """
+    Execute the render effort-summary command.
+    
+    Loads plan files, computes effort metrics and renders effort totals
+    per dimension value.
+    
+    Args:
+        files: List of YAML file paths
+        dimensions: Dimension names (None for cube.DEFAULT_DIMENSIONS)
+        node_id: Optional node whose subtree is summarized
+        jobs: Worker processes for parsing files (see load_plan_set)
+        cache: Optional cache of parsed fragments (see load_plan_set)
+        
+    Returns:
+        Exit code: 0 on success, 1 on error
+    """
+    from specs.v2.tools.effort import compute_effort_metrics
+    from specs.v2.tools.loader import LoadError, MergeConflictError, load_plan_set
+    from specs.v2.tools.render.common import write_lines
+    from specs.v2.tools.render.summary import iter_effort_summary
+    from specs.v2.tools.snapshot import SnapshotError
+    from specs.v2.tools.validator import format_error, validate as validate_plan
+    
+    try:
+        # A compiled snapshot is already validated and computed
+        plan = load_compiled_plan(files)
+        if plan is None:
+            # Load and merge plan files
+            plan = load_plan_set(files, jobs, cache)
+            
+            # Validate first
+            result = validate_plan(plan)
+            if not result.is_valid:
+                for error in result.errors:
+                    print(format_error(error), file=sys.stderr)
+                return 1
+            
+            # Compute effort metrics
+            compute_effort_metrics(plan)
+        
+        # Render effort summary
+        write_lines(iter_effort_summary(plan, dimensions, node_id), sys.stdout)
+        
+        return 0
+        
+    except LoadError as e:
+        print(f"[error] [loading] {e}", file=sys.stderr)
+        return 1
+    except MergeConflictError as e:
+        print(f"[error] [merge] {e}", file=sys.stderr)
+        return 1
+    except SnapshotError as e:
+        print(f"[error] [snapshot] {e}", file=sys.stderr)
+        return 1
+    except ValueError as e:
+        print(f"[error] [render] {e}", file=sys.stderr)
+        return 1
+
+
+def render_plan_lines(
+    plan: "MergedPlan",
+    render_format: str,
+    view_id: Optional[str],
+    critical_path_computed: bool = False,
+) -> Iterator[str]:
+    """
+    Render a validated, computed plan in one of RENDER_FORMATS.
+    
+    Args:
+        plan: MergedPlan after compute_effort_metrics and compute_schedule
+        render_format: One of RENDER_FORMATS
+        view_id: Optional view ID for filtering/formatting
+        critical_path_computed: compute_critical_path was already called
+    
+    Returns:
+        Iterator over the output lines
+    
+    Raises:
+        ValueError: If view_id is provided but view doesn't exist
+    """
+    from specs.v2.tools.render.critical import iter_critical
+    from specs.v2.tools.render.deps import iter_deps
+    from specs.v2.tools.render.gantt import iter_gantt
+    from specs.v2.tools.render.list import iter_list
+    from specs.v2.tools.render.tree import iter_tree
+    from specs.v2.tools.scheduler import compute_critical_path
+    
+    if render_format == "gantt":
+        return iter_gantt(plan, view_id or "")
+    if render_format == "critical":
+        if not critical_path_computed:
+            compute_critical_path(plan)
+        return iter_critical(plan, view_id)
+    renderers = {"tree": iter_tree, "list": iter_list, "deps": iter_deps}
+    return renderers[render_format](plan, view_id)
+
+
+def write_output(lines: Iterable[str], out_path: Optional[str]) -> None:
+    """
+    Print rendered lines, or replace out_path with them atomically.
+    
+    Lines are streamed (see write_lines), so the whole output is never
+    held in memory.
+    
+    Args:
+        lines: Rendered lines (e.g. from render_plan_lines)
+        out_path: Output file, or None for stdout
+    """
+    import tempfile
+    
+    from specs.v2.tools.render.common import write_lines
+    
+    if out_path is None:
+        write_lines(lines, sys.stdout)
+        sys.stdout.flush()
+        return
+    
+    directory = os.path.dirname(os.path.abspath(out_path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            write_lines(lines, f)
+        os.replace(tmp_path, out_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def render_file_name(view_id: Optional[str], render_format: str) -> str:
+    """
+    File name of one render of the render all command.
+    
+    Args:
+        view_id: View ID, or None for the render without a view
+        render_format: One of RENDER_FORMATS
+    
+    Returns:
+        "<view_id>.<format><suffix>", with characters that are unsafe in
+        file names replaced by "_"
+    """
+    stem = UNFILTERED_NAME if view_id is None else re.sub(r"[^\w.-]", "_", view_id)
+    return f"{stem}.{render_format}{RENDER_SUFFIXES[render_format]}"
+
+
+# Plan shared by the render all worker processes (set by _init_render_worker)
+_worker_plan: Optional["MergedPlan"] = None
+
+
+def _init_render_worker(plan: "MergedPlan") -> None:
+    """Process pool initializer: receive the computed plan once per worker."""
+    global _worker_plan
+    _worker_plan = plan
+
+
+def _render_job(
+    plan: Optional["MergedPlan"],
+    render_format: str,
+    view_id: Optional[str],
+    out_path: str,
+) -> Optional[str]:
+    """
+    Render one view in one format into a file.
+    
+    Args:
+        plan: Computed MergedPlan (None in workers: use the shared plan)
+        render_format: One of RENDER_FORMATS
+        view_id: View ID, or None for the render without a view
+        out_path: File to write
+    
+    Returns:
+        Error message, or None on success
+    """
+    if plan is None:
+        plan = _worker_plan
+    try:
+        lines = render_plan_lines(plan, render_format, view_id, critical_path_computed=True)
+        write_output(lines, out_path)
+    except (ValueError, OSError) as e:
+        return str(e)
+    return None
+
+
+def cmd_render_all(
+    files: list[str],
+    out_dir: str,
+    formats: Optional[list[str]] = None,
+    render_jobs: Optional[int] = 1,
+    jobs: Optional[int] = None,
+    cache: Optional["FragmentCache"] = None,
+) -> int:
+    """
+    Execute the render all command.
+    
+    Loads, validates and computes the plan once (effort metrics,
+    schedule, critical path), then renders the plan without a view and
+    every view in every applicable format into out_dir. gantt and
+    critical are skipped for plans without a schedule block.
+    
+    Args:
+        files: List of YAML file paths, or a single compiled snapshot
+        out_dir: Output directory (created if missing)
+        formats: Formats to render (default: RENDER_FORMATS)
+        render_jobs: Worker processes for rendering (0 or None = one
+                     per CPU, 1 = render in this process)
+        jobs: Worker processes for parsing files (see load_plan_set)
+        cache: Optional cache of parsed fragments (see load_plan_set)
+        
+    Returns:
+        Exit code: 0 if every render was written, 1 otherwise
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    
+    from specs.v2.tools.effort import compute_effort_metrics
+    from specs.v2.tools.loader import LoadError, MergeConflictError, load_plan_set
+    from specs.v2.tools.scheduler import compute_critical_path, compute_schedule
+    from specs.v2.tools.snapshot import SnapshotError
+    from specs.v2.tools.validator import format_error, validate as validate_plan
+    
+    try:
+        # A compiled snapshot is already validated and computed
+        plan = load_compiled_plan(files)
+        if plan is None:
+            # Load and merge plan files
+            plan = load_plan_set(files, jobs, cache)
+            
+            # Validate first
+            result = validate_plan(plan)
+            if not result.is_valid:
+                for error in result.errors:
+                    print(format_error(error), file=sys.stderr)
+                return 1
+            
+            # Compute everything the renderers need, once
+            compute_effort_metrics(plan)
+            compute_schedule(plan)
+            compute_critical_path(plan)
+        
+        print_schedule_warnings(plan)
+        
+    except LoadError as e:
+        print(f"[error] [loading] {e}", file=sys.stderr)
+        return 1
+    except MergeConflictError as e:
+        print(f"[error] [merge] {e}", file=sys.stderr)
+        return 1
+    except SnapshotError as e:
+        print(f"[error] [snapshot] {e}", file=sys.stderr)
+        return 1
+    except ValueError as e:
+        print(f"[error] [render] {e}", file=sys.stderr)
+        return 1
+    
+    selected = [f for f in RENDER_FORMATS if formats is None or f in formats]
+    if plan.schedule is None:
+        selected = [f for f in selected if f not in SCHEDULE_FORMATS]
+    
+    os.makedirs(out_dir, exist_ok=True)
+    tasks = [
+        (render_format, view_id, os.path.join(out_dir, render_file_name(view_id, render_format)))
+        for view_id in [None, *plan.views]
+        for render_format in selected
+    ]
+    
+    workers = render_jobs if render_jobs else (os.cpu_count() or 1)
+    workers = min(workers, len(tasks))
+    if workers > 1:
+        # Workers receive the computed plan once and write their own files
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_render_worker,
+            initargs=(plan,),
+        ) as executor:
+            errors = list(executor.map(
+                _render_job,
+                [None] * len(tasks),
+                *zip(*tasks),
+                chunksize=max(1, len(tasks) // (workers * 4)),
+            ))
+    else:
+        errors = [_render_job(plan, *task) for task in tasks]
+    
+    failed = 0
+    for (render_format, view_id, out_path), error in zip(tasks, errors):
+        if error is not None:
+            failed += 1
+            print(f"[error] [render] {out_path}: {error}", file=sys.stderr)
+    
+    if failed:
+        return 1
+    print(f"OK: {len(tasks)} files in {out_dir}")
+    return 0
+
+
+def cmd_watch(
+    files: list[str],
+    render_format: str,
+    view_id: Optional[str],
+    out_path: Optional[str],
+    interval: float = 0.5,
+    jobs: Optional[int] = None,
+    cache: Optional["FragmentCache"] = None,
+    polls: Optional[int] = None,
+) -> int:
+    """
+    Execute the watch command.
+    
+    Renders the plan, then polls the files and re-renders after each
+    change. Only changed files are re-parsed and re-merged, and the
+    schedule is updated incrementally (see watch.PlanWatcher). Errors
+    are reported and watching continues.
+    
+    Args:
+        files: List of YAML file paths
+        render_format: One of RENDER_FORMATS
+        view_id: Optional view ID for filtering/formatting
+        out_path: Output file, or None for stdout
+        interval: Seconds between polls
+        jobs: Worker processes for the initial load (see load_plan_set)
+        cache: Optional cache of parsed fragments (see load_plan_set)
+        polls: Stop after this many polls (None: until interrupted)
+        
+    Returns:
+        Exit code: 0 if the last render succeeded (or on Ctrl+C), 1 otherwise
+    """
+    from specs.v2.tools.loader import LoadError, MergeConflictError
+    from specs.v2.tools.validator import format_error, validate as validate_plan
+    from specs.v2.tools.watch import PlanWatcher
+    
+    watcher = PlanWatcher(files, jobs, cache)
+    status = 0
+    count = 0
+    try:
+        while polls is None or count < polls:
+            if count:
+                time.sleep(interval)
+            count += 1
+            
+            changed = watcher.poll()
+            if not changed:
+                continue
+            
+            started = time.perf_counter()
+            status = 1
+            try:
+                reparsed = watcher.update(changed)
+                
+                result = validate_plan(watcher.plan)
+                if not result.is_valid:
+                    for error in result.errors:
+                        print(format_error(error), file=sys.stderr)
+                    continue
+                
+                watcher.compute()
+                print_schedule_warnings(watcher.plan)
+                write_output(
+                    render_plan_lines(watcher.plan, render_format, view_id),
+                    out_path,
+                )
+                status = 0
+            except LoadError as e:
+                print(f"[error] [loading] {e}", file=sys.stderr)
+                continue
+            except MergeConflictError as e:
+                print(f"[error] [merge] {e}", file=sys.stderr)
+                continue
+            except ValueError as e:
+                print(f"[error] [render] {e}", file=sys.stderr)
+                continue
+            
+            print(
+                f"[watch] rendered {render_format} in "
+                f"{time.perf_counter() - started:.2f} s "
+                f"({len(reparsed)} of {len(files)} files parsed)",
+                file=sys.stderr,
+            )
+    except KeyboardInterrupt:
+        return 0
+    
+    return status
+
+
+def cmd_serve(
+    files: list[str],
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    socket_path: Optional[str] = None,
+    root: Optional[str] = None,
+    threads: Optional[int] = None,
+    output_cache_size: Optional[int] = None,
+    jobs: Optional[int] = None,
+    cache: Optional["FragmentCache"] = None,
+    plan_cache_size: Optional[int] = None,
+) -> int:
+    """
+    Execute the serve command.
+    
+    Serves renders until interrupted (see serve.RenderService). The
+    default plan set is loaded before listening, and its errors are
+    reported without stopping the server.
+    
+    Args:
+        files: Default plan set (may be empty)
+        host: TCP address to listen on
+        port: TCP port to listen on
+        socket_path: Unix socket to listen on instead of TCP
+        root: Directory for file= paths (default: current directory)
+        threads: Request threads (None for serve.DEFAULT_THREADS)
+        output_cache_size: Rendered responses kept in memory
+                           (None for serve.DEFAULT_OUTPUT_CACHE_SIZE)
+        jobs: Worker processes for parsing files (see load_plan_set)
+        cache: Optional cache of parsed fragments (see load_plan_set)
+        plan_cache_size: Plan sets kept loaded in memory
+                         (None for serve.DEFAULT_PLAN_CACHE_SIZE)
+        
+    Returns:
+        Exit code: 0 when interrupted, 1 if the server cannot start
+    """
+    from specs.v2.tools.serve import (
+        DEFAULT_OUTPUT_CACHE_SIZE,
+        DEFAULT_PLAN_CACHE_SIZE,
+        DEFAULT_THREADS,
+        RenderService,
+        create_server,
+    )
+    
+    if threads is None:
+        threads = DEFAULT_THREADS
+    if output_cache_size is None:
+        output_cache_size = DEFAULT_OUTPUT_CACHE_SIZE
+    if plan_cache_size is None:
+        plan_cache_size = DEFAULT_PLAN_CACHE_SIZE
+    service = RenderService(files, root, jobs, cache, output_cache_size, plan_cache_size)
+    if files:
+        for error in service.plans.get(files).errors:
+            print(error, file=sys.stderr)
+    
+    try:
+        server = create_server(service, host, port, socket_path, threads)
+    except (OSError, ValueError) as e:
+        print(f"[error] [serve] {e}", file=sys.stderr)
+        return 1
+    
+    address = socket_path if socket_path is not None else f"http://{host}:{server.server_address[1]}"
+    print(f"[serve] listening on {address}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if socket_path is not None and os.path.exists(socket_path):
+            os.unlink(socket_path)
+    return 0
+
+
 def main(argv: Optional[Sequence[str]] = None) -> int:
     """
     Main entry point for the CLI.
@@ -399,19 +1462,47 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
     """
     parser = create_parser()
     args = parser.parse_args(argv)
+    cache = fragment_cache_from_args(args)
     
     if args.command == "validate":
-        return cmd_validate(args.files)
+        return cmd_validate(args.files, args.jobs, cache)
+    
+    elif args.command == "compile":
+        return cmd_compile(args.files, args.output, args.jobs, cache)
+    
+    elif args.command == "watch":
+        return cmd_watch(
+            args.files, args.render, args.view, args.out,
+            args.interval, args.jobs, cache,
+        )
+    
+    elif args.command == "serve":
+        return cmd_serve(
+            args.files, args.host, args.port, args.socket, args.root,
+            args.threads, args.output_cache, args.jobs, cache,
+            args.plan_cache,
+        )
     
     elif args.command == "render":
         if args.format == "gantt":
-            return cmd_render_gantt(args.files, args.view)
+            return cmd_render_gantt(args.files, args.view, args.jobs, cache)
         elif args.format == "tree":
-            return cmd_render_tree(args.files, args.view)
+            return cmd_render_tree(args.files, args.view, args.jobs, cache)
         elif args.format == "list":
-            return cmd_render_list(args.files, args.view)
+            return cmd_render_list(args.files, args.view, args.jobs, cache)
         elif args.format == "deps":
-            return cmd_render_deps(args.files, args.view)
+            return cmd_render_deps(args.files, args.view, args.jobs, cache)
+        elif args.format == "critical":
+            return cmd_render_critical(args.files, args.view, args.jobs, cache)
+        elif args.format == "effort-summary":
+            return cmd_render_effort_summary(
+                args.files, args.dimensions, args.node, args.jobs, cache,
+            )
+        elif args.format == "all":
+            return cmd_render_all(
+                args.files, args.out_dir, args.formats,
+                args.render_jobs, args.jobs, cache,
+            )
     
     # Should not reach here due to required subparsers
     return 1
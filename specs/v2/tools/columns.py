@@ -0,0 +1,243 @@
+"""
+Columnar schedule results for opskarta v2 plans.
+
+This module stores computed dates as day-ordinal columns instead of ISO
+strings on each ScheduleNode, so consumers (sorting, range queries,
+exports) do not have to re-parse dates.
+
+Layout:
+- node_ids: scheduled node IDs in schedule.nodes order (fixed positions)
+- start, finish: day ordinals (date.toordinal()) per position;
+  UNSCHEDULED (0) marks nodes without computed dates
+- Columns are array('i'); with use_numpy=True (and NumPy installed)
+  they are NumPy int32 arrays and bounds/in_range/order_by are
+  vectorized. NumPy is imported by the first such constructor, so
+  compute_schedule (which uses array columns) never imports it
+
+The ISO string fields (computed_start, computed_finish) are written by
+materialize(), which compute_schedule calls unless materialize=False.
+"""
+
+from array import array
+from datetime import date
+from typing import Any, Optional, Union
+
+from specs.v2.tools.models import Schedule
+
+# Placeholder of _np until _numpy() has tried to import NumPy
+_NOT_IMPORTED = object()
+
+# NumPy module, None if it is not installed (set by _numpy)
+_np: Any = _NOT_IMPORTED
+
+
+# Ordinal stored for nodes without computed dates (date.toordinal() >= 1)
+UNSCHEDULED = 0
+
+
+def _numpy() -> Any:
+    """Import NumPy on first use; None if it is not installed."""
+    global _np
+    if _np is _NOT_IMPORTED:
+        try:
+            import numpy
+        except ImportError:  # pragma: no cover - depends on environment
+            numpy = None
+        _np = numpy
+    return _np
+
+
+def _zeros(size: int, np: Any = None):
+    """Allocate an int column of the given size filled with UNSCHEDULED."""
+    if np is not None:
+        return np.zeros(size, dtype=np.int32)
+    return array("i", bytes(4 * size))
+
+
+def _ordinal(d: Optional[date]) -> int:
+    """Convert an optional date to a column value."""
+    return d.toordinal() if d is not None else UNSCHEDULED
+
+
+def _date(ordinal: int) -> Optional[date]:
+    """Convert a column value back to an optional date."""
+    return date.fromordinal(int(ordinal)) if ordinal != UNSCHEDULED else None
+
+
+class ScheduleColumns:
+    """
+    Computed start/finish dates of scheduled nodes as ordinal columns.
+    
+    Attributes:
+        node_ids: Scheduled node IDs, in schedule.nodes order
+        index: node_id -> position in the columns
+        start: Start ordinal per position (UNSCHEDULED if none)
+        finish: Finish ordinal per position (UNSCHEDULED if none)
+    """
+    
+    def __init__(
+        self,
+        node_ids: Union[list[str], tuple[str, ...]],
+        use_numpy: bool = False,
+    ) -> None:
+        self.node_ids: tuple[str, ...] = tuple(node_ids)
+        self.index: dict[str, int] = {
+            node_id: i for i, node_id in enumerate(self.node_ids)
+        }
+        np = _numpy() if use_numpy else None
+        self.start = _zeros(len(self.node_ids), np)
+        self.finish = _zeros(len(self.node_ids), np)
+    
+    @classmethod
+    def from_dates(
+        cls,
+        node_ids: Union[list[str], tuple[str, ...]],
+        dates: dict[str, tuple[Optional[date], Optional[date]]],
+        use_numpy: bool = False,
+    ) -> "ScheduleColumns":
+        """
+        Build columns from the scheduler's (start, finish) dictionary.
+        
+        Args:
+            node_ids: Scheduled node IDs (column order)
+            dates: node_id -> (start, finish); missing nodes are unscheduled
+            use_numpy: Store NumPy arrays if NumPy is installed
+        
+        Returns:
+            ScheduleColumns
+        """
+        columns = cls(node_ids, use_numpy)
+        for i, node_id in enumerate(columns.node_ids):
+            start, finish = dates.get(node_id, (None, None))
+            columns.start[i] = _ordinal(start)
+            columns.finish[i] = _ordinal(finish)
+        return columns
+    
+    @property
+    def _np(self) -> Any:
+        """NumPy module if the columns are NumPy arrays, None for array('i')."""
+        return None if isinstance(self.start, array) else _numpy()
+    
+    def __len__(self) -> int:
+        return len(self.node_ids)
+    
+    def set(self, node_id: str, start: Optional[date], finish: Optional[date]) -> None:
+        """Store the dates of one node."""
+        i = self.index[node_id]
+        self.start[i] = _ordinal(start)
+        self.finish[i] = _ordinal(finish)
+    
+    def dates(self, node_id: str) -> tuple[Optional[date], Optional[date]]:
+        """Return (start, finish) of a node; (None, None) if unscheduled."""
+        i = self.index[node_id]
+        return (_date(self.start[i]), _date(self.finish[i]))
+    
+    def bounds(self) -> Optional[tuple[date, date]]:
+        """
+        Project bounds: earliest start and latest finish.
+        
+        Returns:
+            (first, last) dates, or None if no node has computed dates
+        """
+        np = self._np
+        if np is not None:
+            scheduled = self.start != UNSCHEDULED
+            if not scheduled.any():
+                return None
+            return (
+                date.fromordinal(int(self.start[scheduled].min())),
+                date.fromordinal(int(self.finish[scheduled].max())),
+            )
+        
+        starts = [s for s in self.start if s != UNSCHEDULED]
+        if not starts:
+            return None
+        return (
+            date.fromordinal(min(starts)),
+            date.fromordinal(max(f for f in self.finish if f != UNSCHEDULED)),
+        )
+    
+    def in_range(self, first: date, last: date) -> list[str]:
+        """
+        Nodes whose [start, finish] overlaps [first, last] (inclusive).
+        
+        Args:
+            first: First day of the range
+            last: Last day of the range
+        
+        Returns:
+            node_ids in column order
+        """
+        lo, hi = first.toordinal(), last.toordinal()
+        np = self._np
+        if np is not None:
+            mask = (self.start != UNSCHEDULED) & (self.start <= hi) & (self.finish >= lo)
+            return [self.node_ids[i] for i in np.flatnonzero(mask)]
+        
+        return [
+            node_id
+            for node_id, s, f in zip(self.node_ids, self.start, self.finish)
+            if s != UNSCHEDULED and s <= hi and f >= lo
+        ]
+    
+    def sort_key(self, field: str) -> dict[str, int]:
+        """
+        Ordinal sort keys of scheduled nodes for the given column.
+        
+        Args:
+            field: "start" or "finish"
+        
+        Returns:
+            node_id -> ordinal, for nodes with computed dates only
+        """
+        column = self._column(field)
+        return {
+            node_id: int(value)
+            for node_id, value in zip(self.node_ids, column)
+            if value != UNSCHEDULED
+        }
+    
+    def order_by(self, field: str) -> list[str]:
+        """
+        Scheduled node_ids sorted by a date column.
+        
+        Ties keep column order; nodes without computed dates are omitted.
+        
+        Args:
+            field: "start" or "finish"
+        
+        Returns:
+            Sorted node_ids
+        """
+        column = self._column(field)
+        np = self._np
+        if np is not None:
+            positions = np.flatnonzero(column != UNSCHEDULED)
+            ranked = positions[np.argsort(column[positions], kind="stable")]
+            return [self.node_ids[i] for i in ranked]
+        
+        positions = [i for i, value in enumerate(column) if value != UNSCHEDULED]
+        positions.sort(key=column.__getitem__)
+        return [self.node_ids[i] for i in positions]
+    
+    def materialize(self, schedule: Schedule) -> None:
+        """
+        Write computed_start/computed_finish ISO strings to ScheduleNodes.
+        
+        Args:
+            schedule: Schedule whose nodes the columns were computed for
+        """
+        for node_id, s, f in zip(self.node_ids, self.start, self.finish):
+            sn = schedule.nodes.get(node_id)
+            if sn is None:
+                continue
+            sn.computed_start = _date(s).isoformat() if s != UNSCHEDULED else None
+            sn.computed_finish = _date(f).isoformat() if f != UNSCHEDULED else None
+    
+    def _column(self, field: str):
+        """Return the start or finish column."""
+        if field == "start":
+            return self.start
+        if field == "finish":
+            return self.finish
+        raise ValueError(f"Unknown date column '{field}' (expected 'start' or 'finish')")
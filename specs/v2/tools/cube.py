@@ -0,0 +1,406 @@
+"""
+Effort aggregation cube for opskarta v2 plans.
+
+Reports break effort down by status, kind, source fragment, calendar or
+scheduled/unscheduled, for the whole plan or below any node. EffortCube
+prepares every breakdown in one pass over the nodes, so that each
+(ancestor, dimension value) total is then a lookup instead of a scan.
+
+Layout:
+- Nodes are numbered in the depth-first order of plan.index, so the
+  subtree of a node is the interval preorder[enter:leave]; nodes on or
+  below a parent cycle (detached) are numbered after them
+- For each dimension, each value keeps the sorted positions of its
+  nodes and the running sum of their effort; the total of a value in a
+  subtree is the difference of two running sums found by bisection,
+  O(log n)
+- Queries with criteria on several dimensions scan the positions of the
+  rarest criterion inside the subtree
+
+What is summed is each node's own effort, the part not covered by its
+children: effort_effective for a leaf, effort_gap for a node with
+children. The total of a subtree therefore equals the effort_effective
+of its top node, unless some estimate is lower than the rollup of its
+children. Node counts are kept alongside. The cube is a snapshot: build
+it after compute_effort_metrics, and again after the plan changes.
+Running sums of float efforts may differ from a direct sum in the last
+digits.
+
+Dimensions map the plan and its node IDs to one hashable value per
+node. Built in (DIMENSIONS): status, kind, fragment (source file),
+scheduled ("scheduled"/"unscheduled"), calendar (of scheduled nodes);
+"x.KEY" reads node.x[KEY].
+
+Example:
+    >>> cube = EffortCube(plan, ["status", "kind"])
+    >>> cube.total("epic1", {"status": "todo"})
+    8
+    >>> cube.breakdown("kind")
+    {'task': (13, 9), 'bug': (2, 3), None: (0, 1)}
+"""
+
+from bisect import bisect_left
+from itertools import accumulate
+from typing import Any, Callable, Hashable, Iterable, Optional, Sequence
+
+from specs.v2.tools.models import MergedPlan
+
+
+# (plan, node_ids) -> one value per node
+Dimension = Callable[[MergedPlan, list[str]], Sequence[Hashable]]
+
+# Dimensions used when none are given
+DEFAULT_DIMENSIONS = ("status", "kind", "fragment", "scheduled")
+
+# Prefix of dimensions reading node.x
+X_PREFIX = "x."
+
+
+def _status(plan: MergedPlan, node_ids: list[str]) -> list[Hashable]:
+    """Status of each node."""
+    nodes = plan.nodes
+    return [nodes[node_id].status for node_id in node_ids]
+
+
+def _kind(plan: MergedPlan, node_ids: list[str]) -> list[Hashable]:
+    """Kind of each node."""
+    nodes = plan.nodes
+    return [nodes[node_id].kind for node_id in node_ids]
+
+
+def _fragment(plan: MergedPlan, node_ids: list[str]) -> list[Hashable]:
+    """Source file the node was merged from (plan.sources)."""
+    sources = plan.sources.of_type("node")
+    return [sources.get(node_id) for node_id in node_ids]
+
+
+def _scheduled(plan: MergedPlan, node_ids: list[str]) -> list[Hashable]:
+    """Whether each node is in schedule.nodes ("scheduled"/"unscheduled")."""
+    scheduled = plan.schedule.nodes if plan.schedule is not None else {}
+    return ["scheduled" if node_id in scheduled else "unscheduled" for node_id in node_ids]
+
+
+def _calendar(plan: MergedPlan, node_ids: list[str]) -> list[Hashable]:
+    """Calendar of scheduled nodes (their own or the default), else None."""
+    if plan.schedule is None:
+        return [None] * len(node_ids)
+    scheduled = plan.schedule.nodes
+    default = plan.schedule.default_calendar
+    result: list[Hashable] = []
+    for node_id in node_ids:
+        sn = scheduled.get(node_id)
+        result.append(None if sn is None else sn.calendar or default)
+    return result
+
+
+# Built-in dimensions by name
+DIMENSIONS: dict[str, Dimension] = {
+    "status": _status,
+    "kind": _kind,
+    "fragment": _fragment,
+    "scheduled": _scheduled,
+    "calendar": _calendar,
+}
+
+
+def x_dimension(key: str) -> Dimension:
+    """
+    Dimension reading an extension field (node.x[key], None if unset).
+    
+    Args:
+        key: Key in node.x
+    
+    Returns:
+        Dimension function
+    """
+    def values(plan: MergedPlan, node_ids: list[str]) -> list[Hashable]:
+        nodes = plan.nodes
+        result: list[Hashable] = []
+        for node_id in node_ids:
+            x = nodes[node_id].x
+            value = x.get(key) if isinstance(x, dict) else None
+            try:
+                hash(value)
+            except TypeError:
+                # Lists/dicts are grouped by their text form
+                value = repr(value)
+            result.append(value)
+        return result
+    return values
+
+
+def resolve_dimension(name: str) -> Dimension:
+    """
+    Look up a dimension by name.
+    
+    Args:
+        name: Name in DIMENSIONS, or "x.KEY" for an extension field
+    
+    Returns:
+        Dimension function
+    
+    Raises:
+        ValueError: If the name is unknown
+    """
+    if name in DIMENSIONS:
+        return DIMENSIONS[name]
+    if name.startswith(X_PREFIX) and len(name) > len(X_PREFIX):
+        return x_dimension(name[len(X_PREFIX):])
+    raise ValueError(
+        f"Unknown dimension '{name}' "
+        f"(expected one of {', '.join(DIMENSIONS)} or {X_PREFIX}KEY)"
+    )
+
+
+def own_effort(plan: MergedPlan, node_ids: list[str]) -> list[float]:
+    """
+    Effort of each node not covered by its children.
+    
+    Args:
+        plan: MergedPlan after compute_effort_metrics
+        node_ids: Nodes to measure
+    
+    Returns:
+        effort_effective for leaves, effort_gap for nodes with children
+        (0 when unset)
+    """
+    nodes = plan.nodes
+    result = []
+    for node_id in node_ids:
+        node = nodes[node_id]
+        value = node.effort_effective if node.effort_rollup is None else node.effort_gap
+        result.append(value if value is not None else 0)
+    return result
+
+
+class _Group:
+    """Nodes of one dimension value: positions and running effort sums."""
+    
+    __slots__ = ("positions", "running")
+    
+    def __init__(self, positions: list[int], effort: list[float]) -> None:
+        self.positions = positions
+        self.running = list(accumulate(map(effort.__getitem__, positions), initial=0))
+    
+    def span(self, start: int, end: int) -> tuple[int, int]:
+        """Indexes into positions of the nodes in [start, end)."""
+        positions = self.positions
+        return bisect_left(positions, start), bisect_left(positions, end)
+
+
+class EffortCube:
+    """
+    Effort totals and node counts per subtree and dimension value.
+    
+    Attributes:
+        dimensions: Dimension names, in the order given
+        node_ids: Nodes in cube order (depth-first, then detached)
+    """
+    
+    def __init__(
+        self,
+        plan: MergedPlan,
+        dimensions: Optional[Iterable[str]] = None,
+        extra: Optional[dict[str, Dimension]] = None,
+    ) -> None:
+        """
+        Build the cube in one pass over the nodes.
+        
+        Args:
+            plan: MergedPlan after compute_effort_metrics
+            dimensions: Dimension names (default: DEFAULT_DIMENSIONS)
+            extra: Custom dimensions by name, added after the named ones
+        
+        Raises:
+            ValueError: If a dimension name is unknown or repeated
+        """
+        self._plan = plan
+        index = plan.index
+        self.node_ids: list[str] = index.preorder + index.detached
+        
+        functions: dict[str, Dimension] = {}
+        names = list(DEFAULT_DIMENSIONS if dimensions is None else dimensions)
+        for name in names:
+            if name in functions:
+                raise ValueError(f"Dimension '{name}' given twice")
+            functions[name] = resolve_dimension(name)
+        for name, function in (extra or {}).items():
+            if name in functions:
+                raise ValueError(f"Dimension '{name}' given twice")
+            functions[name] = function
+        self.dimensions: list[str] = list(functions)
+        
+        self._effort = own_effort(plan, self.node_ids)
+        self._running = list(accumulate(self._effort, initial=0))
+        # dimension -> value of each node (cube order)
+        self._values: dict[str, Sequence[Hashable]] = {}
+        # dimension -> value -> _Group (first-seen order)
+        self._groups: dict[str, dict[Hashable, _Group]] = {}
+        for name, function in functions.items():
+            values = function(plan, self.node_ids)
+            by_value: dict[Hashable, list[int]] = {}
+            for position, value in enumerate(values):
+                positions = by_value.get(value)
+                if positions is None:
+                    by_value[value] = [position]
+                else:
+                    positions.append(position)
+            self._values[name] = values
+            self._groups[name] = {
+                value: _Group(positions, self._effort) for value, positions in by_value.items()
+            }
+    
+    def values(self, dimension: str) -> list[Hashable]:
+        """
+        Get the values of a dimension.
+        
+        Args:
+            dimension: Dimension name
+        
+        Returns:
+            Distinct values, in cube order of their first node
+        
+        Raises:
+            ValueError: If the dimension is not in the cube
+        """
+        return list(self._dimension(dimension))
+    
+    def total(self, node_id: Optional[str] = None, where: Optional[dict[str, Any]] = None) -> float:
+        """
+        Sum the own effort of the nodes in a subtree matching criteria.
+        
+        Args:
+            node_id: Top of the subtree (included); None for the whole plan
+            where: dimension -> required value (all must match)
+        
+        Returns:
+            Effort total (0 when nothing matches)
+        
+        Raises:
+            ValueError: If node_id or a dimension is unknown
+        """
+        return self._aggregate(node_id, where)[0]
+    
+    def count(self, node_id: Optional[str] = None, where: Optional[dict[str, Any]] = None) -> int:
+        """
+        Count the nodes in a subtree matching criteria.
+        
+        Args:
+            node_id: Top of the subtree (included); None for the whole plan
+            where: dimension -> required value (all must match)
+        
+        Returns:
+            Number of matching nodes
+        
+        Raises:
+            ValueError: If node_id or a dimension is unknown
+        """
+        return self._aggregate(node_id, where)[1]
+    
+    def breakdown(
+        self,
+        dimension: str,
+        node_id: Optional[str] = None,
+    ) -> dict[Hashable, tuple[float, int]]:
+        """
+        Split a subtree's effort by the values of one dimension.
+        
+        Args:
+            dimension: Dimension name
+            node_id: Top of the subtree (included); None for the whole plan
+        
+        Returns:
+            value -> (effort total, node count) for the values present in
+            the subtree, in cube order of their first node
+        
+        Raises:
+            ValueError: If node_id or the dimension is unknown
+        """
+        groups = self._dimension(dimension)
+        interval = self._interval(node_id)
+        result = {}
+        for value, group in groups.items():
+            if interval is None:
+                total, count = self._scan(node_id, [(dimension, value)])
+            else:
+                first, last = group.span(*interval)
+                total, count = group.running[last] - group.running[first], last - first
+            if count:
+                result[value] = (total, count)
+        return result
+    
+    def _dimension(self, dimension: str) -> dict[Hashable, _Group]:
+        """Groups of a dimension of the cube."""
+        groups = self._groups.get(dimension)
+        if groups is None:
+            raise ValueError(
+                f"Dimension '{dimension}' not in cube "
+                f"(has {', '.join(self.dimensions) or 'none'})"
+            )
+        return groups
+    
+    def _interval(self, node_id: Optional[str]) -> Optional[tuple[int, int]]:
+        """Cube positions [start, end) of a subtree, None for a detached node."""
+        if node_id is None:
+            return 0, len(self.node_ids)
+        index = self._plan.index
+        start = index.enter.get(node_id)
+        if start is not None:
+            return start, index.leave[node_id]
+        if node_id not in self._plan.nodes:
+            raise ValueError(f"Node '{node_id}' not found")
+        return None
+    
+    def _aggregate(
+        self,
+        node_id: Optional[str],
+        where: Optional[dict[str, Any]],
+    ) -> tuple[float, int]:
+        """(effort total, node count) of a subtree under criteria."""
+        criteria = list((where or {}).items())
+        groups = [self._dimension(dimension).get(value) for dimension, value in criteria]
+        if any(group is None for group in groups):
+            # Unknown dimensions raised above; an absent value matches nothing
+            return 0, 0
+        
+        interval = self._interval(node_id)
+        if interval is None:
+            return self._scan(node_id, criteria)
+        if not criteria:
+            start, end = interval
+            return self._running[end] - self._running[start], end - start
+        
+        spans = [group.span(*interval) for group in groups]
+        rarest = min(range(len(groups)), key=lambda i: spans[i][1] - spans[i][0])
+        group, (first, last) = groups[rarest], spans[rarest]
+        if len(criteria) == 1:
+            return group.running[last] - group.running[first], last - first
+        
+        checks = [
+            (self._values[dimension], value)
+            for i, (dimension, value) in enumerate(criteria) if i != rarest
+        ]
+        effort = self._effort
+        total: float = 0
+        count = 0
+        for position in group.positions[first:last]:
+            if all(values[position] == value for values, value in checks):
+                total += effort[position]
+                count += 1
+        return total, count
+    
+    def _scan(self, node_id: str, criteria: list[tuple[str, Any]]) -> tuple[float, int]:
+        """Aggregate a detached subtree (parent cycle) node by node."""
+        index = self._plan.index
+        offset = len(index.preorder)
+        position = {member: offset + i for i, member in enumerate(index.detached)}
+        checks = [(self._values[dimension], value) for dimension, value in criteria]
+        total: float = 0
+        count = 0
+        # On a cycle the node can be among its own descendants
+        for member in dict.fromkeys([node_id] + self._plan.index.descendants(node_id)):
+            p = position[member]
+            if all(values[p] == value for values, value in checks):
+                total += self._effort[p]
+                count += 1
+        return total, count
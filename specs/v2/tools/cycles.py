@@ -0,0 +1,201 @@
+"""
+Cycle detection for opskarta v2 plans.
+
+The validator reports cycles in two graphs over the nodes: after
+dependencies (any number of edges per node) and the parent hierarchy
+(at most one edge per node). Both searches here are iterative and
+linear in the size of the graph, so long chains cannot exhaust the
+recursion limit, and every cycle is reported once.
+
+- find_cycles: Tarjan's strongly connected components; each component
+  that contains a cycle is reported as a shortest closed path through
+  its first node
+- find_functional_cycles: colouring walk for graphs with at most one
+  successor per node (parent), where every cycle is a simple loop
+
+Cycles are lists of node IDs that start and end with the same node,
+following the edges: ["a", "b", "a"] means a -> b -> a. Their first node
+is the earliest member in node_ids order, and cycles are returned in
+that order.
+
+Example:
+    >>> after = {"a": ["b"], "b": ["a"], "c": ["c"], "d": []}
+    >>> find_cycles(after, after.__getitem__)
+    [['a', 'b', 'a'], ['c', 'c']]
+"""
+
+from collections import deque
+from typing import Callable, Iterable, Optional
+
+
+def strongly_connected_components(
+    node_ids: Iterable[str],
+    successors: Callable[[str], Iterable[str]],
+) -> list[list[str]]:
+    """
+    Find the strongly connected components of a graph (Tarjan, no recursion).
+    
+    Args:
+        node_ids: Vertices of the graph
+        successors: node_id -> IDs it has an edge to (IDs that are not
+                    in node_ids are ignored)
+    
+    Returns:
+        Components in reverse topological order (a component comes
+        before the components with edges into it); members of each
+        component are in node_ids order
+    """
+    node_ids = list(node_ids)
+    position = {node_id: i for i, node_id in enumerate(node_ids)}
+    index: dict[str, int] = {}
+    low: dict[str, int] = {}
+    stack: list[str] = []
+    on_stack: set[str] = set()
+    components: list[list[str]] = []
+    
+    for root_id in node_ids:
+        if root_id in index:
+            continue
+        
+        index[root_id] = low[root_id] = len(index)
+        stack.append(root_id)
+        on_stack.add(root_id)
+        # Entries are (node_id, iterator over its remaining successors)
+        work = [(root_id, iter(successors(root_id)))]
+        while work:
+            node_id, edges = work[-1]
+            for next_id in edges:
+                if next_id not in position:
+                    continue
+                if next_id not in index:
+                    index[next_id] = low[next_id] = len(index)
+                    stack.append(next_id)
+                    on_stack.add(next_id)
+                    work.append((next_id, iter(successors(next_id))))
+                    break
+                if next_id in on_stack and index[next_id] < low[node_id]:
+                    low[node_id] = index[next_id]
+            else:
+                # All successors done: propagate low to the caller and
+                # pop the component if node_id is its root
+                work.pop()
+                if work and low[node_id] < low[work[-1][0]]:
+                    low[work[-1][0]] = low[node_id]
+                if low[node_id] == index[node_id]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node_id:
+                            break
+                    component.sort(key=position.__getitem__)
+                    components.append(component)
+    
+    return components
+
+
+def _shortest_cycle(
+    start_id: str,
+    component: set[str],
+    successors: Callable[[str], Iterable[str]],
+) -> list[str]:
+    """Shortest closed path from start_id back to itself inside component (BFS)."""
+    previous: dict[str, Optional[str]] = {start_id: None}
+    queue = deque([start_id])
+    while queue:
+        node_id = queue.popleft()
+        for next_id in successors(node_id):
+            if next_id == start_id:
+                path = [start_id]
+                current: Optional[str] = node_id
+                while current is not None:
+                    path.append(current)
+                    current = previous[current]
+                path.reverse()
+                return path
+            if next_id in component and next_id not in previous:
+                previous[next_id] = node_id
+                queue.append(next_id)
+    raise ValueError(f"No cycle through '{start_id}'")
+
+
+def find_cycles(
+    node_ids: Iterable[str],
+    successors: Callable[[str], Iterable[str]],
+) -> list[list[str]]:
+    """
+    Find one cycle per strongly connected component that has a cycle.
+    
+    A component has a cycle if it has more than one member or a
+    self-loop. Its cycle is a shortest closed path through its first
+    member, so each group of mutually dependent nodes is reported once.
+    O(V + E).
+    
+    Args:
+        node_ids: Vertices of the graph
+        successors: node_id -> IDs it has an edge to (IDs that are not
+                    in node_ids are ignored)
+    
+    Returns:
+        Cycles, e.g. [["a", "b", "a"], ["c", "c"]]
+    """
+    node_ids = list(node_ids)
+    position = {node_id: i for i, node_id in enumerate(node_ids)}
+    
+    cycles = []
+    for component in strongly_connected_components(node_ids, successors):
+        start_id = component[0]
+        if len(component) == 1 and start_id not in successors(start_id):
+            continue
+        cycles.append(_shortest_cycle(start_id, set(component), successors))
+    
+    cycles.sort(key=lambda cycle: position[cycle[0]])
+    return cycles
+
+
+def find_functional_cycles(
+    node_ids: Iterable[str],
+    successor: Callable[[str], Optional[str]],
+) -> list[list[str]]:
+    """
+    Find every cycle of a graph with at most one successor per node.
+    
+    Each node is walked once: a walk follows successors until it leaves
+    the graph, reaches a node finished by an earlier walk, or returns to
+    a node of its own path (a cycle). O(V).
+    
+    Args:
+        node_ids: Vertices of the graph
+        successor: node_id -> ID of its successor, or None (IDs that
+                   are not in node_ids end the walk)
+    
+    Returns:
+        Cycles, e.g. [["a", "b", "a"], ["c", "c"]]
+    """
+    node_ids = list(node_ids)
+    position = {node_id: i for i, node_id in enumerate(node_ids)}
+    
+    # node_id -> number of the walk that reached it
+    walked: dict[str, int] = {}
+    cycles = []
+    for walk, root_id in enumerate(node_ids):
+        path = []
+        current: Optional[str] = root_id
+        while current is not None and current in position and current not in walked:
+            walked[current] = walk
+            path.append(current)
+            current = successor(current)
+        
+        if current is None or walked.get(current) != walk:
+            continue
+        
+        # The walk closed on its own path: rotate to the first member
+        cycle = path[path.index(current):]
+        first = min(range(len(cycle)), key=lambda i: position[cycle[i]])
+        cycle = cycle[first:] + cycle[:first]
+        cycle.append(cycle[0])
+        cycles.append(cycle)
+    
+    cycles.sort(key=lambda cycle: position[cycle[0]])
+    return cycles
@@ -4,6 +4,16 @@ Effort metrics computation for opskarta v2.
 This module computes effort_rollup, effort_effective, and effort_gap
 for all nodes in a plan using a bottom-up tree traversal.
 
+The traversal does not recurse: nodes are numbered in the depth-first
+order of plan.index and processed one depth level at a time, deepest
+first, each level adding the effort_effective of its nodes into their
+parents. For large plans with NumPy installed (imported on first use,
+see columns._numpy) a level is one numpy.add.at call; otherwise a plain
+loop. Either way the sums are accumulated in child
+order from 0, exactly as sum() over the children would, so int efforts
+stay ints. Nodes on or below a parent cycle (invalid plans) are handled
+by an explicit-stack depth-first walk.
+
 Key concepts:
 - effort_rollup: Sum of effort_effective of all direct children
 - effort_effective: effort if set, otherwise effort_rollup
@@ -16,10 +26,22 @@ Requirements covered:
 - 2.9: For nodes with children, effort_effective = effort if set, else effort_rollup
 """
 
-from collections import defaultdict
-from typing import Optional
+from typing import Any, Optional
+
+from specs.v2.tools.columns import _numpy
+from specs.v2.tools.models import MergedPlan, Node
+
+
+# Largest integer float64 represents exactly, with every integer below it
+_EXACT_INT_LIMIT = 2 ** 53
+
+# Smaller plans use the plain loop: converting their nodes to arrays
+# costs more than it saves, and importing NumPy would dominate the
+# start-up of CLI commands
+_NUMPY_MIN_NODES = 50_000
 
-from specs.v2.tools.models import MergedPlan
+# Key of the forest arrays in PlanIndex.derived
+_DERIVED_KEY = "effort_forest"
 
 
 def compute_effort_metrics(plan: MergedPlan) -> None:
@@ -27,8 +49,8 @@ def compute_effort_metrics(plan: MergedPlan) -> None:
     Compute effort_rollup, effort_effective, effort_gap for all nodes.
     
     Algorithm:
-    1. Build parent-child tree from nodes
-    2. Traverse tree bottom-up (post-order)
+    1. Take the parent-child tree and depth-first order from plan.index
+    2. Traverse tree bottom-up, one depth level at a time (deepest first)
     3. For each node, compute metrics based on children
     
     Semantics:
@@ -49,72 +71,342 @@ def compute_effort_metrics(plan: MergedPlan) -> None:
     if not plan.nodes:
         return
     
-    # Build parent-child tree
-    children: dict[str, list[str]] = defaultdict(list)
-    for node_id, node in plan.nodes.items():
-        if node.parent:
-            children[node.parent].append(node_id)
+    index = plan.index
+    if index.preorder:
+        if (
+            len(plan.nodes) >= _NUMPY_MIN_NODES
+            and _exact_in_float64(plan)
+            and _numpy() is not None
+        ):
+            _rollup_forest_numpy(plan)
+        else:
+            _rollup_forest(plan)
     
-    # Track visited nodes to handle each node exactly once
-    visited: set[str] = set()
+    # Nodes not reachable from roots (parent cycles): shouldn't happen in
+    # valid plans, but handle gracefully
+    if index.detached:
+        _rollup_detached(plan)
+
+
+# Default of update_effort(old_parent=...): the node was not moved
+_NOT_MOVED = object()
+
+
+def update_effort(
+    plan: MergedPlan,
+    node_id: str,
+    old_parent: Any = _NOT_MOVED,
+) -> list[str]:
+    """
+    Update effort metrics after one node was edited, without a full pass.
     
-    def compute(node_id: str) -> Optional[float]:
-        """
-        Recursively compute effort metrics for a node and its descendants.
-        
-        Returns the effort_effective value for the node.
-        """
-        if node_id in visited:
-            # Already computed (can happen with complex hierarchies)
-            return plan.nodes[node_id].effort_effective
-        
-        visited.add(node_id)
-        node = plan.nodes[node_id]
-        child_ids = children[node_id]
+    The plan must hold the metrics of the last compute_effort_metrics
+    (or update_effort) call. The node's new effort_effective is compared
+    with the stored one, and the difference is added to the rollup of
+    each ancestor, walking up until an ancestor's effort_effective does
+    not change (it has its own effort) or the root is reached. Each edit
+    is O(depth) instead of O(number of nodes).
+    
+    Moving a node is supported: set node.parent to the new parent, then
+    pass the previous one as old_parent. The node's effort is subtracted
+    along the old ancestor chain and added along the new one, and
+    plan.index is invalidated since the hierarchy changed. A node newly
+    added to the plan is handled as moved from the roots (old_parent=None).
+    
+    Rollups are kept by adding and subtracting deltas, so with float
+    efforts they may differ from a full recomputation in the last digits
+    of precision.
+    
+    Args:
+        plan: MergedPlan with computed effort metrics. Nodes are modified
+              in-place.
+        node_id: ID of the edited node (its effort and/or parent)
+        old_parent: Parent of the node before a move (None if it was a
+                    root); omit when the parent did not change
+    
+    Returns:
+        IDs of the nodes whose metrics were updated: node_id first, then
+        the ancestors walked, old chain before new chain
+    
+    Raises:
+        KeyError: If node_id is not in the plan
+    """
+    nodes = plan.nodes
+    node = nodes[node_id]
+    old_effective = node.effort_effective
+    # Leaf or not is unchanged by editing the node itself
+    if node.effort_rollup is None:
+        new_effective = _set_leaf(node)
+    else:
+        new_effective = _set_rollup(node, node.effort_rollup)
+    updated = [node_id]
+    
+    moved = old_parent is not _NOT_MOVED and old_parent != node.parent
+    if not moved:
+        if new_effective != old_effective:
+            _propagate(plan, node.parent, old_effective, new_effective, updated)
+        return updated
+    
+    # Old parent becomes a leaf if the node was its only child (the index
+    # may list the node there or not, depending on when it was built)
+    if old_parent in nodes:
+        siblings = plan.index.children.get(old_parent, [])
+        if len(siblings) == (node_id in siblings):
+            old_parent_node = nodes[old_parent]
+            previous = old_parent_node.effort_effective
+            updated.append(old_parent)
+            if _set_leaf(old_parent_node) != previous:
+                _propagate(
+                    plan, old_parent_node.parent,
+                    previous, old_parent_node.effort_effective, updated,
+                )
+        else:
+            _propagate(plan, old_parent, old_effective, None, updated)
+    _propagate(plan, node.parent, None, new_effective, updated)
+    plan.invalidate_index()
+    return updated
+
+
+def _propagate(
+    plan: MergedPlan,
+    parent_id: Optional[str],
+    old_value: Optional[float],
+    new_value: Optional[float],
+    updated: list[str],
+) -> None:
+    """
+    Replace a child's contribution old_value by new_value in the rollup
+    of parent_id, and carry the change up the ancestor chain.
+    
+    None contributes nothing; a leaf parent (no rollup yet) gains its
+    first child. The walk stops at the root, at an ancestor whose
+    effort_effective did not change, or on a parent cycle.
+    """
+    nodes = plan.nodes
+    seen: set[str] = set()
+    while parent_id in nodes and parent_id not in seen:
+        seen.add(parent_id)
+        parent = nodes[parent_id]
         
-        if not child_ids:
-            # Leaf node (Requirement 2.8)
-            # effort_effective = effort
-            node.effort_effective = node.effort
-            node.effort_rollup = None
-            node.effort_gap = None
-            return node.effort
+        rollup = parent.effort_rollup
+        if rollup is None:
+            # A leaf until now: the rollup of its only child, as sum() gives
+            rollup = 0 + new_value if new_value is not None else 0.0
+        else:
+            if old_value is not None:
+                rollup = rollup - old_value
+            if new_value is not None:
+                rollup = rollup + new_value
         
-        # Node with children
-        # First, compute effort_effective for all children
-        child_efforts: list[float] = []
-        for child_id in child_ids:
-            child_effective = compute(child_id)
-            if child_effective is not None:
-                child_efforts.append(child_effective)
+        old_value = parent.effort_effective
+        new_value = _set_rollup(parent, rollup)
+        updated.append(parent_id)
+        if new_value == old_value:
+            return
+        parent_id = parent.parent
+
+
+def _set_leaf(node: Node) -> Optional[float]:
+    """Set the metrics of a node without children (Requirement 2.8)."""
+    node.effort_effective = node.effort
+    node.effort_rollup = None
+    node.effort_gap = None
+    return node.effort
+
+
+def _set_rollup(node: Node, rollup: float) -> Optional[float]:
+    """Set the metrics of a node with children from its rollup."""
+    # Requirement 2.6: effort_rollup = sum of effort_effective of direct children
+    node.effort_rollup = rollup
+    
+    # Requirement 2.9: effort_effective = effort if set, else effort_rollup
+    if node.effort is not None:
+        node.effort_effective = node.effort
+        # Requirement 2.7: effort_gap = max(0, effort - effort_rollup)
+        node.effort_gap = max(0.0, node.effort - rollup)
+    else:
+        node.effort_effective = rollup
+        node.effort_gap = None
+    
+    return node.effort_effective
+
+
+def _forest_arrays(plan: MergedPlan) -> tuple[list[int], list[bool], list[list[int]]]:
+    """
+    Number the nodes of the hierarchy forest in depth-first order.
+    
+    Positions are those of plan.index.preorder. The arrays only depend on
+    the hierarchy, so they are cached in plan.index.derived.
+    
+    Returns:
+        (parent, has_children, levels): parent position per position
+        (-1 for roots), whether the position has children, and the
+        positions of each depth level in depth-first order (so siblings
+        appear in child order)
+    """
+    index = plan.index
+    cached = index.derived.get(_DERIVED_KEY)
+    if cached is not None:
+        return cached
+    
+    enter = index.enter
+    leave = index.leave
+    depth = index.depth
+    nodes = plan.nodes
+    preorder = index.preorder
+    
+    parent = [enter.get(nodes[node_id].parent, -1) for node_id in preorder]
+    has_children = [leave[node_id] > position + 1 for position, node_id in enumerate(preorder)]
+    levels: list[list[int]] = [[] for _ in range(max(depth.values()) + 1)]
+    for position, node_id in enumerate(preorder):
+        levels[depth[node_id]].append(position)
+    
+    cached = index.derived[_DERIVED_KEY] = (parent, has_children, levels)
+    return cached
+
+
+def _rollup_forest(plan: MergedPlan) -> None:
+    """Bottom-up rollup of the hierarchy forest with plain Python lists."""
+    parent, has_children, levels = _forest_arrays(plan)
+    nodes = [plan.nodes[node_id] for node_id in plan.index.preorder]
+    
+    # Running sums of the children's effort_effective, started at 0 like
+    # sum(); contributed marks parents with at least one child effort
+    total: list = [0] * len(nodes)
+    contributed = [False] * len(nodes)
+    
+    for level in reversed(levels):
+        for position in level:
+            node = nodes[position]
+            if has_children[position]:
+                rollup = total[position] if contributed[position] else 0.0
+                effective = _set_rollup(node, rollup)
+            else:
+                # Leaf (inlined _set_leaf: most nodes are leaves)
+                effective = node.effort_effective = node.effort
+                node.effort_rollup = None
+                node.effort_gap = None
+            
+            if effective is not None:
+                parent_position = parent[position]
+                if parent_position >= 0:
+                    total[parent_position] += effective
+                    contributed[parent_position] = True
+
+
+def _exact_in_float64(plan: MergedPlan) -> bool:
+    """
+    Whether float64 sums of the plan's efforts equal Python's sums.
+    
+    Each rollup adds int efforts of distinct nodes, so every int partial
+    sum is exact in float64 when the absolute values of all int efforts
+    add up to at most _EXACT_INT_LIMIT (bounding each effort alone is not
+    enough: 2**53 + 1 rounds to 2**53).
+    """
+    int_total = 0
+    for node in plan.nodes.values():
+        effort = node.effort
+        if effort is not None and not isinstance(effort, float):
+            if not isinstance(effort, int):
+                return False
+            int_total += abs(effort)
+    return int_total <= _EXACT_INT_LIMIT
+
+
+def _rollup_forest_numpy(plan: MergedPlan) -> None:
+    """
+    Bottom-up rollup of the hierarchy forest with NumPy arrays.
+    
+    Each level is evaluated on arrays and added into the parents with
+    numpy.add.at, which accumulates repeated parents in order (the same
+    left-to-right sums as _rollup_forest). Whether a sum only contains
+    ints is tracked alongside, so results are converted back to the
+    Python types _rollup_forest produces.
+    """
+    np = _numpy()
+    parent_list, has_children_list, levels = _forest_arrays(plan)
+    nodes = [plan.nodes[node_id] for node_id in plan.index.preorder]
+    size = len(nodes)
+    
+    parent = np.array(parent_list, dtype=np.int64)
+    has_children = np.array(has_children_list, dtype=bool)
+    has_effort = np.array([node.effort is not None for node in nodes], dtype=bool)
+    effort = np.array(
+        [float(node.effort) if node.effort is not None else 0.0 for node in nodes],
+        dtype=np.float64,
+    )
+    effort_is_float = np.array([isinstance(node.effort, float) for node in nodes], dtype=bool)
+    
+    total = np.zeros(size, dtype=np.float64)
+    contributed = np.zeros(size, dtype=bool)
+    total_is_float = np.zeros(size, dtype=bool)
+    
+    for level in reversed(levels):
+        positions = np.array(level, dtype=np.int64)
+        own = has_effort[positions]
+        inner = has_children[positions]
+        summed = contributed[positions]
         
-        # Requirement 2.6: effort_rollup = sum of effort_effective of direct children
-        rollup = sum(child_efforts) if child_efforts else 0.0
-        node.effort_rollup = rollup
+        # effort_effective: own effort, else rollup (0.0 without child
+        # efforts), else None for leaves without effort
+        effective = np.where(own, effort[positions], np.where(summed, total[positions], 0.0))
+        is_float = np.where(own, effort_is_float[positions], ~summed | total_is_float[positions])
+        defined = own | inner
         
-        # Requirement 2.9: effort_effective = effort if set, else effort_rollup
-        if node.effort is not None:
-            node.effort_effective = node.effort
-            # Requirement 2.7: effort_gap = max(0, effort - effort_rollup)
-            node.effort_gap = max(0.0, node.effort - rollup)
+        parents = parent[positions]
+        adds = defined & (parents >= 0)
+        np.add.at(total, parents[adds], effective[adds])
+        contributed[parents[adds]] = True
+        np.logical_or.at(total_is_float, parents[adds], is_float[adds])
+    
+    for position, node in enumerate(nodes):
+        if not has_children_list[position]:
+            _set_leaf(node)
+        elif not contributed[position]:
+            _set_rollup(node, 0.0)
+        elif total_is_float[position]:
+            _set_rollup(node, float(total[position]))
         else:
-            node.effort_effective = rollup
-            node.effort_gap = None
+            _set_rollup(node, int(total[position]))
+
+
+def _rollup_detached(plan: MergedPlan) -> None:
+    """
+    Rollup of nodes on or below a parent cycle (explicit-stack DFS).
+    
+    Walks children depth-first from each detached node in plan order;
+    a child already visited (the cycle closing) contributes its current
+    effort_effective.
+    """
+    nodes = plan.nodes
+    children = plan.index.children
+    visited: set[str] = set()
+    
+    for start_id in plan.index.detached:
+        if start_id in visited:
+            continue
+        visited.add(start_id)
+        if not children.get(start_id):
+            _set_leaf(nodes[start_id])
+            continue
         
-        return node.effort_effective
-    
-    # Find root nodes (nodes without parent or with non-existent parent)
-    root_ids = [
-        node_id for node_id, node in plan.nodes.items()
-        if not node.parent or node.parent not in plan.nodes
-    ]
-    
-    # Compute metrics starting from each root
-    for root_id in root_ids:
-        compute(root_id)
-    
-    # Handle any orphaned nodes not reachable from roots
-    # (shouldn't happen in valid plans, but handle gracefully)
-    for node_id in plan.nodes:
-        if node_id not in visited:
-            compute(node_id)
+        # Entries are (node_id, remaining child ids, child efforts so far)
+        stack = [(start_id, iter(children[start_id]), [])]
+        while stack:
+            node_id, pending, efforts = stack[-1]
+            for child_id in pending:
+                if child_id in visited:
+                    value = nodes[child_id].effort_effective
+                else:
+                    visited.add(child_id)
+                    if children.get(child_id):
+                        stack.append((child_id, iter(children[child_id]), []))
+                        break
+                    value = _set_leaf(nodes[child_id])
+                if value is not None:
+                    efforts.append(value)
+            else:
+                stack.pop()
+                value = _set_rollup(nodes[node_id], sum(efforts) if efforts else 0.0)
+                if stack and value is not None:
+                    stack[-1][2].append(value)
@@ -0,0 +1,220 @@
+"""
+Plan-wide graph index for opskarta v2.
+
+The validator, effort computation, scheduler and renderers all need the
+same structures derived from the node graph: parent -> children lists,
+the reverse of after edges, the hierarchy in depth-first order. This
+module builds them once, in linear time, and MergedPlan.index caches
+the result on the plan so every stage of a pipeline shares it.
+
+Structures:
+- children: parent_id -> child ids, in plan.nodes order (keys may be
+  parents that do not exist in nodes)
+- roots: nodes without parent or whose parent does not exist
+- dependents: node_id -> ids of the nodes listing it in after (keys
+  may be ids that do not exist in nodes)
+- preorder, depth, enter, leave: depth-first order of the hierarchy
+  forest, roots and children in plan.nodes order. A node's subtree is
+  preorder[enter[node_id]:leave[node_id]] (Euler-tour interval), so
+  descendants() is a slice and is_descendant() two comparisons
+- detached: nodes not reachable from a root, i.e. on or below a parent
+  cycle; they have no depth and no interval
+- topological_order: nodes ordered by after dependencies, dependencies
+  first, ties broken by plan.nodes order (references to missing nodes
+  are ignored)
+- after_blocked: nodes on or behind an after cycle, which never appear
+  in topological_order
+
+Invalidation: the index (and the derived data other modules cache in
+it) describes the nodes at build time. plan.nodes is a NodeMap whose
+version counts added, replaced and removed entries, and MergedPlan.index
+rebuilds the index when that version (or plan.nodes itself) changes.
+Edits of existing Node objects are not tracked: code that changes
+parent, after, kind or status in place calls plan.invalidate_index(),
+as watch.py and effort.update_effort do.
+
+Example:
+    >>> index = plan.index
+    >>> index.children["phase1"]
+    ['task1', 'task2']
+    >>> index.preorder[index.enter["phase1"]:index.leave["phase1"]]
+    ['phase1', 'task1', 'task2']
+    >>> index.is_descendant("task2", "phase1")
+    True
+"""
+
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any
+
+from specs.v2.tools.models import MergedPlan
+
+
+@dataclass
+class PlanIndex:
+    """
+    Derived graph structures of a plan's nodes.
+    
+    Attributes:
+        children: parent_id -> direct child ids (plan.nodes order)
+        roots: Nodes without an existing parent (plan.nodes order)
+        dependents: node_id -> nodes listing it in after (plan.nodes order)
+        preorder: Nodes of the hierarchy forest in depth-first order
+        depth: node_id -> depth in the hierarchy (roots are 0)
+        enter: node_id -> position in preorder
+        leave: node_id -> end (exclusive) of the node's subtree in preorder
+        detached: Nodes on or below a parent cycle (plan.nodes order)
+        topological_order: Nodes ordered by after, dependencies first
+        after_blocked: Nodes on or behind an after cycle (plan.nodes order)
+        derived: Cache for structures built on top of the index by other
+                 modules (key -> value)
+    """
+    children: dict[str, list[str]] = field(default_factory=dict)
+    roots: list[str] = field(default_factory=list)
+    dependents: dict[str, list[str]] = field(default_factory=dict)
+    preorder: list[str] = field(default_factory=list)
+    depth: dict[str, int] = field(default_factory=dict)
+    enter: dict[str, int] = field(default_factory=dict)
+    leave: dict[str, int] = field(default_factory=dict)
+    detached: list[str] = field(default_factory=list)
+    topological_order: list[str] = field(default_factory=list)
+    after_blocked: list[str] = field(default_factory=list)
+    
+    # Structures other modules derive from the same nodes, dropped with
+    # the index (e.g. render.masks.FilterMasks)
+    derived: dict[str, Any] = field(default_factory=dict, repr=False, compare=False)
+    
+    # Descendant sets of ids without an interval (see is_descendant)
+    _walked: dict[str, frozenset[str]] = field(default_factory=dict, repr=False, compare=False)
+    
+    @classmethod
+    def build(cls, plan: MergedPlan) -> "PlanIndex":
+        """
+        Build the index of a plan.
+        
+        Args:
+            plan: MergedPlan (need not be valid: dangling references and
+                  cycles are allowed)
+        
+        Returns:
+            PlanIndex
+        """
+        index = cls()
+        nodes = plan.nodes
+        children = index.children
+        dependents = index.dependents
+        
+        # Hierarchy and reverse after edges, in plan.nodes order
+        pending: dict[str, int] = {}
+        for node_id, node in nodes.items():
+            parent = node.parent
+            if parent:
+                children.setdefault(parent, []).append(node_id)
+            if not parent or parent not in nodes:
+                index.roots.append(node_id)
+            
+            count = 0
+            if node.after:
+                for dep_id in dict.fromkeys(node.after):
+                    dependents.setdefault(dep_id, []).append(node_id)
+                    if dep_id in nodes:
+                        count += 1
+            pending[node_id] = count
+        
+        index._number_forest()
+        if len(index.preorder) < len(nodes):
+            index.detached = [node_id for node_id in nodes if node_id not in index.enter]
+        
+        # Kahn's algorithm over after edges between existing nodes
+        order = index.topological_order
+        queue = deque(node_id for node_id, count in pending.items() if count == 0)
+        while queue:
+            node_id = queue.popleft()
+            order.append(node_id)
+            for dependent_id in dependents.get(node_id, ()):
+                pending[dependent_id] -= 1
+                if pending[dependent_id] == 0:
+                    queue.append(dependent_id)
+        if len(order) < len(nodes):
+            index.after_blocked = [node_id for node_id, count in pending.items() if count > 0]
+        
+        return index
+    
+    def _number_forest(self) -> None:
+        """Depth-first numbering of the hierarchy (no recursion)."""
+        children = self.children
+        preorder = self.preorder
+        depth = self.depth
+        enter = self.enter
+        leave = self.leave
+        
+        # Entries are (node_id, depth); None marks the end of a subtree
+        stack: list = []
+        for root_id in reversed(self.roots):
+            stack.append((root_id, 0))
+        while stack:
+            entry = stack.pop()
+            if entry[0] is None:
+                leave[entry[1]] = len(preorder)
+                continue
+            node_id, level = entry
+            enter[node_id] = len(preorder)
+            depth[node_id] = level
+            preorder.append(node_id)
+            stack.append((None, node_id))
+            for child_id in reversed(children.get(node_id, ())):
+                stack.append((child_id, level + 1))
+    
+    def descendants(self, node_id: str) -> list[str]:
+        """
+        Get all descendants of a node (not including the node itself).
+        
+        For nodes of the hierarchy forest this is a slice of preorder.
+        Detached nodes and ids missing from nodes (which may still have
+        children) are handled by walking the children lists.
+        
+        Args:
+            node_id: ID of the ancestor
+            
+        Returns:
+            Descendant node_ids, in depth-first order
+        """
+        start = self.enter.get(node_id)
+        if start is not None:
+            return self.preorder[start + 1:self.leave[node_id]]
+        
+        result: list[str] = []
+        seen: set[str] = set()
+        stack = list(reversed(self.children.get(node_id, ())))
+        while stack:
+            current = stack.pop()
+            if current in seen:
+                continue
+            seen.add(current)
+            result.append(current)
+            stack.extend(reversed(self.children.get(current, ())))
+        return result
+    
+    def is_descendant(self, node_id: str, ancestor_id: str) -> bool:
+        """
+        Check whether a node lies strictly below another one.
+        
+        Two integer comparisons for nodes of the hierarchy forest; for
+        other ancestors, descendants() is computed once and cached.
+        
+        Args:
+            node_id: ID of the candidate descendant
+            ancestor_id: ID of the ancestor
+            
+        Returns:
+            True if node_id is a child, grandchild, ... of ancestor_id
+        """
+        start = self.enter.get(ancestor_id)
+        if start is not None:
+            position = self.enter.get(node_id)
+            return position is not None and start < position < self.leave[ancestor_id]
+        
+        walked = self._walked.get(ancestor_id)
+        if walked is None:
+            walked = self._walked[ancestor_id] = frozenset(self.descendants(ancestor_id))
+        return node_id in walked
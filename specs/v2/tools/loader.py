@@ -6,6 +6,8 @@ It implements the first stage of the Plan Set processing pipeline.
 
 Key functions:
 - load_fragment(file_path): Load a single YAML file as a Fragment
+- load_fragments(files, jobs, cache): Load many fragments, optionally in
+  parallel and through a FragmentCache
 - merge_fragments(fragments): Merge multiple fragments into a MergedPlan
 
 Requirements covered:
@@ -19,12 +21,16 @@ Requirements covered:
 - 1.8: schedule.default_calendar conflict (only one fragment allowed)
 - 1.9: Return MergedPlan with all merged data
 - 1.10: Source tracking for each element
+
+Merged plans keep sources in a SourceIndex (element type -> id -> file)
+and intern repeated strings to keep large plans compact.
 """
 
+import os
+import sys
+from functools import partial
 from pathlib import Path
-from typing import Any
-
-import yaml
+from typing import TYPE_CHECKING, Any, Optional
 
 from specs.v2.tools.models import (
     Calendar,
@@ -33,11 +39,15 @@ from specs.v2.tools.models import (
     Node,
     Schedule,
     ScheduleNode,
+    SourceIndex,
     Status,
     View,
     ViewFilter,
 )
 
+if TYPE_CHECKING:
+    from specs.v2.tools.cache import FragmentCache
+
 
 # Allowed top-level blocks in a Fragment (Requirement 1.2)
 ALLOWED_TOP_LEVEL_BLOCKS: frozenset[str] = frozenset({
@@ -59,6 +69,18 @@ FORBIDDEN_NODE_FIELDS: frozenset[str] = frozenset({
 })
 
 
+def _intern(value: Any) -> Any:
+    """
+    Intern string values that repeat across many elements.
+    
+    Node ids (also referenced from after, parent and schedule.nodes),
+    kind, status and calendar references then share one string object
+    each instead of one per YAML occurrence. Non-strings are returned
+    unchanged (they are reported by the validator).
+    """
+    return sys.intern(value) if type(value) is str else value
+
+
 class LoadError(Exception):
     """
     Exception raised when loading a fragment fails.
@@ -93,6 +115,10 @@ class LoadError(Exception):
             parts.append(f"(block: '{block_name}')")
         
         super().__init__(" ".join(parts))
+    
+    def __reduce__(self):
+        # Keep file_path and block_name when raised in a worker process
+        return (type(self), (self.message, self.file_path, self.block_name))
 
 
 class MergeConflictError(Exception):
@@ -135,7 +161,7 @@ class MergeConflictError(Exception):
         super().__init__(" ".join(parts))
 
 
-def load_fragment(file_path: str) -> dict[str, Any]:
+def load_fragment(file_path: str, cache: Optional["FragmentCache"] = None) -> dict[str, Any]:
     """
     Load a single YAML file as a Fragment.
     
@@ -144,6 +170,8 @@ def load_fragment(file_path: str) -> dict[str, Any]:
     
     Args:
         file_path: Path to the YAML file to load
+        cache: Optional FragmentCache; on a hit (same file content) the
+               YAML is not parsed, on a miss the parsed data is stored
         
     Returns:
         Dictionary containing:
@@ -170,7 +198,7 @@ def load_fragment(file_path: str) -> dict[str, Any]:
     
     # Read file content
     try:
-        content = path.read_text(encoding="utf-8")
+        raw = path.read_bytes()
     except FileNotFoundError:
         raise LoadError(
             f"File not found: {file_path}",
@@ -187,7 +215,51 @@ def load_fragment(file_path: str) -> dict[str, Any]:
             file_path=file_path,
         )
     
-    # Parse YAML
+    key = None
+    if cache is not None:
+        key = cache.key(raw)
+        data = cache.get(key)
+        if data is not None:
+            data["_source"] = file_path
+            return data
+    
+    try:
+        text = raw.decode("utf-8")
+    except UnicodeDecodeError as e:
+        raise LoadError(
+            f"File is not valid UTF-8: {e}",
+            file_path=file_path,
+        )
+    
+    data = _parse_fragment(text, file_path)
+    if cache is not None:
+        cache.put(key, data)
+    
+    # Add source file information
+    result = dict(data)
+    result["_source"] = file_path
+    
+    return result
+
+
+def _parse_fragment(content: str, file_path: str) -> dict[str, Any]:
+    """
+    Parse fragment text and check its top-level blocks.
+    
+    Args:
+        content: File content
+        file_path: Path of the file (for error messages)
+    
+    Returns:
+        Parsed fragment mapping (without '_source')
+    
+    Raises:
+        LoadError: If YAML is invalid or contains invalid top-level blocks
+    """
+    # Parse YAML (PyYAML is imported on first use: loading a snapshot
+    # never needs it)
+    import yaml
+    
     try:
         data = yaml.safe_load(content)
     except yaml.YAMLError as e:
@@ -217,14 +289,64 @@ def load_fragment(file_path: str) -> dict[str, Any]:
                 block_name=block_name,
             )
     
-    # Add source file information
-    result = dict(data)
-    result["_source"] = file_path
+    return data
+
+
+def load_fragments(
+    files: list[str],
+    jobs: Optional[int] = None,
+    cache: Optional["FragmentCache"] = None,
+) -> list[dict[str, Any]]:
+    """
+    Load several fragments, optionally parsing them in worker processes.
     
-    return result
+    YAML parsing is CPU-bound, so large plan sets load faster when the
+    files are parsed in parallel. Fragments are always returned in the
+    order of files; if several files fail, the error of the first one
+    (in file order) is raised, as with sequential loading.
+    
+    Args:
+        files: List of paths to YAML files to load
+        jobs: Number of worker processes; None or 1 loads sequentially,
+              0 uses one process per CPU
+        cache: Optional FragmentCache (see load_fragment); pruned after
+               new entries were stored
+        
+    Returns:
+        List of fragment dicts (see load_fragment), in file order
+        
+    Raises:
+        LoadError: If any file cannot be read or contains invalid YAML/blocks
+    """
+    if jobs == 0:
+        jobs = os.cpu_count() or 1
+    if not jobs or jobs <= 1 or len(files) <= 1:
+        stored = cache.stored if cache is not None else 0
+        fragments = [load_fragment(file_path, cache) for file_path in files]
+        if cache is not None and cache.stored != stored:
+            cache.prune()
+        return fragments
+    
+    # Imported here: sequential loads (the CLI default) do not need it
+    from concurrent.futures import ProcessPoolExecutor
+    
+    workers = min(jobs, len(files))
+    chunksize = max(1, len(files) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        fragments = list(executor.map(
+            partial(load_fragment, cache=cache), files, chunksize=chunksize
+        ))
+    # Entries were stored by the workers, if at all
+    if cache is not None:
+        cache.prune()
+    return fragments
 
 
-def load_plan_set(files: list[str]) -> MergedPlan:
+def load_plan_set(
+    files: list[str],
+    jobs: Optional[int] = None,
+    cache: Optional["FragmentCache"] = None,
+) -> MergedPlan:
     """
     Load and merge plan fragments from multiple files.
     
@@ -233,6 +355,10 @@ def load_plan_set(files: list[str]) -> MergedPlan:
     
     Args:
         files: List of paths to YAML files to load
+        jobs: Number of worker processes for parsing (see load_fragments);
+              merging always happens in file order, so the result,
+              conflicts and sources are the same for any value
+        cache: Optional FragmentCache of parsed fragments (see load_fragment)
         
     Returns:
         MergedPlan: The merged plan containing all data from all fragments
@@ -250,7 +376,7 @@ def load_plan_set(files: list[str]) -> MergedPlan:
         'Task 1'
     """
     # Load all fragments
-    fragments = [load_fragment(file_path) for file_path in files]
+    fragments = load_fragments(files, jobs, cache)
     
     # Merge and return
     return merge_fragments(fragments)
@@ -300,7 +426,7 @@ def merge_fragments(fragments: list[dict[str, Any]]) -> MergedPlan:
         'nodes.yaml'
     """
     result = MergedPlan()
-    sources: dict[str, str] = {}
+    sources = SourceIndex()
     
     # Track version and default_calendar sources
     version_source: str | None = None
@@ -338,7 +464,7 @@ def merge_fragments(fragments: list[dict[str, Any]]) -> MergedPlan:
                     )
                 setattr(result.meta, key, value)
                 meta_sources[key] = source
-                sources[f"meta:{key}"] = source
+                sources.add("meta", key, source)
         
         # 3. Merge statuses (Requirement 1.5)
         if "statuses" in fragment and fragment["statuses"]:
@@ -348,13 +474,13 @@ def merge_fragments(fragments: list[dict[str, Any]]) -> MergedPlan:
                         f"Duplicate status_id '{status_id}'",
                         element_type="status",
                         element_id=status_id,
-                        files=[sources[f"status:{status_id}"], source],
+                        files=[sources.source("status", status_id), source],
                     )
                 result.statuses[status_id] = Status(
                     label=status_data.get("label", ""),
                     color=status_data.get("color"),
                 )
-                sources[f"status:{status_id}"] = source
+                sources.add("status", status_id, source)
         
         # 4. Merge nodes (Requirement 1.4)
         if "nodes" in fragment and fragment["nodes"]:
@@ -364,7 +490,7 @@ def merge_fragments(fragments: list[dict[str, Any]]) -> MergedPlan:
                         f"Duplicate node_id '{node_id}'",
                         element_type="node",
                         element_id=node_id,
-                        files=[sources[f"node:{node_id}"], source],
+                        files=[sources.source("node", node_id), source],
                     )
                 
                 # Check for forbidden fields (Requirement 2.4)
@@ -377,19 +503,23 @@ def merge_fragments(fragments: list[dict[str, Any]]) -> MergedPlan:
                             block_name=f"nodes.{node_id}.{forbidden_field}",
                         )
                 
+                node_id = _intern(node_id)
+                after = node_data.get("after")
+                if isinstance(after, list):
+                    after = [_intern(dep_id) for dep_id in after]
                 result.nodes[node_id] = Node(
                     title=node_data.get("title", ""),
-                    kind=node_data.get("kind"),
-                    status=node_data.get("status"),
-                    parent=node_data.get("parent"),
-                    after=node_data.get("after"),
+                    kind=_intern(node_data.get("kind")),
+                    status=_intern(node_data.get("status")),
+                    parent=_intern(node_data.get("parent")),
+                    after=after,
                     milestone=node_data.get("milestone", False),
                     issue=node_data.get("issue"),
                     notes=node_data.get("notes"),
                     effort=node_data.get("effort"),
                     x=node_data.get("x"),
                 )
-                sources[f"node:{node_id}"] = source
+                sources.add("node", node_id, source)
         
         # 5-7. Merge schedule (Requirements 1.7, 1.8)
         if "schedule" in fragment and fragment["schedule"]:
@@ -407,12 +537,12 @@ def merge_fragments(fragments: list[dict[str, Any]]) -> MergedPlan:
                             f"Duplicate calendar_id '{cal_id}'",
                             element_type="calendar",
                             element_id=cal_id,
-                            files=[sources[f"calendar:{cal_id}"], source],
+                            files=[sources.source("calendar", cal_id), source],
                         )
                     result.schedule.calendars[cal_id] = Calendar(
                         excludes=cal_data.get("excludes", []),
                     )
-                    sources[f"calendar:{cal_id}"] = source
+                    sources.add("calendar", cal_id, source)
             
             # 6. Merge schedule.nodes (Requirement 1.7)
             if "nodes" in frag_schedule and frag_schedule["nodes"]:
@@ -422,15 +552,16 @@ def merge_fragments(fragments: list[dict[str, Any]]) -> MergedPlan:
                             f"Duplicate schedule node_id '{sn_id}'",
                             element_type="schedule_node",
                             element_id=sn_id,
-                            files=[sources[f"schedule_node:{sn_id}"], source],
+                            files=[sources.source("schedule_node", sn_id), source],
                         )
+                    sn_id = _intern(sn_id)
                     result.schedule.nodes[sn_id] = ScheduleNode(
-                        start=sn_data.get("start"),
-                        finish=sn_data.get("finish"),
-                        duration=sn_data.get("duration"),
-                        calendar=sn_data.get("calendar"),
+                        start=_intern(sn_data.get("start")),
+                        finish=_intern(sn_data.get("finish")),
+                        duration=_intern(sn_data.get("duration")),
+                        calendar=_intern(sn_data.get("calendar")),
                     )
-                    sources[f"schedule_node:{sn_id}"] = source
+                    sources.add("schedule_node", sn_id, source)
             
             # 7. Check default_calendar (Requirement 1.8)
             if "default_calendar" in frag_schedule and frag_schedule["default_calendar"]:
@@ -442,7 +573,7 @@ def merge_fragments(fragments: list[dict[str, Any]]) -> MergedPlan:
                     )
                 result.schedule.default_calendar = frag_schedule["default_calendar"]
                 default_calendar_source = source
-                sources["schedule:default_calendar"] = source
+                sources.add("schedule", "default_calendar", source)
         
         # 8. Merge views
         if "views" in fragment and fragment["views"]:
@@ -452,7 +583,7 @@ def merge_fragments(fragments: list[dict[str, Any]]) -> MergedPlan:
                         f"Duplicate view_id '{view_id}'",
                         element_type="view",
                         element_id=view_id,
-                        files=[sources[f"view:{view_id}"], source],
+                        files=[sources.source("view", view_id), source],
                     )
                 
                 # Parse where filter if present
@@ -476,7 +607,7 @@ def merge_fragments(fragments: list[dict[str, Any]]) -> MergedPlan:
                     axis_format=view_data.get("axis_format"),
                     tick_interval=view_data.get("tick_interval"),
                 )
-                sources[f"view:{view_id}"] = source
+                sources.add("view", view_id, source)
         
         # 9. Merge x (extensions)
         if "x" in fragment and fragment["x"]:
@@ -486,10 +617,10 @@ def merge_fragments(fragments: list[dict[str, Any]]) -> MergedPlan:
                         f"Duplicate extension key '{x_key}'",
                         element_type="x",
                         element_id=x_key,
-                        files=[sources[f"x:{x_key}"], source],
+                        files=[sources.source("x", x_key), source],
                     )
                 result.x[x_key] = x_value
-                sources[f"x:{x_key}"] = source
+                sources.add("x", x_key, source)
     
     # Store sources in result (Requirement 1.10)
     result.sources = sources
@@ -10,6 +10,13 @@ Key concepts:
 - Schedule: Optional layer for calendar planning
 - View: Pure visualization configuration (no effect on scheduling)
 - MergedPlan: Result of merging multiple plan fragments
+- SourceIndex: Source file of each merged element, grouped by element type
+- MergedPlan.index: cached PlanIndex (children, reverse after edges, ...)
+
+Memory layout:
+- Per-element models (Node, ScheduleNode, View, ...) are slotted
+  dataclasses without a per-instance __dict__; the loader interns
+  repeated strings (ids, kind, status, calendar references)
 
 Requirements covered:
 - 2.1, 2.2, 2.3: Node structure and fields
@@ -17,8 +24,12 @@ Requirements covered:
 - 4.3, 4.4, 4.5: View and ViewFilter structure
 """
 
+from collections.abc import Iterator, MutableMapping
 from dataclasses import dataclass, field
-from typing import Any, Optional
+from typing import TYPE_CHECKING, Any, Optional
+
+if TYPE_CHECKING:
+    from specs.v2.tools.index import PlanIndex
 
 
 @dataclass
@@ -42,7 +53,7 @@ class Meta:
     effort_unit: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Status:
     """
     Status definition for nodes.
@@ -57,7 +68,7 @@ class Status:
     color: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Node:
     """
     Work item in the plan structure (v2).
@@ -105,7 +116,7 @@ class Node:
     effort_gap: Optional[float] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Calendar:
     """
     Calendar definition for scheduling.
@@ -122,7 +133,7 @@ class Calendar:
     excludes: list[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class ScheduleNode:
     """
     Scheduling information for a node.
@@ -142,6 +153,12 @@ class ScheduleNode:
         # Computed fields (set by scheduler):
         computed_start: Calculated start date
         computed_finish: Calculated finish date
+        
+        # Computed fields (set by scheduler.compute_critical_path):
+        latest_start: Latest start date that does not delay the plan finish
+        latest_finish: Latest finish date that does not delay the plan finish
+        total_float: Slack in working days (latest_start - computed_start);
+                     0 for nodes on the critical path
     
     Requirements: 3.8 (start, finish, duration, calendar fields)
     """
@@ -153,6 +170,89 @@ class ScheduleNode:
     # Computed fields (set by scheduler)
     computed_start: Optional[str] = None
     computed_finish: Optional[str] = None
+    latest_start: Optional[str] = None
+    latest_finish: Optional[str] = None
+    total_float: Optional[int] = None
+
+
+@dataclass(frozen=True, slots=True)
+class ScheduleWarning:
+    """
+    Warning produced by the scheduler for a single node.
+    
+    Structured so that callers can filter and count warnings by node
+    or code without parsing message strings.
+    
+    Attributes:
+        node_id: ID of the scheduled node the warning refers to
+        code: Machine-readable warning code (see scheduler.WARN_* constants)
+        message: Human-readable description
+    """
+    node_id: str
+    code: str
+    message: str
+    
+    def __str__(self) -> str:
+        return self.message
+
+
+class NodeMap(dict):
+    """
+    dict keyed by node ID that counts changes to its entries.
+    
+    Used for MergedPlan.nodes and Schedule.nodes. version increases
+    whenever an entry is added, replaced or removed; MergedPlan.index
+    (and the filter masks of render/masks.py) are rebuilt when it
+    differs from the version they were built at. Edits of the values
+    themselves (e.g. node.parent = ...) do not change it: code making
+    them calls MergedPlan.invalidate_index().
+    """
+    __slots__ = ("version",)
+    
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.version = 0
+    
+    def __reduce__(self) -> tuple:
+        # Keep the version: a copied or unpickled MergedPlan carries its
+        # cached index and the version it was built at
+        return (type(self), (dict(self),), self.version)
+    
+    def __setstate__(self, version: int) -> None:
+        self.version = version
+    
+    def __setitem__(self, key: str, value: Any) -> None:
+        super().__setitem__(key, value)
+        self.version += 1
+    
+    def __delitem__(self, key: str) -> None:
+        super().__delitem__(key)
+        self.version += 1
+    
+    def __ior__(self, other: Any) -> "NodeMap":
+        self.update(other)
+        return self
+    
+    def pop(self, *args: Any) -> Any:
+        self.version += 1
+        return super().pop(*args)
+    
+    def popitem(self) -> tuple[str, Any]:
+        self.version += 1
+        return super().popitem()
+    
+    def setdefault(self, key: str, default: Any = None) -> Any:
+        if key not in self:
+            self.version += 1
+        return super().setdefault(key, default)
+    
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        self.version += 1
+        super().update(*args, **kwargs)
+    
+    def clear(self) -> None:
+        self.version += 1
+        super().clear()
 
 
 @dataclass
@@ -167,11 +267,15 @@ class Schedule:
         calendars: Dictionary of calendar_id -> Calendar definitions
         default_calendar: Optional reference to default calendar_id
                           Used when ScheduleNode.calendar is not set
-        nodes: Dictionary of node_id -> ScheduleNode
+        nodes: Dictionary of node_id -> ScheduleNode (a NodeMap)
                Only nodes present here participate in schedule calculation
         
         # Runtime fields:
-        warnings: List of scheduling warnings (e.g., unschedulable nodes)
+        warnings: List of ScheduleWarning records (e.g., unschedulable nodes)
+        critical_path: node_ids of the critical chain, first to last
+                       (set by scheduler.compute_critical_path)
+        columns: columns.ScheduleColumns with computed dates as day
+                 ordinals (set by scheduler.compute_schedule)
     
     Requirements:
         - 3.3: calendars block
@@ -180,13 +284,20 @@ class Schedule:
     """
     calendars: dict[str, Calendar] = field(default_factory=dict)
     default_calendar: Optional[str] = None
-    nodes: dict[str, ScheduleNode] = field(default_factory=dict)
+    nodes: dict[str, ScheduleNode] = field(default_factory=NodeMap)
     
     # Runtime fields
-    warnings: list[str] = field(default_factory=list)
+    warnings: list[ScheduleWarning] = field(default_factory=list)
+    critical_path: list[str] = field(default_factory=list)
+    columns: Optional[Any] = field(default=None, compare=False, repr=False)
+    
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name == "nodes" and not isinstance(value, NodeMap):
+            value = NodeMap(value)
+        object.__setattr__(self, name, value)
 
 
-@dataclass
+@dataclass(slots=True)
 class ViewFilter:
     """
     Structural filter for node selection in views.
@@ -211,7 +322,7 @@ class ViewFilter:
     parent: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class View:
     """
     View configuration for visualization.
@@ -251,6 +362,85 @@ class View:
     tick_interval: Optional[str] = None
 
 
+class SourceIndex(MutableMapping):
+    """
+    Source file of each merged element, grouped by element type.
+    
+    Stores element_type -> {element_id -> file_path} instead of one
+    concatenated "type:id" string key per element; the nested dicts
+    reuse the (interned) element ids as keys.
+    
+    Also works as a flat mapping with "type:id" keys for compatibility:
+        >>> sources.add("node", "task1", "nodes.plan.yaml")
+        >>> sources["node:task1"]
+        'nodes.plan.yaml'
+    """
+    __slots__ = ("_by_type",)
+    
+    def __init__(self, items: Optional[dict[str, str]] = None) -> None:
+        self._by_type: dict[str, dict[str, str]] = {}
+        if items:
+            self.update(items)
+    
+    def add(self, element_type: str, element_id: str, source: str) -> None:
+        """Record the source file of an element."""
+        by_id = self._by_type.get(element_type)
+        if by_id is None:
+            by_id = self._by_type[element_type] = {}
+        by_id[element_id] = source
+    
+    def discard(self, element_type: str, element_id: str) -> None:
+        """Forget the source of an element, if recorded."""
+        by_id = self._by_type.get(element_type)
+        if by_id is not None:
+            by_id.pop(element_id, None)
+    
+    def source(self, element_type: str, element_id: str) -> Optional[str]:
+        """Return the source file of an element, or None."""
+        by_id = self._by_type.get(element_type)
+        return by_id.get(element_id) if by_id is not None else None
+    
+    def of_type(self, element_type: str) -> dict[str, str]:
+        """Return element_id -> source file for one element type (do not modify)."""
+        return self._by_type.get(element_type, {})
+    
+    @staticmethod
+    def _split(key: str) -> tuple[str, str]:
+        element_type, sep, element_id = key.partition(":")
+        if not sep:
+            raise KeyError(key)
+        return element_type, element_id
+    
+    def __getitem__(self, key: str) -> str:
+        element_type, element_id = self._split(key)
+        try:
+            return self._by_type[element_type][element_id]
+        except KeyError:
+            raise KeyError(key) from None
+    
+    def __setitem__(self, key: str, source: str) -> None:
+        element_type, element_id = self._split(key)
+        self.add(element_type, element_id, source)
+    
+    def __delitem__(self, key: str) -> None:
+        element_type, element_id = self._split(key)
+        try:
+            del self._by_type[element_type][element_id]
+        except KeyError:
+            raise KeyError(key) from None
+    
+    def __iter__(self) -> Iterator[str]:
+        for element_type, by_id in self._by_type.items():
+            for element_id in by_id:
+                yield f"{element_type}:{element_id}"
+    
+    def __len__(self) -> int:
+        return sum(len(by_id) for by_id in self._by_type.values())
+    
+    def __repr__(self) -> str:
+        return f"SourceIndex({dict(self)!r})"
+
+
 @dataclass
 class MergedPlan:
     """
@@ -263,15 +453,23 @@ class MergedPlan:
         version: Plan format version (must be 2 for v2)
         meta: Plan metadata (merged from fragments)
         statuses: Dictionary of status_id -> Status definitions
-        nodes: Dictionary of node_id -> Node definitions
+        nodes: Dictionary of node_id -> Node definitions (a NodeMap;
+               dicts assigned to plan.nodes are wrapped in one)
         schedule: Optional scheduling layer
         views: Dictionary of view_id -> View definitions
         x: Extension data (arbitrary key-value pairs)
         
         # Merge metadata:
-        sources: Dictionary mapping element_id to source file path
-                 Format: "type:id" -> "file_path"
+        sources: SourceIndex mapping elements to source file paths
+                 Flat access: "type:id" -> "file_path"
                  Example: "node:task1" -> "nodes.plan.yaml"
+                 Structured: sources.source("node", "task1")
+        
+        # Derived data:
+        index: PlanIndex of the nodes (see index.py), built on first
+               access and cached until plan.nodes gains, loses or
+               replaces an entry; call invalidate_index() after editing
+               a node's fields (parent, after, kind, status) in place
     
     Requirements:
         - 1.9: Merged plan with all data from fragments
@@ -280,10 +478,43 @@ class MergedPlan:
     version: int = 2
     meta: Meta = field(default_factory=Meta)
     statuses: dict[str, Status] = field(default_factory=dict)
-    nodes: dict[str, Node] = field(default_factory=dict)
+    nodes: dict[str, Node] = field(default_factory=NodeMap)
     schedule: Optional[Schedule] = None
     views: dict[str, View] = field(default_factory=dict)
     x: dict[str, Any] = field(default_factory=dict)
     
     # Merge metadata
-    sources: dict[str, str] = field(default_factory=dict)
+    sources: SourceIndex = field(default_factory=SourceIndex)
+    
+    # Cached PlanIndex and the plan.nodes version it was built at
+    _index: Optional["PlanIndex"] = field(default=None, init=False, repr=False, compare=False)
+    _index_version: Optional[int] = field(default=None, init=False, repr=False, compare=False)
+    
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name == "nodes":
+            if not isinstance(value, NodeMap):
+                value = NodeMap(value)
+            # A new mapping starts its own version count
+            object.__setattr__(self, "_index", None)
+        object.__setattr__(self, name, value)
+    
+    @property
+    def index(self) -> "PlanIndex":
+        """
+        PlanIndex of the nodes, built on first access.
+        
+        Rebuilt automatically when plan.nodes is replaced or an entry is
+        added, replaced or removed (NodeMap.version); edits of existing
+        Node objects (parent, after, kind, status) need invalidate_index().
+        """
+        version = self.nodes.version
+        if self._index is None or self._index_version != version:
+            from specs.v2.tools.index import PlanIndex
+            self._index = PlanIndex.build(self)
+            self._index_version = version
+        return self._index
+    
+    def invalidate_index(self) -> None:
+        """Drop the cached PlanIndex (after editing nodes in place)."""
+        self._index = None
+        self._index_version = None
@@ -6,6 +6,15 @@ This package provides various rendering functions for visualizing plans:
 - render_tree: Hierarchical tree view
 - render_list: Flat list view
 - render_deps: Dependency graph
+- render_critical: Critical path and float report
+- render_effort_summary: Effort totals per dimension value (cube.py)
+
+Each renderer has a streaming variant (iter_gantt, iter_tree, iter_list,
+iter_deps, iter_critical, iter_effort_summary) that yields the output
+lines one at a time; write_lines writes them to a text stream with
+bounded memory. The render_* functions join the same lines into one
+string. The renderer modules are imported on first access to one of
+their names.
 
 Requirements covered:
 - 5.4: render_gantt(plan, view_id) -> string
@@ -15,9 +24,38 @@ Requirements covered:
 - 5.8: render_deps(plan, view_id) -> string
 """
 
-from specs.v2.tools.render.gantt import render_gantt
-from specs.v2.tools.render.tree import render_tree
-from specs.v2.tools.render.list import render_list
-from specs.v2.tools.render.deps import render_deps
+import importlib
+
+# Module (within this package) defining each exported name; the renderer
+# modules are imported on first access, so importing one renderer (e.g.
+# specs.v2.tools.render.tree) does not import the others
+_EXPORTS = {
+    "write_lines": "common",
+    "iter_gantt": "gantt", "render_gantt": "gantt",
+    "iter_tree": "tree", "render_tree": "tree",
+    "iter_list": "list", "render_list": "list",
+    "iter_deps": "deps", "render_deps": "deps",
+    "iter_critical": "critical", "render_critical": "critical",
+    "iter_effort_summary": "summary", "render_effort_summary": "summary",
+}
+
+__all__ = [
+    "render_gantt", "render_tree", "render_list", "render_deps", "render_critical",
+    "render_effort_summary",
+    "iter_gantt", "iter_tree", "iter_list", "iter_deps", "iter_critical",
+    "iter_effort_summary",
+    "write_lines",
+]
+
+
+def __getattr__(name: str):
+    """Import the renderer defining name on first access (PEP 562)."""
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f"{__name__}.{_EXPORTS[name]}"), name)
+    globals()[name] = value
+    return value
+
 
-__all__ = ["render_gantt", "render_tree", "render_list", "render_deps"]
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -7,6 +7,7 @@ This module provides shared functionality used by all renderers:
 - get_descendants: Get all descendants of a node
 - escape_mermaid_string: Escape text for Mermaid labels
 - sanitize_mermaid_text: Clean text for Mermaid titles/labels
+- write_lines: Write the lines of a streaming renderer to a text stream
 
 Requirements covered:
 - 4.7: View filtering with where clause (kind, status, has_schedule, parent)
@@ -14,9 +15,11 @@ Requirements covered:
 - 4.9: Renderer uses calendar from Schedule for date calculations (not View)
 """
 
-from typing import Optional
+from itertools import islice
+from typing import Iterable, Optional, TextIO
 
 from specs.v2.tools.models import MergedPlan, ViewFilter
+from specs.v2.tools.render.masks import FilterMasks
 
 
 def escape_mermaid_string(text: str) -> str:
@@ -59,8 +62,8 @@ def get_descendants(plan: MergedPlan, parent_id: str) -> set[str]:
     """
     Get all descendants of a node (children, grandchildren, etc.).
     
-    This function performs a breadth-first search to find all nodes
-    that are descendants of the specified parent node.
+    The descendants are a contiguous slice of the depth-first order
+    kept by plan.index (Euler-tour interval of the parent).
     
     Args:
         plan: MergedPlan containing nodes
@@ -72,25 +75,7 @@ def get_descendants(plan: MergedPlan, parent_id: str) -> set[str]:
     Requirements:
         - 4.7: View filtering with where.parent
     """
-    descendants = set()
-    
-    # Build parent -> children mapping
-    children_map: dict[str, list[str]] = {}
-    for node_id, node in plan.nodes.items():
-        if node.parent:
-            if node.parent not in children_map:
-                children_map[node.parent] = []
-            children_map[node.parent].append(node_id)
-    
-    # BFS to find all descendants
-    queue = children_map.get(parent_id, []).copy()
-    while queue:
-        node_id = queue.pop(0)
-        if node_id not in descendants:
-            descendants.add(node_id)
-            queue.extend(children_map.get(node_id, []))
-    
-    return descendants
+    return set(plan.index.descendants(parent_id))
 
 
 def apply_view_filter(
@@ -125,47 +110,8 @@ def apply_view_filter(
     if view_filter is None:
         return node_ids
     
-    result = []
-    
-    # Build set of scheduled node IDs for has_schedule filter
-    scheduled_ids = set()
-    if plan.schedule:
-        scheduled_ids = set(plan.schedule.nodes.keys())
-    
-    # Build set of descendants for parent filter
-    descendants = None
-    if view_filter.parent:
-        descendants = get_descendants(plan, view_filter.parent)
-    
-    for node_id in node_ids:
-        node = plan.nodes.get(node_id)
-        if node is None:
-            continue
-        
-        # Filter by kind
-        if view_filter.kind is not None:
-            if node.kind not in view_filter.kind:
-                continue
-        
-        # Filter by status
-        if view_filter.status is not None:
-            if node.status not in view_filter.status:
-                continue
-        
-        # Filter by has_schedule
-        if view_filter.has_schedule is not None:
-            is_scheduled = node_id in scheduled_ids
-            if view_filter.has_schedule != is_scheduled:
-                continue
-        
-        # Filter by parent (descendants)
-        if descendants is not None:
-            if node_id not in descendants:
-                continue
-        
-        result.append(node_id)
-    
-    return result
+    # Bitset evaluation, shared by all views and renderers of the plan
+    return FilterMasks.of(plan).filter(node_ids, view_filter)
 
 
 def sort_nodes(
@@ -182,6 +128,8 @@ def sort_nodes(
     - kind: Sort alphabetically by kind
     - effort: Sort numerically by effort (or effort_effective if computed)
     - effort_effective: Sort numerically by effort_effective
+    - start, finish: Sort by computed schedule dates (nodes without
+      computed dates last)
     - Any other field: Attempts to get attribute dynamically
     
     Args:
@@ -198,6 +146,9 @@ def sort_nodes(
     if order_by is None:
         return node_ids
     
+    if order_by in ("start", "finish"):
+        return _sort_by_schedule_date(plan, node_ids, order_by)
+    
     def get_sort_key(node_id: str):
         node = plan.nodes.get(node_id)
         if node is None:
@@ -221,3 +172,68 @@ def sort_nodes(
             return getattr(node, order_by, "") or ""
     
     return sorted(node_ids, key=get_sort_key)
+
+
+def _sort_by_schedule_date(
+    plan: MergedPlan,
+    node_ids: list[str],
+    field: str,
+) -> list[str]:
+    """
+    Sort nodes by computed start or finish date.
+    
+    Uses the ordinal columns of the schedule when available and the
+    ISO strings (which sort like dates) otherwise. Nodes without computed
+    dates keep their relative order after the dated ones.
+    
+    Args:
+        plan: MergedPlan after compute_schedule
+        node_ids: List of node IDs to sort
+        field: "start" or "finish"
+        
+    Returns:
+        Sorted list of node IDs
+    """
+    if plan.schedule is None:
+        return node_ids
+    
+    if plan.schedule.columns is not None:
+        keys = plan.schedule.columns.sort_key(field)
+    else:
+        keys = {}
+        for node_id, sn in plan.schedule.nodes.items():
+            value = sn.computed_start if field == "start" else sn.computed_finish
+            if value:
+                keys[node_id] = value
+    
+    dated = sorted((n for n in node_ids if n in keys), key=keys.__getitem__)
+    return dated + [n for n in node_ids if n not in keys]
+
+
+# Lines written per write() call by write_lines
+WRITE_CHUNK_LINES = 4096
+
+
+def write_lines(lines: Iterable[str], stream: TextIO) -> None:
+    """
+    Write rendered lines to a text stream, as print() of the joined lines would.
+    
+    Lines are consumed in chunks of WRITE_CHUNK_LINES, so memory stays
+    bounded by one chunk however long the output is.
+    
+    Args:
+        lines: Lines without line terminators (e.g. from iter_tree)
+        stream: Text stream to write to (e.g. sys.stdout or an open file)
+    """
+    lines = iter(lines)
+    written = False
+    while True:
+        chunk = list(islice(lines, WRITE_CHUNK_LINES))
+        if not chunk:
+            break
+        chunk.append("")
+        stream.write("\n".join(chunk))
+        written = True
+    if not written:
+        # An empty render is an empty line, as with print("")
+        stream.write("\n")
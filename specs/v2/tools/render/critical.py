@@ -0,0 +1,118 @@
+"""
+Critical path renderer for opskarta v2 plans.
+
+This module generates a text report of the critical path and the
+float (slack) of scheduled nodes. It expects compute_schedule and
+compute_critical_path to have been run on the plan.
+
+Key features:
+- Lists the critical chain, first to last, with computed dates
+- Lists the remaining scheduled nodes ordered by total float
+- Applies view filtering (where) if view_id is provided
+- iter_critical yields the lines one at a time (render_critical joins them)
+
+Example output:
+    Critical path (finish 2024-03-15):
+    - Design [2024-03-01 .. 2024-03-05]
+    - Build [2024-03-06 .. 2024-03-15]
+    
+    Float:
+    - Docs [2024-03-06 .. 2024-03-07] float 6d, latest 2024-03-14 .. 2024-03-15
+"""
+
+from typing import Iterator, Optional
+
+from specs.v2.tools.models import MergedPlan, View
+from specs.v2.tools.render.common import apply_view_filter
+
+
+def _format_dates(start: Optional[str], finish: Optional[str]) -> str:
+    """Format a start/finish pair as '[start .. finish]'."""
+    return f"[{start} .. {finish}]"
+
+
+def render_critical(plan: MergedPlan, view_id: Optional[str] = None) -> str:
+    """
+    Generate a critical path report from a MergedPlan.
+    
+    Args:
+        plan: MergedPlan after compute_schedule and compute_critical_path
+        view_id: Optional ID of the view to use for filtering
+    
+    Returns:
+        Report as a string (empty if nothing is scheduled)
+    
+    Raises:
+        ValueError: If view_id is provided but view doesn't exist
+    """
+    return "\n".join(iter_critical(plan, view_id))
+
+
+def iter_critical(plan: MergedPlan, view_id: Optional[str] = None) -> Iterator[str]:
+    """
+    Generate the lines of render_critical one at a time.
+    
+    Args:
+        plan: MergedPlan after compute_schedule and compute_critical_path
+        view_id: Optional ID of the view to use for filtering
+    
+    Returns:
+        Iterator over the output lines (without line terminators)
+    
+    Raises:
+        ValueError: If view_id is provided but view doesn't exist
+                    (raised by this call, before any line is produced)
+    """
+    view: Optional[View] = None
+    if view_id:
+        view = plan.views.get(view_id)
+        if view is None:
+            raise ValueError(f"View '{view_id}' not found")
+    return _critical_lines(plan, view)
+
+
+def _critical_lines(plan: MergedPlan, view: Optional[View]) -> Iterator[str]:
+    """Lines of the report for an optional view."""
+    if plan.schedule is None:
+        return
+    
+    schedule_nodes = plan.schedule.nodes
+    node_ids = [
+        node_id for node_id, sn in schedule_nodes.items()
+        if node_id in plan.nodes and sn.total_float is not None
+    ]
+    if view and view.where:
+        node_ids = apply_view_filter(plan, node_ids, view.where)
+    if not node_ids:
+        return
+    
+    visible = set(node_ids)
+    critical = [node_id for node_id in plan.schedule.critical_path if node_id in visible]
+    critical_set = set(critical)
+    
+    if critical:
+        finish = schedule_nodes[plan.schedule.critical_path[-1]].computed_finish
+        yield f"Critical path (finish {finish}):"
+        for node_id in critical:
+            sn = schedule_nodes[node_id]
+            yield (
+                f"- {plan.nodes[node_id].title} "
+                f"{_format_dates(sn.computed_start, sn.computed_finish)}"
+            )
+    
+    # Remaining nodes, least slack first (stable on schedule order)
+    others = sorted(
+        (node_id for node_id in node_ids if node_id not in critical_set),
+        key=lambda node_id: schedule_nodes[node_id].total_float,
+    )
+    if others:
+        if critical:
+            yield ""
+        yield "Float:"
+        for node_id in others:
+            sn = schedule_nodes[node_id]
+            yield (
+                f"- {plan.nodes[node_id].title} "
+                f"{_format_dates(sn.computed_start, sn.computed_finish)} "
+                f"float {sn.total_float}d, latest {sn.latest_start} .. {sn.latest_finish}"
+            )
@@ -9,6 +9,7 @@ Key features:
 - Mermaid flowchart LR (left-to-right) format
 - Shows "after" relationships as arrows (dependency --> dependent)
 - Applies view filtering (where) if view_id is provided
+- iter_deps yields the lines one at a time (render_deps joins them)
 
 Requirements covered:
 - 5.8: render_deps(plan: Merged_Plan, view_id: Optional[string]) -> string
@@ -23,7 +24,7 @@ Example output:
         task2 --> task3
 """
 
-from typing import Optional
+from typing import Iterator, Optional
 
 from specs.v2.tools.models import MergedPlan, View
 from specs.v2.tools.render.common import (
@@ -101,15 +102,35 @@ def render_deps(plan: MergedPlan, view_id: Optional[str] = None) -> str:
             task1 --> task2
             task2 --> task3
     """
-    lines: list[str] = []
+    return "\n".join(iter_deps(plan, view_id))
+
+
+def iter_deps(plan: MergedPlan, view_id: Optional[str] = None) -> Iterator[str]:
+    """
+    Generate the lines of render_deps one at a time.
     
+    Args:
+        plan: MergedPlan with nodes
+        view_id: Optional ID of the view to use for filtering
+        
+    Returns:
+        Iterator over the output lines (without line terminators)
+        
+    Raises:
+        ValueError: If view_id is provided but view doesn't exist
+                    (raised by this call, before any line is produced)
+    """
     # Get view if specified
     view: Optional[View] = None
     if view_id:
         view = plan.views.get(view_id)
         if view is None:
             raise ValueError(f"View '{view_id}' not found")
-    
+    return _deps_lines(plan, view)
+
+
+def _deps_lines(plan: MergedPlan, view: Optional[View]) -> Iterator[str]:
+    """Lines of the flowchart for an optional view."""
     # Get all node IDs
     all_node_ids = list(plan.nodes.keys())
     
@@ -119,38 +140,23 @@ def render_deps(plan: MergedPlan, view_id: Optional[str] = None) -> str:
     else:
         filtered_ids = set(all_node_ids)
     
-    # If no nodes pass filter, return empty flowchart
-    if not filtered_ids:
-        return "flowchart LR"
-    
-    # Start the flowchart
-    lines.append("flowchart LR")
+    # Start the flowchart (empty if no nodes pass the filter)
+    yield "flowchart LR"
     
-    # Collect edges (dependency relationships)
-    edges: list[tuple[str, str]] = []
+    ordered_ids = [node_id for node_id in sorted(filtered_ids) if node_id in plan.nodes]
     
-    # Add node definitions and collect edges
-    for node_id in sorted(filtered_ids):
-        node = plan.nodes.get(node_id)
-        if node is None:
-            continue
-        
-        # Create node definition with label
+    # Node definitions with labels
+    for node_id in ordered_ids:
         safe_id = _sanitize_node_id(node_id)
-        safe_label = _escape_mermaid_label(node.title)
-        lines.append(f'    {safe_id}["{safe_label}"]')
-        
-        # Collect edges from after dependencies
-        if node.after:
-            for dep_id in node.after:
-                # Only include edge if both nodes are in filtered set
-                if dep_id in filtered_ids:
-                    edges.append((dep_id, node_id))
+        safe_label = _escape_mermaid_label(plan.nodes[node_id].title)
+        yield f'    {safe_id}["{safe_label}"]'
     
-    # Add edges (dependency --> dependent)
-    for dep_id, node_id in edges:
-        safe_dep_id = _sanitize_node_id(dep_id)
+    # Edges (dependency --> dependent), only between filtered nodes
+    for node_id in ordered_ids:
+        after = plan.nodes[node_id].after
+        if not after:
+            continue
         safe_node_id = _sanitize_node_id(node_id)
-        lines.append(f"    {safe_dep_id} --> {safe_node_id}")
-    
-    return "\n".join(lines)
+        for dep_id in after:
+            if dep_id in filtered_ids:
+                yield f"    {_sanitize_node_id(dep_id)} --> {safe_node_id}"
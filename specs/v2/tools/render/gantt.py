@@ -10,13 +10,14 @@ Key features:
 - Uses calendar from schedule for date calculations
 - Applies view filtering (where) if view_id is provided
 - Supports view format settings (date_format, axis_format, tick_interval)
+- iter_gantt yields the lines one at a time (render_gantt joins them)
 
 Requirements covered:
 - 5.4: render_gantt(plan: Merged_Plan, view_id: string) -> string
 - 5.5: Use calendar from schedule for Gantt dates
 """
 
-from typing import Optional
+from typing import Iterator, Optional
 
 from specs.v2.tools.models import MergedPlan, View, ViewFilter
 from specs.v2.tools.render.common import (
@@ -111,17 +112,37 @@ def render_gantt(plan: MergedPlan, view_id: str) -> str:
             Task 2 :task2, 2024-03-06, 2024-03-10
         ```
     """
-    lines: list[str] = []
+    return "\n".join(iter_gantt(plan, view_id))
+
+
+def iter_gantt(plan: MergedPlan, view_id: str) -> Iterator[str]:
+    """
+    Generate the lines of render_gantt one at a time.
     
+    Args:
+        plan: MergedPlan with schedule and computed dates
+        view_id: ID of the view to use for filtering and formatting
+        
+    Returns:
+        Iterator over the output lines (without line terminators)
+        
+    Raises:
+        ValueError: If view_id is provided but view doesn't exist
+                    (raised by this call, before any line is produced)
+    """
     # Get view if specified
     view: Optional[View] = None
     if view_id:
         view = plan.views.get(view_id)
         if view is None:
             raise ValueError(f"View '{view_id}' not found")
-    
+    return _gantt_lines(plan, view)
+
+
+def _gantt_lines(plan: MergedPlan, view: Optional[View]) -> Iterator[str]:
+    """Lines of the diagram for an optional view."""
     # Start Gantt diagram
-    lines.append("gantt")
+    yield "gantt"
     
     # Add title from view or meta
     title = None
@@ -131,28 +152,28 @@ def render_gantt(plan: MergedPlan, view_id: str) -> str:
         title = plan.meta.title
     
     if title:
-        lines.append(f"    title {_escape_mermaid_title(title)}")
+        yield f"    title {_escape_mermaid_title(title)}"
     
     # Add date format (from view or default)
     date_format = "YYYY-MM-DD"
     if view and view.date_format:
         date_format = view.date_format
-    lines.append(f"    dateFormat {date_format}")
+    yield f"    dateFormat {date_format}"
     
     # Add axis format if specified in view
     if view and view.axis_format:
-        lines.append(f"    axisFormat {view.axis_format}")
+        yield f"    axisFormat {view.axis_format}"
     
     # Add tick interval if specified in view
     if view and view.tick_interval:
-        lines.append(f"    tickInterval {view.tick_interval}")
+        yield f"    tickInterval {view.tick_interval}"
     
-    lines.append("")
+    yield ""
     
     # Get scheduled nodes with computed dates
     if plan.schedule is None:
         # No schedule, return empty Gantt
-        return "\n".join(lines)
+        return
     
     # Get list of scheduled node IDs
     scheduled_node_ids = list(plan.schedule.nodes.keys())
@@ -170,31 +191,30 @@ def render_gantt(plan: MergedPlan, view_id: str) -> str:
     
     if not nodes_with_dates:
         # No nodes with dates to render
-        return "\n".join(lines)
+        return
     
     # Group nodes by parent (section) or render flat
     if view and view.group_by == "parent":
-        _render_grouped_by_parent(plan, nodes_with_dates, lines)
+        yield from _render_grouped_by_parent(plan, nodes_with_dates)
     elif view and view.lanes:
-        _render_with_lanes(plan, nodes_with_dates, view.lanes, lines)
+        yield from _render_with_lanes(plan, nodes_with_dates, view.lanes)
     else:
-        _render_flat(plan, nodes_with_dates, lines)
-    
-    return "\n".join(lines)
+        yield from _render_flat(plan, nodes_with_dates)
 
 
 def _render_flat(
     plan: MergedPlan,
     node_ids: list[str],
-    lines: list[str]
-) -> None:
+) -> Iterator[str]:
     """
     Render nodes as a flat list without sections.
     
     Args:
         plan: MergedPlan with nodes and schedule
         node_ids: List of node IDs to render
-        lines: Output lines list to append to
+    
+    Yields:
+        Output lines
     """
     for node_id in node_ids:
         node = plan.nodes.get(node_id)
@@ -210,24 +230,25 @@ def _render_flat(
         
         if node.milestone:
             # Milestones use milestone syntax
-            lines.append(f"    {title} :{task_id}, milestone, {start}, 0d")
+            yield f"    {title} :{task_id}, milestone, {start}, 0d"
         else:
             # Regular tasks
-            lines.append(f"    {title} :{task_id}, {start}, {finish}")
+            yield f"    {title} :{task_id}, {start}, {finish}"
 
 
 def _render_grouped_by_parent(
     plan: MergedPlan,
     node_ids: list[str],
-    lines: list[str]
-) -> None:
+) -> Iterator[str]:
     """
     Render nodes grouped by parent as sections.
     
     Args:
         plan: MergedPlan with nodes and schedule
         node_ids: List of node IDs to render
-        lines: Output lines list to append to
+    
+    Yields:
+        Output lines
     """
     # Build parent -> children mapping for scheduled nodes
     parent_groups: dict[Optional[str], list[str]] = {}
@@ -251,7 +272,7 @@ def _render_grouped_by_parent(
         else:
             section_title = "Tasks"
         
-        lines.append(f"    section {_escape_mermaid_title(section_title)}")
+        yield f"    section {_escape_mermaid_title(section_title)}"
         
         for node_id in children:
             node = plan.nodes.get(node_id)
@@ -266,17 +287,16 @@ def _render_grouped_by_parent(
             finish = sn.computed_finish
             
             if node.milestone:
-                lines.append(f"    {title} :{task_id}, milestone, {start}, 0d")
+                yield f"    {title} :{task_id}, milestone, {start}, 0d"
             else:
-                lines.append(f"    {title} :{task_id}, {start}, {finish}")
+                yield f"    {title} :{task_id}, {start}, {finish}"
 
 
 def _render_with_lanes(
     plan: MergedPlan,
     node_ids: list[str],
     lanes: dict,
-    lines: list[str]
-) -> None:
+) -> Iterator[str]:
     """
     Render nodes using lane configuration.
     
@@ -286,7 +306,9 @@ def _render_with_lanes(
         plan: MergedPlan with nodes and schedule
         node_ids: List of node IDs to render
         lanes: Lane configuration from view
-        lines: Output lines list to append to
+    
+    Yields:
+        Output lines
     """
     node_ids_set = set(node_ids)
     rendered_nodes = set()
@@ -301,7 +323,7 @@ def _render_with_lanes(
         if not lane_scheduled:
             continue
         
-        lines.append(f"    section {_escape_mermaid_title(lane_title)}")
+        yield f"    section {_escape_mermaid_title(lane_title)}"
         
         for node_id in lane_scheduled:
             node = plan.nodes.get(node_id)
@@ -316,16 +338,16 @@ def _render_with_lanes(
             finish = sn.computed_finish
             
             if node.milestone:
-                lines.append(f"    {title} :{task_id}, milestone, {start}, 0d")
+                yield f"    {title} :{task_id}, milestone, {start}, 0d"
             else:
-                lines.append(f"    {title} :{task_id}, {start}, {finish}")
+                yield f"    {title} :{task_id}, {start}, {finish}"
             
             rendered_nodes.add(node_id)
     
     # Render remaining nodes not in any lane
     remaining = [n for n in node_ids if n not in rendered_nodes]
     if remaining:
-        lines.append("    section Other")
+        yield "    section Other"
         for node_id in remaining:
             node = plan.nodes.get(node_id)
             sn = plan.schedule.nodes.get(node_id)
@@ -339,6 +361,6 @@ def _render_with_lanes(
             finish = sn.computed_finish
             
             if node.milestone:
-                lines.append(f"    {title} :{task_id}, milestone, {start}, 0d")
+                yield f"    {title} :{task_id}, milestone, {start}, 0d"
             else:
-                lines.append(f"    {title} :{task_id}, {start}, {finish}")
+                yield f"    {title} :{task_id}, {start}, {finish}"
@@ -10,6 +10,7 @@ Key features:
 - Shows node status and effort if available
 - Applies view filtering (where) if view_id is provided
 - Applies view sorting (order_by) if view_id is provided
+- iter_list yields the lines one at a time (render_list joins them)
 
 Requirements covered:
 - 5.7: render_list(plan: Merged_Plan, view_id: Optional[string]) -> string
@@ -21,7 +22,7 @@ Example output:
     - Task 3 (8 sp)
 """
 
-from typing import Optional
+from typing import Iterator, Optional
 
 from specs.v2.tools.models import MergedPlan, Node, View, ViewFilter
 from specs.v2.tools.render.tree import apply_view_filter, _sort_nodes
@@ -91,15 +92,35 @@ def render_list(plan: MergedPlan, view_id: Optional[str] = None) -> str:
         - Task 2 [in_progress] (3 sp)
         - Task 3 (8 sp)
     """
-    lines: list[str] = []
+    return "\n".join(iter_list(plan, view_id))
+
+
+def iter_list(plan: MergedPlan, view_id: Optional[str] = None) -> Iterator[str]:
+    """
+    Generate the lines of render_list one at a time.
     
+    Args:
+        plan: MergedPlan with nodes
+        view_id: Optional ID of the view to use for filtering and sorting
+        
+    Returns:
+        Iterator over the output lines (without line terminators)
+        
+    Raises:
+        ValueError: If view_id is provided but view doesn't exist
+                    (raised by this call, before any line is produced)
+    """
     # Get view if specified
     view: Optional[View] = None
     if view_id:
         view = plan.views.get(view_id)
         if view is None:
             raise ValueError(f"View '{view_id}' not found")
-    
+    return _list_lines(plan, view)
+
+
+def _list_lines(plan: MergedPlan, view: Optional[View]) -> Iterator[str]:
+    """Lines of the list for an optional view."""
     # Get all node IDs
     all_node_ids = list(plan.nodes.keys())
     
@@ -109,20 +130,11 @@ def render_list(plan: MergedPlan, view_id: Optional[str] = None) -> str:
     else:
         filtered_ids = all_node_ids
     
-    # If no nodes pass filter, return empty string
-    if not filtered_ids:
-        return ""
-    
     # Get order_by from view
     order_by = view.order_by if view else None
     
-    # Sort nodes
-    sorted_ids = _sort_nodes(plan, filtered_ids, order_by)
-    
-    # Format each node as a list item
-    for node_id in sorted_ids:
+    # Sort nodes and format each one as a list item
+    for node_id in _sort_nodes(plan, filtered_ids, order_by):
         line = _format_list_item(plan, node_id)
         if line:
-            lines.append(line)
-    
-    return "\n".join(lines)
+            yield line
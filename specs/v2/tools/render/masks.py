@@ -0,0 +1,259 @@
+"""
+Bitset evaluation of view filters for opskarta v2 renderers.
+
+A plan with many views filters the same nodes over and over. This
+module compiles the per-node facts that ViewFilter criteria test into
+bitsets once per plan, so that each filter is a few bitwise operations
+on Python integers instead of a pass over all nodes.
+
+Layout:
+- Bit i stands for the i-th node of plan.nodes
+- kind, status: one mask per distinct value (None included)
+- scheduled: nodes present in schedule.nodes
+- descendants(P): nodes below P in the hierarchy, built from the
+  Euler-tour slice of plan.index on first use
+
+FilterMasks.of(plan) caches the masks, and the node sets selected by
+each distinct filter, in plan.index.derived, so they are shared by
+every renderer and view of the plan.
+
+Invalidation: the masks are rebuilt when plan.nodes or schedule.nodes
+(both NodeMaps) gains, loses or replaces an entry, when schedule.nodes
+or plan.schedule is replaced, and whenever the index is rebuilt. Edits
+of existing nodes (kind, status, parent) are not tracked: code making
+them calls plan.invalidate_index(), which drops the masks with the
+index. PlanWatcher (watch.py) and effort.update_effort do so.
+
+Requirements covered:
+- 4.7: View filtering with where clause (kind, status, has_schedule, parent)
+"""
+
+from typing import Any, Iterable, Optional
+
+from specs.v2.tools.models import MergedPlan, ViewFilter
+
+
+# Key of the masks in PlanIndex.derived
+_DERIVED_KEY = "filter_masks"
+
+
+def _positions_mask(positions: Iterable[int], size: int) -> int:
+    """Bitset with the given bit positions set (linear in size)."""
+    if not size:
+        return 0
+    bits = bytearray(b"0" * size)
+    for position in positions:
+        bits[position] = 0x31  # "1"
+    bits.reverse()
+    return int(bits, 2)
+
+
+def _filter_key(view_filter: ViewFilter) -> tuple:
+    """Hashable key of the criteria of a filter."""
+    return (
+        tuple(view_filter.kind) if view_filter.kind is not None else None,
+        tuple(view_filter.status) if view_filter.status is not None else None,
+        view_filter.has_schedule,
+        view_filter.parent or None,
+    )
+
+
+class FilterMasks:
+    """
+    Bitsets of a plan's nodes for ViewFilter criteria.
+    
+    Attributes:
+        node_ids: Node IDs in plan.nodes order (bit positions)
+        position: node_id -> bit position
+        all: Mask with every node set
+        kind: kind value -> mask of the nodes with that kind
+        status: status value -> mask of the nodes with that status
+        scheduled: Mask of the nodes present in schedule.nodes
+    """
+    
+    def __init__(self, plan: MergedPlan) -> None:
+        self._plan = plan
+        self.node_ids: list[str] = list(plan.nodes)
+        self.position = {node_id: i for i, node_id in enumerate(self.node_ids)}
+        size = len(self.node_ids)
+        self.all = (1 << size) - 1
+        
+        kinds: dict[Any, list[int]] = {}
+        statuses: dict[Any, list[int]] = {}
+        for position, node in enumerate(plan.nodes.values()):
+            for groups, value in ((kinds, node.kind), (statuses, node.status)):
+                try:
+                    groups.setdefault(value, []).append(position)
+                except TypeError:
+                    # Unhashable (invalid) values never match a filter
+                    pass
+        self.kind = {value: _positions_mask(p, size) for value, p in kinds.items()}
+        self.status = {value: _positions_mask(p, size) for value, p in statuses.items()}
+        
+        self.scheduled = 0
+        if plan.schedule is not None:
+            self.scheduled = _positions_mask(
+                (
+                    self.position[node_id] for node_id in plan.schedule.nodes
+                    if node_id in self.position
+                ),
+                size,
+            )
+        
+        self._descendants: dict[str, int] = {}
+        self._selected: dict[tuple, tuple[list[str], Optional[frozenset[str]]]] = {}
+    
+    @classmethod
+    def of(cls, plan: MergedPlan) -> "FilterMasks":
+        """
+        Get the cached masks of a plan, building them on first use.
+        
+        The cache entry lives in plan.index and is also rebuilt when
+        the version of plan.nodes or schedule.nodes changes, or
+        schedule.nodes is replaced (see the module docstring).
+        
+        Args:
+            plan: MergedPlan containing nodes and schedule
+        
+        Returns:
+            FilterMasks of the plan
+        """
+        schedule_nodes = plan.schedule.nodes if plan.schedule is not None else None
+        # The entry holds schedule_nodes itself, so the identity test
+        # cannot match a new mapping allocated at a freed address
+        key = (
+            plan.nodes.version,
+            schedule_nodes.version if schedule_nodes is not None else None,
+        )
+        
+        derived = plan.index.derived
+        entry = derived.get(_DERIVED_KEY)
+        if entry is None or entry[0] is not schedule_nodes or entry[1] != key:
+            entry = derived[_DERIVED_KEY] = (schedule_nodes, key, cls(plan))
+        return entry[2]
+    
+    def descendants(self, parent_id: str) -> int:
+        """
+        Get the mask of the descendants of a node (cached per node).
+        
+        Args:
+            parent_id: ID of the ancestor
+        
+        Returns:
+            Mask of its children, grandchildren, etc.
+        """
+        mask = self._descendants.get(parent_id)
+        if mask is None:
+            position = self.position
+            mask = _positions_mask(
+                (
+                    position[node_id]
+                    for node_id in self._plan.index.descendants(parent_id)
+                    if node_id in position
+                ),
+                len(self.node_ids),
+            )
+            self._descendants[parent_id] = mask
+        return mask
+    
+    def mask(self, view_filter: ViewFilter) -> int:
+        """
+        Evaluate a filter: all criteria combined with AND.
+        
+        Args:
+            view_filter: ViewFilter with filter criteria
+        
+        Returns:
+            Mask of the nodes matching every criterion
+        """
+        mask = self.all
+        if view_filter.kind is not None:
+            mask &= self._union(self.kind, view_filter.kind)
+        if view_filter.status is not None:
+            mask &= self._union(self.status, view_filter.status)
+        if view_filter.has_schedule is not None:
+            mask &= self.scheduled if view_filter.has_schedule else self.all & ~self.scheduled
+        if view_filter.parent:
+            mask &= self.descendants(view_filter.parent)
+        return mask
+    
+    def ids(self, mask: int) -> list[str]:
+        """
+        Decode a mask into node IDs.
+        
+        Args:
+            mask: Mask over this plan's nodes
+        
+        Returns:
+            Node IDs with their bit set, in plan.nodes order
+        """
+        bits = format(mask, "b")[::-1]
+        node_ids = self.node_ids
+        result = []
+        position = bits.find("1")
+        while position != -1:
+            result.append(node_ids[position])
+            position = bits.find("1", position + 1)
+        return result
+    
+    def selected(self, view_filter: ViewFilter) -> list[str]:
+        """
+        Get the IDs of the nodes matching a filter (cached per criteria).
+        
+        Args:
+            view_filter: ViewFilter with filter criteria
+            
+        Returns:
+            Matching node IDs, in plan.nodes order (do not modify)
+        """
+        return self._entry(view_filter)[0]
+    
+    def filter(self, node_ids: list[str], view_filter: ViewFilter) -> list[str]:
+        """
+        Keep the node IDs that match a filter.
+        
+        Args:
+            node_ids: Node IDs to filter (IDs not in the plan are dropped)
+            view_filter: ViewFilter with filter criteria
+            
+        Returns:
+            Matching node IDs, in the order of node_ids
+        """
+        ids, id_set = self._entry(view_filter)
+        if len(node_ids) == len(self.node_ids) and node_ids == self.node_ids:
+            return list(ids)
+        if id_set is None:
+            id_set = self._entry(view_filter, with_set=True)[1]
+        return [node_id for node_id in node_ids if node_id in id_set]
+    
+    def _entry(
+        self,
+        view_filter: ViewFilter,
+        with_set: bool = False,
+    ) -> tuple[list[str], Optional[frozenset[str]]]:
+        """Cached (ids, set of ids or None) of a filter."""
+        try:
+            key: Optional[tuple] = _filter_key(view_filter)
+            hash(key)
+        except TypeError:
+            key = None
+        
+        entry = self._selected.get(key) if key is not None else None
+        if entry is None:
+            entry = (self.ids(self.mask(view_filter)), None)
+        if with_set and entry[1] is None:
+            entry = (entry[0], frozenset(entry[0]))
+        if key is not None:
+            self._selected[key] = entry
+        return entry
+    
+    @staticmethod
+    def _union(masks: dict[Any, int], values: Iterable[Any]) -> int:
+        """OR of the masks of the given values (unknown values match nothing)."""
+        result = 0
+        for value in values:
+            try:
+                result |= masks.get(value, 0)
+            except TypeError:
+                pass
+        return result
@@ -0,0 +1,149 @@
+"""
+Effort summary renderer for opskarta v2 plans.
+
+This module generates text tables of effort totals from an EffortCube
+(see cube.py): one table per dimension, with a row per child of the
+selected node (per root node for the whole plan), a column per value of
+the dimension, and a Total row. It expects compute_effort_metrics to
+have been run on the plan.
+
+Key features:
+- Dimensions are configurable (status, kind, fragment, scheduled,
+  calendar, x.KEY); the cube is built once for all tables
+- Cells sum each node's own effort over the row's subtree (see
+  cube.own_effort); the total column equals the row's effort_effective
+  when no estimate is below its children's rollup
+- iter_effort_summary yields the lines one at a time
+  (render_effort_summary joins them)
+
+Example output:
+    Effort by status (sp):
+             todo  done  (none)  total
+    Phase 1     5     8       0     13
+    Phase 2     3     0       1      4
+    Total       8     8       1     17
+"""
+
+from typing import Hashable, Iterable, Iterator, Optional
+
+from specs.v2.tools.cube import EffortCube
+from specs.v2.tools.models import MergedPlan
+
+
+# Column label of the None value
+NONE_LABEL = "(none)"
+
+
+def format_effort(value: float) -> str:
+    """Format an effort total without float noise (at most 6 decimals)."""
+    if isinstance(value, int):
+        return str(value)
+    text = f"{value:.6f}".rstrip("0").rstrip(".")
+    return "0" if text == "-0" else text
+
+
+def _value_label(value: Hashable) -> str:
+    """Column label of a dimension value."""
+    return NONE_LABEL if value is None else str(value)
+
+
+def render_effort_summary(
+    plan: MergedPlan,
+    dimensions: Optional[Iterable[str]] = None,
+    node_id: Optional[str] = None,
+) -> str:
+    """
+    Generate effort summary tables from a MergedPlan.
+    
+    Args:
+        plan: MergedPlan after compute_effort_metrics
+        dimensions: Dimension names, one table each
+                    (default: cube.DEFAULT_DIMENSIONS)
+        node_id: Optional node whose subtree is summarized (rows are
+                 its children); the whole plan if None
+    
+    Returns:
+        Tables as a string
+    
+    Raises:
+        ValueError: If a dimension or node_id is unknown
+    """
+    return "\n".join(iter_effort_summary(plan, dimensions, node_id))
+
+
+def iter_effort_summary(
+    plan: MergedPlan,
+    dimensions: Optional[Iterable[str]] = None,
+    node_id: Optional[str] = None,
+) -> Iterator[str]:
+    """
+    Generate the lines of render_effort_summary one at a time.
+    
+    Args:
+        plan: MergedPlan after compute_effort_metrics
+        dimensions: Dimension names, one table each
+                    (default: cube.DEFAULT_DIMENSIONS)
+        node_id: Optional node whose subtree is summarized (rows are
+                 its children); the whole plan if None
+    
+    Returns:
+        Iterator over the output lines (without line terminators)
+    
+    Raises:
+        ValueError: If a dimension or node_id is unknown
+                    (raised by this call, before any line is produced)
+    """
+    if node_id is not None and node_id not in plan.nodes:
+        raise ValueError(f"Node '{node_id}' not found")
+    cube = EffortCube(plan, dimensions)
+    return _summary_lines(plan, cube, node_id)
+
+
+def _summary_lines(
+    plan: MergedPlan,
+    cube: EffortCube,
+    node_id: Optional[str],
+) -> Iterator[str]:
+    """Lines of the tables for a built cube."""
+    index = plan.index
+    row_ids = index.children.get(node_id, []) if node_id is not None else index.roots
+    
+    unit = ""
+    if plan.meta and plan.meta.effort_unit:
+        unit = f" ({plan.meta.effort_unit})"
+    scope = f" under {plan.nodes[node_id].title}" if node_id is not None else ""
+    
+    for number, dimension in enumerate(cube.dimensions):
+        if number:
+            yield ""
+        
+        # (label, top node of the row's subtree); Total covers node_id
+        rows = [(plan.nodes[row_id].title, row_id) for row_id in row_ids]
+        rows.append(("Total", node_id))
+        # Values in order of appearance, None last
+        values = sorted(cube.breakdown(dimension, node_id), key=lambda value: value is None)
+        
+        header = [_value_label(value) for value in values] + ["total"]
+        table = []
+        for _, top_id in rows:
+            cells = cube.breakdown(dimension, top_id)
+            table.append(
+                [format_effort(cells[value][0]) if value in cells else "0" for value in values]
+                + [format_effort(cube.total(top_id))]
+            )
+        
+        label_width = max(len(title) for title, _ in rows)
+        widths = [
+            max(len(header[column]), *(len(cells[column]) for cells in table))
+            for column in range(len(header))
+        ]
+        
+        yield f"Effort by {dimension}{scope}{unit}:"
+        yield "  ".join(
+            [" " * label_width] + [text.rjust(width) for text, width in zip(header, widths)]
+        ).rstrip()
+        for (title, _), cells in zip(rows, table):
+            yield "  ".join(
+                [title.ljust(label_width)]
+                + [text.rjust(width) for text, width in zip(cells, widths)]
+            )
@@ -7,9 +7,12 @@ relationships with optional view filtering and sorting.
 
 Key features:
 - Hierarchical tree structure using Unicode box-drawing characters
+- O(N log N): nodes are sorted once and rendered without recursion,
+  so large and deep hierarchies are cheap
 - Shows node status and effort if available
 - Applies view filtering (where) if view_id is provided
 - Applies view sorting (order_by) if view_id is provided
+- iter_tree yields the lines one at a time (render_tree joins them)
 
 Requirements covered:
 - 5.6: render_tree(plan: Merged_Plan, view_id: Optional[string]) -> string
@@ -23,7 +26,7 @@ Example output:
         └── Task 2.1
 """
 
-from typing import Optional
+from typing import Iterator, Optional
 
 from specs.v2.tools.models import MergedPlan, Node, View, ViewFilter
 from specs.v2.tools.render.common import (
@@ -62,11 +65,9 @@ def _get_children(plan: MergedPlan, parent_id: Optional[str]) -> list[str]:
     Returns:
         List of child node IDs
     """
-    children = []
-    for node_id, node in plan.nodes.items():
-        if node.parent == parent_id:
-            children.append(node_id)
-    return children
+    if parent_id is None:
+        return [node_id for node_id, node in plan.nodes.items() if node.parent is None]
+    return list(plan.index.children.get(parent_id, ()))
 
 
 def _sort_nodes(
@@ -134,56 +135,80 @@ def _format_node_line(
     return "".join(parts)
 
 
-def _render_subtree(
+def _ordered_children(
     plan: MergedPlan,
-    node_id: str,
-    prefix: str,
-    is_last: bool,
     filtered_ids: set[str],
-    order_by: Optional[str],
-    lines: list[str]
-) -> None:
+    order_by: Optional[str]
+) -> tuple[list[str], dict[str, list[str]]]:
     """
-    Recursively render a subtree.
+    Group the filtered nodes under their parents, in display order.
+    
+    The filtered nodes are sorted once (plan.nodes order, then
+    sort_nodes) and distributed to their parents in that order, so every
+    children list comes out sorted without sorting per parent.
     
     Args:
         plan: MergedPlan containing nodes
-        node_id: ID of the current node
-        prefix: Prefix string for indentation
-        is_last: Whether this is the last child in its parent
         filtered_ids: Set of node IDs that pass the filter
-        order_by: Optional field name for sorting children
-        lines: Output lines list to append to
+        order_by: Optional field name for sorting
+        
+    Returns:
+        (root_ids, children): filtered nodes whose parent is missing or
+        filtered out, and parent_id -> filtered children
     """
-    # Only render if node passes filter
-    if node_id not in filtered_ids:
-        return
+    ordered = [node_id for node_id in plan.nodes if node_id in filtered_ids]
+    ordered = _sort_nodes(plan, ordered, order_by)
     
-    # Format and add this node's line
-    line = _format_node_line(plan, node_id, prefix, is_last)
-    if line:
-        lines.append(line)
-    
-    # Get children that pass the filter
-    all_children = _get_children(plan, node_id)
-    children = [c for c in all_children if c in filtered_ids]
-    
-    # Sort children if order_by is specified
-    children = _sort_nodes(plan, children, order_by)
+    root_ids: list[str] = []
+    children: dict[str, list[str]] = {}
+    for node_id in ordered:
+        parent = plan.nodes[node_id].parent
+        if parent is None or parent not in filtered_ids:
+            root_ids.append(node_id)
+        else:
+            children.setdefault(parent, []).append(node_id)
+    return root_ids, children
+
+
+def _render_forest(
+    plan: MergedPlan,
+    root_ids: list[str],
+    children: dict[str, list[str]],
+) -> Iterator[str]:
+    """
+    Render subtrees depth-first without recursion.
     
-    # Calculate new prefix for children
-    if is_last:
-        child_prefix = prefix + "    "
-    else:
-        child_prefix = prefix + "│   "
+    Args:
+        plan: MergedPlan containing nodes
+        root_ids: Top-level node IDs, in display order
+        children: parent_id -> child node IDs, in display order
     
-    # Render children
-    for i, child_id in enumerate(children):
-        child_is_last = (i == len(children) - 1)
-        _render_subtree(
-            plan, child_id, child_prefix, child_is_last,
-            filtered_ids, order_by, lines
-        )
+    Yields:
+        Output lines, top to bottom
+    """
+    # Entries are (node_id, prefix, is_last); pushed in reverse so the
+    # first sibling is rendered first
+    stack = [
+        (root_id, "", i == len(root_ids) - 1)
+        for i, root_id in reversed(list(enumerate(root_ids)))
+    ]
+    while stack:
+        node_id, prefix, is_last = stack.pop()
+        
+        # Format and yield this node's line
+        line = _format_node_line(plan, node_id, prefix, is_last)
+        if line:
+            yield line
+        
+        child_ids = children.get(node_id)
+        if not child_ids:
+            continue
+        
+        # Calculate new prefix for children
+        child_prefix = prefix + ("    " if is_last else "│   ")
+        last = len(child_ids) - 1
+        for i in range(last, -1, -1):
+            stack.append((child_ids[i], child_prefix, i == last))
 
 
 def render_tree(plan: MergedPlan, view_id: Optional[str] = None) -> str:
@@ -215,15 +240,35 @@ def render_tree(plan: MergedPlan, view_id: Optional[str] = None) -> str:
         └── Phase 2
             └── Task 2.1
     """
-    lines: list[str] = []
+    return "\n".join(iter_tree(plan, view_id))
+
+
+def iter_tree(plan: MergedPlan, view_id: Optional[str] = None) -> Iterator[str]:
+    """
+    Generate the lines of render_tree one at a time.
     
+    Args:
+        plan: MergedPlan with nodes
+        view_id: Optional ID of the view to use for filtering and sorting
+        
+    Returns:
+        Iterator over the output lines (without line terminators)
+        
+    Raises:
+        ValueError: If view_id is provided but view doesn't exist
+                    (raised by this call, before any line is produced)
+    """
     # Get view if specified
     view: Optional[View] = None
     if view_id:
         view = plan.views.get(view_id)
         if view is None:
             raise ValueError(f"View '{view_id}' not found")
-    
+    return _tree_lines(plan, view)
+
+
+def _tree_lines(plan: MergedPlan, view: Optional[View]) -> Iterator[str]:
+    """Lines of the tree for an optional view."""
     # Get all node IDs
     all_node_ids = list(plan.nodes.keys())
     
@@ -233,35 +278,16 @@ def render_tree(plan: MergedPlan, view_id: Optional[str] = None) -> str:
     else:
         filtered_ids = set(all_node_ids)
     
-    # If no nodes pass filter, return empty string
+    # Nothing to render if no nodes pass the filter
     if not filtered_ids:
-        return ""
+        return
     
     # Get order_by from view
     order_by = view.order_by if view else None
     
-    # Find root nodes (nodes without parent, or whose parent is not in filtered set)
-    root_ids = []
-    for node_id in filtered_ids:
-        node = plan.nodes.get(node_id)
-        if node is None:
-            continue
-        
-        # A node is a root if:
-        # 1. It has no parent, OR
-        # 2. Its parent is not in the filtered set
-        if node.parent is None or node.parent not in filtered_ids:
-            root_ids.append(node_id)
-    
-    # Sort root nodes
-    root_ids = _sort_nodes(plan, root_ids, order_by)
+    # Root nodes (no parent, or parent not in the filtered set) and the
+    # children of every node, sorted once
+    root_ids, children = _ordered_children(plan, filtered_ids, order_by)
     
     # Render each root and its subtree
-    for i, root_id in enumerate(root_ids):
-        is_last = (i == len(root_ids) - 1)
-        _render_subtree(
-            plan, root_id, "", is_last,
-            filtered_ids, order_by, lines
-        )
-    
-    return "\n".join(lines)
+    yield from _render_forest(plan, root_ids, children)
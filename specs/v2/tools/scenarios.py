@@ -0,0 +1,327 @@
+"""
+What-if scenario scheduling for opskarta v2 plans.
+
+This module evaluates many variants of one plan's schedule without
+copying the plan. A scenario is a sparse set of overrides (ScheduleNode
+fields, calendars, default_calendar) applied on top of the base plan.
+
+Key concepts:
+- The base plan is prepared once: dependency graph, topological order,
+  compiled calendars and the baseline dates are shared by all scenarios
+- A scenario recomputes only the downstream cone of what it overrides;
+  every other node keeps its baseline dates
+- Results are per-scenario date arrays aligned with
+  ScenarioScheduler.node_ids (schedule.nodes order)
+- The base plan is never modified
+
+Overrides cannot change the dependency graph: they may not touch
+Node.after or add/remove nodes from schedule.nodes.
+
+Example:
+    >>> scheduler = ScenarioScheduler(plan)
+    >>> results = scheduler.run_all([
+    ...     Scenario("late-start", nodes={"task1": {"start": "2024-04-01"}}),
+    ...     Scenario("no-weekends", calendars={"default": Calendar()}),
+    ... ], jobs=4)
+    >>> scheduler.dates(results[0], "task2")
+    (datetime.date(2024, 4, 4), datetime.date(2024, 4, 10))
+"""
+
+from collections import ChainMap
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, replace
+from datetime import date
+from typing import Iterable, Optional
+
+from specs.v2.tools.models import Calendar, MergedPlan, Schedule, ScheduleWarning
+from specs.v2.tools.scheduler import (
+    _cyclic_warning,
+    _ordered_warnings,
+    _schedule_nodes,
+    _topological_order,
+    build_schedule_graph,
+    compile_calendar,
+    compile_calendars,
+    compute_node_dates,
+    resolve_calendar,
+    schedule_dependencies,
+)
+
+
+# ScheduleNode fields a scenario may override
+OVERRIDABLE_FIELDS = frozenset({"start", "finish", "duration", "calendar"})
+
+
+@dataclass
+class Scenario:
+    """
+    Sparse what-if overrides for a base plan.
+    
+    Attributes:
+        name: Scenario name (copied to the result)
+        nodes: node_id -> {field: value} overrides of ScheduleNode fields
+               (start, finish, duration, calendar); None clears a field
+        calendars: calendar_id -> Calendar, replacing or adding calendars
+        default_calendar: Replacement schedule.default_calendar, if set
+    """
+    name: str
+    nodes: dict[str, dict[str, Optional[str]]] = field(default_factory=dict)
+    calendars: dict[str, Calendar] = field(default_factory=dict)
+    default_calendar: Optional[str] = None
+
+
+@dataclass
+class ScenarioResult:
+    """
+    Computed dates of one scenario.
+    
+    Attributes:
+        name: Scenario name
+        starts: Start date per node, aligned with ScenarioScheduler.node_ids
+                (None for unschedulable nodes)
+        finishes: Finish date per node, aligned the same way
+        warnings: ScheduleWarning records, in schedule.nodes order
+    """
+    name: str
+    starts: list[Optional[date]]
+    finishes: list[Optional[date]]
+    warnings: list[ScheduleWarning] = field(default_factory=list)
+
+
+class ScenarioScheduler:
+    """
+    Evaluates scenarios against a shared, precomputed base schedule.
+    
+    Construction costs one compute_schedule pass; each scenario then
+    costs O(cone) for the nodes it affects plus an O(N) array copy.
+    """
+    
+    def __init__(self, plan: MergedPlan) -> None:
+        self.plan = plan
+        schedule = plan.schedule if plan.schedule is not None else Schedule()
+        self._schedule = schedule
+        
+        self.node_ids: tuple[str, ...] = tuple(schedule.nodes)
+        self.index: dict[str, int] = {
+            node_id: i for i, node_id in enumerate(self.node_ids)
+        }
+        
+        self._graph = build_schedule_graph(plan) if plan.schedule else None
+        self._calendars = compile_calendars(schedule)
+        self._dates: dict = {}
+        self._warnings: dict[str, ScheduleWarning] = {}
+        self._blocked: frozenset[str] = frozenset()
+        if self._graph is not None:
+            self._dates, self._warnings = _schedule_nodes(
+                plan, self._graph, self._calendars,
+                self._graph.order, self._graph.blocked,
+            )
+            self._blocked = frozenset(self._graph.blocked)
+        
+        self._starts = [self._dates.get(n, (None, None))[0] for n in self.node_ids]
+        self._finishes = [self._dates.get(n, (None, None))[1] for n in self.node_ids]
+    
+    def dates(
+        self,
+        result: ScenarioResult,
+        node_id: str,
+    ) -> tuple[Optional[date], Optional[date]]:
+        """Return (start, finish) of node_id in a scenario result."""
+        i = self.index[node_id]
+        return (result.starts[i], result.finishes[i])
+    
+    def run(self, scenario: Scenario) -> ScenarioResult:
+        """
+        Compute the schedule of a single scenario.
+        
+        Args:
+            scenario: Overrides to apply on top of the base plan
+        
+        Returns:
+            ScenarioResult with the scenario's dates and warnings
+        
+        Raises:
+            ValueError: If an override targets a node outside schedule.nodes
+                        or a field that is not overridable
+        """
+        schedule = self._schedule
+        graph = self._graph
+        
+        # Override ScheduleNodes (copies of the overridden nodes only)
+        overrides = {}
+        for node_id, fields in scenario.nodes.items():
+            if node_id not in schedule.nodes:
+                raise ValueError(
+                    f"Scenario '{scenario.name}': node '{node_id}' is not in schedule.nodes"
+                )
+            unknown = set(fields) - OVERRIDABLE_FIELDS
+            if unknown:
+                raise ValueError(
+                    f"Scenario '{scenario.name}': cannot override "
+                    f"{', '.join(sorted(unknown))} of node '{node_id}'"
+                )
+            overrides[node_id] = replace(schedule.nodes[node_id], **fields)
+        
+        result = ScenarioResult(
+            name=scenario.name,
+            starts=list(self._starts),
+            finishes=list(self._finishes),
+        )
+        if graph is None:
+            return result
+        
+        # Calendars of the scenario: base compiled calendars plus overrides
+        calendar_schedule = schedule
+        calendars = self._calendars
+        if scenario.calendars or scenario.default_calendar is not None:
+            calendar_schedule = Schedule(
+                calendars={**schedule.calendars, **scenario.calendars},
+                default_calendar=(
+                    scenario.default_calendar
+                    if scenario.default_calendar is not None
+                    else schedule.default_calendar
+                ),
+            )
+            calendars = dict(self._calendars)
+            for cal_id, calendar in scenario.calendars.items():
+                calendars[cal_id] = compile_calendar(calendar)
+        
+        # Seeds: overridden nodes and nodes whose calendar changed
+        seeds = set(overrides)
+        if calendar_schedule is not schedule:
+            for node_id, sn in schedule.nodes.items():
+                cal_id = overrides[node_id].calendar if node_id in overrides else sn.calendar
+                if not cal_id and scenario.default_calendar is not None:
+                    seeds.add(node_id)
+                elif (cal_id or schedule.default_calendar) in scenario.calendars:
+                    seeds.add(node_id)
+        
+        # An explicit start (or finish + duration) detaches a node from its
+        # after-dependencies: patch the changed edges in an overlay
+        dependencies = graph.dependencies
+        dependents = graph.dependents
+        changed_deps = {}
+        for node_id, sn in overrides.items():
+            deps = schedule_dependencies(self.plan, node_id, schedule_node=sn)
+            if deps != graph.dependencies[node_id]:
+                changed_deps[node_id] = deps
+        if changed_deps:
+            changed_dependents: dict[str, list[str]] = {}
+            for node_id, deps in changed_deps.items():
+                for dep_id in graph.dependencies[node_id]:
+                    if dep_id not in changed_dependents:
+                        changed_dependents[dep_id] = list(graph.dependents[dep_id])
+                    changed_dependents[dep_id].remove(node_id)
+                for dep_id in deps:
+                    if dep_id not in changed_dependents:
+                        changed_dependents[dep_id] = list(graph.dependents[dep_id])
+                    changed_dependents[dep_id].append(node_id)
+            dependencies = ChainMap(changed_deps, graph.dependencies)
+            dependents = ChainMap(changed_dependents, graph.dependents)
+        
+        # Downstream cone of the seeds
+        cone: dict[str, None] = {}
+        stack = list(seeds)
+        while stack:
+            node_id = stack.pop()
+            if node_id in cone:
+                continue
+            cone[node_id] = None
+            stack.extend(dependents[node_id])
+        
+        # Order the cone; nodes behind a cycle outside of it stay blocked
+        order, blocked = _topological_order(
+            list(cone), dependencies, dependents, self._blocked.difference(cone)
+        )
+        
+        # Recompute the cone; dependencies outside it keep baseline dates
+        cone_dates: dict = {}
+        dates = ChainMap(cone_dates, self._dates)
+        warnings = dict(self._warnings)
+        for node_id in order:
+            sn = overrides.get(node_id) or schedule.nodes[node_id]
+            calendar = resolve_calendar(calendar_schedule, sn.calendar, calendars)
+            start, finish, warning = compute_node_dates(
+                self.plan, node_id, calendar, dependencies[node_id],
+                dates, schedule_node=sn,
+            )
+            cone_dates[node_id] = (start, finish)
+            i = self.index[node_id]
+            result.starts[i] = start
+            result.finishes[i] = finish
+            if warning is None:
+                warnings.pop(node_id, None)
+            else:
+                warnings[node_id] = warning
+        for node_id in blocked:
+            i = self.index[node_id]
+            result.starts[i] = None
+            result.finishes[i] = None
+            warnings[node_id] = _cyclic_warning(node_id)
+        
+        result.warnings = _ordered_warnings(self.plan, warnings)
+        return result
+    
+    def run_all(
+        self,
+        scenarios: Iterable[Scenario],
+        jobs: Optional[int] = None,
+    ) -> list[ScenarioResult]:
+        """
+        Compute the schedules of many scenarios.
+        
+        Args:
+            scenarios: Scenarios to evaluate
+            jobs: Number of worker processes; None or 1 runs in-process.
+                  Each worker prepares the base plan once.
+        
+        Returns:
+            One ScenarioResult per scenario, in input order
+        """
+        scenarios = list(scenarios)
+        if not jobs or jobs <= 1 or len(scenarios) <= 1:
+            return [self.run(scenario) for scenario in scenarios]
+        
+        chunksize = max(1, len(scenarios) // (jobs * 4))
+        with ProcessPoolExecutor(
+            max_workers=jobs,
+            initializer=_init_worker,
+            initargs=(self.plan,),
+        ) as executor:
+            return list(executor.map(_run_in_worker, scenarios, chunksize=chunksize))
+
+
+# ScenarioScheduler of the current worker process (see run_all)
+_worker_scheduler: Optional[ScenarioScheduler] = None
+
+
+def _init_worker(plan: MergedPlan) -> None:
+    """Prepare the base plan once per worker process."""
+    global _worker_scheduler
+    _worker_scheduler = ScenarioScheduler(plan)
+
+
+def _run_in_worker(scenario: Scenario) -> ScenarioResult:
+    """Run one scenario in a worker process."""
+    return _worker_scheduler.run(scenario)
+
+
+def run_scenarios(
+    plan: MergedPlan,
+    scenarios: Iterable[Scenario],
+    jobs: Optional[int] = None,
+) -> list[ScenarioResult]:
+    """
+    Compute the schedules of many what-if scenarios of one plan.
+    
+    Shortcut for ScenarioScheduler(plan).run_all(scenarios, jobs).
+    
+    Args:
+        plan: Base plan (not modified)
+        scenarios: Scenarios to evaluate
+        jobs: Number of worker processes; None or 1 runs in-process
+    
+    Returns:
+        One ScenarioResult per scenario, in input order
+    """
+    return ScenarioScheduler(plan).run_all(scenarios, jobs)
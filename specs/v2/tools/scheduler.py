@@ -12,11 +12,32 @@ Key concepts:
 
 Algorithm:
 1. Identify scheduled nodes (present in schedule.nodes)
-2. For each scheduled node, compute start/finish with memoization
+2. Order scheduled nodes topologically by their after dependencies
+   (Kahn's algorithm, no recursion) and compute start/finish once each
 3. Dependencies (after) come from nodes, not schedule.nodes
 4. Only scheduled dependencies are considered for date calculation
 5. If all dependencies are unschedulable, node is also unschedulable
 
+Calendar arithmetic:
+- Calendars are compiled into WorkCalendar (weekend flag + sorted holiday
+  ordinals), so adding or counting workdays costs O(log H) per call
+  instead of walking day by day
+- compute_schedule compiles each calendar_id once per run
+  (compile_calendars) and shares it between all nodes using it
+
+Columnar results:
+- compute_schedule also stores the dates as day-ordinal columns
+  (plan.schedule.columns, see columns.ScheduleColumns); with
+  materialize=False the ISO string fields are left for later
+
+Critical path:
+- compute_critical_path runs a backward pass over the same topological
+  order and sets latest_start, latest_finish and total_float
+
+Incremental rescheduling:
+- IncrementalScheduler keeps the dependency graph and computed dates, and
+  after an edit recomputes only the downstream cone of the changed nodes
+
 Requirements covered:
 - 3.10: Use default_calendar when Schedule_Node doesn't have calendar
 - 3.11: Include nodes in schedule.nodes in calculation
@@ -26,10 +47,20 @@ Requirements covered:
 """
 
 import re
+from bisect import bisect_right
+from collections import deque
+from dataclasses import dataclass, field
 from datetime import date, timedelta
-from typing import Optional
+from typing import Iterable, Optional, Union
 
-from specs.v2.tools.models import Calendar, MergedPlan
+from specs.v2.tools.columns import ScheduleColumns
+from specs.v2.tools.models import (
+    Calendar,
+    MergedPlan,
+    Schedule,
+    ScheduleNode,
+    ScheduleWarning,
+)
 
 
 # Duration pattern: Nd (days) or Nw (weeks)
@@ -38,6 +69,11 @@ DURATION_PATTERN = re.compile(r"^([1-9][0-9]*)([dw])$")
 # Date pattern: YYYY-MM-DD
 DATE_PATTERN = re.compile(r"^(\d{4})-(\d{2})-(\d{2})$")
 
+# ScheduleWarning codes
+WARN_DEPENDENCIES_UNSCHEDULABLE = "dependencies_unschedulable"
+WARN_NO_START = "no_start"
+WARN_CYCLIC_DEPENDENCY = "cyclic_dependency"
+
 
 def parse_date(date_str: str) -> Optional[date]:
     """
@@ -106,6 +142,212 @@ def parse_duration(duration_str: str) -> Optional[int]:
     return None
 
 
+def _weekdays_upto(ordinal: int) -> int:
+    """
+    Count Monday-Friday days with ordinal in [1, ordinal].
+    
+    Ordinal 1 (0001-01-01) is a Monday, so whole weeks contribute 5 days
+    and the remainder contributes at most 5. Floor division keeps the
+    formula valid for ordinals <= 0 as well.
+    """
+    return (ordinal // 7) * 5 + min(ordinal % 7, 5)
+
+
+def _weekday_ordinal(count: int) -> int:
+    """
+    Inverse of _weekdays_upto: smallest ordinal with _weekdays_upto >= count.
+    """
+    weeks, rest = divmod(count - 1, 5)
+    return weeks * 7 + rest + 1
+
+
+@dataclass(frozen=True)
+class WorkCalendar:
+    """
+    Compiled calendar for constant-time workday arithmetic.
+    
+    A Calendar stores exclusions as strings, which makes day-by-day walks
+    re-parse every excluded date on every step. WorkCalendar keeps the
+    same information as a weekend flag plus a sorted tuple of holiday
+    ordinals, so that "N workdays after d" is a whole-week jump corrected
+    by a bisect into the holiday list.
+    
+    WorkCalendar is immutable, so one instance can be shared by every
+    node (and every consumer: scheduler, renderers, validators) that
+    uses the same calendar_id. See compile_calendars().
+    
+    Attributes:
+        weekends: Whether Saturday and Sunday are non-working days
+        holidays: Sorted ordinals of excluded dates that would otherwise
+                  be working days (weekend dates are dropped when
+                  weekends=True so that they are not counted twice)
+        excluded: Same ordinals as a frozenset for O(1) is_workday checks
+                  (derived from holidays)
+    """
+    weekends: bool = False
+    holidays: tuple[int, ...] = ()
+    excluded: frozenset[int] = field(
+        init=False, repr=False, compare=False, default=frozenset()
+    )
+    
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "excluded", frozenset(self.holidays))
+    
+    def is_workday(self, d: date) -> bool:
+        """Check if a date is a working day."""
+        if self.weekends and d.weekday() >= 5:
+            return False
+        return d.toordinal() not in self.excluded
+    
+    def _base_upto(self, ordinal: int) -> int:
+        """Count days with ordinal <= ordinal, ignoring holidays."""
+        return _weekdays_upto(ordinal) if self.weekends else ordinal
+    
+    def _base_ordinal(self, count: int) -> int:
+        """Smallest ordinal with _base_upto >= count."""
+        return _weekday_ordinal(count) if self.weekends else count
+    
+    def workdays_upto(self, ordinal: int) -> int:
+        """
+        Count working days with ordinal <= the given ordinal.
+        
+        The absolute value is meaningless; only differences between two
+        calls are, which is all the arithmetic below relies on.
+        """
+        return self._base_upto(ordinal) - bisect_right(self.holidays, ordinal)
+    
+    def nth_workday(self, count: int) -> date:
+        """
+        Find the working day whose workdays_upto value equals count.
+        
+        Starts from the position that ignores holidays and jumps forward
+        by the number of holidays skipped until the count is reached.
+        """
+        ordinal = self._base_ordinal(count)
+        deficit = count - self.workdays_upto(ordinal)
+        while deficit > 0:
+            ordinal = self._base_ordinal(self._base_upto(ordinal) + deficit)
+            deficit = count - self.workdays_upto(ordinal)
+        return date.fromordinal(ordinal)
+    
+    def workday_on_or_before(self, d: date) -> date:
+        """Find the latest working day that is not after d."""
+        return self.nth_workday(self.workdays_upto(d.toordinal()))
+    
+    def next_workday(self, d: date) -> date:
+        """Find the next working day after d (exclusive)."""
+        return self.nth_workday(self.workdays_upto(d.toordinal()) + 1)
+    
+    def add_workdays(self, start: date, days: int) -> date:
+        """Add working days to start (0 means same day)."""
+        if days <= 0:
+            return start
+        return self.nth_workday(self.workdays_upto(start.toordinal()) + days)
+    
+    def sub_workdays(self, end: date, days: int) -> date:
+        """Subtract working days from end (0 means same day)."""
+        if days <= 0:
+            return end
+        before = self.workdays_upto(end.toordinal() - 1)
+        return self.nth_workday(before - days + 1)
+    
+    def count_workdays_between(self, start: date, finish: date) -> int:
+        """Count working days in [start, finish] (both inclusive)."""
+        if finish < start:
+            return 0
+        return (
+            self.workdays_upto(finish.toordinal())
+            - self.workdays_upto(start.toordinal() - 1)
+        )
+
+
+def compile_calendar(calendar: Calendar) -> WorkCalendar:
+    """
+    Compile a Calendar into a WorkCalendar.
+    
+    Excludes are parsed once: "weekends" sets the weekend flag, valid
+    YYYY-MM-DD strings become holiday ordinals, anything else is ignored
+    (same semantics as is_excluded_date).
+    
+    Args:
+        calendar: Calendar with exclusions
+        
+    Returns:
+        WorkCalendar for fast workday arithmetic
+    """
+    weekends = "weekends" in calendar.excludes
+    holidays: set[int] = set()
+    for exclude in calendar.excludes:
+        if exclude == "weekends":
+            continue
+        excluded_date = parse_date(exclude)
+        if excluded_date is None:
+            continue
+        if weekends and excluded_date.weekday() >= 5:
+            continue
+        holidays.add(excluded_date.toordinal())
+    return WorkCalendar(weekends=weekends, holidays=tuple(sorted(holidays)))
+
+
+# Calendar used when a node has neither calendar nor default_calendar
+EMPTY_CALENDAR = WorkCalendar()
+
+
+def compile_calendars(schedule: Schedule) -> dict[str, WorkCalendar]:
+    """
+    Compile every calendar of a schedule, keyed by calendar_id.
+    
+    Each calendar is compiled exactly once; all nodes referring to the
+    same calendar_id share the resulting WorkCalendar.
+    
+    Args:
+        schedule: Schedule with calendars
+        
+    Returns:
+        Dictionary of calendar_id -> WorkCalendar
+    """
+    return {
+        cal_id: compile_calendar(calendar)
+        for cal_id, calendar in schedule.calendars.items()
+    }
+
+
+def resolve_calendar(
+    schedule: Schedule,
+    calendar_id: Optional[str],
+    compiled: Optional[dict[str, WorkCalendar]] = None,
+) -> WorkCalendar:
+    """
+    Resolve the compiled calendar for a schedule node's calendar reference.
+    
+    Falls back to schedule.default_calendar when calendar_id is not set,
+    and to EMPTY_CALENDAR (no exclusions) when neither is available.
+    
+    Args:
+        schedule: Schedule with calendars and default_calendar
+        calendar_id: ScheduleNode.calendar (may be None)
+        compiled: Optional result of compile_calendars(schedule) to reuse
+        
+    Returns:
+        WorkCalendar for the node
+    
+    Requirement: 3.10
+    """
+    cal_id = calendar_id or schedule.default_calendar
+    if not cal_id or cal_id not in schedule.calendars:
+        return EMPTY_CALENDAR
+    if compiled is not None:
+        return compiled[cal_id]
+    return compile_calendar(schedule.calendars[cal_id])
+
+
+def _work_calendar(calendar: Union[Calendar, WorkCalendar]) -> WorkCalendar:
+    """Return calendar as a WorkCalendar, compiling it if needed."""
+    if isinstance(calendar, WorkCalendar):
+        return calendar
+    return compile_calendar(calendar)
+
+
 def is_excluded_date(d: date, calendar: Calendar) -> bool:
     """
     Check if a date is excluded by the calendar.
@@ -131,38 +373,41 @@ def is_excluded_date(d: date, calendar: Calendar) -> bool:
     return False
 
 
-def is_workday(d: date, calendar: Calendar) -> bool:
+def is_workday(d: date, calendar: Union[Calendar, WorkCalendar]) -> bool:
     """
     Check if a date is a working day according to the calendar.
     
     Args:
         d: Date to check
-        calendar: Calendar with exclusions
+        calendar: Calendar with exclusions (or its compiled form)
         
     Returns:
         True if the date is a working day
     """
+    if isinstance(calendar, WorkCalendar):
+        return calendar.is_workday(d)
     return not is_excluded_date(d, calendar)
 
 
-def next_workday(d: date, calendar: Calendar) -> date:
+def next_workday(d: date, calendar: Union[Calendar, WorkCalendar]) -> date:
     """
     Find the next working day after the given date.
     
     Args:
         d: Starting date (exclusive)
-        calendar: Calendar with exclusions
+        calendar: Calendar with exclusions (or its compiled form)
         
     Returns:
         The next working day after d
     """
-    result = d + timedelta(days=1)
-    while not is_workday(result, calendar):
-        result += timedelta(days=1)
-    return result
+    return _work_calendar(calendar).next_workday(d)
 
 
-def normalize_start(d: date, calendar: Calendar, is_milestone: bool) -> date:
+def normalize_start(
+    d: date,
+    calendar: Union[Calendar, WorkCalendar],
+    is_milestone: bool,
+) -> date:
     """
     Normalize a start date to a working day.
     
@@ -172,7 +417,7 @@ def normalize_start(d: date, calendar: Calendar, is_milestone: bool) -> date:
     
     Args:
         d: Start date to normalize
-        calendar: Calendar with exclusions
+        calendar: Calendar with exclusions (or its compiled form)
         is_milestone: Whether the node is a milestone
         
     Returns:
@@ -181,77 +426,378 @@ def normalize_start(d: date, calendar: Calendar, is_milestone: bool) -> date:
     if is_milestone:
         return d
     
-    if is_workday(d, calendar):
+    work_calendar = _work_calendar(calendar)
+    if work_calendar.is_workday(d):
         return d
     
-    return next_workday(d - timedelta(days=1), calendar)
+    return work_calendar.next_workday(d - timedelta(days=1))
 
 
-def add_workdays(start: date, days: int, calendar: Calendar) -> date:
+def add_workdays(
+    start: date,
+    days: int,
+    calendar: Union[Calendar, WorkCalendar],
+) -> date:
     """
     Add working days to a start date.
     
     Args:
         start: Starting date (inclusive)
         days: Number of working days to add (0 means same day)
-        calendar: Calendar with exclusions
+        calendar: Calendar with exclusions (or its compiled form)
         
     Returns:
         The resulting date after adding working days
     """
     if days <= 0:
         return start
-    
-    result = start
-    remaining = days
-    
-    while remaining > 0:
-        result += timedelta(days=1)
-        if is_workday(result, calendar):
-            remaining -= 1
-    
-    return result
+    return _work_calendar(calendar).add_workdays(start, days)
 
 
-def sub_workdays(end: date, days: int, calendar: Calendar) -> date:
+def sub_workdays(
+    end: date,
+    days: int,
+    calendar: Union[Calendar, WorkCalendar],
+) -> date:
     """
     Subtract working days from an end date.
     
     Args:
         end: Ending date (inclusive)
         days: Number of working days to subtract (0 means same day)
-        calendar: Calendar with exclusions
+        calendar: Calendar with exclusions (or its compiled form)
         
     Returns:
         The resulting date after subtracting working days
     """
     if days <= 0:
         return end
+    return _work_calendar(calendar).sub_workdays(end, days)
+
+
+def count_workdays_between(
+    start: date,
+    finish: date,
+    calendar: Union[Calendar, WorkCalendar],
+) -> int:
+    """
+    Count working days between two dates.
+    
+    Args:
+        start: First date (inclusive)
+        finish: Last date (inclusive)
+        calendar: Calendar with exclusions (or its compiled form)
+        
+    Returns:
+        Number of working days in [start, finish], 0 if finish < start
+    """
+    return _work_calendar(calendar).count_workdays_between(start, finish)
+
+
+@dataclass
+class ScheduleGraph:
+    """
+    Dependency graph of the scheduled subgraph.
+    
+    Only edges that actually drive a node's start date are included:
+    a node with an explicit start, or with finish + duration, does not
+    depend on its after list. Dependencies on nodes that are not in
+    schedule.nodes are dropped (Requirement 3.13).
+    
+    Attributes:
+        dependencies: node_id -> scheduled dependencies driving its start
+        dependents: node_id -> scheduled nodes whose start depends on it
+        order: Scheduled node_ids in topological order (dependencies first)
+        blocked: Scheduled node_ids that lie on or behind an after-cycle
+                 and therefore never become ready
+    """
+    dependencies: dict[str, list[str]] = field(default_factory=dict)
+    dependents: dict[str, list[str]] = field(default_factory=dict)
+    order: list[str] = field(default_factory=list)
+    blocked: list[str] = field(default_factory=list)
+
+
+def schedule_dependencies(
+    plan: MergedPlan,
+    node_id: str,
+    schedule_node: Optional[ScheduleNode] = None,
+) -> list[str]:
+    """
+    Get the scheduled dependencies that drive a scheduled node's start.
+    
+    Only priority 3 nodes (no explicit start, no finish + duration)
+    take their start from after; of those dependencies, only the ones
+    present in schedule.nodes count (Requirement 3.13).
+    
+    Args:
+        plan: MergedPlan with schedule
+        node_id: ID of a node in schedule.nodes
+        schedule_node: ScheduleNode to use instead of
+                       plan.schedule.nodes[node_id] (what-if scenarios)
+        
+    Returns:
+        List of dependency node_ids (may be empty)
+    """
+    sn = schedule_node if schedule_node is not None else plan.schedule.nodes[node_id]
+    node = plan.nodes.get(node_id)
+    if node is None or not node.after or sn.start or (sn.finish and sn.duration):
+        return []
+    return [dep_id for dep_id in node.after if dep_id in plan.schedule.nodes]
+
+
+def build_schedule_graph(plan: MergedPlan) -> ScheduleGraph:
+    """
+    Build the scheduled dependency graph and its topological order.
+    
+    Uses Kahn's algorithm with an explicit queue, so arbitrarily long
+    after-chains are handled without recursion. Ties are broken by
+    schedule.nodes order, which keeps the result deterministic.
+    
+    Args:
+        plan: MergedPlan with schedule
+        
+    Returns:
+        ScheduleGraph (empty if the plan has no schedule)
+    """
+    graph = ScheduleGraph()
+    if plan.schedule is None:
+        return graph
+    
+    schedule_nodes = plan.schedule.nodes
     
-    result = end
-    remaining = days
+    for node_id in schedule_nodes:
+        graph.dependents[node_id] = []
     
-    while remaining > 0:
-        result -= timedelta(days=1)
-        if is_workday(result, calendar):
-            remaining -= 1
+    for node_id in schedule_nodes:
+        deps = schedule_dependencies(plan, node_id)
+        graph.dependencies[node_id] = deps
+        for dep_id in deps:
+            graph.dependents[dep_id].append(node_id)
     
-    return result
+    graph.order, graph.blocked = _topological_order(
+        list(schedule_nodes), graph.dependencies, graph.dependents
+    )
+    return graph
 
 
-def compute_schedule(plan: MergedPlan) -> None:
+def _topological_order(
+    node_ids: list[str],
+    dependencies: dict[str, list[str]],
+    dependents: dict[str, list[str]],
+    blocked_outside: Union[set[str], frozenset[str]] = frozenset(),
+) -> tuple[list[str], list[str]]:
+    """
+    Order a subset of scheduled nodes with Kahn's algorithm.
+    
+    Only edges between nodes of the subset are considered; dependencies
+    outside of it are treated as already computed, except for the ones
+    in blocked_outside, which never become ready.
+    
+    Args:
+        node_ids: Nodes to order (ties are broken by this order)
+        dependencies: node_id -> dependency node_ids
+        dependents: node_id -> dependent node_ids
+        blocked_outside: Blocked nodes outside of node_ids
+        
+    Returns:
+        (order, blocked): topological order, and the nodes that never
+        became ready because they are on or behind a cycle
+    """
+    members = set(node_ids)
+    pending = {
+        node_id: sum(
+            1 for dep_id in dependencies[node_id]
+            if dep_id in members or dep_id in blocked_outside
+        )
+        for node_id in node_ids
+    }
+    
+    order: list[str] = []
+    queue = deque(node_id for node_id in node_ids if pending[node_id] == 0)
+    while queue:
+        node_id = queue.popleft()
+        order.append(node_id)
+        for dependent_id in dependents[node_id]:
+            if dependent_id not in members:
+                continue
+            pending[dependent_id] -= 1
+            if pending[dependent_id] == 0:
+                queue.append(dependent_id)
+    
+    blocked: list[str] = []
+    if len(order) < len(node_ids):
+        blocked = [node_id for node_id in node_ids if pending[node_id] > 0]
+    
+    return order, blocked
+
+
+def _warning(node_id: str, code: str, message: str) -> ScheduleWarning:
+    """Create a ScheduleWarning with the standard message prefix."""
+    return ScheduleWarning(node_id=node_id, code=code, message=f"Node '{node_id}': {message}")
+
+
+def _cyclic_warning(node_id: str) -> ScheduleWarning:
+    """Warning for a node on or behind an after-cycle."""
+    return _warning(
+        node_id,
+        WARN_CYCLIC_DEPENDENCY,
+        "cannot compute start date (cyclic after dependency)",
+    )
+
+
+def compute_node_dates(
+    plan: MergedPlan,
+    node_id: str,
+    calendar: WorkCalendar,
+    dependencies: list[str],
+    dates: dict[str, tuple[Optional[date], Optional[date]]],
+    schedule_node: Optional[ScheduleNode] = None,
+) -> tuple[Optional[date], Optional[date], Optional[ScheduleWarning]]:
+    """
+    Compute start and finish dates for a single scheduled node.
+    
+    Start priority: explicit start, then finish + duration (backward
+    scheduling), then the latest finish of scheduled dependencies.
+    
+    Args:
+        plan: MergedPlan with schedule
+        node_id: ID of a node in schedule.nodes
+        calendar: Compiled calendar of the node (see resolve_calendar)
+        dependencies: Scheduled dependencies (see schedule_dependencies)
+        dates: Already computed (start, finish) of every dependency
+        schedule_node: ScheduleNode to use instead of
+                       plan.schedule.nodes[node_id] (what-if scenarios)
+        
+    Returns:
+        (start, finish, warning). start and finish are None when the
+        node is unschedulable; warning is set in that case.
+    
+    Requirements: 3.13, 3.14
+    """
+    sn = schedule_node if schedule_node is not None else plan.schedule.nodes[node_id]
+    node = plan.nodes.get(node_id)
+    
+    if node is None:
+        # Node doesn't exist in nodes (should be caught by validator)
+        return (None, None, None)
+    
+    is_milestone = node.milestone
+    
+    start: Optional[date] = None
+    finish: Optional[date] = None
+    
+    # Priority 1: Explicit start date
+    if sn.start:
+        parsed_start = parse_date(sn.start)
+        if parsed_start:
+            start = normalize_start(parsed_start, calendar, is_milestone)
+    
+    # Priority 2: finish + duration (backward scheduling)
+    elif sn.finish and sn.duration:
+        parsed_finish = parse_date(sn.finish)
+        duration_days = parse_duration(sn.duration)
+        
+        if parsed_finish and duration_days:
+            # Subtract duration from finish to get start
+            # duration is in working days, so we need to subtract (duration - 1)
+            # because both start and finish are inclusive
+            start = sub_workdays(parsed_finish, duration_days - 1, calendar)
+    
+    # Priority 3: Dependencies (after) - only scheduled ones (Requirement 3.13)
+    elif dependencies:
+        # Finish dates of all scheduled dependencies (already computed)
+        dep_finishes = [
+            dates[dep_id][1] for dep_id in dependencies
+            if dates[dep_id][1] is not None
+        ]
+        
+        if not dep_finishes:
+            # All scheduled dependencies are unschedulable (Requirement 3.14)
+            return (None, None, _warning(
+                node_id,
+                WARN_DEPENDENCIES_UNSCHEDULABLE,
+                "all scheduled dependencies are unschedulable",
+            ))
+        
+        # Start after the latest dependency finishes
+        max_finish = max(dep_finishes)
+        
+        if is_milestone:
+            # Milestones can start on the same day as dependency finish
+            start = max_finish
+        else:
+            # Regular nodes start on the next working day
+            start = calendar.next_workday(max_finish)
+    
+    if start is None:
+        # Node is unschedulable (Requirement 3.14)
+        return (None, None, _warning(node_id, WARN_NO_START, "cannot compute start date"))
+    
+    # Compute finish date
+    if sn.finish:
+        # Explicit finish date
+        parsed_finish = parse_date(sn.finish)
+        if parsed_finish:
+            finish = parsed_finish
+        else:
+            # Invalid finish date, compute from duration
+            duration_days = parse_duration(sn.duration) if sn.duration else 1
+            finish = add_workdays(start, duration_days - 1, calendar)
+    else:
+        # Compute finish from duration (default: 1 day for milestones)
+        duration_days = parse_duration(sn.duration) if sn.duration else 1
+        
+        if is_milestone:
+            # Milestones have zero duration (finish = start)
+            finish = start
+        else:
+            # Regular nodes: add (duration - 1) working days
+            finish = add_workdays(start, duration_days - 1, calendar)
+    
+    return (start, finish, None)
+
+
+def _store_dates(
+    plan: MergedPlan,
+    node_ids: list[str],
+    dates: dict[str, tuple[Optional[date], Optional[date]]],
+) -> None:
+    """Write computed dates of the given nodes to their ScheduleNodes and columns."""
+    columns = plan.schedule.columns
+    for node_id in node_ids:
+        sn = plan.schedule.nodes[node_id]
+        start, finish = dates[node_id]
+        sn.computed_start = format_date(start) if start else None
+        sn.computed_finish = format_date(finish) if finish else None
+        if columns is not None:
+            columns.set(node_id, start, finish)
+
+
+def _ordered_warnings(
+    plan: MergedPlan,
+    warnings: dict[str, ScheduleWarning],
+) -> list[ScheduleWarning]:
+    """List warnings in schedule.nodes order (at most one per node)."""
+    return [
+        warnings[node_id] for node_id in plan.schedule.nodes
+        if node_id in warnings
+    ]
+
+
+def compute_schedule(plan: MergedPlan, materialize: bool = True) -> None:
     """
     Compute dates for scheduled nodes.
     
     This function calculates computed_start and computed_finish for all
-    nodes present in schedule.nodes. It uses memoization to avoid
-    redundant calculations.
+    nodes present in schedule.nodes. Nodes are processed once each in
+    topological order (see build_schedule_graph), so dependency dates
+    are always known when a dependent node is computed.
     
     Key principles:
     - Only nodes in schedule.nodes participate in calculation
     - Dependencies (after) come from nodes, not schedule.nodes
     - Only scheduled dependencies are considered
-    - Uses memoization to avoid repeated calculations
+    - No recursion: long after-chains do not hit the recursion limit
     
     Node states:
     - included: present in schedule.nodes
@@ -261,7 +807,15 @@ def compute_schedule(plan: MergedPlan) -> None:
     Args:
         plan: MergedPlan with schedule to process. Schedule nodes are
               modified in-place with computed_start and computed_finish.
-              Warnings are added to plan.schedule.warnings.
+              Warnings are stored in plan.schedule.warnings as
+              ScheduleWarning records (at most one per node, in
+              schedule.nodes order). The dates are also stored as
+              ordinal columns in plan.schedule.columns.
+        materialize: Write the computed_start/computed_finish strings.
+                     With False they are cleared and only
+                     plan.schedule.columns is filled; call
+                     plan.schedule.columns.materialize(plan.schedule)
+                     when the strings are needed.
     
     Requirements:
         - 3.10: Use default_calendar when calendar not specified
@@ -274,147 +828,364 @@ def compute_schedule(plan: MergedPlan) -> None:
     if plan.schedule is None:
         return
     
-    # Set of scheduled node IDs (Requirement 3.11, 3.12)
-    scheduled_ids = set(plan.schedule.nodes.keys())
-    
-    if not scheduled_ids:
+    # Scheduled nodes (Requirement 3.11, 3.12)
+    if not plan.schedule.nodes:
         return
     
-    # Memoization cache: node_id -> (start, finish) or None if unschedulable
-    cache: dict[str, tuple[Optional[date], Optional[date]]] = {}
+    graph = build_schedule_graph(plan)
     
-    # Warnings collection
-    warnings: list[str] = []
+    # Compile each calendar once per run, shared by all its nodes
+    calendars = compile_calendars(plan.schedule)
     
-    def get_calendar(node_id: str) -> Calendar:
-        """
-        Get the calendar for a scheduled node.
-        
-        Uses the node's explicit calendar if set, otherwise falls back
-        to default_calendar. If neither is available, returns an empty
-        calendar (no exclusions).
+    dates, warnings = _schedule_nodes(plan, graph, calendars, graph.order, graph.blocked)
+    
+    plan.schedule.columns = ScheduleColumns.from_dates(list(plan.schedule.nodes), dates)
+    if materialize:
+        plan.schedule.columns.materialize(plan.schedule)
+    else:
+        # Do not leave dates of an earlier run behind
+        for sn in plan.schedule.nodes.values():
+            sn.computed_start = None
+            sn.computed_finish = None
+    plan.schedule.warnings = _ordered_warnings(plan, warnings)
+
+
+def _schedule_nodes(
+    plan: MergedPlan,
+    graph: ScheduleGraph,
+    calendars: dict[str, WorkCalendar],
+    order: list[str],
+    blocked: list[str],
+    dates: Optional[dict[str, tuple[Optional[date], Optional[date]]]] = None,
+    warnings: Optional[dict[str, ScheduleWarning]] = None,
+) -> tuple[
+    dict[str, tuple[Optional[date], Optional[date]]],
+    dict[str, ScheduleWarning],
+]:
+    """
+    Compute dates for nodes in topological order.
+    
+    Args:
+        plan: MergedPlan with schedule
+        graph: Scheduled dependency graph
+        calendars: Result of compile_calendars
+        order: Nodes to compute, dependencies first
+        blocked: Nodes on or behind a cycle (marked unschedulable)
+        dates: Existing dates to update (dependencies outside order)
+        warnings: Existing warnings to update
         
-        Requirement: 3.10
-        """
+    Returns:
+        (dates, warnings) dictionaries keyed by node_id
+    """
+    dates = {} if dates is None else dates
+    warnings = {} if warnings is None else warnings
+    
+    for node_id in order:
         sn = plan.schedule.nodes[node_id]
-        cal_id = sn.calendar or plan.schedule.default_calendar
+        calendar = resolve_calendar(plan.schedule, sn.calendar, calendars)
+        start, finish, warning = compute_node_dates(
+            plan, node_id, calendar, graph.dependencies[node_id], dates
+        )
+        dates[node_id] = (start, finish)
+        if warning is None:
+            warnings.pop(node_id, None)
+        else:
+            warnings[node_id] = warning
+    
+    # Nodes on or behind an after-cycle never become ready
+    for node_id in blocked:
+        dates[node_id] = (None, None)
+        warnings[node_id] = _cyclic_warning(node_id)
+    
+    return dates, warnings
+
+
+class IncrementalScheduler:
+    """
+    Schedule that is updated after edits instead of recomputed.
+    
+    Keeps the scheduled dependency graph (with reverse edges), the
+    compiled calendars and the computed (start, finish) of every node.
+    After an edit, update() recomputes only the changed nodes and their
+    transitive dependents; the result is the same as a full
+    compute_schedule run.
+    
+    Edits that update() understands (pass the edited node_ids):
+    - ScheduleNode fields (start, finish, duration, calendar)
+    - Node.after and Node.milestone
+    - Adding or removing a node in schedule.nodes or nodes
+    
+    Changes to schedule.calendars or schedule.default_calendar affect
+    arbitrary nodes; call refresh() after them.
+    
+    Example:
+        >>> scheduler = IncrementalScheduler(plan)  # full pass
+        >>> plan.schedule.nodes["task1"].duration = "5d"
+        >>> scheduler.update(["task1"])  # task1 and its downstream cone
+        ['task1', 'task2', 'milestone1']
+    """
+    
+    def __init__(self, plan: MergedPlan) -> None:
+        self.plan = plan
+        self.refresh()
+    
+    def refresh(self) -> None:
+        """Recompute the whole schedule and rebuild all indexes."""
+        plan = self.plan
+        self._graph = ScheduleGraph()
+        self._calendars: dict[str, WorkCalendar] = {}
+        self._dates: dict[str, tuple[Optional[date], Optional[date]]] = {}
+        self._warnings: dict[str, ScheduleWarning] = {}
+        self._blocked: set[str] = set()
         
-        if cal_id and cal_id in plan.schedule.calendars:
-            return plan.schedule.calendars[cal_id]
+        # Reverse after index over all nodes: node_id -> nodes listing it in after
+        # (seeded from plan.index, then maintained by update)
+        self._after: dict[str, tuple[str, ...]] = {
+            node_id: tuple(node.after) for node_id, node in plan.nodes.items() if node.after
+        }
+        self._after_dependents: dict[str, set[str]] = {
+            dep_id: set(dependent_ids)
+            for dep_id, dependent_ids in plan.index.dependents.items()
+        }
         
-        # Return empty calendar if no calendar found
-        return Calendar(excludes=[])
+        if plan.schedule is None:
+            return
+        
+        self._graph = build_schedule_graph(plan)
+        self._calendars = compile_calendars(plan.schedule)
+        self._blocked = set(self._graph.blocked)
+        self._dates, self._warnings = _schedule_nodes(
+            plan, self._graph, self._calendars,
+            self._graph.order, self._graph.blocked,
+        )
+        plan.schedule.columns = ScheduleColumns.from_dates(list(plan.schedule.nodes), self._dates)
+        plan.schedule.columns.materialize(plan.schedule)
+        plan.schedule.warnings = _ordered_warnings(plan, self._warnings)
     
-    def compute_dates(node_id: str) -> tuple[Optional[date], Optional[date]]:
+    def update(self, changed_ids: Iterable[str]) -> list[str]:
         """
-        Compute start and finish dates for a scheduled node with memoization.
+        Recompute the schedule after the given nodes were edited.
+        
+        Also invalidates plan.index, which may describe the nodes
+        before the edit.
         
-        Returns (start, finish) tuple. If dates cannot be computed,
-        returns (None, None) and adds a warning.
+        Args:
+            changed_ids: IDs of edited, added or removed nodes
+            
+        Returns:
+            IDs of the recomputed scheduled nodes, in computation order
         """
-        # Check memoization cache
-        if node_id in cache:
-            return cache[node_id]
+        plan = self.plan
+        changed = list(dict.fromkeys(changed_ids))
+        if changed:
+            # The edits may have changed parent or after (see MergedPlan.index)
+            plan.invalidate_index()
+        if plan.schedule is None:
+            return []
         
-        sn = plan.schedule.nodes[node_id]
-        node = plan.nodes.get(node_id)
+        schedule_nodes = plan.schedule.nodes
+        graph = self._graph
         
-        if node is None:
-            # Node doesn't exist in nodes (should be caught by validator)
-            cache[node_id] = (None, None)
-            return (None, None)
+        # 1. Nodes whose dependency lists may have changed: the edited
+        #    nodes and every node listing an edited node in after
+        owners: dict[str, None] = {}
+        for node_id in changed:
+            self._index_after(node_id)
+            owners[node_id] = None
+            for owner_id in self._after_dependents.get(node_id, ()):
+                owners[owner_id] = None
         
-        calendar = get_calendar(node_id)
-        is_milestone = node.milestone
+        # 2. Rebuild their edges (remove all old edges first, so that
+        #    dependents lists of removed nodes are still present)
+        for owner_id in owners:
+            for dep_id in graph.dependencies.pop(owner_id, []):
+                graph.dependents[dep_id].remove(owner_id)
+        for owner_id in owners:
+            if owner_id in schedule_nodes:
+                graph.dependents.setdefault(owner_id, [])
+        for owner_id in owners:
+            if owner_id in schedule_nodes:
+                deps = schedule_dependencies(plan, owner_id)
+                graph.dependencies[owner_id] = deps
+                for dep_id in deps:
+                    graph.dependents[dep_id].append(owner_id)
+            else:
+                graph.dependents.pop(owner_id, None)
+                self._dates.pop(owner_id, None)
+                self._warnings.pop(owner_id, None)
+                self._blocked.discard(owner_id)
         
-        start: Optional[date] = None
-        finish: Optional[date] = None
+        # 3. Downstream cone of the affected scheduled nodes
+        cone: dict[str, None] = {}
+        queue = deque(owner_id for owner_id in owners if owner_id in schedule_nodes)
+        while queue:
+            node_id = queue.popleft()
+            if node_id in cone:
+                continue
+            cone[node_id] = None
+            queue.extend(graph.dependents[node_id])
         
-        # Priority 1: Explicit start date
-        if sn.start:
-            parsed_start = parse_date(sn.start)
-            if parsed_start:
-                start = normalize_start(parsed_start, calendar, is_milestone)
+        # 4. Recompute the cone in topological order; nodes behind a
+        #    cycle outside of the cone stay blocked
+        self._blocked.difference_update(cone)
+        order, blocked = _topological_order(
+            list(cone), graph.dependencies, graph.dependents, self._blocked
+        )
+        self._blocked.update(blocked)
+        _schedule_nodes(
+            plan, graph, self._calendars, order, blocked,
+            self._dates, self._warnings,
+        )
         
-        # Priority 2: finish + duration (backward scheduling)
-        elif sn.finish and sn.duration:
-            parsed_finish = parse_date(sn.finish)
-            duration_days = parse_duration(sn.duration)
-            
-            if parsed_finish and duration_days:
-                # Subtract duration from finish to get start
-                # duration is in working days, so we need to subtract (duration - 1)
-                # because both start and finish are inclusive
-                start = sub_workdays(parsed_finish, duration_days - 1, calendar)
-        
-        # Priority 3: Dependencies (after) - only scheduled ones (Requirement 3.13)
-        elif node.after:
-            scheduled_deps = [dep_id for dep_id in node.after if dep_id in scheduled_ids]
-            
-            if scheduled_deps:
-                # Compute finish dates for all scheduled dependencies
-                dep_finishes: list[date] = []
-                
-                for dep_id in scheduled_deps:
-                    _, dep_finish = compute_dates(dep_id)
-                    if dep_finish is not None:
-                        dep_finishes.append(dep_finish)
-                
-                if dep_finishes:
-                    # Start after the latest dependency finishes
-                    max_finish = max(dep_finishes)
-                    
-                    if is_milestone:
-                        # Milestones can start on the same day as dependency finish
-                        start = max_finish
-                    else:
-                        # Regular nodes start on the next working day
-                        start = next_workday(max_finish, calendar)
-                else:
-                    # All scheduled dependencies are unschedulable (Requirement 3.14)
-                    warnings.append(
-                        f"Node '{node_id}': all scheduled dependencies are unschedulable"
-                    )
-            # else: no scheduled dependencies, fall through to unschedulable
-        
-        # Compute finish date if we have a start
-        if start is not None:
-            if sn.finish:
-                # Explicit finish date
-                parsed_finish = parse_date(sn.finish)
-                if parsed_finish:
-                    finish = parsed_finish
-                else:
-                    # Invalid finish date, compute from duration
-                    duration_days = parse_duration(sn.duration) if sn.duration else 1
-                    finish = add_workdays(start, duration_days - 1, calendar)
+        # Column positions follow schedule.nodes; rebuild them when
+        # nodes were added to or removed from the schedule
+        columns = plan.schedule.columns
+        if columns is None or columns.node_ids != tuple(schedule_nodes):
+            plan.schedule.columns = ScheduleColumns.from_dates(list(schedule_nodes), self._dates)
+        _store_dates(plan, order + blocked, self._dates)
+        plan.schedule.warnings = _ordered_warnings(plan, self._warnings)
+        
+        return order + blocked
+    
+    def _index_after(self, node_id: str) -> None:
+        """Update the reverse after index for one node."""
+        for dep_id in self._after.pop(node_id, ()):
+            self._after_dependents[dep_id].discard(node_id)
+        
+        node = self.plan.nodes.get(node_id)
+        if node is None or not node.after:
+            return
+        
+        after = tuple(node.after)
+        self._after[node_id] = after
+        for dep_id in after:
+            self._after_dependents.setdefault(dep_id, set()).add(node_id)
+
+
+def compute_critical_path(
+    plan: MergedPlan,
+    graph: Optional[ScheduleGraph] = None,
+) -> list[str]:
+    """
+    Compute latest dates, total float and the critical path.
+    
+    Backward pass over the scheduled dependency graph, run after
+    compute_schedule. The plan finish is the latest computed_finish; a
+    node's latest finish is bounded by the latest start of each
+    dependent (the day before it, or the same day for milestone
+    dependents, mirroring the forward rules). Each node is visited once
+    in reverse topological order, so the pass is linear in the graph.
+    
+    Sets on every scheduled node with computed dates:
+    - latest_start, latest_finish (YYYY-MM-DD)
+    - total_float: working days between computed_start and latest_start
+      in the node's calendar (<= 0 means critical)
+    
+    The critical path is the chain of critical nodes that ends at the
+    plan finish, following at each step the dependency that finishes
+    last (the one that drives the start date).
+    
+    Args:
+        plan: MergedPlan after compute_schedule
+        graph: Optional result of build_schedule_graph(plan) to reuse
+        
+    Returns:
+        node_ids of the critical path, first to last (also stored in
+        plan.schedule.critical_path); empty if nothing is scheduled
+    """
+    if plan.schedule is None:
+        return []
+    
+    schedule_nodes = plan.schedule.nodes
+    if graph is None:
+        graph = build_schedule_graph(plan)
+    calendars = compile_calendars(plan.schedule)
+    
+    # Early dates from the forward pass (columns avoid re-parsing strings)
+    columns = plan.schedule.columns
+    early: dict[str, tuple[date, date]] = {}
+    for node_id in graph.order:
+        sn = schedule_nodes[node_id]
+        sn.latest_start = None
+        sn.latest_finish = None
+        sn.total_float = None
+        if columns is not None and node_id in columns.index:
+            start, finish = columns.dates(node_id)
+        else:
+            start = parse_date(sn.computed_start) if sn.computed_start else None
+            finish = parse_date(sn.computed_finish) if sn.computed_finish else None
+        if start is not None and finish is not None:
+            early[node_id] = (start, finish)
+    
+    plan.schedule.critical_path = []
+    if not early:
+        return []
+    
+    plan_finish = max(finish for _, finish in early.values())
+    
+    # Backward pass: latest dates in reverse topological order
+    late: dict[str, tuple[date, date]] = {}
+    total_float: dict[str, int] = {}
+    for node_id in reversed(graph.order):
+        if node_id not in early:
+            continue
+        
+        sn = schedule_nodes[node_id]
+        node = plan.nodes.get(node_id)
+        is_milestone = node.milestone if node else False
+        calendar = resolve_calendar(plan.schedule, sn.calendar, calendars)
+        
+        bound = plan_finish
+        for dependent_id in graph.dependents[node_id]:
+            if dependent_id not in late:
+                continue
+            dependent_start = late[dependent_id][0]
+            dependent = plan.nodes.get(dependent_id)
+            if dependent is not None and dependent.milestone:
+                # Milestones start on the day their dependencies finish
+                bound = min(bound, dependent_start)
             else:
-                # Compute finish from duration (default: 1 day for milestones)
-                duration_days = parse_duration(sn.duration) if sn.duration else 1
-                
-                if is_milestone:
-                    # Milestones have zero duration (finish = start)
-                    finish = start
-                else:
-                    # Regular nodes: add (duration - 1) working days
-                    finish = add_workdays(start, duration_days - 1, calendar)
+                # Regular nodes start the next working day
+                bound = min(bound, dependent_start - timedelta(days=1))
+        
+        start, finish = early[node_id]
+        if is_milestone:
+            late_finish = bound
+            late_start = bound
         else:
-            # Node is unschedulable (Requirement 3.14)
-            if node_id not in [w.split("'")[1] for w in warnings if "'" in w]:
-                warnings.append(f"Node '{node_id}': cannot compute start date")
+            late_finish = calendar.workday_on_or_before(bound)
+            duration_days = max(calendar.count_workdays_between(start, finish), 1)
+            late_start = calendar.sub_workdays(late_finish, duration_days - 1)
         
-        # Store in cache
-        cache[node_id] = (start, finish)
-        return (start, finish)
+        late[node_id] = (late_start, late_finish)
+        total_float[node_id] = (
+            calendar.workdays_upto(late_start.toordinal())
+            - calendar.workdays_upto(start.toordinal())
+        )
+        sn.latest_start = format_date(late_start)
+        sn.latest_finish = format_date(late_finish)
+        sn.total_float = total_float[node_id]
     
-    # Compute dates for all scheduled nodes
-    for node_id in scheduled_ids:
-        sn = plan.schedule.nodes[node_id]
-        start, finish = compute_dates(node_id)
-        
-        # Store computed dates as strings
-        sn.computed_start = format_date(start) if start else None
-        sn.computed_finish = format_date(finish) if finish else None
+    # Critical chain: walk back from the last critical node at the plan finish
+    # (last in topological order, so trailing milestones are included)
+    current = next(
+        (
+            node_id for node_id in reversed(graph.order)
+            if node_id in early
+            and early[node_id][1] == plan_finish
+            and total_float[node_id] <= 0
+        ),
+        None,
+    )
+    chain: list[str] = []
+    while current is not None:
+        chain.append(current)
+        critical_deps = [
+            dep_id for dep_id in graph.dependencies[current]
+            if dep_id in early and total_float[dep_id] <= 0
+        ]
+        current = max(critical_deps, key=lambda dep_id: early[dep_id][1], default=None)
     
-    # Store warnings in schedule
-    plan.schedule.warnings = warnings
+    chain.reverse()
+    plan.schedule.critical_path = chain
+    return chain
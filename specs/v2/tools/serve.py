@@ -0,0 +1,597 @@
+"""
+Render server for opskarta v2 plan sets.
+
+Running `cli render ...` once per page view pays interpreter start-up,
+loading, validation and scheduling every time. The server keeps each
+plan set loaded and computed in memory, and serves renders over HTTP on
+a local TCP port or a Unix socket:
+
+    GET /render/{format}?view=VIEW_ID&file=main.yaml&file=nodes.yaml
+    GET /render/effort-summary?by=status&by=kind&node=NODE_ID
+
+Key concepts:
+- PlanStore keeps one computed plan per plan set, keyed by the real
+  paths of its files. Every request stats the files; when a stamp
+  (mtime_ns, size) changed, the contents are hashed, and the plan is
+  reloaded only if a hash differs. Requests for other plan sets are not
+  blocked by a reload. The store is an LRU bounded by a number of plan
+  sets, and plan sets whose files disappeared are dropped.
+- A loaded plan is fully computed (effort, schedule, critical path,
+  index) before it is published and never modified afterwards, so
+  requests render from it concurrently; a reload publishes a new plan
+  and requests in flight keep the old one.
+- OutputCache is an LRU of rendered bodies keyed by plan generation,
+  format and parameters; a reloaded plan gets a new generation.
+- Requests are handled by a fixed pool of threads.
+- Files given in requests must be inside the server root directory.
+
+Responses are text/plain (UTF-8) and match the CLI output byte for
+byte. Status codes: 400 bad parameters or unknown view, 403 file outside
+the root, 404 unknown path or format, 422 plan does not load or
+validate (the body lists the errors).
+
+Example:
+    >>> service = RenderService(["main.yaml", "nodes.yaml"])
+    >>> server = create_server(service, port=8765)
+    >>> server.serve_forever()
+"""
+
+import hashlib
+import io
+import itertools
+import os
+import socketserver
+import stat
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from typing import TYPE_CHECKING, Hashable, Optional, Sequence
+from urllib.parse import parse_qs, urlsplit
+
+from specs.v2.tools.effort import compute_effort_metrics
+from specs.v2.tools.loader import LoadError, MergeConflictError, load_plan_set
+from specs.v2.tools.models import MergedPlan
+from specs.v2.tools.render import (
+    iter_critical,
+    iter_deps,
+    iter_effort_summary,
+    iter_gantt,
+    iter_list,
+    iter_tree,
+    write_lines,
+)
+from specs.v2.tools.scheduler import compute_critical_path, compute_schedule
+from specs.v2.tools.snapshot import SnapshotError, is_snapshot, load_snapshot
+from specs.v2.tools.validator import format_error, validate
+
+if TYPE_CHECKING:
+    from specs.v2.tools.cache import FragmentCache
+
+
+# Formats served under /render/
+SERVE_FORMATS = ("gantt", "tree", "list", "deps", "critical", "effort-summary")
+
+# Default number of request threads
+DEFAULT_THREADS = 8
+
+# Default number of rendered bodies kept by OutputCache
+DEFAULT_OUTPUT_CACHE_SIZE = 256
+
+# Default number of plan sets kept loaded by PlanStore
+DEFAULT_PLAN_CACHE_SIZE = 16
+
+# Stamp of a file that does not exist (or cannot be read)
+_MISSING = (-1, -1)
+
+
+def _stamp(file_path: str) -> tuple[int, int]:
+    """Modification stamp of a file: (mtime_ns, size)."""
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return _MISSING
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def _digest(file_path: str) -> Optional[str]:
+    """SHA-256 of a file's contents, or None if it cannot be read."""
+    try:
+        with open(file_path, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return None
+
+
+@dataclass
+class PlanEntry:
+    """
+    One loaded plan set.
+    
+    Attributes:
+        files: Real paths of the files, in load order
+        stamps: (mtime_ns, size) of each file when it was loaded
+        digests: SHA-256 of each file when it was loaded
+        generation: Number identifying this load (unique per PlanStore)
+        plan: Computed plan (read-only), or None if loading failed
+        errors: Error messages when loading or validation failed
+    """
+    files: tuple[str, ...]
+    stamps: tuple[tuple[int, int], ...]
+    digests: tuple[Optional[str], ...]
+    generation: int
+    plan: Optional[MergedPlan] = None
+    errors: list[str] = field(default_factory=list)
+
+
+def load_computed_plan(
+    files: Sequence[str],
+    jobs: Optional[int] = None,
+    cache: Optional["FragmentCache"] = None,
+) -> tuple[Optional[MergedPlan], list[str]]:
+    """
+    Load, validate and compute a plan set for read-only rendering.
+    
+    Computes effort metrics, the schedule and the critical path, and
+    builds plan.index, so that rendering does not modify the plan.
+    
+    Args:
+        files: YAML file paths, or a single compiled snapshot
+        jobs: Worker processes for parsing files (see load_plan_set)
+        cache: Optional cache of parsed fragments (see load_plan_set)
+    
+    Returns:
+        (plan, []) on success, (None, error messages) otherwise
+    """
+    try:
+        if len(files) == 1 and is_snapshot(files[0]):
+            # A compiled snapshot is already validated and computed
+            plan = load_snapshot(files[0])
+        else:
+            plan = load_plan_set(list(files), jobs, cache)
+            
+            result = validate(plan)
+            if not result.is_valid:
+                return None, [format_error(error) for error in result.errors]
+            
+            compute_effort_metrics(plan)
+            compute_schedule(plan)
+            compute_critical_path(plan)
+    except LoadError as e:
+        return None, [f"[error] [loading] {e}"]
+    except MergeConflictError as e:
+        return None, [f"[error] [merge] {e}"]
+    except SnapshotError as e:
+        return None, [f"[error] [snapshot] {e}"]
+    
+    plan.index  # built now rather than by concurrent requests
+    return plan, []
+
+
+class PlanStore:
+    """
+    Computed plans by plan set, reloaded when their files change.
+    
+    Plan sets are named by clients, so the store is a thread-safe LRU:
+    beyond max_entries the least recently used plan set is dropped, and
+    a plan set is dropped as soon as one of its files is missing.
+    """
+    
+    def __init__(
+        self,
+        jobs: Optional[int] = None,
+        cache: Optional["FragmentCache"] = None,
+        max_entries: int = DEFAULT_PLAN_CACHE_SIZE,
+    ) -> None:
+        """
+        Args:
+            jobs: Worker processes for parsing files (see load_plan_set)
+            cache: Optional cache of parsed fragments (see load_plan_set)
+            max_entries: Plan sets kept loaded; the least recently used
+                         is dropped first (0 loads on every request)
+        """
+        self.jobs = jobs
+        self.cache = cache
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple[str, ...], PlanEntry] = OrderedDict()
+        self._locks: dict[tuple[str, ...], threading.Lock] = {}
+        # Guards _entries and _locks
+        self._locks_lock = threading.Lock()
+        self._generations = itertools.count(1)
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def get(self, files: Sequence[str]) -> PlanEntry:
+        """
+        Get the current entry of a plan set, loading it if needed.
+        
+        Args:
+            files: Paths of the plan set files
+        
+        Returns:
+            PlanEntry (check plan/errors); the same object as long as
+            the file contents do not change and the plan set stays in
+            the store
+        """
+        key = tuple(os.path.realpath(file_path) for file_path in files)
+        stamps = tuple(_stamp(file_path) for file_path in key)
+        entry = self._lookup(key)
+        if entry is not None and entry.stamps == stamps:
+            return entry
+        
+        with self._lock(key):
+            # Another request may have reloaded while this one waited
+            entry = self._lookup(key)
+            stamps = tuple(_stamp(file_path) for file_path in key)
+            if entry is not None and entry.stamps == stamps:
+                return entry
+            
+            digests = tuple(_digest(file_path) for file_path in key)
+            if entry is not None and entry.digests == digests:
+                # Touched, not changed: keep the plan
+                entry.stamps = stamps
+                return entry
+            
+            plan, errors = load_computed_plan(key, self.jobs, self.cache)
+            entry = PlanEntry(
+                files=key,
+                stamps=stamps,
+                digests=digests,
+                generation=next(self._generations),
+                plan=plan,
+                errors=errors,
+            )
+            if _MISSING in stamps:
+                # Report the error without keeping the plan set
+                self._discard(key)
+            else:
+                self._store(key, entry)
+            return entry
+    
+    def _lookup(self, key: tuple[str, ...]) -> Optional[PlanEntry]:
+        """Stored entry of a plan set (marking it recently used), or None."""
+        with self._locks_lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+    
+    def _store(self, key: tuple[str, ...], entry: PlanEntry) -> None:
+        """Store an entry, dropping missing and least recently used plan sets."""
+        with self._locks_lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            missing = [
+                other for other, stored in self._entries.items()
+                if any(_stamp(file_path) == _MISSING for file_path in stored.files)
+            ]
+            for other in missing:
+                self._drop(other)
+            while len(self._entries) > max(self.max_entries, 0):
+                self._drop(next(iter(self._entries)))
+    
+    def _discard(self, key: tuple[str, ...]) -> None:
+        """Drop a plan set from the store."""
+        with self._locks_lock:
+            self._drop(key)
+    
+    def _drop(self, key: tuple[str, ...]) -> None:
+        """Drop a plan set and its lock (with _locks_lock held)."""
+        self._entries.pop(key, None)
+        self._locks.pop(key, None)
+    
+    def _lock(self, key: tuple[str, ...]) -> threading.Lock:
+        """Lock serializing the loads of one plan set."""
+        with self._locks_lock:
+            lock = self._locks.get(key)
+            if lock is None:
+                lock = self._locks[key] = threading.Lock()
+            return lock
+
+
+class OutputCache:
+    """
+    Thread-safe LRU of rendered response bodies.
+    """
+    
+    def __init__(self, max_entries: int = DEFAULT_OUTPUT_CACHE_SIZE) -> None:
+        """
+        Args:
+            max_entries: Bodies kept; the least recently used is dropped
+                         first (0 disables the cache)
+        """
+        self.max_entries = max_entries
+        self._entries: OrderedDict[Hashable, bytes] = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def get(self, key: Hashable) -> Optional[bytes]:
+        """Return a cached body (marking it recently used), or None."""
+        with self._lock:
+            body = self._entries.get(key)
+            if body is not None:
+                self._entries.move_to_end(key)
+            return body
+    
+    def put(self, key: Hashable, body: bytes) -> None:
+        """Store a body, dropping the least recently used beyond max_entries."""
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = body
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+@dataclass
+class Response:
+    """
+    Result of one request.
+    
+    Attributes:
+        status: HTTP status code
+        body: UTF-8 response body
+        cached: Whether the body came from the output cache
+    """
+    status: int
+    body: bytes
+    cached: bool = False
+
+
+def _text(status: int, message: str) -> Response:
+    """Response with a one-line (or multi-line) text body."""
+    return Response(status, (message.rstrip("\n") + "\n").encode("utf-8"))
+
+
+def render_body(
+    plan: MergedPlan,
+    render_format: str,
+    view_id: Optional[str] = None,
+    dimensions: Optional[list[str]] = None,
+    node_id: Optional[str] = None,
+) -> bytes:
+    """
+    Render a computed plan as the CLI would print it.
+    
+    Args:
+        plan: Plan returned by load_computed_plan
+        render_format: One of SERVE_FORMATS
+        view_id: Optional view ID (not used by effort-summary)
+        dimensions: effort-summary dimensions (None for the default)
+        node_id: effort-summary subtree
+    
+    Returns:
+        UTF-8 encoded output, each line terminated by a newline
+    
+    Raises:
+        ValueError: If the view, a dimension or the node is unknown
+    """
+    if render_format == "effort-summary":
+        lines = iter_effort_summary(plan, dimensions, node_id)
+    elif render_format == "gantt":
+        lines = iter_gantt(plan, view_id or "")
+    else:
+        renderers = {
+            "tree": iter_tree,
+            "list": iter_list,
+            "deps": iter_deps,
+            "critical": iter_critical,
+        }
+        lines = renderers[render_format](plan, view_id)
+    
+    output = io.StringIO()
+    write_lines(lines, output)
+    return output.getvalue().encode("utf-8")
+
+
+class RenderService:
+    """
+    Request handling of the render server, independent of the transport.
+    
+    Attributes:
+        default_files: Plan set used when a request names no file
+        root: Directory that files named in requests must be inside
+        plans: PlanStore of computed plans
+        outputs: OutputCache of rendered bodies
+    """
+    
+    def __init__(
+        self,
+        default_files: Optional[Sequence[str]] = None,
+        root: Optional[str] = None,
+        jobs: Optional[int] = None,
+        cache: Optional["FragmentCache"] = None,
+        output_cache_size: int = DEFAULT_OUTPUT_CACHE_SIZE,
+        plan_cache_size: int = DEFAULT_PLAN_CACHE_SIZE,
+    ) -> None:
+        """
+        Args:
+            default_files: Plan set used when a request names no file
+            root: Directory for files named in requests (default: the
+                  current directory)
+            jobs: Worker processes for parsing files (see load_plan_set)
+            cache: Optional cache of parsed fragments (see load_plan_set)
+            output_cache_size: Rendered bodies kept (see OutputCache)
+            plan_cache_size: Plan sets kept loaded (see PlanStore)
+        """
+        self.default_files = list(default_files or [])
+        self.root = os.path.realpath(root or os.getcwd())
+        self.plans = PlanStore(jobs, cache, plan_cache_size)
+        self.outputs = OutputCache(output_cache_size)
+    
+    def handle(self, target: str) -> Response:
+        """
+        Answer a GET request.
+        
+        Args:
+            target: Request target, e.g. "/render/tree?view=backlog"
+        
+        Returns:
+            Response
+        """
+        url = urlsplit(target)
+        parts = [part for part in url.path.split("/") if part]
+        if len(parts) != 2 or parts[0] != "render":
+            return _text(HTTPStatus.NOT_FOUND, f"Not found: {url.path}")
+        render_format = parts[1]
+        if render_format not in SERVE_FORMATS:
+            return _text(
+                HTTPStatus.NOT_FOUND,
+                f"Unknown format '{render_format}' (expected one of {', '.join(SERVE_FORMATS)})",
+            )
+        
+        query = parse_qs(url.query)
+        view_id = query.get("view", [None])[-1] or None
+        node_id = query.get("node", [None])[-1] or None
+        dimensions = query.get("by") or None
+        
+        files = query.get("file")
+        if files:
+            for file_path in files:
+                if not self._inside_root(file_path):
+                    return _text(HTTPStatus.FORBIDDEN, f"File outside the server root: {file_path}")
+            files = [os.path.join(self.root, file_path) for file_path in files]
+        else:
+            files = self.default_files
+        if not files:
+            return _text(HTTPStatus.BAD_REQUEST, "No plan files: pass file=PATH")
+        
+        entry = self.plans.get(files)
+        if entry.plan is None:
+            return _text(HTTPStatus.UNPROCESSABLE_ENTITY, "\n".join(entry.errors))
+        
+        key = (
+            entry.generation, render_format, view_id,
+            tuple(dimensions) if dimensions else None, node_id,
+        )
+        body = self.outputs.get(key)
+        if body is not None:
+            return Response(HTTPStatus.OK, body, cached=True)
+        
+        try:
+            body = render_body(entry.plan, render_format, view_id, dimensions, node_id)
+        except ValueError as e:
+            return _text(HTTPStatus.BAD_REQUEST, f"[error] [render] {e}")
+        self.outputs.put(key, body)
+        return Response(HTTPStatus.OK, body)
+    
+    def _inside_root(self, file_path: str) -> bool:
+        """Whether a requested path resolves to a file inside root."""
+        real = os.path.realpath(os.path.join(self.root, file_path))
+        return os.path.commonpath([self.root, real]) == self.root
+
+
+class RenderRequestHandler(BaseHTTPRequestHandler):
+    """HTTP front end of RenderService (server.service)."""
+    
+    server_version = "opskarta-serve"
+    
+    def do_GET(self) -> None:
+        response = self.server.service.handle(self.path)
+        self.send_response(response.status)
+        self.send_header("Content-Type", "text/plain; charset=utf-8")
+        self.send_header("Content-Length", str(len(response.body)))
+        self.send_header("X-Opskarta-Cache", "hit" if response.cached else "miss")
+        self.end_headers()
+        self.wfile.write(response.body)
+    
+    def address_string(self) -> str:
+        # Unix socket peers have no (host, port) address
+        if isinstance(self.client_address, tuple) and self.client_address:
+            return str(self.client_address[0])
+        return "unix"
+    
+    def log_message(self, format: str, *args) -> None:
+        if not getattr(self.server, "quiet", False):
+            super().log_message(format, *args)
+
+
+class _ThreadPoolMixIn:
+    """Handle each request on a fixed pool of threads (cf. ThreadingMixIn)."""
+    
+    threads = DEFAULT_THREADS
+    
+    def process_request(self, request, client_address) -> None:
+        if getattr(self, "_pool", None) is None:
+            self._pool = ThreadPoolExecutor(self.threads, thread_name_prefix="opskarta-serve")
+        self._pool.submit(self._process_request_in_pool, request, client_address)
+    
+    def _process_request_in_pool(self, request, client_address) -> None:
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+    
+    def server_close(self) -> None:
+        super().server_close()
+        if getattr(self, "_pool", None) is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+
+class RenderHTTPServer(_ThreadPoolMixIn, HTTPServer):
+    """RenderService over TCP."""
+
+
+if hasattr(socketserver, "UnixStreamServer"):
+    class RenderUnixServer(_ThreadPoolMixIn, socketserver.UnixStreamServer):
+        """RenderService over a Unix socket."""
+else:  # pragma: no cover - Windows
+    RenderUnixServer = None
+
+
+def create_server(
+    service: RenderService,
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    socket_path: Optional[str] = None,
+    threads: int = DEFAULT_THREADS,
+    quiet: bool = False,
+) -> socketserver.BaseServer:
+    """
+    Create a server for a RenderService (call serve_forever to run it).
+    
+    Args:
+        service: RenderService answering the requests
+        host: TCP host to bind (ignored with socket_path)
+        port: TCP port to bind (0 = any free port; see server_address)
+        socket_path: Unix socket path to bind instead of TCP; an existing
+                     socket (e.g. left by a previous server) is replaced,
+                     any other file is left alone
+        threads: Request threads
+        quiet: Do not log requests to stderr
+    
+    Returns:
+        Bound server
+    
+    Raises:
+        OSError: If the address cannot be bound (FileExistsError if
+                 socket_path exists and is not a socket)
+        ValueError: If Unix sockets are not supported on this platform
+    """
+    if socket_path is not None:
+        if RenderUnixServer is None:
+            raise ValueError("Unix sockets are not supported on this platform")
+        try:
+            mode = os.lstat(socket_path).st_mode
+        except FileNotFoundError:
+            pass
+        else:
+            if not stat.S_ISSOCK(mode):
+                raise FileExistsError(f"Not a socket, refusing to replace it: {socket_path}")
+            os.unlink(socket_path)
+        server = RenderUnixServer(socket_path, RenderRequestHandler)
+    else:
+        server = RenderHTTPServer((host, port), RenderRequestHandler)
+    server.service = service
+    server.threads = threads
+    server.quiet = quiet
+    return server
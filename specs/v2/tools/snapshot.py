@@ -0,0 +1,619 @@
+"""
+Compiled plan snapshots for opskarta v2.
+
+A snapshot is a binary file holding a fully computed MergedPlan (after
+validation, compute_effort_metrics, compute_schedule and
+compute_critical_path). Rendering from a snapshot skips YAML parsing,
+merging, validation and scheduling, so many views of one plan can be
+rendered cheaply (`opskarta compile`, then `opskarta render ... plan.opsnap`).
+
+File layout (native little-endian):
+- Header: magic b"OPSKSNAP", format version (u16), section count (u32)
+- Section table: 4-byte name, offset (u64), length (u64) per section;
+  sections start at 8-byte boundaries
+- STRS: string table, UTF-8 strings joined by NUL; every other section
+  refers to strings by index
+- Node columns (one entry per node, plan.nodes order): int32 string
+  indices (NID, NTTL, NKND, NSTS, NISS, NNOT, NSRC), int32 parent node
+  index (NPAR), uint8 flags (NFLG), CSR after adjacency (NAFO offsets,
+  NAFT node indices), float64 effort values with uint8 number kinds
+  (NEF*/NEK*)
+- Schedule node columns (schedule.nodes order): string indices (SNID,
+  SSTA, SFIN, SDUR, SCAL, SSRC), int32 day ordinals (SCST, SCFN, SLST,
+  SLFN; 0 = none), int32 total float (STFL)
+- CRIT: critical path node indices; SWRN: warning string index triples
+- REST: pickle of the small remaining parts (meta, statuses, views,
+  calendars, x, other sources) and of values that do not fit a column
+  (e.g. extension data, unquoted YAML dates)
+
+Loading maps the file with mmap and reads the columns through
+memoryview casts, without an intermediate decoding step; only the
+model objects the renderers need are built.
+
+Safety: REST is read by a restricted unpickler that only rebuilds the
+model classes it can contain (Meta, Status, Calendar, View, ViewFilter)
+and YAML value types (dates, times, sets); any other global makes the
+snapshot corrupt. Files are treated as snapshots only when their name
+ends with SNAPSHOT_SUFFIX (see is_snapshot), never by sniffing content.
+"""
+
+import io
+import mmap
+import os
+import pickle
+import struct
+import sys
+from array import array
+from datetime import date
+from typing import Any, Optional
+
+from specs.v2.tools.columns import ScheduleColumns
+from specs.v2.tools.models import (
+    MergedPlan,
+    Node,
+    Schedule,
+    ScheduleNode,
+    ScheduleWarning,
+    SourceIndex,
+)
+
+
+MAGIC = b"OPSKSNAP"
+
+# Bump on any incompatible layout change
+SNAPSHOT_VERSION = 1
+
+# Conventional file extension of compiled plans
+SNAPSHOT_SUFFIX = ".opsnap"
+
+_HEADER = struct.Struct("<8sHxxI")
+_SECTION = struct.Struct("<4sQQ")
+
+# String/node index meaning "None" and "value stored in REST extras"
+_NONE = -1
+_EXTRA = -2
+
+# total_float value meaning "None"
+_NO_FLOAT = -(2 ** 31)
+
+# Node flags (NFLG)
+_MILESTONE = 1
+_HAS_AFTER = 2
+
+# Number kinds of effort columns (NEK*)
+_NUM_NONE = 0
+_NUM_INT = 1
+_NUM_FLOAT = 2
+
+_EFFORT_FIELDS = ("effort", "effort_rollup", "effort_effective", "effort_gap")
+
+# Section typecodes (default: int32)
+_TYPECODES = {
+    "NFLG": "B",
+    "NEF0": "d", "NEF1": "d", "NEF2": "d", "NEF3": "d",
+    "NEK0": "B", "NEK1": "B", "NEK2": "B", "NEK3": "B",
+}
+
+
+# Globals REST may reference: model classes and the non-container
+# value types of yaml.safe_load (extension data, unquoted dates)
+_REST_GLOBALS = frozenset({
+    ("specs.v2.tools.models", "Meta"),
+    ("specs.v2.tools.models", "Status"),
+    ("specs.v2.tools.models", "Calendar"),
+    ("specs.v2.tools.models", "View"),
+    ("specs.v2.tools.models", "ViewFilter"),
+    ("datetime", "date"),
+    ("datetime", "datetime"),
+    ("datetime", "time"),
+    ("datetime", "timedelta"),
+    ("datetime", "timezone"),
+    ("builtins", "set"),
+    ("builtins", "frozenset"),
+})
+
+
+class SnapshotError(Exception):
+    """
+    Exception raised when a snapshot cannot be written or read.
+    
+    Attributes:
+        message: Human-readable error description
+        file_path: Path to the snapshot file (if known)
+    """
+    
+    def __init__(self, message: str, file_path: Optional[str] = None) -> None:
+        self.message = message
+        self.file_path = file_path
+        super().__init__(f"[{file_path}] {message}" if file_path else message)
+
+
+class _StringTable:
+    """Deduplicating string table used while writing a snapshot."""
+    
+    def __init__(self) -> None:
+        self.index: dict[str, int] = {}
+        self.strings: list[str] = []
+    
+    def add(self, value: str) -> int:
+        i = self.index.get(value)
+        if i is None:
+            i = self.index[value] = len(self.strings)
+            self.strings.append(value)
+        return i
+    
+    def ref(self, value: Any, extras: dict, position: int, name: str) -> int:
+        """Index of an optional string; other values go to extras."""
+        if value is None:
+            return _NONE
+        if type(value) is str and "\0" not in value:
+            return self.add(value)
+        extras.setdefault(position, {})[name] = value
+        return _EXTRA
+
+
+def _ordinal(value: Any, extras: dict, position: int, name: str) -> int:
+    """Day ordinal of an optional ISO date string; others go to extras."""
+    if value is None:
+        return 0
+    if type(value) is str:
+        try:
+            parsed = date.fromisoformat(value)
+        except ValueError:
+            parsed = None
+        if parsed is not None and parsed.isoformat() == value:
+            return parsed.toordinal()
+    extras.setdefault(position, {})[name] = value
+    return _EXTRA
+
+
+class _RestUnpickler(pickle.Unpickler):
+    """Unpickler of the REST section; refuses globals outside _REST_GLOBALS."""
+    
+    def find_class(self, module: str, name: str) -> Any:
+        if (module, name) not in _REST_GLOBALS:
+            raise pickle.UnpicklingError(f"Global '{module}.{name}' is not allowed in a snapshot")
+        return super().find_class(module, name)
+
+
+def is_snapshot(file_path: str) -> bool:
+    """
+    Check whether a FILE argument names a compiled plan snapshot.
+    
+    Snapshots are opted into by name (SNAPSHOT_SUFFIX), not detected by
+    content, so a YAML file argument or a render server file= parameter
+    is never read as a snapshot by accident; load_snapshot then checks
+    the magic bytes.
+    
+    Args:
+        file_path: Path to check
+    
+    Returns:
+        True if the file name ends with SNAPSHOT_SUFFIX
+    """
+    return str(file_path).endswith(SNAPSHOT_SUFFIX)
+
+
+def save_snapshot(plan: MergedPlan, file_path: str) -> None:
+    """
+    Write a compiled snapshot of a plan.
+    
+    The plan should be validated and computed (effort metrics, schedule,
+    critical path) first; the snapshot stores it as it is.
+    
+    Args:
+        plan: Plan to store
+        file_path: Output file
+    
+    Raises:
+        SnapshotError: If node ids are not strings or the file cannot be written
+    """
+    strings = _StringTable()
+    sections: dict[str, array] = {}
+    
+    # Nodes
+    node_ids = list(plan.nodes)
+    for node_id in node_ids:
+        if type(node_id) is not str or "\0" in node_id:
+            raise SnapshotError(f"Node id {node_id!r} cannot be stored", file_path)
+    node_index = {node_id: i for i, node_id in enumerate(node_ids)}
+    
+    node_extras: dict[int, dict[str, Any]] = {}
+    nid, title, kind, status, issue, notes, source = (array("i") for _ in range(7))
+    parent = array("i")
+    flags = array("B")
+    after_offsets = array("i", [0])
+    after_targets = array("i")
+    effort_values = [array("d") for _ in _EFFORT_FIELDS]
+    effort_kinds = [array("B") for _ in _EFFORT_FIELDS]
+    node_sources = plan.sources.of_type("node")
+    
+    for i, node_id in enumerate(node_ids):
+        node = plan.nodes[node_id]
+        nid.append(strings.add(node_id))
+        title.append(strings.ref(node.title, node_extras, i, "title"))
+        kind.append(strings.ref(node.kind, node_extras, i, "kind"))
+        status.append(strings.ref(node.status, node_extras, i, "status"))
+        issue.append(strings.ref(node.issue, node_extras, i, "issue"))
+        notes.append(strings.ref(node.notes, node_extras, i, "notes"))
+        source.append(strings.ref(node_sources.get(node_id), node_extras, i, "_source"))
+        
+        if node.parent is None:
+            parent.append(_NONE)
+        elif node.parent in node_index:
+            parent.append(node_index[node.parent])
+        else:
+            parent.append(_EXTRA)
+            node_extras.setdefault(i, {})["parent"] = node.parent
+        
+        node_flags = 0
+        if node.milestone is True:
+            node_flags |= _MILESTONE
+        elif node.milestone is not False:
+            node_extras.setdefault(i, {})["milestone"] = node.milestone
+        if node.after is not None:
+            if isinstance(node.after, list) and all(
+                type(dep_id) is str and dep_id in node_index for dep_id in node.after
+            ):
+                node_flags |= _HAS_AFTER
+                after_targets.extend(node_index[dep_id] for dep_id in node.after)
+            else:
+                node_extras.setdefault(i, {})["after"] = node.after
+        flags.append(node_flags)
+        after_offsets.append(len(after_targets))
+        
+        for k, name in enumerate(_EFFORT_FIELDS):
+            value = getattr(node, name)
+            if value is None:
+                effort_kinds[k].append(_NUM_NONE)
+                effort_values[k].append(0.0)
+            elif type(value) is float:
+                effort_kinds[k].append(_NUM_FLOAT)
+                effort_values[k].append(value)
+            elif type(value) is int and float(value) == value and abs(value) < 2 ** 53:
+                effort_kinds[k].append(_NUM_INT)
+                effort_values[k].append(float(value))
+            else:
+                effort_kinds[k].append(_NUM_NONE)
+                effort_values[k].append(0.0)
+                node_extras.setdefault(i, {})[name] = value
+        
+        if node.x is not None:
+            node_extras.setdefault(i, {})["x"] = node.x
+    
+    sections.update({
+        "NID ": nid, "NTTL": title, "NKND": kind, "NSTS": status,
+        "NISS": issue, "NNOT": notes, "NSRC": source, "NPAR": parent,
+        "NFLG": flags, "NAFO": after_offsets, "NAFT": after_targets,
+    })
+    for k in range(len(_EFFORT_FIELDS)):
+        sections[f"NEF{k}"] = effort_values[k]
+        sections[f"NEK{k}"] = effort_kinds[k]
+    
+    # Schedule
+    schedule = plan.schedule
+    schedule_extras: dict[int, dict[str, Any]] = {}
+    rest_schedule = None
+    if schedule is not None:
+        rest_schedule = {
+            "calendars": schedule.calendars,
+            "default_calendar": schedule.default_calendar,
+        }
+        snid, sstart, sfinish, sduration, scalendar, ssource = (array("i") for _ in range(6))
+        cstart, cfinish, lstart, lfinish, tfloat = (array("i") for _ in range(5))
+        sn_sources = plan.sources.of_type("schedule_node")
+        for i, (sn_id, sn) in enumerate(schedule.nodes.items()):
+            if type(sn_id) is not str or "\0" in sn_id:
+                raise SnapshotError(f"Schedule node id {sn_id!r} cannot be stored", file_path)
+            snid.append(strings.add(sn_id))
+            sstart.append(strings.ref(sn.start, schedule_extras, i, "start"))
+            sfinish.append(strings.ref(sn.finish, schedule_extras, i, "finish"))
+            sduration.append(strings.ref(sn.duration, schedule_extras, i, "duration"))
+            scalendar.append(strings.ref(sn.calendar, schedule_extras, i, "calendar"))
+            ssource.append(strings.ref(sn_sources.get(sn_id), schedule_extras, i, "_source"))
+            cstart.append(_ordinal(sn.computed_start, schedule_extras, i, "computed_start"))
+            cfinish.append(_ordinal(sn.computed_finish, schedule_extras, i, "computed_finish"))
+            lstart.append(_ordinal(sn.latest_start, schedule_extras, i, "latest_start"))
+            lfinish.append(_ordinal(sn.latest_finish, schedule_extras, i, "latest_finish"))
+            if sn.total_float is None:
+                tfloat.append(_NO_FLOAT)
+            elif type(sn.total_float) is int and _NO_FLOAT < sn.total_float < 2 ** 31:
+                tfloat.append(sn.total_float)
+            else:
+                tfloat.append(_NO_FLOAT)
+                schedule_extras.setdefault(i, {})["total_float"] = sn.total_float
+        
+        warnings = array("i")
+        for warning in schedule.warnings:
+            for value in (warning.node_id, warning.code, warning.message):
+                if type(value) is not str or "\0" in value:
+                    raise SnapshotError(f"Warning {warning!r} cannot be stored", file_path)
+                warnings.append(strings.add(value))
+        
+        critical = array("i")
+        for node_id in schedule.critical_path:
+            critical.append(strings.add(node_id))
+        
+        sections.update({
+            "SNID": snid, "SSTA": sstart, "SFIN": sfinish, "SDUR": sduration,
+            "SCAL": scalendar, "SSRC": ssource, "SCST": cstart, "SCFN": cfinish,
+            "SLST": lstart, "SLFN": lfinish, "STFL": tfloat,
+            "SWRN": warnings, "CRIT": critical,
+        })
+    
+    # Sources of everything except nodes and schedule nodes
+    other_sources = {
+        element_type: plan.sources.of_type(element_type)
+        for element_type in _source_types(plan.sources)
+        if element_type not in ("node", "schedule_node")
+    }
+    rest = {
+        "version": plan.version,
+        "meta": plan.meta,
+        "statuses": plan.statuses,
+        "views": plan.views,
+        "x": plan.x,
+        "schedule": rest_schedule,
+        "sources": other_sources,
+        "node_extras": node_extras,
+        "schedule_extras": schedule_extras,
+    }
+    
+    blobs: list[tuple[str, bytes]] = [
+        ("STRS", "\0".join(strings.strings).encode("utf-8")),
+        ("STRN", array("i", [len(strings.strings)]).tobytes()),
+    ]
+    blobs.extend((name, column.tobytes()) for name, column in sections.items())
+    blobs.append(("REST", pickle.dumps(rest, protocol=pickle.HIGHEST_PROTOCOL)))
+    
+    _write(file_path, blobs)
+
+
+def _source_types(sources: SourceIndex) -> list[str]:
+    """Element types present in a SourceIndex."""
+    types: dict[str, None] = {}
+    for key in sources:
+        types[key.split(":", 1)[0]] = None
+    return list(types)
+
+
+def _write(file_path: str, blobs: list[tuple[str, bytes]]) -> None:
+    """Write the header, the section table and 8-byte aligned sections."""
+    offset = _HEADER.size + _SECTION.size * len(blobs)
+    table = []
+    for name, blob in blobs:
+        offset += -offset % 8
+        table.append((name, offset, len(blob)))
+        offset += len(blob)
+    
+    import tempfile
+    
+    # Written next to the target and renamed over it, so a reader (e.g.
+    # serve, which maps the file) never sees a truncated snapshot and a
+    # failed write leaves the previous one in place
+    tmp_path = None
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(file_path)), suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(_HEADER.pack(MAGIC, SNAPSHOT_VERSION, len(blobs)))
+            for name, section_offset, length in table:
+                f.write(_SECTION.pack(name.encode("ascii"), section_offset, length))
+            for (name, blob), (_, section_offset, _) in zip(blobs, table):
+                f.write(b"\0" * (section_offset - f.tell()))
+                f.write(blob)
+        os.replace(tmp_path, file_path)
+    except OSError as e:
+        raise SnapshotError(f"Cannot write snapshot: {e}", file_path)
+    finally:
+        # Only left over if writing or renaming failed
+        if tmp_path is not None and os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+
+
+def load_snapshot(file_path: str) -> MergedPlan:
+    """
+    Load a compiled plan snapshot.
+    
+    Args:
+        file_path: Snapshot written by save_snapshot
+    
+    Returns:
+        MergedPlan equal to the plan that was saved, with
+        schedule.columns rebuilt from the stored date ordinals
+    
+    Raises:
+        SnapshotError: If the file cannot be read, is not a snapshot or
+                       was written by an incompatible version
+    """
+    if sys.byteorder != "little":  # pragma: no cover - platform dependent
+        raise SnapshotError("Snapshots require a little-endian platform", file_path)
+    
+    try:
+        with open(file_path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError) as e:
+        raise SnapshotError(f"Cannot read snapshot: {e}", file_path)
+    
+    # Errors are raised after closing the map: the caught exception's
+    # traceback keeps views into it alive until the except block ends
+    error: Optional[SnapshotError] = None
+    try:
+        plan = _decode(memoryview(mapped), file_path)
+    except SnapshotError as e:
+        error = SnapshotError(e.message, file_path)
+    except (
+        struct.error, pickle.UnpicklingError, EOFError,
+        IndexError, KeyError, TypeError, ValueError,
+    ) as e:
+        error = SnapshotError(f"Corrupt snapshot: {e}", file_path)
+    mapped.close()
+    if error is not None:
+        raise error
+    return plan
+
+
+def _decode(view: memoryview, file_path: str) -> MergedPlan:
+    """Build a MergedPlan from a mapped snapshot."""
+    if len(view) < _HEADER.size:
+        raise SnapshotError("Not a compiled plan snapshot", file_path)
+    magic, version, count = _HEADER.unpack_from(view)
+    if magic != MAGIC:
+        raise SnapshotError("Not a compiled plan snapshot", file_path)
+    if version != SNAPSHOT_VERSION:
+        raise SnapshotError(
+            f"Unsupported snapshot version {version} (expected {SNAPSHOT_VERSION}); "
+            f"recompile the plan",
+            file_path,
+        )
+    
+    raw: dict[str, memoryview] = {}
+    for k in range(count):
+        name, offset, length = _SECTION.unpack_from(view, _HEADER.size + k * _SECTION.size)
+        if offset + length > len(view):
+            raise SnapshotError("Truncated snapshot", file_path)
+        raw[name.decode("ascii")] = view[offset:offset + length]
+    
+    def column(name: str):
+        return raw[name].cast(_TYPECODES.get(name, "i"))
+    
+    count_strings = column("STRN")[0]
+    strings = bytes(raw["STRS"]).decode("utf-8").split("\0") if count_strings else []
+    rest = _RestUnpickler(io.BytesIO(raw["REST"])).load()
+    
+    def text(index: int, extras: Optional[dict], name: str) -> Any:
+        if index >= 0:
+            return strings[index]
+        if index == _EXTRA:
+            return extras[name]
+        return None
+    
+    # Nodes
+    plan = MergedPlan(
+        version=rest["version"],
+        meta=rest["meta"],
+        statuses=rest["statuses"],
+        views=rest["views"],
+        x=rest["x"],
+    )
+    sources = plan.sources
+    node_extras = rest["node_extras"]
+    nid, title, kind, status = column("NID "), column("NTTL"), column("NKND"), column("NSTS")
+    issue, notes, source, parent = column("NISS"), column("NNOT"), column("NSRC"), column("NPAR")
+    flags, after_offsets, after_targets = column("NFLG"), column("NAFO"), column("NAFT")
+    effort_values = [column(f"NEF{k}") for k in range(len(_EFFORT_FIELDS))]
+    effort_kinds = [column(f"NEK{k}") for k in range(len(_EFFORT_FIELDS))]
+    
+    node_ids = [strings[i] for i in nid]
+    nodes = plan.nodes
+    for i, node_id in enumerate(node_ids):
+        extras = node_extras.get(i)
+        node_flags = flags[i]
+        
+        if node_flags & _HAS_AFTER:
+            after = [node_ids[t] for t in after_targets[after_offsets[i]:after_offsets[i + 1]]]
+        else:
+            after = extras.get("after") if extras else None
+        
+        parent_index = parent[i]
+        if parent_index >= 0:
+            parent_id = node_ids[parent_index]
+        else:
+            parent_id = extras["parent"] if parent_index == _EXTRA else None
+        
+        efforts = []
+        for k, name in enumerate(_EFFORT_FIELDS):
+            number_kind = effort_kinds[k][i]
+            if number_kind == _NUM_INT:
+                efforts.append(int(effort_values[k][i]))
+            elif number_kind == _NUM_FLOAT:
+                efforts.append(effort_values[k][i])
+            else:
+                efforts.append(extras.get(name) if extras else None)
+        
+        nodes[node_id] = Node(
+            title=text(title[i], extras, "title"),
+            kind=text(kind[i], extras, "kind"),
+            status=text(status[i], extras, "status"),
+            parent=parent_id,
+            after=after,
+            milestone=(
+                True if node_flags & _MILESTONE
+                else extras.get("milestone", False) if extras else False
+            ),
+            issue=text(issue[i], extras, "issue"),
+            notes=text(notes[i], extras, "notes"),
+            effort=efforts[0],
+            x=extras.get("x") if extras else None,
+            effort_rollup=efforts[1],
+            effort_effective=efforts[2],
+            effort_gap=efforts[3],
+        )
+        node_source = text(source[i], extras, "_source")
+        if node_source is not None:
+            sources.add("node", node_id, node_source)
+    
+    # Schedule
+    rest_schedule = rest["schedule"]
+    if rest_schedule is not None:
+        schedule = plan.schedule = Schedule(
+            calendars=rest_schedule["calendars"],
+            default_calendar=rest_schedule["default_calendar"],
+        )
+        schedule_extras = rest["schedule_extras"]
+        snid, sstart, sfinish = column("SNID"), column("SSTA"), column("SFIN")
+        sduration, scalendar, ssource = column("SDUR"), column("SCAL"), column("SSRC")
+        cstart, cfinish = column("SCST"), column("SCFN")
+        lstart, lfinish, tfloat = column("SLST"), column("SLFN"), column("STFL")
+        
+        iso: dict[int, str] = {}
+        
+        def day(ordinal: int, extras: Optional[dict], name: str) -> Optional[str]:
+            if ordinal > 0:
+                value = iso.get(ordinal)
+                if value is None:
+                    value = iso[ordinal] = date.fromordinal(ordinal).isoformat()
+                return value
+            if ordinal == _EXTRA:
+                return extras[name]
+            return None
+        
+        sn_ids = [strings[i] for i in snid]
+        for i, sn_id in enumerate(sn_ids):
+            extras = schedule_extras.get(i)
+            total_float = tfloat[i]
+            if total_float == _NO_FLOAT:
+                total_float = extras.get("total_float") if extras else None
+            schedule.nodes[sn_id] = ScheduleNode(
+                start=text(sstart[i], extras, "start"),
+                finish=text(sfinish[i], extras, "finish"),
+                duration=text(sduration[i], extras, "duration"),
+                calendar=text(scalendar[i], extras, "calendar"),
+                computed_start=day(cstart[i], extras, "computed_start"),
+                computed_finish=day(cfinish[i], extras, "computed_finish"),
+                latest_start=day(lstart[i], extras, "latest_start"),
+                latest_finish=day(lfinish[i], extras, "latest_finish"),
+                total_float=total_float,
+            )
+            sn_source = text(ssource[i], extras, "_source")
+            if sn_source is not None:
+                sources.add("schedule_node", sn_id, sn_source)
+        
+        warnings = column("SWRN")
+        schedule.warnings = [
+            ScheduleWarning(strings[warnings[k]], strings[warnings[k + 1]], strings[warnings[k + 2]])
+            for k in range(0, len(warnings), 3)
+        ]
+        schedule.critical_path = [strings[i] for i in column("CRIT")]
+        
+        columns = ScheduleColumns(sn_ids)
+        for i in range(len(sn_ids)):
+            # Extras (non-ISO computed values) are not dates
+            columns.start[i] = max(cstart[i], 0)
+            columns.finish[i] = max(cfinish[i], 0)
+        schedule.columns = columns
+    
+    for element_type, by_id in rest["sources"].items():
+        for element_id, element_source in by_id.items():
+            sources.add(element_type, element_id, element_source)
+    
+    return plan
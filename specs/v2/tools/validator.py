@@ -29,6 +29,7 @@ from dataclasses import dataclass, field
 from enum import Enum
 from typing import Optional
 
+from specs.v2.tools.cycles import find_cycles, find_functional_cycles
 from specs.v2.tools.models import MergedPlan
 
 
@@ -401,7 +402,7 @@ def _validate_node_references(plan: MergedPlan, result: ValidationResult) -> Non
     
     Requirements: 2.1, 2.2
     """
-    node_ids = set(plan.nodes.keys())
+    node_ids = plan.nodes.keys()
     status_ids = set(plan.statuses.keys())
     
     for node_id, node in plan.nodes.items():
@@ -447,126 +448,59 @@ def _detect_parent_cycles(plan: MergedPlan, result: ValidationResult) -> None:
     """
     Detect cyclic dependencies in parent hierarchy.
     
-    Uses DFS to detect cycles in the parent-child relationship.
-    A cycle exists if following parent references leads back to the starting node.
+    A cycle exists if following parent references leads back to the
+    starting node. Every node has at most one parent, so each cycle is
+    a simple loop found by a linear walk (see cycles.find_functional_cycles);
+    each one is reported once. Only nodes that plan.index could not reach
+    from a root (on or below a cycle) are searched; the parent chain of
+    every other node ends at a root.
     
     Requirements: 2.2 (parent field validation)
     """
-    # Build parent map for quick lookup
-    node_ids = set(plan.nodes.keys())
-    
-    # Track visited nodes and nodes in current path
-    visited: set[str] = set()
-    in_path: set[str] = set()
-    
-    def has_cycle(node_id: str, path: list[str]) -> Optional[list[str]]:
-        """
-        Check if there's a cycle starting from node_id.
-        Returns the cycle path if found, None otherwise.
-        """
-        if node_id in in_path:
-            # Found a cycle - return the cycle path
-            cycle_start = path.index(node_id)
-            return path[cycle_start:] + [node_id]
-        
-        if node_id in visited:
-            return None
-        
-        visited.add(node_id)
-        in_path.add(node_id)
-        path.append(node_id)
-        
-        node = plan.nodes.get(node_id)
-        if node and node.parent and node.parent in node_ids:
-            cycle = has_cycle(node.parent, path)
-            if cycle:
-                return cycle
-        
-        path.pop()
-        in_path.remove(node_id)
-        return None
-    
-    # Check each node for cycles
-    for node_id in plan.nodes:
-        if node_id not in visited:
-            cycle = has_cycle(node_id, [])
-            if cycle:
-                source_key = f"node:{cycle[0]}"
-                file_source = plan.sources.get(source_key)
-                cycle_str = " -> ".join(cycle)
-                result.add_error(
-                    message=f"Cyclic parent dependency detected: {cycle_str}",
-                    path=f"nodes.{cycle[0]}.parent",
-                    file_source=file_source,
-                )
-                # Reset visited to continue checking other potential cycles
-                # but mark cycle nodes as visited to avoid duplicate errors
-                for cid in cycle[:-1]:  # Exclude the repeated last element
-                    visited.add(cid)
+    nodes = plan.nodes
+    
+    def parent_of(node_id: str) -> Optional[str]:
+        return nodes[node_id].parent
+    
+    for cycle in find_functional_cycles(plan.index.detached, parent_of):
+        source_key = f"node:{cycle[0]}"
+        file_source = plan.sources.get(source_key)
+        cycle_str = " -> ".join(cycle)
+        result.add_error(
+            message=f"Cyclic parent dependency detected: {cycle_str}",
+            path=f"nodes.{cycle[0]}.parent",
+            file_source=file_source,
+        )
 
 
 def _detect_after_cycles(plan: MergedPlan, result: ValidationResult) -> None:
     """
     Detect cyclic dependencies in after relationships.
     
-    Uses DFS to detect cycles in the dependency graph formed by after references.
-    A cycle exists if following after references leads back to the starting node.
+    A cycle exists if following after references leads back to the
+    starting node. Strongly connected components of the after graph are
+    found in O(V + E) without recursion (see cycles.find_cycles), and
+    each group of mutually dependent nodes is reported once, as a
+    shortest cycle through its first node. Only nodes that plan.index
+    could not order topologically (on or behind a cycle) are searched;
+    no other node lies on a cycle.
     
     Requirements: 2.2 (after field validation)
     """
-    node_ids = set(plan.nodes.keys())
-    
-    # Track visited nodes and nodes in current path
-    visited: set[str] = set()
-    in_path: set[str] = set()
-    reported_cycles: set[frozenset[str]] = set()  # Track reported cycles to avoid duplicates
-    
-    def find_cycle(node_id: str, path: list[str]) -> Optional[list[str]]:
-        """
-        Check if there's a cycle starting from node_id in after dependencies.
-        Returns the cycle path if found, None otherwise.
-        """
-        if node_id in in_path:
-            # Found a cycle - return the cycle path
-            cycle_start = path.index(node_id)
-            return path[cycle_start:] + [node_id]
-        
-        if node_id in visited:
-            return None
-        
-        visited.add(node_id)
-        in_path.add(node_id)
-        path.append(node_id)
-        
-        node = plan.nodes.get(node_id)
-        if node and node.after:
-            for after_id in node.after:
-                if after_id in node_ids:
-                    cycle = find_cycle(after_id, path)
-                    if cycle:
-                        return cycle
-        
-        path.pop()
-        in_path.remove(node_id)
-        return None
-    
-    # Check each node for cycles
-    for node_id in plan.nodes:
-        if node_id not in visited:
-            cycle = find_cycle(node_id, [])
-            if cycle:
-                # Create a frozenset of cycle nodes to check for duplicates
-                cycle_set = frozenset(cycle[:-1])  # Exclude repeated last element
-                if cycle_set not in reported_cycles:
-                    reported_cycles.add(cycle_set)
-                    source_key = f"node:{cycle[0]}"
-                    file_source = plan.sources.get(source_key)
-                    cycle_str = " -> ".join(cycle)
-                    result.add_error(
-                        message=f"Cyclic after dependency detected: {cycle_str}",
-                        path=f"nodes.{cycle[0]}.after",
-                        file_source=file_source,
-                    )
+    nodes = plan.nodes
+    
+    def after_of(node_id: str) -> list[str]:
+        return nodes[node_id].after or []
+    
+    for cycle in find_cycles(plan.index.after_blocked, after_of):
+        source_key = f"node:{cycle[0]}"
+        file_source = plan.sources.get(source_key)
+        cycle_str = " -> ".join(cycle)
+        result.add_error(
+            message=f"Cyclic after dependency detected: {cycle_str}",
+            path=f"nodes.{cycle[0]}.after",
+            file_source=file_source,
+        )
 
 
 def _validate_schedule_references(plan: MergedPlan, result: ValidationResult) -> None:
@@ -584,7 +518,7 @@ def _validate_schedule_references(plan: MergedPlan, result: ValidationResult) ->
     if plan.schedule is None:
         return
     
-    node_ids = set(plan.nodes.keys())
+    node_ids = plan.nodes.keys()
     calendar_ids = set(plan.schedule.calendars.keys())
     
     # Check default_calendar reference
@@ -643,7 +577,7 @@ def _validate_views(plan: MergedPlan, result: ValidationResult) -> None:
     
     Requirements: 4.2, 4.3
     """
-    node_ids = set(plan.nodes.keys())
+    node_ids = plan.nodes.keys()
     
     for view_id, view in plan.views.items():
         source_key = f"view:{view_id}"
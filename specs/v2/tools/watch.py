@@ -0,0 +1,364 @@
+"""
+Watch mode for opskarta v2 plan sets.
+
+PlanWatcher keeps one MergedPlan up to date while fragment files are
+edited. When files change, only those files are re-parsed. Their
+previous nodes and schedule nodes are retracted from the plan (looked
+up through plan.sources) and the new ones are merged in place. The
+schedule is then updated with IncrementalScheduler for the nodes whose
+scheduling inputs changed.
+
+Key concepts:
+- Change detection polls file stamps (mtime_ns, size); no platform
+  file-notification APIs are needed
+- The small blocks (version, meta, statuses, calendars, views, x) are
+  re-merged from the cached fragments on every update. This is cheap,
+  and keeps conflict detection and sources exact.
+- Nodes and schedule nodes keep the order a full load would give them
+- ScheduleNodes whose inputs did not change keep their computed dates
+- After a load or merge error, the next update reloads the whole set
+
+The result after update() + compute() equals a fresh load_plan_set,
+compute_effort_metrics and compute_schedule of the same files.
+
+Example:
+    >>> watcher = PlanWatcher(["main.yaml", "nodes.yaml"])
+    >>> watcher.update(watcher.poll())  # initial full load
+    >>> watcher.compute()
+    >>> # ... nodes.yaml is edited ...
+    >>> watcher.update(watcher.poll())  # re-merges nodes.yaml only
+    ['nodes.yaml']
+"""
+
+import os
+from typing import Any, Iterable, Optional
+
+from specs.v2.tools.cache import FragmentCache
+from specs.v2.tools.effort import compute_effort_metrics
+from specs.v2.tools.loader import (
+    LoadError,
+    MergeConflictError,
+    load_fragment,
+    load_fragments,
+    merge_fragments,
+)
+from specs.v2.tools.models import MergedPlan, Schedule
+from specs.v2.tools.scheduler import IncrementalScheduler
+
+
+# Source types of the blocks that are re-merged from all fragments
+_SMALL_SOURCE_TYPES = ("meta", "status", "calendar", "schedule", "view", "x")
+
+# Stamp of a file that does not exist (or cannot be read)
+_MISSING = (-1, -1)
+
+
+def _stamp(file_path: str) -> tuple[int, int]:
+    """Modification stamp of a file: (mtime_ns, size)."""
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return _MISSING
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def _without_nodes(fragment: dict[str, Any]) -> dict[str, Any]:
+    """Fragment without nodes and schedule.nodes (the small blocks only)."""
+    result = {key: value for key, value in fragment.items() if key != "nodes"}
+    schedule = fragment.get("schedule")
+    if isinstance(schedule, dict) and "nodes" in schedule:
+        result["schedule"] = {key: value for key, value in schedule.items() if key != "nodes"}
+    return result
+
+
+def _only_nodes(fragment: dict[str, Any]) -> dict[str, Any]:
+    """Fragment with nodes and schedule.nodes only."""
+    result = {"_source": fragment["_source"]}
+    if "nodes" in fragment:
+        result["nodes"] = fragment["nodes"]
+    schedule = fragment.get("schedule")
+    if isinstance(schedule, dict) and "nodes" in schedule:
+        result["schedule"] = {"nodes": schedule["nodes"]}
+    return result
+
+
+class PlanWatcher:
+    """
+    Incrementally maintained MergedPlan of a set of fragment files.
+    
+    Attributes:
+        files: Fragment files, in merge order
+        jobs: Worker processes for full loads (see load_fragments)
+        cache: Optional FragmentCache used for every parse
+        plan: Current merged plan (the same object across updates
+              unless a full reload was needed)
+    """
+    
+    def __init__(
+        self,
+        files: list[str],
+        jobs: Optional[int] = None,
+        cache: Optional[FragmentCache] = None,
+    ) -> None:
+        self.files = list(files)
+        self.jobs = jobs
+        self.cache = cache
+        self.plan = MergedPlan()
+        self._fragments: dict[str, dict[str, Any]] = {}
+        self._stamps: dict[str, tuple[int, int]] = {}
+        # file -> ids it contributes, in merge order
+        self._node_ids: dict[str, list[str]] = {}
+        self._schedule_node_ids: dict[str, list[str]] = {}
+        # Scheduling work left for compute()
+        self._scheduler: Optional[IncrementalScheduler] = None
+        self._changed_ids: dict[str, None] = {}
+        self._refresh = True
+        # A full reload is needed (initially and after errors)
+        self._stale = True
+    
+    def poll(self) -> list[str]:
+        """
+        Check the files for changes since the previous poll.
+        
+        Returns:
+            Changed files in merge order (all files on the first poll)
+        """
+        changed = []
+        for file_path in self.files:
+            stamp = _stamp(file_path)
+            if self._stamps.get(file_path) != stamp:
+                self._stamps[file_path] = stamp
+                changed.append(file_path)
+        return changed
+    
+    def update(self, changed: Iterable[str]) -> list[str]:
+        """
+        Bring the plan up to date after files changed.
+        
+        Args:
+            changed: Changed files (e.g. from poll())
+        
+        Returns:
+            Files that were re-parsed (all files after a full reload)
+        
+        Raises:
+            LoadError: If a changed file cannot be loaded
+            MergeConflictError: If the new contents conflict
+        """
+        changed_set = set(changed)
+        if not changed_set:
+            return []
+        
+        try:
+            if self._stale:
+                self._load()
+                return list(self.files)
+            changed_files = [f for f in self.files if f in changed_set]
+            self._remerge(changed_files)
+            return changed_files
+        except (LoadError, MergeConflictError):
+            self._stale = True
+            raise
+    
+    def compute(self) -> None:
+        """
+        Recompute effort metrics and update the schedule.
+        
+        Call after update() once the plan has been validated; scheduling
+        work of updates made while the plan was invalid is kept until
+        then.
+        """
+        plan = self.plan
+        compute_effort_metrics(plan)
+        
+        if plan.schedule is None:
+            self._scheduler = None
+        elif self._scheduler is None or self._scheduler.plan is not plan:
+            self._scheduler = IncrementalScheduler(plan)
+        elif self._refresh:
+            self._scheduler.refresh()
+        else:
+            self._scheduler.update(self._changed_ids)
+        self._changed_ids = {}
+        self._refresh = False
+    
+    def _load(self) -> None:
+        """Load and merge all files."""
+        fragments = load_fragments(self.files, self.jobs, self.cache)
+        self._install(merge_fragments(fragments), fragments)
+    
+    def _install(self, plan: MergedPlan, fragments: list[dict[str, Any]]) -> None:
+        """Use a fully merged plan as the new state."""
+        self.plan = plan
+        self._fragments = dict(zip(self.files, fragments))
+        self._node_ids = self._ids_by_file(plan.sources.of_type("node"))
+        self._schedule_node_ids = self._ids_by_file(plan.sources.of_type("schedule_node"))
+        self._scheduler = None
+        self._changed_ids = {}
+        self._refresh = True
+        self._stale = False
+    
+    def _ids_by_file(self, sources: dict[str, str]) -> dict[str, list[str]]:
+        """Group element ids by source file, keeping merge order."""
+        by_file: dict[str, list[str]] = {file_path: [] for file_path in self.files}
+        for element_id, source in sources.items():
+            by_file.setdefault(source, []).append(element_id)
+        return by_file
+    
+    def _remerge(self, changed: list[str]) -> None:
+        """Replace the contributions of changed files."""
+        plan = self.plan
+        
+        # Parse and merge everything before touching the plan
+        new_fragments = {f: load_fragment(f, self.cache) for f in changed}
+        fragments = [new_fragments.get(f) or self._fragments[f] for f in self.files]
+        small = merge_fragments([_without_nodes(fragment) for fragment in fragments])
+        added = {f: merge_fragments([_only_nodes(new_fragments[f])]) for f in changed}
+        
+        # Conflicts with unchanged files (or between changed files): a
+        # full merge raises the same error a fresh load would
+        if self._has_conflict(changed, added):
+            self._install(merge_fragments(fragments), fragments)
+            return
+        
+        # Scheduling inputs before the edit
+        schedule = plan.schedule
+        before = {}
+        for f in changed:
+            for node_id in self._node_ids[f]:
+                before[node_id] = _scheduling_inputs(plan, node_id)
+            for sn_id in self._schedule_node_ids[f]:
+                before[sn_id] = _scheduling_inputs(plan, sn_id)
+        
+        # Small blocks
+        plan.version = small.version
+        plan.meta = small.meta
+        plan.statuses = small.statuses
+        plan.views = small.views
+        plan.x = small.x
+        if any(fragment.get("schedule") for fragment in fragments):
+            calendars = small.schedule.calendars if small.schedule else {}
+            default_calendar = small.schedule.default_calendar if small.schedule else None
+            if schedule is None:
+                schedule = plan.schedule = Schedule()
+                self._refresh = True
+            if (calendars, default_calendar) != (schedule.calendars, schedule.default_calendar):
+                self._refresh = True
+            schedule.calendars = calendars
+            schedule.default_calendar = default_calendar
+        elif schedule is not None:
+            schedule = plan.schedule = None
+            self._refresh = True
+        
+        sources = plan.sources
+        for element_type in _SMALL_SOURCE_TYPES:
+            for element_id in list(sources.of_type(element_type)):
+                sources.discard(element_type, element_id)
+            for element_id, source in small.sources.of_type(element_type).items():
+                sources.add(element_type, element_id, source)
+        
+        # Retract the previous contributions and merge the new ones
+        for f in changed:
+            for node_id in self._node_ids[f]:
+                sources.discard("node", node_id)
+            for sn_id in self._schedule_node_ids[f]:
+                sources.discard("schedule_node", sn_id)
+        
+        new_nodes = {f: added[f].nodes for f in changed}
+        new_schedule_nodes = {
+            f: (added[f].schedule.nodes if added[f].schedule else {}) for f in changed
+        }
+        _replace_in_order(plan.nodes, self._node_ids, new_nodes, self.files)
+        plan.invalidate_index()
+        if schedule is not None:
+            # Keep computed dates of schedule nodes with unchanged inputs
+            for f, sn_by_id in new_schedule_nodes.items():
+                for sn_id, sn in sn_by_id.items():
+                    old = schedule.nodes.get(sn_id)
+                    if old is not None and _same_inputs(old, sn):
+                        sn_by_id[sn_id] = old
+            _replace_in_order(schedule.nodes, self._schedule_node_ids, new_schedule_nodes, self.files)
+        
+        for f in changed:
+            self._fragments[f] = new_fragments[f]
+            self._node_ids[f] = list(new_nodes[f])
+            self._schedule_node_ids[f] = list(new_schedule_nodes[f])
+            for node_id in new_nodes[f]:
+                sources.add("node", node_id, f)
+            for sn_id in new_schedule_nodes[f]:
+                sources.add("schedule_node", sn_id, f)
+        
+        # Nodes to reschedule
+        after = {}
+        for f in changed:
+            for node_id in new_nodes[f]:
+                after[node_id] = _scheduling_inputs(plan, node_id)
+            for sn_id in new_schedule_nodes[f]:
+                after[sn_id] = _scheduling_inputs(plan, sn_id)
+        for element_id in before.keys() | after.keys():
+            if before.get(element_id) != after.get(element_id):
+                self._changed_ids[element_id] = None
+    
+    def _has_conflict(self, changed: list[str], added: dict[str, MergedPlan]) -> bool:
+        """Whether new ids of changed files collide with other contributions."""
+        changed_set = set(changed)
+        owners = (self.plan.sources.of_type("node"), self.plan.sources.of_type("schedule_node"))
+        seen: tuple[set[str], set[str]] = (set(), set())
+        for f in changed:
+            schedule = added[f].schedule
+            id_lists = (added[f].nodes, schedule.nodes if schedule else {})
+            for owner_map, seen_ids, ids in zip(owners, seen, id_lists):
+                for element_id in ids:
+                    owner = owner_map.get(element_id)
+                    if element_id in seen_ids or (owner is not None and owner not in changed_set):
+                        return True
+                    seen_ids.add(element_id)
+        return False
+
+
+def _scheduling_inputs(plan: MergedPlan, node_id: str) -> tuple:
+    """Fields of a node that IncrementalScheduler.update depends on."""
+    node = plan.nodes.get(node_id)
+    sn = plan.schedule.nodes.get(node_id) if plan.schedule is not None else None
+    return (
+        (node.after, node.milestone) if node is not None else None,
+        (sn.start, sn.finish, sn.duration, sn.calendar) if sn is not None else None,
+    )
+
+
+def _same_inputs(old, new) -> bool:
+    """Whether two ScheduleNodes have the same input fields."""
+    return (
+        (old.start, old.finish, old.duration, old.calendar)
+        == (new.start, new.finish, new.duration, new.calendar)
+    )
+
+
+def _replace_in_order(
+    target: dict[str, Any],
+    ids_by_file: dict[str, list[str]],
+    new_by_file: dict[str, dict[str, Any]],
+    files: list[str],
+) -> None:
+    """
+    Replace the elements of some files in a merged dict.
+    
+    Elements keep their positions when a file's id list is unchanged;
+    otherwise the dict is rebuilt in file order, as merge_fragments
+    would build it.
+    """
+    if all(list(new) == ids_by_file[f] for f, new in new_by_file.items()):
+        for new in new_by_file.values():
+            target.update(new)
+        return
+    
+    merged: dict[str, Any] = {}
+    for f in files:
+        new = new_by_file.get(f)
+        if new is not None:
+            merged.update(new)
+        else:
+            for element_id in ids_by_file.get(f, ()):
+                merged[element_id] = target[element_id]
+    target.clear()
+    target.update(merged)